@@ -0,0 +1,81 @@
+"""add_backtest_result_tables
+
+Revision ID: 7c4e1a9b2d3f
+Revises: d5e78f9a1b2c
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c4e1a9b2d3f'
+down_revision: Union[str, None] = 'd5e78f9a1b2c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Per-day backtest results
+    op.create_table('hedge_fund_backtest_days',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('flow_run_id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.String(length=10), nullable=False),
+        sa.Column('portfolio_value', sa.Float(), nullable=False),
+        sa.Column('cash', sa.Float(), nullable=False),
+        sa.Column('portfolio_return', sa.Float(), nullable=True),
+        sa.Column('long_exposure', sa.Float(), nullable=True),
+        sa.Column('short_exposure', sa.Float(), nullable=True),
+        sa.Column('gross_exposure', sa.Float(), nullable=True),
+        sa.Column('net_exposure', sa.Float(), nullable=True),
+        sa.Column('long_short_ratio', sa.Float(), nullable=True),
+        sa.Column('performance_metrics', sa.JSON(), nullable=True),
+        sa.Column('decisions', sa.JSON(), nullable=True),
+        sa.Column('executed_trades', sa.JSON(), nullable=True),
+        sa.Column('current_prices', sa.JSON(), nullable=True),
+        sa.Column('analyst_signals', sa.JSON(), nullable=True),
+        sa.Column('usage', sa.JSON(), nullable=True),
+        sa.ForeignKeyConstraint(['flow_run_id'], ['hedge_fund_flow_runs.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_hedge_fund_backtest_days_id'), 'hedge_fund_backtest_days', ['id'], unique=False)
+    op.create_index('ix_hedge_fund_backtest_days_run_date', 'hedge_fund_backtest_days', ['flow_run_id', 'date'], unique=True)
+
+    # Per-ticker, per-day backtest results
+    op.create_table('hedge_fund_backtest_ticker_results',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('flow_run_id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.String(length=10), nullable=False),
+        sa.Column('ticker', sa.String(length=20), nullable=False),
+        sa.Column('action', sa.String(length=20), nullable=True),
+        sa.Column('quantity', sa.Integer(), nullable=True),
+        sa.Column('price', sa.Float(), nullable=True),
+        sa.Column('shares_owned', sa.Integer(), nullable=True),
+        sa.Column('long_shares', sa.Integer(), nullable=True),
+        sa.Column('short_shares', sa.Integer(), nullable=True),
+        sa.Column('position_value', sa.Float(), nullable=True),
+        sa.Column('bullish_count', sa.Integer(), nullable=True),
+        sa.Column('bearish_count', sa.Integer(), nullable=True),
+        sa.Column('neutral_count', sa.Integer(), nullable=True),
+        sa.Column('analyst_signals', sa.JSON(), nullable=True),
+        sa.ForeignKeyConstraint(['flow_run_id'], ['hedge_fund_flow_runs.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_hedge_fund_backtest_ticker_results_id'), 'hedge_fund_backtest_ticker_results', ['id'], unique=False)
+    op.create_index('ix_hedge_fund_backtest_ticker_results_run_ticker', 'hedge_fund_backtest_ticker_results', ['flow_run_id', 'ticker', 'date'], unique=False)
+    op.create_index('ix_hedge_fund_backtest_ticker_results_run_date', 'hedge_fund_backtest_ticker_results', ['flow_run_id', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_hedge_fund_backtest_ticker_results_run_date', table_name='hedge_fund_backtest_ticker_results')
+    op.drop_index('ix_hedge_fund_backtest_ticker_results_run_ticker', table_name='hedge_fund_backtest_ticker_results')
+    op.drop_index(op.f('ix_hedge_fund_backtest_ticker_results_id'), table_name='hedge_fund_backtest_ticker_results')
+    op.drop_table('hedge_fund_backtest_ticker_results')
+    op.drop_index('ix_hedge_fund_backtest_days_run_date', table_name='hedge_fund_backtest_days')
+    op.drop_index(op.f('ix_hedge_fund_backtest_days_id'), table_name='hedge_fund_backtest_days')
+    op.drop_table('hedge_fund_backtest_days')
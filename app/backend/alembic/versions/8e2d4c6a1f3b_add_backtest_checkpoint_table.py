@@ -0,0 +1,37 @@
+"""add_backtest_checkpoint_table
+
+Revision ID: 8e2d4c6a1f3b
+Revises: 7c4e1a9b2d3f
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2d4c6a1f3b'
+down_revision: Union[str, None] = '7c4e1a9b2d3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # One resume checkpoint per backtest run, kept out of the run's analysis cycles
+    op.create_table('hedge_fund_backtest_checkpoints',
+        sa.Column('flow_run_id', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('checkpoint', sa.JSON(), nullable=False),
+        sa.ForeignKeyConstraint(['flow_run_id'], ['hedge_fund_flow_runs.id']),
+        sa.PrimaryKeyConstraint('flow_run_id')
+    )
+    # Checkpoints written before the table existed were stored as cycles
+    op.execute("DELETE FROM hedge_fund_flow_run_cycles WHERE trigger_reason = 'checkpoint'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('hedge_fund_backtest_checkpoints')
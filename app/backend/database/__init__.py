@@ -1,4 +1,4 @@
-from .connection import get_db, engine, SessionLocal
+from .connection import get_db, get_async_db, engine, SessionLocal
 from .models import Base
 
-__all__ = ["get_db", "engine", "SessionLocal", "Base"] 
\ No newline at end of file
+__all__ = ["get_db", "get_async_db", "engine", "SessionLocal", "Base"] 
\ No newline at end of file
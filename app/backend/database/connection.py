@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -8,14 +9,65 @@ from pathlib import Path
 BACKEND_DIR = Path(__file__).parent.parent
 DATABASE_PATH = BACKEND_DIR / "hedge_fund.db"
 
-# Database configuration - use absolute path
-DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
+# Database configuration - use absolute path; set DATABASE_URL to use another database (e.g. a local Postgres)
+DATABASE_URL = os.environ.get("DATABASE_URL", f"sqlite:///{DATABASE_PATH}")
+
+# Async drivers used for the optional async session path, per database backend
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _engine_options(url: str) -> dict:
+    """Pool and driver options for the database behind url (sized by DATABASE_POOL_SIZE and DATABASE_MAX_OVERFLOW)."""
+    options = {
+        "pool_size": int(os.environ.get("DATABASE_POOL_SIZE", "5")),
+        "max_overflow": int(os.environ.get("DATABASE_MAX_OVERFLOW", "10")),
+        "pool_timeout": 30,
+    }
+    if is_sqlite(url):
+        # Sessions are used from threadpool workers; timeout is how long a writer waits for the lock
+        options["connect_args"] = {"check_same_thread": False, "timeout": 30}
+        if make_url(url).database in (None, "", ":memory:"):
+            # Each connection to an in-memory database would be a separate, empty database
+            return {"connect_args": options["connect_args"]}
+    else:
+        # Server databases close idle connections; check them before use
+        options["pool_pre_ping"] = True
+    return options
+
+
+def configure_sqlite(dbapi_connection, connection_record=None):
+    """
+    Tune a new SQLite connection for concurrent use.
+
+    WAL lets readers proceed while a writer commits, and NORMAL synchronous is durable under WAL
+    except for the last transactions on power loss. The busy timeout makes writers queue for the
+    lock instead of failing with "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA cache_size=-{int(os.environ.get('SQLITE_CACHE_KB', '65536'))}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA busy_timeout=30000")
+    finally:
+        cursor.close()
+
+
+def create_database_engine(url: str):
+    """Create an engine for url, with pooling and (for SQLite) the concurrency pragmas."""
+    engine = create_engine(url, **_engine_options(url))
+    if is_sqlite(url):
+        event.listen(engine, "connect", configure_sqlite)
+    return engine
+
 
 # Create SQLAlchemy engine
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Needed for SQLite
-)
+engine = create_database_engine(DATABASE_URL)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -29,4 +81,46 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+
+def get_async_database_url(url: str = DATABASE_URL) -> str:
+    """The async-driver form of url (ASYNC_DATABASE_URL overrides it)."""
+    if os.environ.get("ASYNC_DATABASE_URL"):
+        return os.environ["ASYNC_DATABASE_URL"]
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"No async driver configured for {backend} databases; set ASYNC_DATABASE_URL")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+_async_session_factory = None
+
+
+def get_async_session_factory():
+    """
+    Session factory for the optional async path, created on first use.
+
+    Needs SQLAlchemy's asyncio extension and the backend's async driver (aiosqlite or asyncpg),
+    which are not installed by default.
+    """
+    global _async_session_factory
+    if _async_session_factory is None:
+        try:
+            from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        except ImportError as e:
+            raise RuntimeError(f"Async database sessions need the asyncio extras of SQLAlchemy: {e}") from e
+
+        url = get_async_database_url()
+        async_engine = create_async_engine(url, **_engine_options(url))
+        if is_sqlite(url):
+            event.listen(async_engine.sync_engine, "connect", configure_sqlite)
+        _async_session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+    return _async_session_factory
+
+
+# Dependency for async routes that use AsyncSession queries
+async def get_async_db():
+    async with get_async_session_factory()() as db:
+        yield db
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, JSON, ForeignKey, Float, Index
 from sqlalchemy.sql import func
 from .connection import Base
 
@@ -94,6 +94,72 @@ class HedgeFundFlowRunCycle(Base):
     market_conditions = Column(JSON, nullable=True)  # Market data snapshot at cycle start
 
 
+class HedgeFundBacktestDay(Base):
+    """One trading day of a backtest run: portfolio value, exposures and the day's decisions"""
+    __tablename__ = "hedge_fund_backtest_days"
+    __table_args__ = (Index("ix_hedge_fund_backtest_days_run_date", "flow_run_id", "date", unique=True),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    flow_run_id = Column(Integer, ForeignKey("hedge_fund_flow_runs.id"), nullable=False)
+    date = Column(String(10), nullable=False)  # YYYY-MM-DD
+
+    # Portfolio state after the day's trades
+    portfolio_value = Column(Float, nullable=False)
+    cash = Column(Float, nullable=False)
+    portfolio_return = Column(Float, nullable=True)
+    long_exposure = Column(Float, nullable=True)
+    short_exposure = Column(Float, nullable=True)
+    gross_exposure = Column(Float, nullable=True)
+    net_exposure = Column(Float, nullable=True)
+    long_short_ratio = Column(Float, nullable=True)
+
+    # Large per-day payloads, only loaded when requested
+    performance_metrics = Column(JSON, nullable=True)
+    decisions = Column(JSON, nullable=True)
+    executed_trades = Column(JSON, nullable=True)
+    current_prices = Column(JSON, nullable=True)
+    analyst_signals = Column(JSON, nullable=True)
+    usage = Column(JSON, nullable=True)
+
+
+class HedgeFundBacktestCheckpoint(Base):
+    """Latest resume checkpoint of a backtest run: its state after the last stored day"""
+    __tablename__ = "hedge_fund_backtest_checkpoints"
+
+    flow_run_id = Column(Integer, ForeignKey("hedge_fund_flow_runs.id"), primary_key=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    checkpoint = Column(JSON, nullable=False)
+
+
+class HedgeFundBacktestTickerResult(Base):
+    """One ticker on one trading day of a backtest run"""
+    __tablename__ = "hedge_fund_backtest_ticker_results"
+    __table_args__ = (
+        Index("ix_hedge_fund_backtest_ticker_results_run_ticker", "flow_run_id", "ticker", "date"),
+        Index("ix_hedge_fund_backtest_ticker_results_run_date", "flow_run_id", "date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    flow_run_id = Column(Integer, ForeignKey("hedge_fund_flow_runs.id"), nullable=False)
+    date = Column(String(10), nullable=False)  # YYYY-MM-DD
+    ticker = Column(String(20), nullable=False)
+
+    # Trade and position
+    action = Column(String(20), nullable=True)  # buy, sell, short, cover, hold
+    quantity = Column(Integer, nullable=True)  # Executed quantity
+    price = Column(Float, nullable=True)
+    shares_owned = Column(Integer, nullable=True)  # Net shares (long - short)
+    long_shares = Column(Integer, nullable=True)
+    short_shares = Column(Integer, nullable=True)
+    position_value = Column(Float, nullable=True)
+
+    # Analyst consensus
+    bullish_count = Column(Integer, nullable=True)
+    bearish_count = Column(Integer, nullable=True)
+    neutral_count = Column(Integer, nullable=True)
+    analyst_signals = Column(JSON, nullable=True)  # The ticker's signal from each analyst
+
+
 class ApiKey(Base):
     """Table to store API keys for various services"""
     __tablename__ = "api_keys"
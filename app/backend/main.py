@@ -7,6 +7,7 @@ from app.backend.routes import api_router
 from app.backend.database.connection import engine
 from app.backend.database.models import Base
 from app.backend.services.ollama_service import ollama_service
+from app.backend.services.continuous_trading import get_continuous_scheduler
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -53,3 +54,9 @@ async def startup_event():
     except Exception as e:
         logger.warning(f"Could not check Ollama status: {e}")
         logger.info("ℹ Ollama integration is available if you install it later")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the continuous flow runs still running, recording them as interrupted."""
+    await get_continuous_scheduler().shutdown()
@@ -1,16 +1,52 @@
-from typing import Dict, Optional, Any, Literal
+from typing import Dict, List, Optional, Any, Literal
+
+import orjson
 from pydantic import BaseModel
 
 
+def _json_default(value: Any) -> Any:
+    """Serialize values orjson does not handle natively."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    # numpy scalars OPT_SERIALIZE_NUMPY does not cover; extended precision ones have no Python equivalent
+    if hasattr(value, "item") and not hasattr(item := value.item(), "item"):
+        return item
+    return str(value)
+
+
+def dumps_json(value: Any) -> str:
+    """Encode a value as compact JSON."""
+    return orjson.dumps(value, default=_json_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+
+
 class BaseEvent(BaseModel):
     """Base class for all Server-Sent Event events"""
 
     type: str
 
+    def to_payload(self) -> Dict[str, Any]:
+        """Field values of the event, as sent to the client"""
+        # Events are flat, so the field dict encodes directly without a model_dump pass
+        return self.__dict__
+
     def to_sse(self) -> str:
         """Convert to Server-Sent Event format"""
         event_type = self.type.lower()
-        return f"event: {event_type}\ndata: {self.model_dump_json()}\n\n"
+        return f"event: {event_type}\ndata: {dumps_json(self.to_payload())}\n\n"
+
+
+def encode_sse_batch(events: List[BaseEvent]) -> str:
+    """
+    Encode events as a single Server-Sent Event frame.
+
+    A single event keeps its own frame; several events (queued while the client was behind)
+    are sent as one "batch" frame whose data is the list of event payloads, each with its type.
+    """
+    if not events:
+        return ""
+    if len(events) == 1:
+        return events[0].to_sse()
+    return f"event: batch\ndata: {dumps_json([event.to_payload() for event in events])}\n\n"
 
 
 class StartEvent(BaseEvent):
@@ -18,6 +54,17 @@ class StartEvent(BaseEvent):
 
     type: Literal["start"] = "start"
     timestamp: Optional[str] = None
+    # ID to cancel the run with (DELETE /hedge-fund/runs/{run_id})
+    run_id: Optional[str] = None
+
+
+class QueuedEvent(BaseEvent):
+    """Event reporting a run's position in the queue while it waits for a worker"""
+
+    type: Literal["queued"] = "queued"
+    run_id: str
+    position: int
+    timestamp: Optional[str] = None
 
 class ProgressUpdateEvent(BaseEvent):
     """Event containing an agent's progress update"""
@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional, Dict, Any
+from typing import List, Literal, Optional, Dict, Any
 from src.llm.models import ModelProvider
 from enum import Enum
 from app.backend.services.graph import extract_base_agent_key
@@ -68,6 +68,19 @@ class BaseHedgeFundRequest(BaseModel):
     margin_requirement: float = 0.0
     portfolio_positions: Optional[List[PortfolioPosition]] = None
     api_keys: Optional[Dict[str, str]] = None
+    # ID of the saved flow being run, if any; compiled graphs are cached per flow
+    flow_id: Optional[int] = None
+    # Optional src.utils.hedging.HedgingPolicy settings, e.g. {"enabled": true, "deadline_seconds": 60}
+    llm_hedging: Optional[Dict[str, Any]] = None
+    # Reuse stored analyst signals for unchanged (analyst, model, ticker, date window) combinations
+    reuse_cached_results: bool = True
+    # Per-ticker data versions, set by scheduled runs whose data is refreshed incrementally; analyst
+    # signals are reused until their ticker's version changes
+    data_versions: Optional[Dict[str, str]] = None
+    # News sentiment scoring: local model only (no LLM calls), and the local confidence (0-100)
+    # at or above which a headline is not sent to the LLM
+    sentiment_offline: bool = False
+    sentiment_threshold: Optional[float] = Field(default=None, ge=0, le=100)
 
     def get_agent_ids(self) -> List[str]:
         """Extract agent IDs from graph structure"""
@@ -110,6 +123,7 @@ class BacktestDayResult(BaseModel):
     gross_exposure: float
     net_exposure: float
     long_short_ratio: Optional[float] = None
+    usage: Optional[Dict[str, Any]] = None
 
 
 class BacktestPerformanceMetrics(BaseModel):
@@ -140,6 +154,14 @@ class HedgeFundRequest(BaseHedgeFundRequest):
         return (datetime.strptime(self.end_date, "%Y-%m-%d") - timedelta(days=90)).strftime("%Y-%m-%d")
 
 
+class ContinuousRunRequest(HedgeFundRequest):
+    """Run a flow on a schedule; each cycle analyzes the data as of its own date, over a window as long as start_date..end_date"""
+    # continuous paper-trades the decisions, advisory only records them
+    trading_mode: Literal["continuous", "advisory"] = "continuous"
+    schedule: Literal["hourly", "daily", "weekly"] = "hourly"
+    duration: Literal["1day", "1week", "1month"] = "1day"
+
+
 # Flow-related schemas
 class FlowCreateRequest(BaseModel):
     name: str = Field(..., min_length=1, max_length=200)
@@ -217,6 +239,9 @@ class FlowRunResponse(BaseModel):
     updated_at: Optional[datetime]
     started_at: Optional[datetime]
     completed_at: Optional[datetime]
+    trading_mode: Optional[str] = None
+    schedule: Optional[str] = None
+    duration: Optional[str] = None
     request_data: Optional[Dict[str, Any]]
     results: Optional[Dict[str, Any]]
     error_message: Optional[str]
@@ -240,6 +265,35 @@ class FlowRunSummaryResponse(BaseModel):
         from_attributes = True
 
 
+class FlowRunCycleResponse(BaseModel):
+    """Analysis cycle within a flow run, including its LLM and API usage"""
+    id: int
+    flow_run_id: int
+    cycle_number: int
+    status: str
+    started_at: datetime
+    completed_at: Optional[datetime]
+    analyst_signals: Optional[Dict[str, Any]]
+    trading_decisions: Optional[Dict[str, Any]]
+    executed_trades: Optional[Dict[str, Any]]
+    error_message: Optional[str]
+    llm_calls_count: Optional[int]
+    api_calls_count: Optional[int]
+    estimated_cost: Optional[str]
+    trigger_reason: Optional[str]
+
+    class Config:
+        from_attributes = True
+
+
+class BacktestResultPage(BaseModel):
+    """A page of stored backtest results, with only the requested fields of each row"""
+    total: int
+    limit: int
+    offset: int
+    items: List[Dict[str, Any]]
+
+
 # API Key schemas
 class ApiKeyCreateRequest(BaseModel):
     """Request to create or update an API key"""
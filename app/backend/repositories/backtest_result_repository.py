@@ -0,0 +1,139 @@
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Sequence, Tuple
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.backend.database.models import HedgeFundBacktestCheckpoint, HedgeFundBacktestDay, HedgeFundBacktestTickerResult
+
+
+# Columns that can be requested from each table (besides date, which is always returned)
+DAY_FIELDS = (
+    "portfolio_value", "cash", "portfolio_return", "long_exposure", "short_exposure", "gross_exposure",
+    "net_exposure", "long_short_ratio", "performance_metrics", "decisions", "executed_trades",
+    "current_prices", "analyst_signals", "usage",
+)
+TICKER_FIELDS = (
+    "ticker", "action", "quantity", "price", "shares_owned", "long_shares", "short_shares", "position_value",
+    "bullish_count", "bearish_count", "neutral_count", "analyst_signals",
+)
+
+# Returned when no fields are requested: the scalar columns, without the large JSON payloads
+DAY_SUMMARY_FIELDS = (
+    "portfolio_value", "cash", "portfolio_return", "long_exposure", "short_exposure", "gross_exposure",
+    "net_exposure", "long_short_ratio",
+)
+TICKER_SUMMARY_FIELDS = tuple(field for field in TICKER_FIELDS if field != "analyst_signals")
+
+
+class BacktestResultRepository:
+    """Repository for the per-day and per-ticker results of backtest runs"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add_day_results(self, run_id: int, day_results: List[Dict[str, Any]], checkpoint: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Insert a batch of backtest day results (as streamed by the backtest service). Returns the number of days.
+        A checkpoint of the backtest's state after the batch's last day replaces the run's previous one in the same transaction.
+        """
+        if not day_results:
+            return 0
+
+        days = []
+        ticker_results = []
+        for day in day_results:
+            days.append({
+                "flow_run_id": run_id,
+                "date": day["date"],
+                **{field: day.get(field) for field in DAY_FIELDS},
+            })
+            for detail in day.get("ticker_details", []):
+                ticker = detail["ticker"]
+                ticker_results.append({
+                    "flow_run_id": run_id,
+                    "date": day["date"],
+                    **{field: detail.get(field) for field in TICKER_SUMMARY_FIELDS},
+                    "analyst_signals": {agent: signals[ticker] for agent, signals in (day.get("analyst_signals") or {}).items() if ticker in signals},
+                })
+
+        # Bulk inserts: one executemany per table instead of an ORM object per row
+        self.db.execute(insert(HedgeFundBacktestDay), days)
+        if ticker_results:
+            self.db.execute(insert(HedgeFundBacktestTickerResult), ticker_results)
+        if checkpoint is not None:
+            self._set_checkpoint(run_id, checkpoint)
+        self.db.commit()
+        return len(days)
+
+    def get_checkpoint(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """Get the latest checkpoint of a backtest run, or None if none was stored yet."""
+        row = self.db.get(HedgeFundBacktestCheckpoint, run_id)
+        return row.checkpoint if row else None
+
+    def _set_checkpoint(self, run_id: int, checkpoint: Dict[str, Any]):
+        # One checkpoint row per run, updated in place
+        row = self.db.get(HedgeFundBacktestCheckpoint, run_id)
+        if row is None:
+            self.db.add(HedgeFundBacktestCheckpoint(flow_run_id=run_id, updated_at=datetime.utcnow(), checkpoint=checkpoint))
+        else:
+            row.checkpoint = checkpoint
+            row.updated_at = datetime.utcnow()
+
+    def get_days(
+        self,
+        run_id: int,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        fields: Sequence[str] = DAY_SUMMARY_FIELDS,
+        limit: Optional[int] = 100,
+        offset: int = 0,
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """Get a page of a run's days in date order (all of them if limit is None), with only the requested columns. Returns (total, rows)."""
+        query = self._filter(self.db.query(HedgeFundBacktestDay), HedgeFundBacktestDay, run_id, start_date, end_date)
+        return self._page(query, HedgeFundBacktestDay, ("date", *fields), (HedgeFundBacktestDay.date,), limit, offset)
+
+    def get_ticker_results(
+        self,
+        run_id: int,
+        ticker: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        fields: Sequence[str] = TICKER_SUMMARY_FIELDS,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """Get a page of a run's per-ticker results in date order, for one ticker or all. Returns (total, rows)."""
+        query = self._filter(self.db.query(HedgeFundBacktestTickerResult), HedgeFundBacktestTickerResult, run_id, start_date, end_date)
+        if ticker is not None:
+            query = query.filter(HedgeFundBacktestTickerResult.ticker == ticker)
+        order = (HedgeFundBacktestTickerResult.date, HedgeFundBacktestTickerResult.ticker)
+        return self._page(query, HedgeFundBacktestTickerResult, ("date", *fields), order, limit, offset)
+
+    def delete_results(self, run_id: int, after_date: Optional[str] = None):
+        """Delete the stored results of a run, or only its days after after_date (without committing)."""
+        for model in (HedgeFundBacktestDay, HedgeFundBacktestTickerResult):
+            query = self.db.query(model).filter(model.flow_run_id == run_id)
+            if after_date is not None:
+                query = query.filter(model.date > after_date)
+            query.delete(synchronize_session=False)
+        if after_date is None:
+            self.db.query(HedgeFundBacktestCheckpoint).filter(HedgeFundBacktestCheckpoint.flow_run_id == run_id).delete(synchronize_session=False)
+
+    @staticmethod
+    def _filter(query, model, run_id: int, start_date: Optional[str], end_date: Optional[str]):
+        query = query.filter(model.flow_run_id == run_id)
+        if start_date is not None:
+            query = query.filter(model.date >= start_date)
+        if end_date is not None:
+            query = query.filter(model.date <= end_date)
+        return query
+
+    @staticmethod
+    def _page(query, model, fields: Sequence[str], order, limit: Optional[int], offset: int) -> Tuple[int, List[Dict[str, Any]]]:
+        total = query.count()
+        columns = [getattr(model, field) for field in dict.fromkeys(fields)]
+        # Selecting only the requested columns keeps unrequested JSON payloads out of the result set
+        query = query.with_entities(*columns).order_by(*order)
+        if limit is not None:
+            query = query.limit(limit)
+        rows = query.offset(offset).all()
+        return total, [dict(row._mapping) for row in rows]
@@ -1,6 +1,7 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from app.backend.database.models import HedgeFundFlow
+from app.backend.services.graph_cache import get_graph_cache
 
 
 class FlowRepository:
@@ -71,6 +72,10 @@ class FlowRepository:
         
         self.db.commit()
         self.db.refresh(flow)
+
+        # Drop compiled graphs built from the previous version of the flow
+        if nodes is not None or edges is not None:
+            get_graph_cache().invalidate_flow(flow_id)
         return flow
     
     def delete_flow(self, flow_id: int) -> bool:
@@ -81,6 +86,7 @@ class FlowRepository:
         
         self.db.delete(flow)
         self.db.commit()
+        get_graph_cache().invalidate_flow(flow_id)
         return True
     
     def duplicate_flow(self, flow_id: int, new_name: str = None) -> Optional[HedgeFundFlow]:
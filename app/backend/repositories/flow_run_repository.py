@@ -2,7 +2,8 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, func
-from app.backend.database.models import HedgeFundFlowRun
+from app.backend.database.models import HedgeFundFlowRun, HedgeFundFlowRunCycle
+from app.backend.repositories.backtest_result_repository import BacktestResultRepository
 from app.backend.models.schemas import FlowRunStatus
 
 
@@ -12,7 +13,15 @@ class FlowRunRepository:
     def __init__(self, db: Session):
         self.db = db
     
-    def create_flow_run(self, flow_id: int, request_data: Dict[str, Any] = None) -> HedgeFundFlowRun:
+    def create_flow_run(
+        self,
+        flow_id: int,
+        request_data: Dict[str, Any] = None,
+        trading_mode: str = "one-time",
+        schedule: Optional[str] = None,
+        duration: Optional[str] = None,
+        initial_portfolio: Optional[Dict[str, Any]] = None,
+    ) -> HedgeFundFlowRun:
         """Create a new flow run"""
         # Get the next run number for this flow
         run_number = self._get_next_run_number(flow_id)
@@ -21,7 +30,11 @@ class FlowRunRepository:
             flow_id=flow_id,
             request_data=request_data,
             run_number=run_number,
-            status=FlowRunStatus.IDLE.value
+            status=FlowRunStatus.IDLE.value,
+            trading_mode=trading_mode,
+            schedule=schedule,
+            duration=duration,
+            initial_portfolio=initial_portfolio,
         )
         self.db.add(flow_run)
         self.db.commit()
@@ -68,7 +81,8 @@ class FlowRunRepository:
         run_id: int,
         status: Optional[FlowRunStatus] = None,
         results: Optional[Dict[str, Any]] = None,
-        error_message: Optional[str] = None
+        error_message: Optional[str] = None,
+        final_portfolio: Optional[Dict[str, Any]] = None,
     ) -> Optional[HedgeFundFlowRun]:
         """Update an existing flow run"""
         flow_run = self.get_flow_run_by_id(run_id)
@@ -90,6 +104,8 @@ class FlowRunRepository:
             flow_run.results = results
         if error_message is not None:
             flow_run.error_message = error_message
+        if final_portfolio is not None:
+            flow_run.final_portfolio = final_portfolio
         
         self.db.commit()
         self.db.refresh(flow_run)
@@ -101,12 +117,17 @@ class FlowRunRepository:
         if not flow_run:
             return False
         
+        BacktestResultRepository(self.db).delete_results(run_id)
         self.db.delete(flow_run)
         self.db.commit()
         return True
     
     def delete_flow_runs_by_flow_id(self, flow_id: int) -> int:
         """Delete all runs for a specific flow. Returns count of deleted runs."""
+        run_ids = [run_id for (run_id,) in self.db.query(HedgeFundFlowRun.id).filter(HedgeFundFlowRun.flow_id == flow_id)]
+        results = BacktestResultRepository(self.db)
+        for run_id in run_ids:
+            results.delete_results(run_id)
         deleted_count = (
             self.db.query(HedgeFundFlowRun)
             .filter(HedgeFundFlowRun.flow_id == flow_id)
@@ -130,4 +151,69 @@ class FlowRunRepository:
             .filter(HedgeFundFlowRun.flow_id == flow_id)
             .scalar()
         )
-        return (max_run_number or 0) + 1 
\ No newline at end of file
+        return (max_run_number or 0) + 1 
+
+    def create_flow_run_cycle(self, run_id: int, trigger_reason: Optional[str] = None) -> HedgeFundFlowRunCycle:
+        """Start a new analysis cycle within a flow run"""
+        max_cycle_number = (
+            self.db.query(func.max(HedgeFundFlowRunCycle.cycle_number))
+            .filter(HedgeFundFlowRunCycle.flow_run_id == run_id)
+            .scalar()
+        )
+        cycle = HedgeFundFlowRunCycle(
+            flow_run_id=run_id,
+            cycle_number=(max_cycle_number or 0) + 1,
+            started_at=datetime.utcnow(),
+            trigger_reason=trigger_reason,
+        )
+        self.db.add(cycle)
+        self.db.commit()
+        self.db.refresh(cycle)
+        return cycle
+
+    def complete_flow_run_cycle(
+        self,
+        cycle_id: int,
+        analyst_signals: Optional[Dict[str, Any]] = None,
+        trading_decisions: Optional[Dict[str, Any]] = None,
+        executed_trades: Optional[Dict[str, Any]] = None,
+        portfolio_snapshot: Optional[Dict[str, Any]] = None,
+        performance_metrics: Optional[Dict[str, Any]] = None,
+        usage: Optional[Dict[str, Any]] = None,
+        error_message: Optional[str] = None,
+    ) -> Optional[HedgeFundFlowRunCycle]:
+        """Finish a cycle, storing its results and the LLM/API usage summary recorded while it ran"""
+        cycle = self.db.query(HedgeFundFlowRunCycle).filter(HedgeFundFlowRunCycle.id == cycle_id).first()
+        if not cycle:
+            return None
+
+        cycle.completed_at = datetime.utcnow()
+        cycle.status = "ERROR" if error_message else "COMPLETED"
+        cycle.error_message = error_message
+        if analyst_signals is not None:
+            cycle.analyst_signals = analyst_signals
+        if trading_decisions is not None:
+            cycle.trading_decisions = trading_decisions
+        if executed_trades is not None:
+            cycle.executed_trades = executed_trades
+        if portfolio_snapshot is not None:
+            cycle.portfolio_snapshot = portfolio_snapshot
+        if performance_metrics is not None:
+            cycle.performance_metrics = performance_metrics
+        if usage is not None:
+            cycle.llm_calls_count = usage.get("llm", {}).get("calls", 0)
+            cycle.api_calls_count = usage.get("api", {}).get("calls", 0)
+            cycle.estimated_cost = f"{usage.get('llm', {}).get('estimated_cost', 0.0):.6f}"
+
+        self.db.commit()
+        self.db.refresh(cycle)
+        return cycle
+
+    def get_flow_run_cycles(self, run_id: int) -> List[HedgeFundFlowRunCycle]:
+        """Get all cycles of a flow run in order"""
+        return (
+            self.db.query(HedgeFundFlowRunCycle)
+            .filter(HedgeFundFlowRunCycle.flow_run_id == run_id)
+            .order_by(HedgeFundFlowRunCycle.cycle_number)
+            .all()
+        )
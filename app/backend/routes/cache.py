@@ -0,0 +1,69 @@
+from fastapi import APIRouter, HTTPException
+
+from app.backend.models.schemas import ErrorResponse
+from app.backend.services.node_result_store import get_node_result_store
+from src.data.cache import get_cache
+
+router = APIRouter(prefix="/cache")
+
+
+@router.get(
+    path="/stats",
+    responses={
+        200: {"description": "Memory usage and hit/miss/eviction statistics of the data cache"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+)
+async def get_cache_stats():
+    """Get memory usage and hit/miss/eviction statistics for the financial data cache."""
+    try:
+        return get_cache().get_stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve cache stats: {str(e)}")
+
+
+@router.delete(
+    path="/",
+    responses={
+        204: {"description": "Cache cleared successfully"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+)
+async def clear_cache():
+    """Drop all cached financial data."""
+    try:
+        get_cache().clear()
+        return {"message": "Cache cleared successfully"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to clear cache: {str(e)}")
+
+
+@router.get(
+    path="/node-results/stats",
+    responses={
+        200: {"description": "Size and hit/miss statistics of the stored analyst results"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+)
+async def get_node_result_stats():
+    """Get size and hit/miss statistics for the analyst results reused across runs."""
+    try:
+        return get_node_result_store().get_stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve node result stats: {str(e)}")
+
+
+@router.delete(
+    path="/node-results",
+    responses={
+        204: {"description": "Stored analyst results cleared successfully"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+)
+async def clear_node_results():
+    """Drop all stored analyst results, so the next run analyzes every ticker again."""
+    try:
+        get_node_result_store().clear()
+        return {"message": "Stored analyst results cleared successfully"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to clear node results: {str(e)}")
@@ -5,12 +5,26 @@ from typing import List, Optional
 from app.backend.database import get_db
 from app.backend.repositories.flow_run_repository import FlowRunRepository
 from app.backend.repositories.flow_repository import FlowRepository
+from app.backend.repositories.backtest_result_repository import (
+    BacktestResultRepository,
+    DAY_FIELDS,
+    DAY_SUMMARY_FIELDS,
+    TICKER_FIELDS,
+    TICKER_SUMMARY_FIELDS,
+)
+from app.backend.services.api_key_service import ApiKeyService
+from app.backend.services.continuous_trading import get_continuous_scheduler
+from app.backend.services.graph import get_compiled_graph
+from app.backend.services.portfolio import create_portfolio
 from app.backend.models.schemas import (
+    ContinuousRunRequest,
     FlowRunCreateRequest,
     FlowRunUpdateRequest,
     FlowRunResponse,
     FlowRunSummaryResponse,
+    FlowRunCycleResponse,
     FlowRunStatus,
+    BacktestResultPage,
     ErrorResponse
 )
 
@@ -51,6 +65,85 @@ async def create_flow_run(
         raise HTTPException(status_code=500, detail=f"Failed to create flow run: {str(e)}")
 
 
+@router.post(
+    "/continuous",
+    response_model=FlowRunResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Flow not found"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+)
+async def start_continuous_flow_run(flow_id: int, request_data: ContinuousRunRequest, db: Session = Depends(get_db)):
+    """Start a continuous (paper-trading) or advisory run of the flow, with a cycle on every schedule interval"""
+    try:
+        # Verify flow exists
+        flow_repo = FlowRepository(db)
+        flow = flow_repo.get_flow_by_id(flow_id)
+        if not flow:
+            raise HTTPException(status_code=404, detail="Flow not found")
+
+        # Hydrate API keys from database if not provided
+        if not request_data.api_keys:
+            request_data.api_keys = ApiKeyService(db).get_api_keys_dict()
+        request_data.flow_id = flow_id
+
+        graph = get_compiled_graph(graph_nodes=request_data.graph_nodes, graph_edges=request_data.graph_edges, flow_id=flow_id)
+
+        run_repo = FlowRunRepository(db)
+        flow_run = run_repo.create_flow_run(
+            flow_id,
+            request_data=request_data.model_dump(mode="json", exclude={"api_keys"}),
+            trading_mode=request_data.trading_mode,
+            schedule=request_data.schedule,
+            duration=request_data.duration,
+            initial_portfolio=create_portfolio(request_data.initial_cash, request_data.margin_requirement, request_data.tickers, request_data.portfolio_positions),
+        )
+        flow_run = run_repo.update_flow_run(flow_run.id, status=FlowRunStatus.IN_PROGRESS)
+
+        get_continuous_scheduler().start(flow_run.id, request_data, graph)
+        return FlowRunResponse.from_orm(flow_run)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to start continuous flow run: {str(e)}")
+
+
+@router.post(
+    "/{run_id}/stop",
+    response_model=FlowRunResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Flow or run not found"},
+        409: {"model": ErrorResponse, "description": "Flow run is not running"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+)
+async def stop_continuous_flow_run(flow_id: int, run_id: int, db: Session = Depends(get_db)):
+    """Stop a continuous or advisory run; it completes with the cycles run so far"""
+    try:
+        # Verify flow exists
+        flow_repo = FlowRepository(db)
+        flow = flow_repo.get_flow_by_id(flow_id)
+        if not flow:
+            raise HTTPException(status_code=404, detail="Flow not found")
+
+        # Verify run exists and belongs to this flow
+        run_repo = FlowRunRepository(db)
+        flow_run = run_repo.get_flow_run_by_id(run_id)
+        if not flow_run or flow_run.flow_id != flow_id:
+            raise HTTPException(status_code=404, detail="Flow run not found")
+
+        if not await get_continuous_scheduler().stop(run_id):
+            raise HTTPException(status_code=409, detail="Flow run is not running")
+
+        # The run was completed from the scheduler's own session
+        db.refresh(flow_run)
+        return FlowRunResponse.from_orm(flow_run)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to stop flow run: {str(e)}")
+
+
 @router.get(
     "/",
     response_model=List[FlowRunSummaryResponse],
@@ -167,6 +260,137 @@ async def get_flow_run(flow_id: int, run_id: int, db: Session = Depends(get_db))
         raise HTTPException(status_code=500, detail=f"Failed to retrieve flow run: {str(e)}")
 
 
+@router.get(
+    "/{run_id}/cycles",
+    response_model=List[FlowRunCycleResponse],
+    responses={
+        404: {"model": ErrorResponse, "description": "Flow or run not found"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+)
+async def get_flow_run_cycles(flow_id: int, run_id: int, db: Session = Depends(get_db)):
+    """Get the analysis cycles of a flow run, with their LLM/API call counts and estimated cost"""
+    try:
+        # Verify flow exists
+        flow_repo = FlowRepository(db)
+        flow = flow_repo.get_flow_by_id(flow_id)
+        if not flow:
+            raise HTTPException(status_code=404, detail="Flow not found")
+        
+        # Get flow run
+        run_repo = FlowRunRepository(db)
+        flow_run = run_repo.get_flow_run_by_id(run_id)
+        if not flow_run or flow_run.flow_id != flow_id:
+            raise HTTPException(status_code=404, detail="Flow run not found")
+        
+        cycles = run_repo.get_flow_run_cycles(run_id)
+        return [FlowRunCycleResponse.from_orm(cycle) for cycle in cycles]
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve flow run cycles: {str(e)}")
+
+
+def _parse_fields(fields: Optional[str], allowed, default):
+    """Parse a comma-separated list of result fields, rejecting unknown ones."""
+    if not fields:
+        return default
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}. Allowed fields: {', '.join(allowed)}")
+    return requested
+
+
+@router.get(
+    "/{run_id}/backtest/days",
+    response_model=BacktestResultPage,
+    responses={
+        400: {"model": ErrorResponse, "description": "Unknown fields requested"},
+        404: {"model": ErrorResponse, "description": "Flow or run not found"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+)
+async def get_backtest_days(
+    flow_id: int,
+    run_id: int,
+    start_date: Optional[str] = Query(None, description="First date to include (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Last date to include (YYYY-MM-DD)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return besides the date (defaults to the portfolio values)"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of days to return"),
+    offset: int = Query(0, ge=0, description="Number of days to skip"),
+    db: Session = Depends(get_db)
+):
+    """Get a page of a backtest run's per-day results"""
+    try:
+        # Verify flow exists
+        flow_repo = FlowRepository(db)
+        flow = flow_repo.get_flow_by_id(flow_id)
+        if not flow:
+            raise HTTPException(status_code=404, detail="Flow not found")
+        
+        # Get flow run
+        run_repo = FlowRunRepository(db)
+        flow_run = run_repo.get_flow_run_by_id(run_id)
+        if not flow_run or flow_run.flow_id != flow_id:
+            raise HTTPException(status_code=404, detail="Flow run not found")
+        
+        selected = _parse_fields(fields, DAY_FIELDS, DAY_SUMMARY_FIELDS)
+        total, items = BacktestResultRepository(db).get_days(
+            run_id, start_date=start_date, end_date=end_date, fields=selected, limit=limit, offset=offset
+        )
+        return BacktestResultPage(total=total, limit=limit, offset=offset, items=items)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve backtest days: {str(e)}")
+
+
+@router.get(
+    "/{run_id}/backtest/tickers",
+    response_model=BacktestResultPage,
+    responses={
+        400: {"model": ErrorResponse, "description": "Unknown fields requested"},
+        404: {"model": ErrorResponse, "description": "Flow or run not found"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+)
+async def get_backtest_ticker_results(
+    flow_id: int,
+    run_id: int,
+    ticker: Optional[str] = Query(None, description="Only return results for this ticker"),
+    start_date: Optional[str] = Query(None, description="First date to include (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Last date to include (YYYY-MM-DD)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return besides the date (defaults to all but analyst_signals)"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of results to return"),
+    offset: int = Query(0, ge=0, description="Number of results to skip"),
+    db: Session = Depends(get_db)
+):
+    """Get a page of a backtest run's per-ticker daily results"""
+    try:
+        # Verify flow exists
+        flow_repo = FlowRepository(db)
+        flow = flow_repo.get_flow_by_id(flow_id)
+        if not flow:
+            raise HTTPException(status_code=404, detail="Flow not found")
+        
+        # Get flow run
+        run_repo = FlowRunRepository(db)
+        flow_run = run_repo.get_flow_run_by_id(run_id)
+        if not flow_run or flow_run.flow_id != flow_id:
+            raise HTTPException(status_code=404, detail="Flow run not found")
+        
+        selected = _parse_fields(fields, TICKER_FIELDS, TICKER_SUMMARY_FIELDS)
+        total, items = BacktestResultRepository(db).get_ticker_results(
+            run_id, ticker=ticker, start_date=start_date, end_date=end_date, fields=selected, limit=limit, offset=offset
+        )
+        return BacktestResultPage(total=total, limit=limit, offset=offset, items=items)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve backtest ticker results: {str(e)}")
+
+
 @router.put(
     "/{run_id}",
     response_model=FlowRunResponse,
@@ -1,26 +1,51 @@
 from fastapi import APIRouter, HTTPException, Request, Depends
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from typing import Any, Dict, Optional
 import asyncio
+import uuid
 
 from app.backend.database import get_db
-from app.backend.models.schemas import ErrorResponse, HedgeFundRequest, BacktestRequest, BacktestDayResult, BacktestPerformanceMetrics
-from app.backend.models.events import StartEvent, ProgressUpdateEvent, ErrorEvent, CompleteEvent
-from app.backend.services.graph import create_graph, parse_hedge_fund_response, run_graph_async
+from app.backend.models.schemas import ErrorResponse, FlowRunStatus, HedgeFundRequest, BacktestRequest, BacktestDayResult, BacktestPerformanceMetrics
+from app.backend.repositories.flow_repository import FlowRepository
+from app.backend.repositories.flow_run_repository import FlowRunRepository
+from app.backend.repositories.backtest_result_repository import BacktestResultRepository, DAY_FIELDS
+from app.backend.models.events import StartEvent, ProgressUpdateEvent, QueuedEvent, ErrorEvent, CompleteEvent, dumps_json, encode_sse_batch
+from app.backend.services.graph import get_compiled_graph, parse_hedge_fund_response, run_graph_async
 from app.backend.services.portfolio import create_portfolio
+from app.backend.services.progress_stream import ProgressStream
+from app.backend.services.run_scheduler import BACKTEST, RUN, RunQueueFullError, get_run_scheduler
 from app.backend.services.backtest_service import BacktestService
+from app.backend.services.backtest_result_writer import BacktestResultWriter
 from app.backend.services.api_key_service import ApiKeyService
 from src.utils.progress import progress
 from src.utils.analysts import get_agents_list
 
 router = APIRouter(prefix="/hedge-fund")
 
+# Flow runs whose backtest is streaming in this process, so they are not resumed twice
+_active_backtest_runs = set()
+
+
+def _run_owner(request_data, request: Request) -> str:
+    """Owner a run is scheduled fairly against: its saved flow, or the client for unsaved flows."""
+    if request_data.flow_id is not None:
+        return f"flow:{request_data.flow_id}"
+    return f"client:{request.client.host if request.client else 'unknown'}"
+
+
+def _publish_queue_position(progress_stream: ProgressStream, run_id: str):
+    """Queue position callback that streams the run's position, merged while the client catches up."""
+    return lambda position: progress_stream.publish(QueuedEvent(run_id=run_id, position=position), key="queue")
+
+
 @router.post(
     path="/run",
     responses={
         200: {"description": "Successful response with streaming updates"},
         400: {"model": ErrorResponse, "description": "Invalid request parameters"},
         500: {"model": ErrorResponse, "description": "Internal server error"},
+        503: {"model": ErrorResponse, "description": "Run queue is full"},
     },
 )
 async def run(request_data: HedgeFundRequest, request: Request, db: Session = Depends(get_db)):
@@ -33,12 +58,12 @@ async def run(request_data: HedgeFundRequest, request: Request, db: Session = De
         # Create the portfolio
         portfolio = create_portfolio(request_data.initial_cash, request_data.margin_requirement, request_data.tickers, request_data.portfolio_positions)
 
-        # Construct agent graph using the React Flow graph structure
-        graph = create_graph(
+        # Construct agent graph using the React Flow graph structure (cached per flow structure)
+        graph = get_compiled_graph(
             graph_nodes=request_data.graph_nodes,
-            graph_edges=request_data.graph_edges
+            graph_edges=request_data.graph_edges,
+            flow_id=request_data.flow_id,
         )
-        graph = graph.compile()
 
         # Log a test progress update for debugging
         progress.update_status("system", None, "Preparing hedge fund run")
@@ -48,6 +73,11 @@ async def run(request_data: HedgeFundRequest, request: Request, db: Session = De
         if hasattr(model_provider, "value"):
             model_provider = model_provider.value
 
+        # Refuse runs up front when every worker is busy and the queue is full
+        scheduler = get_run_scheduler()
+        if not scheduler.has_capacity(RUN):
+            raise HTTPException(status_code=503, detail="Too many runs are queued, please try again later")
+
         # Function to detect client disconnection
         async def wait_for_disconnect():
             """Wait for client disconnect and return True when it happens"""
@@ -61,67 +91,74 @@ async def run(request_data: HedgeFundRequest, request: Request, db: Session = De
 
         # Set up streaming response
         async def event_generator():
-            # Queue for progress updates
-            progress_queue = asyncio.Queue()
+            # This run's progress channel, delivered into this response's event loop
+            run_id = uuid.uuid4().hex
+            progress_stream = ProgressStream()
             run_task = None
             disconnect_task = None
 
-            # Simple handler to add updates to the queue
-            def progress_handler(agent_name, ticker, status, analysis, timestamp):
-                event = ProgressUpdateEvent(agent=agent_name, ticker=ticker, status=status, timestamp=timestamp, analysis=analysis)
-                progress_queue.put_nowait(event)
-
-            # Register our handler with the progress tracker
-            progress.register_handler(progress_handler)
+            progress.subscribe(run_id, progress_stream.publish_updates)
 
             try:
-                # Start the graph execution in a background task
-                run_task = asyncio.create_task(
-                    run_graph_async(
-                        graph=graph,
-                        portfolio=portfolio,
-                        tickers=request_data.tickers,
-                        start_date=request_data.start_date,
-                        end_date=request_data.end_date,
-                        model_name=request_data.model_name,
-                        model_provider=model_provider,
-                        request=request_data,  # Pass the full request for agent-specific model access
-                    )
-                )
+                try:
+                    ticket = scheduler.submit(run_id, RUN, owner=_run_owner(request_data, request))
+                except RunQueueFullError as e:
+                    yield ErrorEvent(message=str(e)).to_sse()
+                    return
+
+                async def run_when_admitted():
+                    async with scheduler.slot(ticket, on_position=_publish_queue_position(progress_stream, run_id)):
+                        return await run_graph_async(
+                            graph=graph,
+                            portfolio=portfolio,
+                            tickers=request_data.tickers,
+                            start_date=request_data.start_date,
+                            end_date=request_data.end_date,
+                            model_name=request_data.model_name,
+                            model_provider=model_provider,
+                            request=request_data,  # Pass the full request for agent-specific model access
+                            run_id=run_id,
+                            executor=scheduler.executor,
+                        )
+
+                # Start the graph execution in a background task, once a worker is free
+                run_task = asyncio.create_task(run_when_admitted())
                 
                 # Start the disconnect detection task
                 disconnect_task = asyncio.create_task(wait_for_disconnect())
                 
                 # Send initial message
-                yield StartEvent().to_sse()
+                yield StartEvent(run_id=run_id).to_sse()
 
                 # Stream progress updates until run_task completes or client disconnects
-                while not run_task.done():
-                    # Check if client disconnected
-                    if disconnect_task.done():
-                        print("Client disconnected, cancelling hedge fund execution")
-                        run_task.cancel()
-                        try:
-                            await run_task
-                        except asyncio.CancelledError:
-                            pass
-                        return
-
-                    # Either get a progress update or wait a bit
+                async for frame in progress_stream.frames(run_task, disconnect_task):
+                    yield frame
+
+                # Check if client disconnected
+                if disconnect_task.done():
+                    print("Client disconnected, cancelling hedge fund execution")
+                    run_task.cancel()
                     try:
-                        event = await asyncio.wait_for(progress_queue.get(), timeout=1.0)
-                        yield event.to_sse()
-                    except asyncio.TimeoutError:
-                        # Just continue the loop
+                        await run_task
+                    except asyncio.CancelledError:
                         pass
+                    return
 
                 # Get the final result
                 try:
                     result = await run_task
                 except asyncio.CancelledError:
                     print("Task was cancelled")
+                    if run_task.cancelled():
+                        yield ErrorEvent(message="Run was cancelled").to_sse()
                     return
 
+                # Deliver the run's last status updates before its result
+                progress.flush()
+                events = await progress_stream.drain()
+                if events:
+                    yield encode_sse_batch(events)
+
                 if not result or not result.get("messages"):
                     yield ErrorEvent(message="Failed to generate hedge fund decisions").to_sse()
                     return
@@ -132,6 +169,7 @@ async def run(request_data: HedgeFundRequest, request: Request, db: Session = De
                         "decisions": parse_hedge_fund_response(result.get("messages", [])[-1].content),
                         "analyst_signals": result.get("data", {}).get("analyst_signals", {}),
                         "current_prices": result.get("data", {}).get("current_prices", {}),
+                        "usage": result.get("usage"),
                     }
                 )
                 yield final_data.to_sse()
@@ -141,7 +179,7 @@ async def run(request_data: HedgeFundRequest, request: Request, db: Session = De
                 return
             finally:
                 # Clean up
-                progress.unregister_handler(progress_handler)
+                progress.unsubscribe(run_id, progress_stream.publish_updates)
                 if run_task and not run_task.done():
                     run_task.cancel()
                     try:
@@ -165,6 +203,7 @@ async def run(request_data: HedgeFundRequest, request: Request, db: Session = De
         200: {"description": "Successful response with streaming backtest updates"},
         400: {"model": ErrorResponse, "description": "Invalid request parameters"},
         500: {"model": ErrorResponse, "description": "Internal server error"},
+        503: {"model": ErrorResponse, "description": "Backtest queue is full"},
     },
 )
 async def backtest(request_data: BacktestRequest, request: Request, db: Session = Depends(get_db)):
@@ -175,165 +214,308 @@ async def backtest(request_data: BacktestRequest, request: Request, db: Session
             api_key_service = ApiKeyService(db)
             request_data.api_keys = api_key_service.get_api_keys_dict()
 
-        # Convert model_provider to string if it's an enum
-        model_provider = request_data.model_provider
-        if hasattr(model_provider, "value"):
-            model_provider = model_provider.value
-
-        # Create the portfolio (same as /run endpoint)
-        portfolio = create_portfolio(
-            request_data.initial_capital, 
-            request_data.margin_requirement, 
-            request_data.tickers, 
-            request_data.portfolio_positions
-        )
-
         # Construct agent graph using the React Flow graph structure (same as /run endpoint)
-        graph = create_graph(graph_nodes=request_data.graph_nodes, graph_edges=request_data.graph_edges)
-        graph = graph.compile()
-
-        # Create backtest service with the compiled graph
-        backtest_service = BacktestService(
-            graph=graph,
-            portfolio=portfolio,
-            tickers=request_data.tickers,
-            start_date=request_data.start_date,
-            end_date=request_data.end_date,
-            initial_capital=request_data.initial_capital,
-            model_name=request_data.model_name,
-            model_provider=model_provider,
-            request=request_data,  # Pass the full request for agent-specific model access
-        )
+        graph = get_compiled_graph(graph_nodes=request_data.graph_nodes, graph_edges=request_data.graph_edges, flow_id=request_data.flow_id)
+
+        # Refuse backtests up front when every worker is busy and the queue is full
+        scheduler = get_run_scheduler()
+        if not scheduler.has_capacity(BACKTEST):
+            raise HTTPException(status_code=503, detail="Too many backtests are queued, please try again later")
+
+        # Store the results of saved flows' backtests as a flow run, day by day as they complete
+        result_writer = None
+        if request_data.flow_id is not None and FlowRepository(db).get_flow_by_id(request_data.flow_id):
+            run_repo = FlowRunRepository(db)
+            flow_run = run_repo.create_flow_run(
+                request_data.flow_id,
+                request_data=request_data.model_dump(mode="json", exclude={"api_keys"}),
+                trading_mode="backtest",
+            )
+            result_writer = BacktestResultWriter(flow_run.id)
+
+        try:
+            return _stream_backtest(request_data, request, graph, scheduler, result_writer)
+        except Exception as e:
+            # The run never started streaming, so nothing else will record its failure
+            if result_writer:
+                FlowRunRepository(db).update_flow_run(result_writer.flow_run_id, status=FlowRunStatus.ERROR, error_message=f"Backtest could not start: {str(e)}")
+            raise
 
-        # Function to detect client disconnection
-        async def wait_for_disconnect():
-            """Wait for client disconnect and return True when it happens"""
-            try:
-                while True:
-                    message = await request.receive()
-                    if message["type"] == "http.disconnect":
-                        return True
-            except Exception:
-                return True
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An error occurred while processing the backtest request: {str(e)}")
 
-        # Set up streaming response
-        async def event_generator():
-            progress_queue = asyncio.Queue()
-            backtest_task = None
-            disconnect_task = None
 
-            # Global progress handler to capture individual agent updates during backtest
-            def progress_handler(agent_name, ticker, status, analysis, timestamp):
-                event = ProgressUpdateEvent(agent=agent_name, ticker=ticker, status=status, timestamp=timestamp, analysis=analysis)
-                progress_queue.put_nowait(event)
-
-            # Progress callback to handle backtest-specific updates
-            def progress_callback(update):
-                if update["type"] == "progress":
-                    event = ProgressUpdateEvent(
-                        agent="backtest",
-                        ticker=None,
-                        status=f"Processing {update['current_date']} ({update['current_step']}/{update['total_dates']})",
-                        timestamp=None,
-                        analysis=None
-                    )
-                    progress_queue.put_nowait(event)
-                elif update["type"] == "backtest_result":
-                    # Convert day result to a streaming event
-                    backtest_result = BacktestDayResult(**update["data"])
-                    
-                    # Send the full day result data as JSON in the analysis field
-                    import json
-                    analysis_data = json.dumps(update["data"])
-                    
-                    event = ProgressUpdateEvent(
-                        agent="backtest",
-                        ticker=None,
-                        status=f"Completed {backtest_result.date} - Portfolio: ${backtest_result.portfolio_value:,.2f}",
-                        timestamp=None,
-                        analysis=analysis_data
-                    )
-                    progress_queue.put_nowait(event)
-
-            # Register our handler with the progress tracker to capture agent updates
-            progress.register_handler(progress_handler)
-            
-            try:
-                # Start the backtest in a background task
-                backtest_task = asyncio.create_task(
-                    backtest_service.run_backtest_async(progress_callback=progress_callback)
+@router.post(
+    path="/backtest/{flow_run_id}/resume",
+    responses={
+        200: {"description": "Successful response with streaming backtest updates"},
+        400: {"model": ErrorResponse, "description": "Backtest run already completed"},
+        404: {"model": ErrorResponse, "description": "Backtest run not found"},
+        409: {"model": ErrorResponse, "description": "Backtest run is still running"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+        503: {"model": ErrorResponse, "description": "Backtest queue is full"},
+    },
+)
+async def resume_backtest(flow_run_id: int, request: Request, db: Session = Depends(get_db)):
+    """Resume a failed or interrupted backtest run after its last checkpointed day, with streaming updates."""
+    try:
+        run_repo = FlowRunRepository(db)
+        flow_run = run_repo.get_flow_run_by_id(flow_run_id)
+        if not flow_run or flow_run.trading_mode != "backtest" or not flow_run.request_data:
+            raise HTTPException(status_code=404, detail="Backtest run not found")
+        if flow_run.status == FlowRunStatus.COMPLETE.value:
+            raise HTTPException(status_code=400, detail="Backtest run already completed")
+        if flow_run_id in _active_backtest_runs:
+            raise HTTPException(status_code=409, detail="Backtest run is still running")
+
+        # Rebuild the original request; API keys are never stored with it
+        request_data = BacktestRequest(**flow_run.request_data)
+        request_data.api_keys = ApiKeyService(db).get_api_keys_dict()
+
+        graph = get_compiled_graph(graph_nodes=request_data.graph_nodes, graph_edges=request_data.graph_edges, flow_id=request_data.flow_id)
+
+        scheduler = get_run_scheduler()
+        if not scheduler.has_capacity(BACKTEST):
+            raise HTTPException(status_code=503, detail="Too many backtests are queued, please try again later")
+
+        # Days stored after the last checkpoint (or all of them, without one) are run again
+        result_repo = BacktestResultRepository(db)
+        checkpoint = result_repo.get_checkpoint(flow_run_id)
+        result_repo.delete_results(flow_run_id, after_date=checkpoint["last_completed_date"] if checkpoint else None)
+        db.commit()
+        if checkpoint:
+            _, completed_days = result_repo.get_days(flow_run_id, fields=DAY_FIELDS, limit=None)
+            checkpoint = {**checkpoint, "results": completed_days}
+
+        return _stream_backtest(request_data, request, graph, scheduler, BacktestResultWriter(flow_run_id), checkpoint)
+
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An error occurred while resuming the backtest: {str(e)}")
+
+
+def _stream_backtest(
+    request_data: BacktestRequest,
+    request: Request,
+    graph,
+    scheduler,
+    result_writer: Optional[BacktestResultWriter] = None,
+    checkpoint: Optional[Dict[str, Any]] = None,
+) -> StreamingResponse:
+    """Run a backtest once a worker is free, streaming its progress and storing its days with result_writer."""
+    # Convert model_provider to string if it's an enum
+    model_provider = request_data.model_provider
+    if hasattr(model_provider, "value"):
+        model_provider = model_provider.value
+
+    # Create the portfolio (same as /run endpoint)
+    portfolio = create_portfolio(
+        request_data.initial_capital, 
+        request_data.margin_requirement, 
+        request_data.tickers, 
+        request_data.portfolio_positions
+    )
+
+    # Create backtest service with the compiled graph
+    backtest_service = BacktestService(
+        graph=graph,
+        portfolio=portfolio,
+        tickers=request_data.tickers,
+        start_date=request_data.start_date,
+        end_date=request_data.end_date,
+        initial_capital=request_data.initial_capital,
+        model_name=request_data.model_name,
+        model_provider=model_provider,
+        request=request_data,  # Pass the full request for agent-specific model access
+        run_id=uuid.uuid4().hex,
+        executor=scheduler.executor,
+        checkpoint=checkpoint,
+    )
+
+    # Function to detect client disconnection
+    async def wait_for_disconnect():
+        """Wait for client disconnect and return True when it happens"""
+        try:
+            while True:
+                message = await request.receive()
+                if message["type"] == "http.disconnect":
+                    return True
+        except Exception:
+            return True
+
+    # Set up streaming response
+    async def event_generator():
+        progress_stream = ProgressStream()
+        backtest_task = None
+        disconnect_task = None
+
+        # Progress callback to handle backtest-specific updates
+        def progress_callback(update):
+            if update["type"] == "progress":
+                event = ProgressUpdateEvent(
+                    agent="backtest",
+                    ticker=None,
+                    status=f"Processing {update['current_date']} ({update['current_step']}/{update['total_dates']})",
+                    timestamp=None,
+                    analysis=None
                 )
+                progress_stream.publish(event, key="backtest")
+            elif update["type"] == "backtest_result":
+                # Convert day result to a streaming event
+                backtest_result = BacktestDayResult(**update["data"])
+                if result_writer:
+                    result_writer.add(update["data"], checkpoint=update.get("checkpoint"))
                 
-                # Start the disconnect detection task
-                disconnect_task = asyncio.create_task(wait_for_disconnect())
+                # Send the full day result data as JSON in the analysis field
+                analysis_data = dumps_json(update["data"])
                 
-                # Send initial message
-                yield StartEvent().to_sse()
-
-                # Stream progress updates until backtest_task completes or client disconnects
-                while not backtest_task.done():
-                    # Check if client disconnected
-                    if disconnect_task.done():
-                        print("Client disconnected, cancelling backtest execution")
-                        backtest_task.cancel()
-                        try:
-                            await backtest_task
-                        except asyncio.CancelledError:
-                            pass
-                        return
-
-                    # Either get a progress update or wait a bit
-                    try:
-                        event = await asyncio.wait_for(progress_queue.get(), timeout=1.0)
-                        yield event.to_sse()
-                    except asyncio.TimeoutError:
-                        # Just continue the loop
-                        pass
+                event = ProgressUpdateEvent(
+                    agent="backtest",
+                    ticker=None,
+                    status=f"Completed {backtest_result.date} - Portfolio: ${backtest_result.portfolio_value:,.2f}",
+                    timestamp=None,
+                    analysis=analysis_data
+                )
+                # Day results are never merged or dropped
+                progress_stream.publish(event)
+
+        # Capture the agent updates of this backtest's graph runs only
+        run_id = backtest_service.run_id
+        progress.subscribe(run_id, progress_stream.publish_updates)
+        
+        try:
+            # The run is only marked in progress once it streams, so every exit path below (including
+            # the client going away) goes through the finally block that records it as failed
+            if result_writer:
+                _active_backtest_runs.add(result_writer.flow_run_id)
+                await result_writer.start()
 
-                # Get the final result
+            try:
+                ticket = scheduler.submit(run_id, BACKTEST, owner=_run_owner(request_data, request))
+            except RunQueueFullError as e:
+                yield ErrorEvent(message=str(e)).to_sse()
+                return
+
+            async def run_when_admitted():
+                async with scheduler.slot(ticket, on_position=_publish_queue_position(progress_stream, run_id)):
+                    return await backtest_service.run_backtest_async(progress_callback=progress_callback)
+
+            # Start the backtest in a background task, once a worker is free
+            backtest_task = asyncio.create_task(run_when_admitted())
+            
+            # Start the disconnect detection task
+            disconnect_task = asyncio.create_task(wait_for_disconnect())
+            
+            # Send initial message
+            yield StartEvent(run_id=run_id).to_sse()
+
+            # Stream progress updates until backtest_task completes or client disconnects
+            async for frame in progress_stream.frames(backtest_task, disconnect_task):
+                yield frame
+
+            # Check if client disconnected
+            if disconnect_task.done():
+                print("Client disconnected, cancelling backtest execution")
+                backtest_task.cancel()
                 try:
-                    result = await backtest_task
+                    await backtest_task
                 except asyncio.CancelledError:
-                    print("Backtest task was cancelled")
-                    return
+                    pass
+                return
 
-                if not result:
-                    yield ErrorEvent(message="Failed to complete backtest").to_sse()
-                    return
+            # Get the final result
+            try:
+                result = await backtest_task
+            except asyncio.CancelledError:
+                print("Backtest task was cancelled")
+                if backtest_task.cancelled():
+                    yield ErrorEvent(message="Backtest was cancelled").to_sse()
+                return
 
-                # Send the final result
-                performance_metrics = BacktestPerformanceMetrics(**result["performance_metrics"])
-                final_data = CompleteEvent(
-                    data={
-                        "performance_metrics": performance_metrics.model_dump(),
-                        "final_portfolio": result["final_portfolio"],
-                        "total_days": len(result["results"]),
-                    }
-                )
-                yield final_data.to_sse()
+            # Deliver the last day results and status updates before the summary
+            progress.flush()
+            events = await progress_stream.drain()
+            if events:
+                yield encode_sse_batch(events)
 
-            except asyncio.CancelledError:
-                print("Backtest event generator cancelled")
+            if not result:
+                yield ErrorEvent(message="Failed to complete backtest").to_sse()
                 return
-            finally:
-                # Clean up
-                progress.unregister_handler(progress_handler)
-                if backtest_task and not backtest_task.done():
-                    backtest_task.cancel()
-                    try:
-                        await backtest_task
-                    except asyncio.CancelledError:
-                        pass
-                if disconnect_task and not disconnect_task.done():
-                    disconnect_task.cancel()
 
-        # Return a streaming response
-        return StreamingResponse(event_generator(), media_type="text/event-stream")
+            # Send the final result
+            performance_metrics = BacktestPerformanceMetrics(**result["performance_metrics"])
+            summary = {
+                "performance_metrics": performance_metrics.model_dump(),
+                "final_portfolio": result["final_portfolio"],
+                "total_days": len(result["results"]),
+                "usage": result.get("usage"),
+            }
+            if result_writer:
+                await result_writer.finish(results=summary)
+                summary["flow_run_id"] = result_writer.flow_run_id
+            final_data = CompleteEvent(data=summary)
+            yield final_data.to_sse()
+
+        except asyncio.CancelledError:
+            print("Backtest event generator cancelled")
+            return
+        finally:
+            # Clean up
+            progress.unsubscribe(run_id, progress_stream.publish_updates)
+            if backtest_task and not backtest_task.done():
+                backtest_task.cancel()
+                try:
+                    await backtest_task
+                except asyncio.CancelledError:
+                    pass
+            if disconnect_task and not disconnect_task.done():
+                disconnect_task.cancel()
+            # Keep the days stored so far and mark runs that did not complete as failed (they can be resumed)
+            if result_writer:
+                if not result_writer.finished:
+                    await result_writer.finish(error_message="Backtest did not complete")
+                _active_backtest_runs.discard(result_writer.flow_run_id)
 
-    except HTTPException as e:
-        raise e
+    # Return a streaming response
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+
+@router.get(
+    path="/runs/queue",
+    responses={
+        200: {"description": "Worker and queue usage per run type"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+)
+async def get_run_queue():
+    """Get the number of workers, running and queued runs for hedge-fund runs and backtests."""
+    try:
+        return get_run_scheduler().get_stats()
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"An error occurred while processing the backtest request: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve run queue stats: {str(e)}")
+
+
+@router.delete(
+    path="/runs/{run_id}",
+    responses={
+        200: {"description": "Run cancelled successfully"},
+        404: {"model": ErrorResponse, "description": "Run not found"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+)
+async def cancel_run(run_id: str):
+    """Cancel a queued or running hedge-fund run or backtest."""
+    try:
+        if not get_run_scheduler().cancel(run_id):
+            raise HTTPException(status_code=404, detail="Run not found")
+        return {"message": "Run cancelled successfully"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to cancel run: {str(e)}")
 
 
 @router.get(
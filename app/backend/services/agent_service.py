@@ -1,13 +1,20 @@
 from functools import partial
-from typing import Callable
+from typing import Callable, Optional
+
+from app.backend.services.node_result_store import memoize_analyst
 from src.graph.state import AgentState
+from src.utils.tracing import traced_node
 
-def create_agent_function(agent_function: Callable, agent_id: str) -> Callable[[AgentState], dict]:
+def create_agent_function(agent_function: Callable, agent_id: str, memoize_key: Optional[str] = None) -> Callable[[AgentState], dict]:
     """
     Creates a new function from an agent function that accepts an agent_id.
 
     :param agent_function: The agent function to wrap.
     :param agent_id: The ID to be passed to the agent.
-    :return: A new function that can be called by LangGraph.
+    :param memoize_key: For analysts, the base agent key under which per-ticker results are reused across runs.
+    :return: A new function that can be called by LangGraph, traced as a span when tracing is on.
     """
-    return partial(agent_function, agent_id=agent_id) 
\ No newline at end of file
+    node_function = partial(agent_function, agent_id=agent_id)
+    if memoize_key:
+        node_function = memoize_analyst(node_function, memoize_key, agent_id)
+    return traced_node(node_function, agent_id)
@@ -0,0 +1,74 @@
+import asyncio
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from app.backend.database.connection import SessionLocal
+from app.backend.models.schemas import FlowRunStatus
+from app.backend.repositories.backtest_result_repository import BacktestResultRepository
+from app.backend.repositories.flow_run_repository import FlowRunRepository
+
+
+class BacktestResultWriter:
+    """
+    Stores a running backtest's day results under its flow run, in batches of batch_size days.
+
+    Results are buffered as the backtest streams them and each full batch is written on a worker
+    thread with its own session, so the event loop never waits on the database. Each batch is
+    stored with a checkpoint of the backtest's state after its last day, so a failed run can be
+    resumed from there; the checkpoint can be given as a function, which is only called when a
+    batch is written. finish() writes the remaining days and records the run's status and summary.
+    """
+
+    def __init__(self, flow_run_id: int, batch_size: Optional[int] = None, session_factory: Callable = SessionLocal):
+        self.flow_run_id = flow_run_id
+        # Days per write; BACKTEST_RESULT_BATCH_SIZE by default
+        self.batch_size = max(1, batch_size or int(os.environ.get("BACKTEST_RESULT_BATCH_SIZE", "20")))
+        self.session_factory = session_factory
+        self.finished = False
+        self._buffer: List[Dict[str, Any]] = []
+        self._checkpoint: Optional[Dict[str, Any] | Callable[[], Dict[str, Any]]] = None
+        self._writes: List[asyncio.Future] = []
+
+    def add(self, day_result: Dict[str, Any], checkpoint: Optional[Dict[str, Any] | Callable[[], Dict[str, Any]]] = None):
+        """Buffer a day result and the backtest's state after it (or a function building it); called from the event loop as the backtest produces them."""
+        self._buffer.append(day_result)
+        self._checkpoint = checkpoint
+        if len(self._buffer) >= self.batch_size:
+            self._write_buffer()
+
+    def _write_buffer(self):
+        batch, self._buffer = self._buffer, []
+        if batch:
+            checkpoint = self._checkpoint() if callable(self._checkpoint) else self._checkpoint
+            previous = self._writes[-1] if self._writes else None
+            self._writes.append(asyncio.ensure_future(self._write_after(previous, batch, checkpoint)))
+
+    async def _write_after(self, previous: Optional[asyncio.Future], batch: List[Dict[str, Any]], checkpoint: Optional[Dict[str, Any]]):
+        # Batches are stored in order (and not after a failed one), so the latest checkpoint covers every stored day
+        if previous is not None:
+            await previous
+        await asyncio.get_running_loop().run_in_executor(None, self._write, batch, checkpoint)
+
+    def _write(self, batch: List[Dict[str, Any]], checkpoint: Optional[Dict[str, Any]]):
+        with self.session_factory() as db:
+            BacktestResultRepository(db).add_day_results(self.flow_run_id, batch, checkpoint=checkpoint)
+
+    def _update_run(self, status: FlowRunStatus, results: Optional[Dict[str, Any]], error_message: Optional[str]):
+        with self.session_factory() as db:
+            FlowRunRepository(db).update_flow_run(self.flow_run_id, status=status, results=results, error_message=error_message)
+
+    async def start(self):
+        """Mark the run in progress; called once the backtest is actually streaming."""
+        await asyncio.get_running_loop().run_in_executor(None, self._update_run, FlowRunStatus.IN_PROGRESS, None, None)
+
+    async def finish(self, results: Optional[Dict[str, Any]] = None, error_message: Optional[str] = None):
+        """Write the remaining days and mark the run complete (or failed, with error_message)."""
+        if self.finished:
+            return
+        self.finished = True
+        self._write_buffer()
+        failures = [e for e in await asyncio.gather(*self._writes, return_exceptions=True) if isinstance(e, Exception)]
+        if failures:
+            error_message = error_message or f"Failed to store backtest results: {failures[0]}"
+        status = FlowRunStatus.ERROR if error_message else FlowRunStatus.COMPLETE
+        await asyncio.get_running_loop().run_in_executor(None, self._update_run, status, results, error_message)
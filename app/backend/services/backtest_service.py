@@ -4,6 +4,9 @@ import pandas as pd
 import numpy as np
 from typing import Callable, Dict, List, Optional, Any
 import asyncio
+import contextvars
+import copy
+from functools import partial
 
 from src.tools.api import (
     get_company_news,
@@ -14,6 +17,7 @@ from src.tools.api import (
 )
 from app.backend.services.graph import run_graph_async, parse_hedge_fund_response
 from app.backend.services.portfolio import create_portfolio
+from src.utils.usage import track_usage
 
 class BacktestService:
     """
@@ -32,6 +36,9 @@ class BacktestService:
         model_name: str = "gpt-4.1",
         model_provider: str = "OpenAI",
         request: dict = {},
+        run_id: Optional[str] = None,
+        executor=None,
+        checkpoint: Optional[Dict[str, Any]] = None,
     ):
         """
         Initialize the backtest service.
@@ -45,6 +52,10 @@ class BacktestService:
         :param model_name: Which LLM model name to use.
         :param model_provider: Which LLM provider.
         :param request: Request object containing API keys and other metadata.
+        :param run_id: Progress channel the agents' status updates are published on.
+        :param executor: Executor for graph runs and data fetching (the loop's default executor if None).
+        :param checkpoint: State of an interrupted run to resume after its last completed day (see _checkpoint_state),
+            with the results of the days up to it under "results" (its equity curve is rebuilt from them).
         """
         self.graph = graph
         self.portfolio = portfolio
@@ -55,7 +66,11 @@ class BacktestService:
         self.model_name = model_name
         self.model_provider = model_provider
         self.request = request
+        self.run_id = run_id
+        self.executor = executor
+        self.checkpoint = checkpoint
         self.portfolio_values = []
+        self._usage = None
 
     def execute_trade(self, ticker: str, action: str, quantity: float, current_price: float) -> int:
         """
@@ -232,6 +247,26 @@ class BacktestService:
             get_insider_trades(ticker, self.end_date, start_date=self.start_date, limit=1000, api_key=api_key)
             get_company_news(ticker, self.end_date, start_date=self.start_date, limit=1000, api_key=api_key)
 
+    def get_current_prices(self, previous_date_str: str, current_date_str: str) -> Optional[Dict[str, float]]:
+        """Get each ticker's latest close in the window, or None if any ticker has no price data."""
+        current_prices = {}
+        for ticker in self.tickers:
+            try:
+                price_data = get_price_data(ticker, previous_date_str, current_date_str)
+            except Exception:
+                return None
+            if price_data.empty:
+                return None
+            current_prices[ticker] = price_data.iloc[-1]["close"]
+        return current_prices
+
+    async def _run_blocking(self, fn: Callable, *args):
+        """Run blocking data fetching on the executor, so the event loop keeps serving other requests."""
+        loop = asyncio.get_running_loop()
+        # Copy the context so the run's usage tracker also sees the API calls
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self.executor, lambda: context.run(fn, *args))
+
     def _update_performance_metrics(self, performance_metrics: Dict[str, Any]):
         """Update performance metrics using daily returns."""
         values_df = pd.DataFrame(self.portfolio_values).set_index("Date")
@@ -283,9 +318,54 @@ class BacktestService:
         """
         Run the backtest asynchronously with optional progress callbacks.
         Uses the pre-compiled graph for trading decisions.
+        The result includes a "usage" summary for the whole run; each day's result has its own.
+        """
+        with track_usage() as usage:
+            if self.checkpoint and self.checkpoint.get("usage"):
+                # Usage of the days completed before the checkpoint
+                usage.merge_summary(self.checkpoint["usage"])
+            self._usage = usage
+            result = await self._run_backtest(progress_callback)
+        result["usage"] = usage.summary()
+        return result
+
+    def _checkpoint_state(self, last_completed_date: str, performance_metrics: Dict[str, Any]) -> Dict[str, Any]:
         """
+        JSON-serializable state after a completed day, from which the backtest can be resumed.
+
+        The equity curve is not included: it is rebuilt from the stored day results on resume, so
+        the state stays the same size however long the backtest runs.
+        """
+        return {
+            "last_completed_date": last_completed_date,
+            "portfolio": copy.deepcopy(self.portfolio),
+            "performance_metrics": dict(performance_metrics),
+            "usage": self._usage.summary() if self._usage else None,
+        }
+
+    def _restore_checkpoint(self, performance_metrics: Dict[str, Any]) -> str:
+        """Restore the state of the checkpoint's last completed day and return that day."""
+        self.portfolio = copy.deepcopy(self.checkpoint["portfolio"])
+        last_completed_date = self.checkpoint["last_completed_date"]
+        self.portfolio_values += [
+            {
+                "Date": pd.Timestamp(day["date"]),
+                "Portfolio Value": day["portfolio_value"],
+                "Long Exposure": day["long_exposure"],
+                "Short Exposure": day["short_exposure"],
+                "Gross Exposure": day["gross_exposure"],
+                "Net Exposure": day["net_exposure"],
+                "Long/Short Ratio": day["long_short_ratio"],
+            }
+            for day in self.checkpoint.get("results", [])
+            if day["date"] <= last_completed_date
+        ]
+        performance_metrics.update(self.checkpoint["performance_metrics"])
+        return last_completed_date
+
+    async def _run_backtest(self, progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
         # Pre-fetch all data at the start
-        self.prefetch_data()
+        await self._run_blocking(self.prefetch_data)
 
         dates = pd.date_range(self.start_date, self.end_date, freq="B")
         performance_metrics = {
@@ -305,6 +385,12 @@ class BacktestService:
 
         backtest_results = []
 
+        # Continue an interrupted run after its last completed day
+        last_completed_date = None
+        if self.checkpoint:
+            last_completed_date = self._restore_checkpoint(performance_metrics)
+            backtest_results = list(self.checkpoint.get("results", []))
+
         for i, current_date in enumerate(dates):
             # Allow other async operations to run
             await asyncio.sleep(0)
@@ -315,6 +401,8 @@ class BacktestService:
 
             if lookback_start == current_date_str:
                 continue
+            if last_completed_date is not None and current_date_str <= last_completed_date:
+                continue
 
             # Send progress update if callback provided
             if progress_callback:
@@ -327,25 +415,8 @@ class BacktestService:
                 })
 
             # Get current prices
-            try:
-                current_prices = {}
-                missing_data = False
-
-                for ticker in self.tickers:
-                    try:
-                        price_data = get_price_data(ticker, previous_date_str, current_date_str)
-                        if price_data.empty:
-                            missing_data = True
-                            break
-                        current_prices[ticker] = price_data.iloc[-1]["close"]
-                    except Exception as e:
-                        missing_data = True
-                        break
-
-                if missing_data:
-                    continue
-
-            except Exception:
+            current_prices = await self._run_blocking(self.get_current_prices, previous_date_str, current_date_str)
+            if current_prices is None:
                 continue
 
             # Create portfolio for this iteration
@@ -370,6 +441,8 @@ class BacktestService:
                     model_name=self.model_name,
                     model_provider=self.model_provider,
                     request=self.request,
+                    run_id=self.run_id,
+                    executor=self.executor,
                 )
                 
                 # Parse the decisions from the graph result
@@ -379,11 +452,13 @@ class BacktestService:
                 else:
                     decisions = {}
                     analyst_signals = {}
+                day_usage = result.get("usage") if result else None
                     
             except Exception as e:
                 print(f"Error running graph for {current_date_str}: {e}")
                 decisions = {}
                 analyst_signals = {}
+                day_usage = None
 
             # Execute trades based on decisions
             executed_trades = {}
@@ -437,6 +512,7 @@ class BacktestService:
                 "long_short_ratio": long_short_ratio,
                 "portfolio_return": portfolio_return,
                 "performance_metrics": performance_metrics.copy(),
+                "usage": day_usage,
                 # Add detailed trading information for each ticker
                 "ticker_details": []
             }
@@ -480,11 +556,13 @@ class BacktestService:
 
             backtest_results.append(date_result)
 
-            # Send intermediate result if callback provided
+            # Send intermediate result if callback provided; the checkpoint is only built if the
+            # receiver stores it (e.g. when it writes a batch of days), before the next day starts
             if progress_callback:
                 progress_callback({
                     "type": "backtest_result",
                     "data": date_result,
+                    "checkpoint": partial(self._checkpoint_state, current_date_str, performance_metrics),
                 })
 
         # Ensure final performance metrics are calculated
@@ -0,0 +1,231 @@
+import asyncio
+import contextvars
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from app.backend.database.connection import SessionLocal
+from app.backend.models.schemas import ContinuousRunRequest, FlowRunStatus
+from app.backend.repositories.flow_run_repository import FlowRunRepository
+from app.backend.services.graph import parse_hedge_fund_response, run_graph_async
+from app.backend.services.portfolio import create_portfolio
+from app.backend.services.run_scheduler import RUN, RunScheduler, get_run_scheduler
+from src.backtesting.portfolio import Portfolio
+from src.backtesting.trader import TradeExecutor
+from src.backtesting.valuation import calculate_portfolio_value
+from src.tools.data_refresh import DataRefresher
+from src.utils.usage import track_usage
+
+# Seconds between cycles, and how long a run lasts, by the names stored on the flow run
+SCHEDULE_SECONDS = {"hourly": 3600, "daily": 86400, "weekly": 604800}
+DURATION_SECONDS = {"1day": 86400, "1week": 604800, "1month": 2592000}
+
+
+class _ContinuousRun:
+    """A scheduled flow run and the state it carries from cycle to cycle."""
+
+    def __init__(self, flow_run_id: int, request: ContinuousRunRequest, graph):
+        self.flow_run_id = flow_run_id
+        self.request = request
+        self.graph = graph
+        self.interval = SCHEDULE_SECONDS[request.schedule]
+        self.duration = DURATION_SECONDS[request.duration]
+        # Each cycle analyzes a window of the same length, ending on the cycle's date
+        self.lookback = datetime.strptime(request.end_date, "%Y-%m-%d") - datetime.strptime(request.get_start_date(), "%Y-%m-%d")
+        self.portfolio = Portfolio.from_snapshot(create_portfolio(request.initial_cash, request.margin_requirement, request.tickers, request.portfolio_positions))
+        self.initial_value: Optional[float] = None
+        self.performance_metrics: Optional[Dict[str, Any]] = None
+        # Data versions of the tickers as of the last analyzed cycle
+        self.versions: Dict[str, str] = {}
+        self.cycles = 0
+        # Error recorded on the run when it is stopped before its duration is up, None for a user stop
+        self.stop_error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+
+class ContinuousTradingScheduler:
+    """
+    In-process scheduler for continuous and advisory flow runs.
+
+    Each run is an asyncio task that starts a cycle every schedule interval until its duration is
+    up. A cycle refreshes only the data published since the previous one and, when any ticker's
+    data changed, runs the flow's graph through the run scheduler (like any other run) with the
+    tickers' data versions, so memoized analysts recompute only the changed tickers. Continuous
+    runs paper-trade the decisions at the latest prices; advisory runs only record them. Every
+    cycle is stored as a flow run cycle, with the LLM and API usage it recorded.
+    """
+
+    def __init__(self, run_scheduler: Optional[RunScheduler] = None, refresher: Optional[DataRefresher] = None, session_factory: Callable = SessionLocal):
+        self._run_scheduler = run_scheduler
+        self.refresher = refresher or DataRefresher()
+        self.session_factory = session_factory
+        self._runs: Dict[int, _ContinuousRun] = {}
+        self._trade_executor = TradeExecutor()
+
+    @property
+    def run_scheduler(self) -> RunScheduler:
+        return self._run_scheduler or get_run_scheduler()
+
+    def is_running(self, flow_run_id: int) -> bool:
+        return flow_run_id in self._runs
+
+    def get_active_runs(self) -> list[int]:
+        return list(self._runs)
+
+    def start(self, flow_run_id: int, request: ContinuousRunRequest, graph) -> None:
+        """Start running a flow run's cycles in the background; called from the event loop."""
+        if flow_run_id in self._runs:
+            raise ValueError(f"Flow run {flow_run_id} is already running")
+        run = _ContinuousRun(flow_run_id, request, graph)
+        self._runs[flow_run_id] = run
+        run.task = asyncio.create_task(self._run(run))
+
+    async def stop(self, flow_run_id: int, error_message: Optional[str] = None) -> bool:
+        """Stop a run after (or during) its current cycle; the run completes, or fails with error_message if given."""
+        run = self._runs.get(flow_run_id)
+        if run is None:
+            return False
+        run.stop_error = error_message
+        run.task.cancel()
+        await asyncio.gather(run.task, return_exceptions=True)
+        return True
+
+    async def shutdown(self):
+        """Stop every run, e.g. when the server shuts down."""
+        for flow_run_id in list(self._runs):
+            await self.stop(flow_run_id, error_message="Server shut down before the run finished")
+
+    async def _run(self, run: _ContinuousRun):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + run.duration
+        error_message = None
+        try:
+            while True:
+                started = loop.time()
+                await self._run_cycle(run)
+                next_cycle = started + run.interval
+                if next_cycle >= deadline:
+                    break
+                await asyncio.sleep(next_cycle - loop.time())
+        except asyncio.CancelledError:
+            error_message = run.stop_error
+        except Exception as e:
+            error_message = f"Continuous run failed: {str(e)}"
+        finally:
+            self._runs.pop(run.flow_run_id, None)
+            await loop.run_in_executor(None, self._finish_run, run, error_message)
+
+    async def _run_cycle(self, run: _ContinuousRun):
+        loop = asyncio.get_running_loop()
+        request = run.request
+        cycle_id = await loop.run_in_executor(None, self._create_cycle, run.flow_run_id)
+        run.cycles += 1
+        end_date = datetime.now().strftime("%Y-%m-%d")
+        analyst_signals = decisions = executed_trades = None
+        error_message = None
+
+        with track_usage() as usage:
+            try:
+                api_key = (request.api_keys or {}).get("FINANCIAL_DATASETS_API_KEY")
+                context = contextvars.copy_context()
+                versions = await loop.run_in_executor(None, lambda: context.run(self.refresher.refresh, request.tickers, end_date, api_key))
+
+                prices = self.refresher.latest_prices(request.tickers)
+                if run.initial_value is None and len(prices) == len(request.tickers):
+                    run.initial_value = calculate_portfolio_value(run.portfolio, prices)
+
+                # Without new data the previous cycle's decisions still stand
+                if any(versions[ticker] != run.versions.get(ticker) for ticker in request.tickers):
+                    analyst_signals, decisions, executed_trades = await self._analyze(run, end_date, versions, prices)
+                    run.versions = versions
+                else:
+                    decisions, executed_trades = {}, {}
+            except asyncio.CancelledError:
+                await loop.run_in_executor(None, self._complete_cycle, run, cycle_id, None, None, None, usage.summary(), "Run stopped during the cycle")
+                raise
+            except Exception as e:
+                error_message = str(e)
+
+        await loop.run_in_executor(None, self._complete_cycle, run, cycle_id, analyst_signals, decisions, executed_trades, usage.summary(), error_message)
+
+    async def _analyze(self, run: _ContinuousRun, end_date: str, versions: Dict[str, str], prices: Dict[str, float]) -> tuple[dict, dict, dict]:
+        """Run the graph on the cycle's data, then paper-trade its decisions for continuous runs."""
+        request = run.request
+        start_date = (datetime.strptime(end_date, "%Y-%m-%d") - run.lookback).strftime("%Y-%m-%d")
+        cycle_request = request.model_copy(update={"start_date": start_date, "end_date": end_date, "data_versions": versions})
+        model_provider = request.model_provider
+        if hasattr(model_provider, "value"):
+            model_provider = model_provider.value
+
+        scheduler = self.run_scheduler
+        run_id = uuid.uuid4().hex
+        ticket = scheduler.submit(run_id, RUN, owner=f"flow:{request.flow_id}")
+        async with scheduler.slot(ticket):
+            result = await run_graph_async(
+                graph=run.graph,
+                portfolio=run.portfolio.get_snapshot(),
+                tickers=request.tickers,
+                start_date=start_date,
+                end_date=end_date,
+                model_name=request.model_name,
+                model_provider=model_provider,
+                request=cycle_request,
+                run_id=run_id,
+                executor=scheduler.executor,
+            )
+        if not result or not result.get("messages"):
+            raise ValueError("Failed to generate hedge fund decisions")
+
+        decisions = parse_hedge_fund_response(result["messages"][-1].content) or {}
+        analyst_signals = result.get("data", {}).get("analyst_signals", {})
+        prices.update(result.get("data", {}).get("current_prices") or {})
+
+        executed_trades = {}
+        if request.trading_mode == "continuous":
+            positions = run.portfolio.get_positions()
+            for ticker, decision in decisions.items():
+                if ticker in positions and ticker in prices:
+                    executed_trades[ticker] = self._trade_executor.execute_trade(ticker, decision.get("action", "hold"), decision.get("quantity", 0), prices[ticker], run.portfolio)
+        return analyst_signals, decisions, executed_trades
+
+    def _create_cycle(self, flow_run_id: int) -> int:
+        with self.session_factory() as db:
+            return FlowRunRepository(db).create_flow_run_cycle(flow_run_id, trigger_reason="scheduled").id
+
+    def _complete_cycle(self, run: _ContinuousRun, cycle_id: int, analyst_signals, decisions, executed_trades, usage: Dict[str, Any], error_message: Optional[str]):
+        prices = self.refresher.latest_prices(run.request.tickers)
+        if run.initial_value and len(prices) == len(run.request.tickers):
+            portfolio_value = calculate_portfolio_value(run.portfolio, prices)
+            run.performance_metrics = {"portfolio_value": portfolio_value, "portfolio_return": (portfolio_value / run.initial_value - 1.0) * 100}
+        with self.session_factory() as db:
+            FlowRunRepository(db).complete_flow_run_cycle(
+                cycle_id,
+                analyst_signals=analyst_signals,
+                trading_decisions=decisions,
+                executed_trades=executed_trades,
+                portfolio_snapshot=run.portfolio.get_snapshot(),
+                performance_metrics=run.performance_metrics,
+                usage=usage,
+                error_message=error_message,
+            )
+
+    def _finish_run(self, run: _ContinuousRun, error_message: Optional[str]):
+        with self.session_factory() as db:
+            FlowRunRepository(db).update_flow_run(
+                run.flow_run_id,
+                status=FlowRunStatus.ERROR if error_message else FlowRunStatus.COMPLETE,
+                results={"cycles": run.cycles, "performance_metrics": run.performance_metrics},
+                error_message=error_message,
+                final_portfolio=run.portfolio.get_snapshot(),
+            )
+
+
+_continuous_scheduler: Optional[ContinuousTradingScheduler] = None
+
+
+def get_continuous_scheduler() -> ContinuousTradingScheduler:
+    """Get the global scheduler of continuous and advisory flow runs."""
+    global _continuous_scheduler
+    if _continuous_scheduler is None:
+        _continuous_scheduler = ContinuousTradingScheduler()
+    return _continuous_scheduler
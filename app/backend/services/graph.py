@@ -1,15 +1,25 @@
 import asyncio
+import contextvars
 import json
 import re
+from contextlib import nullcontext
 from langchain_core.messages import HumanMessage
 from langgraph.graph import END, StateGraph
 
 from app.backend.services.agent_service import create_agent_function
+from app.backend.services.graph_cache import get_graph_cache
+from app.backend.services.process_pool import get_process_runner, process_mode_enabled
 from src.agents.portfolio_manager import portfolio_management_agent
-from src.agents.risk_manager import risk_management_agent
+from src.agents.risk_manager import risk_analytics_run, risk_management_agent
 from src.main import start
 from src.utils.analysts import ANALYST_CONFIG
 from src.graph.state import AgentState
+from src.llm.models import ModelProvider, get_ollama_base_url
+from src.llm.ollama_scheduler import get_ollama_scheduler
+from src.tools.sentiment_scorer import sentiment_metadata
+from src.utils.progress import progress_run
+from src.utils.tracing import get_trace_dir, new_trace_path, trace_run
+from src.utils.usage import track_usage
 
 
 def extract_base_agent_key(unique_id: str) -> str:
@@ -62,7 +72,7 @@ def create_graph(graph_nodes: list, graph_edges: list) -> StateGraph:
             continue
             
         node_name, node_func = analyst_nodes[base_agent_key]
-        agent_function = create_agent_function(node_func, unique_agent_id)
+        agent_function = create_agent_function(node_func, unique_agent_id, memoize_key=base_agent_key)
         graph.add_node(unique_agent_id, agent_function)
     
     # Add portfolio manager nodes and their corresponding risk managers
@@ -76,7 +86,7 @@ def create_graph(graph_nodes: list, graph_edges: list) -> StateGraph:
         risk_manager_id = f"risk_management_agent_{suffix}"
         risk_manager_nodes[portfolio_manager_id] = risk_manager_id
         
-        # Add the risk manager node
+        # Add the risk manager node; run_graph shares its market analytics with the other portfolio managers' risk managers
         risk_manager_function = create_agent_function(risk_management_agent, risk_manager_id)
         graph.add_node(risk_manager_id, risk_manager_function)
 
@@ -129,12 +139,32 @@ def create_graph(graph_nodes: list, graph_edges: list) -> StateGraph:
     return graph
 
 
-async def run_graph_async(graph, portfolio, tickers, start_date, end_date, model_name, model_provider, request=None):
-    """Async wrapper for run_graph to work with asyncio."""
+def get_compiled_graph(graph_nodes: list, graph_edges: list, flow_id: int | None = None):
+    """Get the compiled graph for a React Flow structure, reusing a cached one when the structure is unchanged."""
+    return get_graph_cache().get_or_compile(
+        graph_nodes,
+        graph_edges,
+        lambda: create_graph(graph_nodes=graph_nodes, graph_edges=graph_edges).compile(),
+        flow_id=flow_id,
+    )
+
+
+async def run_graph_async(graph, portfolio, tickers, start_date, end_date, model_name, model_provider, request=None, run_id=None, executor=None):
+    """
+    Async wrapper for run_graph to work with asyncio; runs on executor (the loop's default executor if None).
+
+    With RUN_EXECUTION_MODE=process, requests that carry their flow's structure run in a worker
+    process instead, which compiles the same graph from the request.
+    """
+    if process_mode_enabled() and getattr(request, "graph_nodes", None) is not None:
+        return await get_process_runner().run(portfolio, tickers, start_date, end_date, model_name, model_provider, request, run_id, executor=executor)
+
     # Use run_in_executor to run the synchronous function in a separate thread
     # so it doesn't block the event loop
     loop = asyncio.get_running_loop()
-    result = await loop.run_in_executor(None, lambda: run_graph(graph, portfolio, tickers, start_date, end_date, model_name, model_provider, request))  # Use default executor
+    # Copy the context so usage trackers opened by the caller also see the graph's calls
+    context = contextvars.copy_context()
+    result = await loop.run_in_executor(executor, lambda: context.run(run_graph, graph, portfolio, tickers, start_date, end_date, model_name, model_provider, request, run_id))
     return result
 
 
@@ -147,34 +177,63 @@ def run_graph(
     model_name: str,
     model_provider: str,
     request=None,
+    run_id: str | None = None,
 ) -> dict:
     """
     Run the graph with the given portfolio, tickers,
     start date, end date, show reasoning, model name,
     and model provider.
+
+    The returned state includes a "usage" summary of the LLM and API calls made by the run.
+    When AGENT_TRACE_DIR is set, a Chrome trace of the run is written there.
+    Agent status updates are published on the run_id's progress channel.
+    The risk managers of several portfolio managers share market analytics within the run only.
     """
-    return graph.invoke(
-        {
-            "messages": [
-                HumanMessage(
-                    content="Make trading decisions based on the provided data.",
-                )
-            ],
-            "data": {
-                "tickers": tickers,
-                "portfolio": portfolio,
-                "start_date": start_date,
-                "end_date": end_date,
-                "analyst_signals": {},
-            },
-            "metadata": {
-                "show_reasoning": False,
-                "model_name": model_name,
-                "model_provider": model_provider,
-                "request": request,  # Pass the request for agent-specific model access
+    # Load local models while the analysts fetch their data, rather than on the first request
+    ollama_models = _get_ollama_models(request, model_name, model_provider)
+    if ollama_models:
+        get_ollama_scheduler().preload(ollama_models, base_url=get_ollama_base_url())
+
+    # Trace backend runs to AGENT_TRACE_DIR when it is set
+    trace_dir = get_trace_dir()
+    with track_usage() as usage, progress_run(run_id), risk_analytics_run(), (trace_run(new_trace_path(trace_dir)) if trace_dir else nullcontext()):
+        result = graph.invoke(
+            {
+                "messages": [
+                    HumanMessage(
+                        content="Make trading decisions based on the provided data.",
+                    )
+                ],
+                "data": {
+                    "tickers": tickers,
+                    "portfolio": portfolio,
+                    "start_date": start_date,
+                    "end_date": end_date,
+                    "analyst_signals": {},
+                },
+                "metadata": {
+                    "show_reasoning": False,
+                    "model_name": model_name,
+                    "model_provider": model_provider,
+                    "request": request,  # Pass the request for agent-specific model access
+                    "run_id": run_id,
+                    # Per-ticker versions of refreshed data (scheduled runs), for caches keyed by the data a run sees
+                    "data_versions": getattr(request, "data_versions", None) or {},
+                    **sentiment_metadata(getattr(request, "sentiment_offline", False), getattr(request, "sentiment_threshold", None)),
+                },
             },
-        },
-    )
+        )
+
+    result["usage"] = usage.summary()
+    return result
+
+
+def _get_ollama_models(request, model_name: str, model_provider: str) -> list[str]:
+    """Get the Ollama models a run will call, from the global and per-agent model settings."""
+    configs = [(model_name, model_provider)]
+    if request is not None and hasattr(request, "get_agent_model_config"):
+        configs += [request.get_agent_model_config(agent_id) for agent_id in request.get_agent_ids()]
+    return list(dict.fromkeys(name for name, provider in configs if name and provider == ModelProvider.OLLAMA))
 
 
 def parse_hedge_fund_response(response):
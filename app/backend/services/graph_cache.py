@@ -0,0 +1,76 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+
+def graph_signature(graph_nodes: list, graph_edges: list) -> str:
+    """
+    Canonical signature of a React Flow graph's structure.
+
+    Only node IDs and edge endpoints shape the compiled graph, so positions, labels
+    and the order nodes and edges arrive in do not change the signature.
+    """
+    structure = {
+        "nodes": sorted(node.id for node in graph_nodes),
+        "edges": sorted([edge.source, edge.target] for edge in graph_edges),
+    }
+    return hashlib.sha256(json.dumps(structure, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+class CompiledGraphCache:
+    """LRU cache of compiled agent graphs keyed by flow ID and graph signature."""
+
+    def __init__(self, max_size: int = 32):
+        self.max_size = max(1, max_size)
+        self._graphs: OrderedDict[tuple[Optional[int], str], Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_or_compile(self, graph_nodes: list, graph_edges: list, compile_graph: Callable[[], Any], flow_id: Optional[int] = None) -> Any:
+        """Return the cached compiled graph for this structure, compiling it with compile_graph on a miss."""
+        key = (flow_id, graph_signature(graph_nodes, graph_edges))
+        with self._lock:
+            compiled = self._graphs.get(key)
+            if compiled is not None:
+                self._graphs.move_to_end(key)
+                self._hits += 1
+                return compiled
+            self._misses += 1
+
+        # Compile outside the lock; a concurrent miss for the same key just compiles twice
+        compiled = compile_graph()
+        with self._lock:
+            self._graphs[key] = compiled
+            self._graphs.move_to_end(key)
+            while len(self._graphs) > self.max_size:
+                self._graphs.popitem(last=False)
+        return compiled
+
+    def invalidate_flow(self, flow_id: int) -> int:
+        """Drop the compiled graphs of a flow. Returns the number of graphs removed."""
+        with self._lock:
+            keys = [key for key in self._graphs if key[0] == flow_id]
+            for key in keys:
+                del self._graphs[key]
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._graphs.clear()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._graphs), "max_size": self.max_size, "hits": self._hits, "misses": self._misses}
+
+
+# Global compiled graph cache; size it with GRAPH_CACHE_SIZE
+_graph_cache = CompiledGraphCache(max_size=int(os.environ.get("GRAPH_CACHE_SIZE", "32")))
+
+
+def get_graph_cache() -> CompiledGraphCache:
+    """Get the global compiled graph cache."""
+    return _graph_cache
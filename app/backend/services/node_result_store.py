@@ -0,0 +1,153 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from langchain_core.messages import HumanMessage
+
+from src.data.cache import SingleFlight, get_cache
+from src.graph.state import AgentState
+from src.utils.llm import get_agent_model_config
+from src.utils.progress import progress
+from src.utils.usage import track_usage
+
+
+class NodeResultStore:
+    """
+    LRU store of analyst signals keyed by (agent, model provider, model name, ticker, date window, data version).
+
+    Entries expire after ttl_seconds (or their own TTL), since data the cache does not hold (line
+    items, today's market cap) can change unnoticed. Stored signals are shared between runs and
+    must be treated as read-only.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl_seconds: float = 3600):
+        self.max_size = max(1, max_size)
+        self.ttl_seconds = ttl_seconds
+        # key -> (expiry time, result)
+        self._results: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: tuple) -> Optional[Any]:
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None and time.monotonic() > entry[0]:
+                del self._results[key]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._results.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def set(self, key: tuple, result: Any, ttl_seconds: Optional[float] = None):
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._results[key] = (time.monotonic() + ttl_seconds, result)
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._results), "max_size": self.max_size, "ttl_seconds": self.ttl_seconds, "hits": self._hits, "misses": self._misses}
+
+
+# Deduplicates concurrent analyses of the same tickers by the same analyst
+_single_flight = SingleFlight()
+
+# Global analyst result store; size it with NODE_RESULT_STORE_SIZE and NODE_RESULT_TTL_SECONDS
+_node_result_store = NodeResultStore(
+    max_size=int(os.environ.get("NODE_RESULT_STORE_SIZE", "10000")),
+    ttl_seconds=float(os.environ.get("NODE_RESULT_TTL_SECONDS", "3600")),
+)
+
+
+def get_node_result_store() -> NodeResultStore:
+    """Get the global analyst result store."""
+    return _node_result_store
+
+
+def _get_stored(store: NodeResultStore, cache, keys: dict[str, tuple], tickers: list[str]) -> dict[str, Any]:
+    stored = {}
+    for ticker in tickers:
+        entry = store.get(keys[ticker])
+        # A result is only valid while the cached data it was computed from is unchanged
+        if entry is not None and cache.key_versions(entry[0]) == entry[0]:
+            stored[ticker] = entry[1]
+    return stored
+
+
+def memoize_analyst(agent_function: Callable[[AgentState], dict], agent_key: str, agent_id: str) -> Callable[[AgentState], dict]:
+    """
+    Wrap an analyst node so only tickers without a stored result are analyzed.
+
+    Results are stored per ticker under the analyst's base key (so they survive node IDs changing
+    as a flow is edited), its model configuration and the run's date window, together with the
+    content versions of the ticker's cached data the analysis read. A stored result is reused only
+    while that data is unchanged; data other analysts or runs fetch for the ticker does not affect
+    it. Runs whose metadata carries data_versions (scheduled runs, whose data is refreshed
+    incrementally) also key results by the ticker's refresh version; those results stay valid
+    until the version changes, so they do not expire. Tickers whose LLM calls failed (and so fell
+    back to a default signal) are not stored. Requests can opt out with reuse_cached_results=False.
+    """
+
+    def memoized(state: AgentState) -> dict:
+        request = state["metadata"].get("request")
+        if request is not None and not getattr(request, "reuse_cached_results", True):
+            return agent_function(state)
+
+        store = get_node_result_store()
+        cache = get_cache()
+        data = state["data"]
+        tickers = data["tickers"]
+        model_name, model_provider = get_agent_model_config(state, agent_id)
+        data_versions = state["metadata"].get("data_versions") or {}
+        keys = {ticker: (agent_key, model_provider, model_name, ticker, data.get("start_date"), data.get("end_date"), data_versions.get(ticker)) for ticker in tickers}
+
+        signals = _get_stored(store, cache, keys, tickers)
+        missing = [ticker for ticker in tickers if ticker not in signals]
+        if not missing:
+            progress.update_status(agent_id, None, "Done")
+        else:
+            # The same analyst on several portfolio-manager branches analyzes the tickers once;
+            # the other branches wait and pick up the stored results
+            with _single_flight.acquire(repr(tuple(keys[ticker] for ticker in missing))) as waited:
+                if waited:
+                    signals.update(_get_stored(store, cache, keys, missing))
+                    missing = [ticker for ticker in tickers if ticker not in signals]
+                if missing:
+                    with track_usage() as usage, cache.track_reads() as read_keys:
+                        update = agent_function({**state, "data": {**data, "tickers": missing}})
+                    new_signals = update["data"]["analyst_signals"][agent_id]
+                    failures = {ticker: totals["failures"] for ticker, totals in usage.summary()["by_ticker"].items()}
+                    # Versions taken after the analysis, once the data it fetched is cached; cache keys start with the ticker
+                    read_versions = cache.key_versions(read_keys)
+                    for ticker in missing:
+                        if ticker not in new_signals:
+                            continue
+                        signals[ticker] = new_signals[ticker]
+                        # Calls not attributed to a ticker may have affected any of them
+                        if not failures.get(ticker) and not failures.get("all"):
+                            dependencies = {cache_key: version for cache_key, version in read_versions.items() if cache_key[1].partition("_")[0] == ticker}
+                            store.set(keys[ticker], (dependencies, new_signals[ticker]), ttl_seconds=math.inf if data_versions.get(ticker) else None)
+                    if len(missing) == len(tickers):
+                        return update
+                else:
+                    progress.update_status(agent_id, None, "Done")
+
+        signals = {ticker: signals[ticker] for ticker in tickers if ticker in signals}
+        message = HumanMessage(content=json.dumps(signals, default=str), name=agent_id)
+        return {"messages": [message], "data": {"analyst_signals": {agent_id: signals}}}
+
+    return memoized
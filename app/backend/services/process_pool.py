@@ -0,0 +1,144 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional
+
+from app.backend.services.run_scheduler import hold_slot
+from src.data.cache import get_cache
+from src.utils.progress import progress, progress_run
+from src.utils.usage import record_usage_summary
+
+# Seconds to wait for a finished run's last progress updates to arrive from its worker
+PROGRESS_DELIVERY_TIMEOUT = 5.0
+
+# Progress channel back to the parent, set in each worker process by _init_worker
+_worker_updates = None
+
+
+def process_mode_enabled() -> bool:
+    """Whether graph runs execute in worker processes (RUN_EXECUTION_MODE=process) instead of threads."""
+    return os.environ.get("RUN_EXECUTION_MODE", "thread").lower() == "process"
+
+
+def _init_worker(updates):
+    """Forward the worker's progress updates (already attributed to their runs) to the parent."""
+    global _worker_updates
+    _worker_updates = updates
+    progress.register_handler(lambda batch: updates.put(("progress", batch)))
+
+
+def _run_graph_in_worker(job_id: str, cache_snapshot: dict, portfolio: dict, tickers: list[str], start_date: str, end_date: str, model_name: str, model_provider: str, request, run_id: Optional[str]) -> dict:
+    from app.backend.services.graph import get_compiled_graph, run_graph
+
+    get_cache().load(cache_snapshot)
+    # Compiled graphs are not picklable; each worker compiles (and caches) the flow's structure itself
+    graph = get_compiled_graph(graph_nodes=request.graph_nodes, graph_edges=request.graph_edges, flow_id=request.flow_id)
+    try:
+        return run_graph(graph, portfolio, tickers, start_date, end_date, model_name, model_provider, request, run_id)
+    finally:
+        progress.flush()
+        _worker_updates.put(("done", job_id))
+
+
+class ProcessGraphRunner:
+    """
+    Runs whole graph invocations in a pool of worker processes, so concurrent runs' CPU-bound
+    analysis (pandas/NumPy valuation loops in the persona agents) uses every core instead of
+    contending for one GIL.
+
+    Each job carries the request (the flow's structure and model settings), the portfolio and a
+    read-only snapshot of the parent's cached data for the run's tickers, so workers start from
+    data the parent (e.g. a backtest prefetch) already fetched. Workers publish their progress
+    updates on a queue that a listener thread republishes on the parent's progress bus, and
+    the run's usage summary is added to the parent's active usage trackers.
+
+    Per-process state (data cache entries fetched by a worker, stored analyst results, compiled
+    graphs) stays in that worker and is reused by the runs it serves next.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, start_method: str = "spawn"):
+        context = multiprocessing.get_context(start_method)
+        self._updates = context.Queue()
+        self._pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=context, initializer=_init_worker, initargs=(self._updates,))
+        self._lock = threading.Lock()
+        # job ID -> callback run once the job's last progress updates were republished
+        self._delivered: Dict[str, Callable[[], None]] = {}
+        self._listener = threading.Thread(target=self._listen, name="process-runner-progress", daemon=True)
+        self._listener.start()
+
+    def _listen(self):
+        while True:
+            try:
+                kind, payload = self._updates.get()
+            except (EOFError, OSError):
+                # The queue was closed along with the runner
+                return
+            if kind == "progress":
+                for update in payload:
+                    with progress_run(update.run_id):
+                        progress.update_status(update.agent_name, update.ticker, update.status, update.analysis)
+            elif kind == "done":
+                with self._lock:
+                    callback = self._delivered.pop(payload, None)
+                if callback is not None:
+                    callback()
+
+    async def run(self, portfolio: dict, tickers: list[str], start_date: str, end_date: str, model_name: str, model_provider: str, request, run_id: Optional[str] = None, executor=None) -> dict:
+        """
+        Run the request's graph in a worker process; same arguments and result as run_graph.
+
+        The cache snapshot is taken on executor (the loop's default executor if None). Called from a
+        run scheduler slot, the job holds the slot until the worker returns.
+        """
+        loop = asyncio.get_running_loop()
+        job_id = uuid.uuid4().hex
+        delivered = loop.create_future()
+
+        def on_delivered():
+            try:
+                loop.call_soon_threadsafe(lambda: delivered.done() or delivered.set_result(None))
+            except RuntimeError:
+                # The loop is closed: nobody waits for the updates anymore
+                pass
+
+        with self._lock:
+            self._delivered[job_id] = on_delivered
+        try:
+            cache_snapshot = await loop.run_in_executor(executor, get_cache().snapshot, tickers)
+            job = hold_slot(self._pool.submit(_run_graph_in_worker, job_id, cache_snapshot, portfolio, tickers, start_date, end_date, model_name, model_provider, request, run_id))
+            result = await asyncio.wrap_future(job)
+            # Updates travel separately from the result; deliver them before the caller reports completion
+            try:
+                await asyncio.wait_for(delivered, PROGRESS_DELIVERY_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            with self._lock:
+                self._delivered.pop(job_id, None)
+
+        record_usage_summary(result["usage"])
+        return result
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_process_runner: Optional[ProcessGraphRunner] = None
+_process_runner_lock = threading.Lock()
+
+
+def get_process_runner() -> ProcessGraphRunner:
+    """Get the shared process runner, configured by RUN_PROCESS_WORKERS (default: CPU count) and RUN_PROCESS_START_METHOD (default spawn)."""
+    global _process_runner
+    if _process_runner is None:
+        with _process_runner_lock:
+            if _process_runner is None:
+                workers = os.environ.get("RUN_PROCESS_WORKERS")
+                _process_runner = ProcessGraphRunner(
+                    max_workers=int(workers) if workers else None,
+                    start_method=os.environ.get("RUN_PROCESS_START_METHOD", "spawn"),
+                )
+    return _process_runner
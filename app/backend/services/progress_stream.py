@@ -0,0 +1,116 @@
+import asyncio
+import itertools
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Hashable, List, Optional
+
+from app.backend.models.events import BaseEvent, ProgressUpdateEvent, encode_sse_batch
+from src.utils.progress import ProgressUpdate
+
+
+class ProgressStream:
+    """
+    Thread-safe bridge that delivers a run's events into the event loop of its SSE response.
+
+    Producers on any thread publish through loop.call_soon_threadsafe, so the buffer is only
+    touched on the loop thread and a published event always wakes the consumer. Events with a
+    merge key (agent status updates, keyed by agent and ticker) replace the undelivered event
+    with the same key; when more than max_pending of them wait for a slow client, the oldest
+    are dropped. Events without a key (e.g. backtest day results) are never merged or dropped.
+    """
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None, max_pending: int = 1000):
+        self._loop = loop or asyncio.get_running_loop()
+        self.max_pending = max(1, max_pending)
+        self._pending: OrderedDict[tuple, BaseEvent] = OrderedDict()
+        self._mergeable = 0
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self.dropped = 0
+
+    def publish(self, event: BaseEvent, key: Optional[Hashable] = None):
+        """Publish an event from any thread."""
+        self._call_soon([(event, key)])
+
+    def publish_updates(self, updates: List[ProgressUpdate]):
+        """Progress handler: publish a batch of agent status updates, merged per agent and ticker."""
+        self._call_soon(
+            [
+                (ProgressUpdateEvent(agent=update.agent_name, ticker=update.ticker, status=update.status, timestamp=update.timestamp, analysis=update.analysis), (update.agent_name, update.ticker))
+                for update in updates
+            ]
+        )
+
+    def _call_soon(self, items: list[tuple[BaseEvent, Any]]):
+        try:
+            self._loop.call_soon_threadsafe(self._push, items)
+        except RuntimeError:
+            # The loop is closed: the client is gone and nobody will read the events
+            pass
+
+    def _push(self, items: list[tuple[BaseEvent, Any]]):
+        for event, key in items:
+            if key is None:
+                self._pending[("event", next(self._sequence))] = event
+                continue
+            slot = ("merge", key)
+            if self._pending.pop(slot, None) is None:
+                self._mergeable += 1
+            self._pending[slot] = event
+        if self._mergeable > self.max_pending:
+            self._drop_oldest(self._mergeable - self.max_pending)
+        if self._pending:
+            self._wakeup.set()
+
+    def _drop_oldest(self, count: int):
+        for slot in [slot for slot in self._pending if slot[0] == "merge"][:count]:
+            del self._pending[slot]
+            self._mergeable -= 1
+            self.dropped += 1
+
+    async def get(self, timeout: Optional[float] = None) -> List[BaseEvent]:
+        """Wait up to timeout seconds for events and return everything pending (an empty list on timeout)."""
+        if not self._pending:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        return self._take()
+
+    async def frames(self, task: asyncio.Future, disconnect_task: asyncio.Future) -> AsyncIterator[str]:
+        """
+        Yield SSE frames of the published events until task finishes or the client disconnects.
+
+        Waits on new events, task completion and the disconnect together, so events are sent as
+        soon as they are published and the loop exits as soon as either task is done. Events that
+        pile up while a frame is being sent to a slow client go out together as one batch frame.
+        Callers check disconnect_task afterwards, and drain() the events published at the end.
+        """
+        waiter = None
+        try:
+            while not task.done() and not disconnect_task.done():
+                if waiter is None:
+                    waiter = asyncio.ensure_future(self._wakeup.wait())
+                await asyncio.wait({waiter, task, disconnect_task}, return_when=asyncio.FIRST_COMPLETED)
+                if disconnect_task.done():
+                    return
+                if waiter.done():
+                    waiter = None
+                    events = self._take()
+                    if events:
+                        yield encode_sse_batch(events)
+        finally:
+            if waiter is not None:
+                waiter.cancel()
+
+    async def drain(self) -> List[BaseEvent]:
+        """Return the pending events without waiting, including those published just before the call."""
+        # Let callbacks already scheduled by other threads run first
+        await asyncio.sleep(0)
+        return self._take()
+
+    def _take(self) -> List[BaseEvent]:
+        self._wakeup.clear()
+        events = list(self._pending.values())
+        self._pending.clear()
+        self._mergeable = 0
+        return events
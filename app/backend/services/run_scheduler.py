@@ -0,0 +1,224 @@
+import asyncio
+import contextvars
+import os
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Optional
+
+RUN = "run"
+BACKTEST = "backtest"
+
+
+class RunQueueFullError(Exception):
+    """Raised when a run is submitted while all workers are busy and the queue is full."""
+
+
+class RunTicket:
+    """A submitted run: waiting in its type's queue until admitted to a worker slot."""
+
+    def __init__(self, scheduler: "RunScheduler", run_id: str, run_type: str, owner: str):
+        self._scheduler = scheduler
+        self.run_id = run_id
+        self.run_type = run_type
+        self.owner = owner
+        # 1-based position in the admission order while queued, None once admitted
+        self.position: Optional[int] = None
+        self.task: Optional[asyncio.Task] = None
+        self._admitted = asyncio.get_running_loop().create_future()
+        self._moved = asyncio.Event()
+        self._finished = False
+        # Executor work submitted from the ticket's slot, and whether its block has exited
+        self._work: set[Future] = set()
+        self._exited = False
+
+    @property
+    def admitted(self) -> bool:
+        return self._admitted.done() and not self._admitted.cancelled()
+
+
+# Ticket whose slot the current task is in, so the executor can attribute work to it
+_current_ticket: contextvars.ContextVar[Optional[RunTicket]] = contextvars.ContextVar("run_ticket", default=None)
+
+
+def hold_slot(future: Future) -> Future:
+    """
+    Keep the current run's worker slot until the future is done.
+
+    For work a run starts outside the scheduler's executor (e.g. in a worker process); the
+    executor's own work is tracked automatically. Work that has not started when the run is
+    cancelled is cancelled with it.
+    """
+    ticket = _current_ticket.get()
+    if ticket is not None:
+        ticket._work.add(future)
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda done: loop.call_soon_threadsafe(ticket._scheduler._work_done, ticket, done))
+    return future
+
+
+class _RunExecutor(ThreadPoolExecutor):
+    """Thread pool that tracks the work submitted from each ticket's slot, so the slot is held until that work returns."""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        return hold_slot(super().submit(fn, *args, **kwargs))
+
+
+class RunScheduler:
+    """
+    Admission control for hedge-fund and backtest runs.
+
+    Each run type has its own number of worker slots; runs that do not get a slot wait in a
+    bounded queue. Waiting runs are admitted round-robin across owners (flows, or clients for
+    unsaved flows), so one owner queueing many backtests does not starve everyone else. Runs
+    execute their blocking work on the scheduler's executor, sized to the total worker count; a
+    cancelled run keeps its slot until the work it already started on the executor (or registered
+    with hold_slot) returns, so no more than the worker count of runs ever execute at once.
+
+    The scheduler is driven from the event loop; it is not safe to call from worker threads.
+    """
+
+    def __init__(self, workers: Dict[str, int], max_queued: int = 50):
+        self.workers = {run_type: max(1, count) for run_type, count in workers.items()}
+        self.max_queued = max(0, max_queued)
+        self.executor = _RunExecutor(max_workers=sum(self.workers.values()), thread_name_prefix="hedge-fund-run")
+        self._running: Dict[str, int] = {run_type: 0 for run_type in self.workers}
+        self._queues: Dict[str, OrderedDict[str, deque[RunTicket]]] = {run_type: OrderedDict() for run_type in self.workers}
+        self._tickets: Dict[str, RunTicket] = {}
+
+    def has_capacity(self, run_type: str) -> bool:
+        """Whether a run of this type would currently be admitted or queued."""
+        return self._running[run_type] < self.workers[run_type] or self._queued(run_type) < self.max_queued
+
+    def submit(self, run_id: str, run_type: str, owner: str) -> RunTicket:
+        """Queue a run for a worker slot of its type, raising RunQueueFullError when the queue is full."""
+        if not self.has_capacity(run_type):
+            raise RunQueueFullError(f"The {run_type} queue is full ({self.max_queued} runs waiting)")
+        ticket = RunTicket(self, run_id, run_type, owner)
+        self._tickets[run_id] = ticket
+        self._queues[run_type].setdefault(owner, deque()).append(ticket)
+        self._admit(run_type)
+        return ticket
+
+    @asynccontextmanager
+    async def slot(self, ticket: RunTicket, on_position: Optional[Callable[[int], None]] = None):
+        """
+        Wait until the ticket is admitted, then hold its worker slot for the duration of the block.
+
+        on_position is called with the ticket's queue position whenever it changes. Cancelling the
+        waiting task removes the ticket from the queue; cancelling the running task frees its slot
+        once the executor work started from the block returns. A ticket cancelled before its slot
+        was entered raises CancelledError.
+        """
+        ticket.task = asyncio.current_task()
+        token = _current_ticket.set(ticket)
+        try:
+            reported = None
+            while not ticket.admitted:
+                if ticket._finished:
+                    raise asyncio.CancelledError()
+                if on_position is not None and ticket.position != reported:
+                    reported = ticket.position
+                    on_position(reported)
+                ticket._moved.clear()
+                moved = asyncio.ensure_future(ticket._moved.wait())
+                try:
+                    await asyncio.wait({ticket._admitted, moved}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    moved.cancel()
+            if ticket._finished:
+                raise asyncio.CancelledError()
+            yield
+        finally:
+            _current_ticket.reset(token)
+            ticket._exited = True
+            # Work that is still queued will not be waited for; only work already running holds the slot
+            for future in list(ticket._work):
+                future.cancel()
+            if all(future.done() for future in ticket._work):
+                self._finish(ticket)
+
+    def cancel(self, run_id: str) -> bool:
+        """Cancel a queued or running run; returns False for unknown (or already finished) runs."""
+        ticket = self._tickets.get(run_id)
+        if ticket is None:
+            return False
+        if ticket.task is not None:
+            ticket.task.cancel()
+        else:
+            self._finish(ticket)
+        return True
+
+    def get_stats(self) -> dict:
+        return {
+            run_type: {"workers": self.workers[run_type], "running": self._running[run_type], "queued": self._queued(run_type), "max_queued": self.max_queued}
+            for run_type in self.workers
+        }
+
+    def _work_done(self, ticket: RunTicket, future: Future):
+        ticket._work.discard(future)
+        if ticket._exited and not ticket._work:
+            self._finish(ticket)
+
+    def _queued(self, run_type: str) -> int:
+        return sum(len(tickets) for tickets in self._queues[run_type].values())
+
+    def _finish(self, ticket: RunTicket):
+        if ticket._finished:
+            return
+        ticket._finished = True
+        self._tickets.pop(ticket.run_id, None)
+        if ticket.admitted:
+            self._running[ticket.run_type] -= 1
+        else:
+            ticket._admitted.cancel()
+            queue = self._queues[ticket.run_type]
+            queue[ticket.owner].remove(ticket)
+            if not queue[ticket.owner]:
+                del queue[ticket.owner]
+        self._admit(ticket.run_type)
+
+    def _admit(self, run_type: str):
+        queue = self._queues[run_type]
+        while queue and self._running[run_type] < self.workers[run_type]:
+            # The owner at the front goes next, then moves to the back of the rotation
+            owner, tickets = next(iter(queue.items()))
+            ticket = tickets.popleft()
+            if tickets:
+                queue.move_to_end(owner)
+            else:
+                del queue[owner]
+            self._running[run_type] += 1
+            ticket.position = None
+            ticket._admitted.set_result(None)
+        self._reposition(run_type)
+
+    def _reposition(self, run_type: str):
+        # Admission order interleaves the owners' queues in rotation order
+        owners = list(self._queues[run_type].values())
+        position = 0
+        for rank in range(max((len(tickets) for tickets in owners), default=0)):
+            for tickets in owners:
+                if rank < len(tickets):
+                    position += 1
+                    ticket = tickets[rank]
+                    if ticket.position != position:
+                        ticket.position = position
+                        ticket._moved.set()
+
+
+_run_scheduler: Optional[RunScheduler] = None
+
+
+def get_run_scheduler() -> RunScheduler:
+    """Get the global run scheduler, configured by RUN_WORKERS (default 2), BACKTEST_WORKERS (default 1) and RUN_QUEUE_SIZE (default 50)."""
+    global _run_scheduler
+    if _run_scheduler is None:
+        _run_scheduler = RunScheduler(
+            workers={
+                RUN: int(os.environ.get("RUN_WORKERS", "2")),
+                BACKTEST: int(os.environ.get("BACKTEST_WORKERS", "1")),
+            },
+            max_queued=int(os.environ.get("RUN_QUEUE_SIZE", "50")),
+        )
+    return _run_scheduler
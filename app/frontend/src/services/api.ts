@@ -98,8 +98,9 @@ export const api = {
     // Helper function to get agent IDs from graph structure
     const getAgentIds = () => params.graph_nodes.map(node => node.id);
 
-    // Pass the unique node IDs directly to the backend
-    const backendParams = params;
+    // Pass the unique node IDs directly to the backend, along with the saved flow ID (if any)
+    const savedFlowId = flowId !== null ? Number(flowId) : NaN;
+    const backendParams: HedgeFundRequest = Number.isInteger(savedFlowId) ? { ...params, flow_id: savedFlowId } : params;
 
     // For SSE connections with FastAPI, we need to use POST
     // First, create the controller
@@ -156,88 +157,96 @@ export const api = {
                 const dataMatch = eventText.match(/^data: (.+)$/m);
                 
                 if (eventTypeMatch && dataMatch) {
-                  const eventType = eventTypeMatch[1];
-                  const eventData = JSON.parse(dataMatch[1]);
+                  const frameData = JSON.parse(dataMatch[1]);
+                  // A batch frame carries several events (sent together when the client falls behind)
+                  const frameEvents: [string, any][] = eventTypeMatch[1] === 'batch'
+                    ? frameData.map((event: any) => [event.type, event])
+                    : [[eventTypeMatch[1], frameData]];
+                  for (const [eventType, eventData] of frameEvents) {
                   
-                  console.log(`Parsed ${eventType} event:`, eventData);
+                    console.log(`Parsed ${eventType} event:`, eventData);
                   
-                  // Process based on event type
-                  switch (eventType) {
-                    case 'start':
-                      // Reset all nodes at the start of a new run
-                      nodeContext.resetAllNodes(flowId);
-                      break;
-                    case 'progress':
-                      if (eventData.agent) {
-                        // Map the progress to a node status
-                        let nodeStatus: NodeStatus = 'IN_PROGRESS';
-                        if (eventData.status === 'Done') {
-                          nodeStatus = 'COMPLETE';
-                        }
-                        // Map the backend agent name to the unique node ID
-                        const baseAgentKey = eventData.agent.replace('_agent', '');
+                    // Process based on event type
+                    switch (eventType) {
+                      case 'start':
+                        // Reset all nodes at the start of a new run
+                        nodeContext.resetAllNodes(flowId);
+                        break;
+                      case 'progress':
+                        if (eventData.agent) {
+                          // Map the progress to a node status
+                          let nodeStatus: NodeStatus = 'IN_PROGRESS';
+                          if (eventData.status === 'Done') {
+                            nodeStatus = 'COMPLETE';
+                          }
+                          // Map the backend agent name to the unique node ID
+                          const baseAgentKey = eventData.agent.replace('_agent', '');
                         
-                        // Find the unique node ID that corresponds to this base agent key
-                        const uniqueNodeId = getAgentIds().find(id => 
-                          extractBaseAgentKey(id) === baseAgentKey
-                        ) || baseAgentKey;
+                          // Find the unique node ID that corresponds to this base agent key
+                          const uniqueNodeId = getAgentIds().find(id => 
+                            extractBaseAgentKey(id) === baseAgentKey
+                          ) || baseAgentKey;
                                                 
-                        // Use the enhanced API to update both status and additional data
-                        nodeContext.updateAgentNode(flowId, uniqueNodeId, {
-                          status: nodeStatus,
-                          ticker: eventData.ticker,
-                          message: eventData.status,
-                          analysis: eventData.analysis,
-                          timestamp: eventData.timestamp
+                          // Use the enhanced API to update both status and additional data
+                          nodeContext.updateAgentNode(flowId, uniqueNodeId, {
+                            status: nodeStatus,
+                            ticker: eventData.ticker,
+                            message: eventData.status,
+                            analysis: eventData.analysis,
+                            timestamp: eventData.timestamp
+                          });
+                        }
+                        break;
+                      case 'complete':
+                        // Store the complete event data in the node context
+                        if (eventData.data) {
+                          nodeContext.setOutputNodeData(flowId, eventData.data as OutputNodeData);
+                        }
+                        // Mark all agents as complete when the whole process is done
+                        nodeContext.updateAgentNodes(flowId, getAgentIds(), 'COMPLETE');
+                        // Also update the output node
+                        nodeContext.updateAgentNode(flowId, 'output', {
+                          status: 'COMPLETE',
+                          message: 'Analysis complete'
                         });
-                      }
-                      break;
-                    case 'complete':
-                      // Store the complete event data in the node context
-                      if (eventData.data) {
-                        nodeContext.setOutputNodeData(flowId, eventData.data as OutputNodeData);
-                      }
-                      // Mark all agents as complete when the whole process is done
-                      nodeContext.updateAgentNodes(flowId, getAgentIds(), 'COMPLETE');
-                      // Also update the output node
-                      nodeContext.updateAgentNode(flowId, 'output', {
-                        status: 'COMPLETE',
-                        message: 'Analysis complete'
-                      });
 
-                      // Update flow connection state to completed
-                      if (flowId) {
-                        flowConnectionManager.setConnection(flowId, {
-                          state: 'completed',
-                          abortController: null,
-                        });
+                        // Update flow connection state to completed
+                        if (flowId) {
+                          flowConnectionManager.setConnection(flowId, {
+                            state: 'completed',
+                            abortController: null,
+                          });
 
-                        // Optional: Auto-cleanup completed connections after a delay
-                        setTimeout(() => {
-                          const currentConnection = flowConnectionManager.getConnection(flowId);
-                          if (currentConnection.state === 'completed') {
-                            flowConnectionManager.setConnection(flowId, {
-                              state: 'idle',
-                            });
-                          }
-                        }, 30000); // 30 seconds
-                      }
-                      break;
-                    case 'error':
-                      // Mark all agents as error when there's an error  
-                      nodeContext.updateAgentNodes(flowId, getAgentIds(), 'ERROR');
+                          // Optional: Auto-cleanup completed connections after a delay
+                          setTimeout(() => {
+                            const currentConnection = flowConnectionManager.getConnection(flowId);
+                            if (currentConnection.state === 'completed') {
+                              flowConnectionManager.setConnection(flowId, {
+                                state: 'idle',
+                              });
+                            }
+                          }, 30000); // 30 seconds
+                        }
+                        break;
+                      case 'error':
+                        // Mark all agents as error when there's an error  
+                        nodeContext.updateAgentNodes(flowId, getAgentIds(), 'ERROR');
                       
-                      // Update flow connection state to error
-                      if (flowId) {
-                        flowConnectionManager.setConnection(flowId, {
-                          state: 'error',
-                          error: eventData.message || 'Unknown error occurred',
-                          abortController: null,
-                        });
-                      }
-                      break;
-                    default:
-                      console.warn('Unknown event type:', eventType);
+                        // Update flow connection state to error
+                        if (flowId) {
+                          flowConnectionManager.setConnection(flowId, {
+                            state: 'error',
+                            error: eventData.message || 'Unknown error occurred',
+                            abortController: null,
+                          });
+                        }
+                        break;
+                      case 'queued':
+                        // The run waits for a free worker; agents report progress once it starts
+                        break;
+                      default:
+                        console.warn('Unknown event type:', eventType);
+                    }
                   }
                 }
               } catch (err) {
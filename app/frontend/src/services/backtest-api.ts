@@ -22,6 +22,10 @@ export const backtestApi = {
     nodeContext: ReturnType<typeof useNodeContext>,
     flowId: string | null = null
   ): (() => void) => {
+    // Send the saved flow ID (if any) so the backend can reuse its compiled graph and schedule the run per flow
+    const savedFlowId = flowId !== null ? Number(flowId) : NaN;
+    const backendParams: BacktestRequest = Number.isInteger(savedFlowId) ? { ...params, flow_id: savedFlowId } : params;
+
     // Create the controller for aborting the request
     const controller = new AbortController();
     const { signal } = controller;
@@ -32,7 +36,7 @@ export const backtestApi = {
       headers: {
         'Content-Type': 'application/json',
       },
-      body: JSON.stringify(params),
+      body: JSON.stringify(backendParams),
       signal,
     })
     .then(response => {
@@ -79,139 +83,152 @@ export const backtestApi = {
                 const dataMatch = eventText.match(/^data: (.+)$/m);
                 
                 if (eventTypeMatch && dataMatch) {
-                  const eventType = eventTypeMatch[1];
-                  const eventData = JSON.parse(dataMatch[1]);
+                  const frameData = JSON.parse(dataMatch[1]);
+                  // A batch frame carries several events (sent together when the client falls behind)
+                  const frameEvents: [string, any][] = eventTypeMatch[1] === 'batch'
+                    ? frameData.map((event: any) => [event.type, event])
+                    : [[eventTypeMatch[1], frameData]];
+                  for (const [eventType, eventData] of frameEvents) {
                   
-                  console.log(`Parsed backtest ${eventType} event:`, eventData);
+                    console.log(`Parsed backtest ${eventType} event:`, eventData);
                   
-                  // Process based on event type
-                  switch (eventType) {
-                    case 'start':
-                      // Reset all nodes at the start of a new backtest
-                      nodeContext.resetAllNodes(flowId);
-                      // Clear local backtest results
-                      backtestResults = [];
-                      // Create a backtest agent entry
-                      nodeContext.updateAgentNode(flowId, 'backtest', {
-                        status: 'IN_PROGRESS',
-                        message: 'Starting backtest...',
-                        backtestResults: [],
-                      });
-                      break;
+                    // Process based on event type
+                    switch (eventType) {
+                      case 'start':
+                        // Reset all nodes at the start of a new backtest
+                        nodeContext.resetAllNodes(flowId);
+                        // Clear local backtest results
+                        backtestResults = [];
+                        // Create a backtest agent entry
+                        nodeContext.updateAgentNode(flowId, 'backtest', {
+                          status: 'IN_PROGRESS',
+                          message: 'Starting backtest...',
+                          backtestResults: [],
+                        });
+                        break;
                     
-                    case 'progress':
-                      // Handle individual agent updates (from actual agents during backtest)
-                      if (eventData.agent && eventData.agent !== 'backtest') {
-                        // Map the progress to a node status
-                        let nodeStatus: NodeStatus = 'IN_PROGRESS';
-                        if (eventData.status === 'Done') {
-                          nodeStatus = 'COMPLETE';
-                        }
-                        // Map the backend agent name to the unique node ID
-                        const baseAgentKey = eventData.agent.replace('_agent', '');
+                      case 'progress':
+                        // Handle individual agent updates (from actual agents during backtest)
+                        if (eventData.agent && eventData.agent !== 'backtest') {
+                          // Map the progress to a node status
+                          let nodeStatus: NodeStatus = 'IN_PROGRESS';
+                          if (eventData.status === 'Done') {
+                            nodeStatus = 'COMPLETE';
+                          }
+                          // Map the backend agent name to the unique node ID
+                          const baseAgentKey = eventData.agent.replace('_agent', '');
                         
-                        // Find the unique node ID that corresponds to this base agent key
-                        // We need to get the agent IDs from the request parameters
-                        const agentIds = params.graph_nodes.map(node => node.id);
-                        const uniqueNodeId = agentIds.find(id => 
-                          extractBaseAgentKey(id) === baseAgentKey
-                        ) || baseAgentKey;
+                          // Find the unique node ID that corresponds to this base agent key
+                          // We need to get the agent IDs from the request parameters
+                          const agentIds = params.graph_nodes.map(node => node.id);
+                          const uniqueNodeId = agentIds.find(id => 
+                            extractBaseAgentKey(id) === baseAgentKey
+                          ) || baseAgentKey;
                                                 
-                        // Use the enhanced API to update both status and additional data
-                        nodeContext.updateAgentNode(flowId, uniqueNodeId, {
-                          status: nodeStatus,
-                          ticker: eventData.ticker,
-                          message: eventData.status,
-                          analysis: eventData.analysis,
-                          timestamp: eventData.timestamp
-                        });
-                      }
-                      // Handle backtest-specific progress updates
-                      else if (eventData.agent === 'backtest') {
-                        // If this progress update contains backtest result data, add it to local array
-                        if (eventData.analysis) {
-                          try {
-                            const backtestResultData = JSON.parse(eventData.analysis);
-                            // Add to local array and keep only the last 50 results to avoid memory issues
-                            backtestResults = [...backtestResults, backtestResultData].slice(-50);
-                          } catch (error) {
-                            console.error('Error parsing backtest result data:', error);
-                          }
+                          // Use the enhanced API to update both status and additional data
+                          nodeContext.updateAgentNode(flowId, uniqueNodeId, {
+                            status: nodeStatus,
+                            ticker: eventData.ticker,
+                            message: eventData.status,
+                            analysis: eventData.analysis,
+                            timestamp: eventData.timestamp
+                          });
                         }
+                        // Handle backtest-specific progress updates
+                        else if (eventData.agent === 'backtest') {
+                          // If this progress update contains backtest result data, add it to local array
+                          if (eventData.analysis) {
+                            try {
+                              const backtestResultData = JSON.parse(eventData.analysis);
+                              // Add to local array and keep only the last 50 results to avoid memory issues
+                              backtestResults = [...backtestResults, backtestResultData].slice(-50);
+                            } catch (error) {
+                              console.error('Error parsing backtest result data:', error);
+                            }
+                          }
                         
-                        // Update the node with the local backtest results
-                        nodeContext.updateAgentNode(flowId, 'backtest', {
-                          status: 'IN_PROGRESS',
-                          message: eventData.status,
-                          backtestResults: backtestResults,
-                        });
-                      }
-                      break;
+                          // Update the node with the local backtest results
+                          nodeContext.updateAgentNode(flowId, 'backtest', {
+                            status: 'IN_PROGRESS',
+                            message: eventData.status,
+                            backtestResults: backtestResults,
+                          });
+                        }
+                        break;
                     
-                    case 'complete':
-                      // Store the complete backtest results
-                      if (eventData.data) {
-                        const backtestResults = {
-                          decisions: { backtest: { type: 'backtest_complete' } },
-                          analyst_signals: {},
-                          performance_metrics: eventData.data.performance_metrics,
-                          final_portfolio: eventData.data.final_portfolio,
-                          total_days: eventData.data.total_days,
-                        };
+                      case 'complete':
+                        // Store the complete backtest results
+                        if (eventData.data) {
+                          const backtestResults = {
+                            decisions: { backtest: { type: 'backtest_complete' } },
+                            analyst_signals: {},
+                            performance_metrics: eventData.data.performance_metrics,
+                            final_portfolio: eventData.data.final_portfolio,
+                            total_days: eventData.data.total_days,
+                          };
                         
-                        nodeContext.setOutputNodeData(flowId, backtestResults);
-                      }
+                          nodeContext.setOutputNodeData(flowId, backtestResults);
+                        }
                       
-                      // Mark the backtest agent as complete
-                      nodeContext.updateAgentNode(flowId, 'backtest', {
-                        status: 'COMPLETE',
-                        message: 'Backtest completed successfully',
-                      });
+                        // Mark the backtest agent as complete
+                        nodeContext.updateAgentNode(flowId, 'backtest', {
+                          status: 'COMPLETE',
+                          message: 'Backtest completed successfully',
+                        });
                       
-                      // Update the output node
-                      nodeContext.updateAgentNode(flowId, 'output', {
-                        status: 'COMPLETE',
-                        message: 'Backtest analysis complete'
-                      });
-
-                      // Update flow connection state to completed
-                      if (flowId) {
-                        flowConnectionManager.setConnection(flowId, {
-                          state: 'completed',
-                          abortController: null,
+                        // Update the output node
+                        nodeContext.updateAgentNode(flowId, 'output', {
+                          status: 'COMPLETE',
+                          message: 'Backtest analysis complete'
                         });
 
-                        // Auto-cleanup completed connections after a delay
-                        setTimeout(() => {
-                          const currentConnection = flowConnectionManager.getConnection(flowId);
-                          if (currentConnection.state === 'completed') {
-                            flowConnectionManager.setConnection(flowId, {
-                              state: 'idle',
-                            });
-                          }
-                        }, 30000); // 30 seconds
-                      }
-                      break;
+                        // Update flow connection state to completed
+                        if (flowId) {
+                          flowConnectionManager.setConnection(flowId, {
+                            state: 'completed',
+                            abortController: null,
+                          });
+
+                          // Auto-cleanup completed connections after a delay
+                          setTimeout(() => {
+                            const currentConnection = flowConnectionManager.getConnection(flowId);
+                            if (currentConnection.state === 'completed') {
+                              flowConnectionManager.setConnection(flowId, {
+                                state: 'idle',
+                              });
+                            }
+                          }, 30000); // 30 seconds
+                        }
+                        break;
                     
-                    case 'error':
-                      // Mark nodes as error when there's an error
-                      nodeContext.updateAgentNode(flowId, 'portfolio-start', {
-                        status: 'ERROR',
-                        message: eventData.message || 'Backtest failed',
-                      });
-                      
-                      // Update flow connection state to error
-                      if (flowId) {
-                        flowConnectionManager.setConnection(flowId, {
-                          state: 'error',
-                          error: eventData.message || 'Unknown error occurred',
-                          abortController: null,
+                      case 'error':
+                        // Mark nodes as error when there's an error
+                        nodeContext.updateAgentNode(flowId, 'portfolio-start', {
+                          status: 'ERROR',
+                          message: eventData.message || 'Backtest failed',
                         });
-                      }
-                      break;
+                      
+                        // Update flow connection state to error
+                        if (flowId) {
+                          flowConnectionManager.setConnection(flowId, {
+                            state: 'error',
+                            error: eventData.message || 'Unknown error occurred',
+                            abortController: null,
+                          });
+                        }
+                        break;
                     
-                    default:
-                      console.warn('Unknown backtest event type:', eventType);
+                      case 'queued':
+                        // The backtest waits for a free worker
+                        nodeContext.updateAgentNode(flowId, 'backtest', {
+                          status: 'IN_PROGRESS',
+                          message: `Queued (position ${eventData.position})`,
+                        });
+                        break;
+
+                      default:
+                        console.warn('Unknown backtest event type:', eventType);
+                    }
                   }
                 }
               } catch (err) {
@@ -43,6 +43,7 @@ export interface BaseHedgeFundRequest {
   model_provider?: ModelProvider;
   margin_requirement?: number;
   portfolio_positions?: PortfolioPosition[];
+  flow_id?: number; // Saved flow being run; lets the backend reuse its compiled graph
 }
 
 export interface HedgeFundRequest extends BaseHedgeFundRequest {
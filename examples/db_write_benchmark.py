@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Write-heavy load benchmark for the backend database.
+
+Several writer threads update flow runs with large JSON results (as concurrent runs finishing
+do) while reader threads list runs (as the UI polling them does). The same load runs against
+a bare SQLite engine (default journal mode and driver settings) and the backend's tuned engine
+(WAL, pragmas, pooling), reporting throughput and "database is locked" failures.
+
+Usage:
+    poetry run python examples/db_write_benchmark.py
+    poetry run python examples/db_write_benchmark.py --writers 16 --updates 100
+    poetry run python examples/db_write_benchmark.py --url postgresql://localhost/hedge_fund
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.backend.database.connection import create_database_engine
+from app.backend.database.models import Base
+from app.backend.models.schemas import FlowRunStatus
+from app.backend.repositories.flow_repository import FlowRepository
+from app.backend.repositories.flow_run_repository import FlowRunRepository
+
+
+def _results_payload(size_kb: int) -> dict:
+    """A flow run result of roughly size_kb kilobytes of JSON."""
+    signal = {"signal": "bullish", "confidence": 75, "reasoning": "x" * 200}
+    return {"analyst_signals": {f"agent_{i}": {"AAPL": signal} for i in range(size_kb * 1024 // 260)}}
+
+
+def run_load(engine, writers: int, readers: int, updates: int, payload_kb: int) -> dict:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    with Session() as db:
+        flow_id = FlowRepository(db).create_flow(name="benchmark", nodes={}, edges={}).id
+        run_ids = [FlowRunRepository(db).create_flow_run(flow_id).id for _ in range(writers)]
+
+    payload = _results_payload(payload_kb)
+    counts = {"writes": 0, "reads": 0, "locked": 0}
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def count(key: str):
+        with lock:
+            counts[key] += 1
+
+    def writer(run_id: int):
+        for _ in range(updates):
+            with Session() as db:
+                try:
+                    FlowRunRepository(db).update_flow_run(run_id, status=FlowRunStatus.IN_PROGRESS, results=payload)
+                    count("writes")
+                except OperationalError:
+                    db.rollback()
+                    count("locked")
+
+    def reader(flow_id: int):
+        while not done.is_set():
+            with Session() as db:
+                try:
+                    FlowRunRepository(db).get_flow_runs_by_flow_id(flow_id)
+                    count("reads")
+                except OperationalError:
+                    count("locked")
+
+    reader_threads = [threading.Thread(target=reader, args=(flow_id,)) for _ in range(readers)]
+    writer_threads = [threading.Thread(target=writer, args=(run_id,)) for run_id in run_ids]
+    start = time.perf_counter()
+    for thread in reader_threads + writer_threads:
+        thread.start()
+    for thread in writer_threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    for thread in reader_threads:
+        thread.join()
+    engine.dispose()
+
+    return {**counts, "seconds": elapsed, "writes_per_second": counts["writes"] / elapsed, "reads_per_second": counts["reads"] / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent flow-run writes against the backend database")
+    parser.add_argument("--writers", type=int, default=8, help="Concurrent writer threads")
+    parser.add_argument("--readers", type=int, default=4, help="Concurrent reader threads")
+    parser.add_argument("--updates", type=int, default=50, help="Updates per writer")
+    parser.add_argument("--payload-kb", type=int, default=64, help="Approximate size of each results JSON")
+    parser.add_argument("--url", help="Benchmark this database URL with the tuned engine only")
+    args = parser.parse_args()
+
+    if args.url:
+        engines = {"tuned": create_database_engine(args.url)}
+    else:
+        directory = Path(tempfile.mkdtemp())
+        engines = {
+            # What the backend used before: default journal mode and the driver's 5s lock wait
+            "bare sqlite": create_engine(f"sqlite:///{directory / 'bare.db'}", connect_args={"check_same_thread": False}),
+            "tuned sqlite": create_database_engine(f"sqlite:///{directory / 'tuned.db'}"),
+        }
+
+    print(f"{args.writers} writers x {args.updates} updates of ~{args.payload_kb}KB, {args.readers} readers")
+    for name, engine in engines.items():
+        result = run_load(engine, args.writers, args.readers, args.updates, args.payload_kb)
+        print(
+            f"{name:>14}: {result['writes_per_second']:8.1f} writes/s  {result['reads_per_second']:8.1f} reads/s  "
+            f"{result['locked']:5d} locked errors  ({result['seconds']:.2f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
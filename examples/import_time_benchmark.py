@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Startup import-time benchmark for the CLI, the backtester and the backend.
+
+Each entry point is imported in a fresh interpreter with `python -X importtime`, several times,
+reporting the median cumulative import time and the slowest top-level imports of the last run.
+
+Usage:
+    poetry run python examples/import_time_benchmark.py
+    poetry run python examples/import_time_benchmark.py --repeat 5 --top 15 src.main
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+ENTRY_POINTS = ["src.main", "src.backtester", "app.backend.main"]
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Import a module in a fresh interpreter and return the cumulative microseconds of each import."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=REPO_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # Nesting is shown by two spaces of indentation per level; keep the entry point's direct imports
+        if (len(name) - len(name.lstrip()) - 1) // 2 > 1:
+            continue
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the import time of the CLI and server entry points")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS, help="Modules to import")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per module")
+    parser.add_argument("--top", type=int, default=10, help="Slowest top-level imports to list")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        runs = [import_times(module) for _ in range(max(1, args.repeat))]
+        median = statistics.median(run[module] for run in runs) / 1e6
+        print(f"{module}: {median:.2f}s (median of {len(runs)})")
+        slowest = sorted(((seconds, name) for name, seconds in runs[-1].items() if name != module), reverse=True)[: args.top]
+        for microseconds, name in slowest:
+            print(f"  {microseconds / 1e6:6.2f}s  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -131,10 +131,9 @@ def aswath_damodaran_agent(state: AgentState, agent_id: str = "aswath_damodaran_
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(damodaran_signals, "Aswath Damodaran Agent")
 
-    state["data"]["analyst_signals"][agent_id] = damodaran_signals
     progress.update_status(agent_id, None, "Done")
 
-    return {"messages": [message], "data": state["data"]}
+    return {"messages": [message], "data": {"analyst_signals": {agent_id: damodaran_signals}}}
 
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -416,4 +415,5 @@ def generate_damodaran_output(
         agent_name=agent_id,
         state=state,
         default_factory=default_signal,
+        ticker=ticker,
     )
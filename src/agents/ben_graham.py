@@ -86,12 +86,9 @@ def ben_graham_agent(state: AgentState, agent_id: str = "ben_graham_agent"):
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(graham_analysis, "Ben Graham Agent")
 
-    # Store signals in the overall state
-    state["data"]["analyst_signals"][agent_id] = graham_analysis
-
     progress.update_status(agent_id, None, "Done")
 
-    return {"messages": [message], "data": state["data"]}
+    return {"messages": [message], "data": {"analyst_signals": {agent_id: graham_analysis}}}
 
 
 def analyze_earnings_stability(metrics: list, financial_line_items: list) -> dict:
@@ -345,4 +342,5 @@ def generate_graham_output(
         agent_name=agent_id,
         state=state,
         default_factory=create_default_ben_graham_signal,
+        ticker=ticker,
     )
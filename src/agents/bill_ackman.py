@@ -122,15 +122,12 @@ def bill_ackman_agent(state: AgentState, agent_id: str = "bill_ackman_agent"):
     # Show reasoning if requested
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(ackman_analysis, "Bill Ackman Agent")
-    
-    # Add signals to the overall state
-    state["data"]["analyst_signals"][agent_id] = ackman_analysis
 
     progress.update_status(agent_id, None, "Done")
 
     return {
         "messages": [message],
-        "data": state["data"]
+        "data": {"analyst_signals": {agent_id: ackman_analysis}}
     }
 
 
@@ -465,4 +462,5 @@ def generate_ackman_output(
         agent_name=agent_id, 
         state=state,
         default_factory=create_default_bill_ackman_signal,
+        ticker=ticker,
     )
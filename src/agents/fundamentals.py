@@ -152,12 +152,9 @@ def fundamentals_analyst_agent(state: AgentState, agent_id: str = "fundamentals_
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(fundamental_analysis, "Fundamental Analysis Agent")
 
-    # Add the signal to the analyst_signals list
-    state["data"]["analyst_signals"][agent_id] = fundamental_analysis
-
     progress.update_status(agent_id, None, "Done")
     
     return {
         "messages": [message],
-        "data": data,
+        "data": {"analyst_signals": {agent_id: fundamental_analysis}},
     }
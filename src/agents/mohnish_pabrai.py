@@ -122,9 +122,7 @@ def mohnish_pabrai_agent(state: AgentState, agent_id: str = "mohnish_pabrai_agen
 
     progress.update_status(agent_id, None, "Done")
 
-    state["data"]["analyst_signals"][agent_id] = pabrai_analysis
-
-    return {"messages": [message], "data": state["data"]}
+    return {"messages": [message], "data": {"analyst_signals": {agent_id: pabrai_analysis}}}
 
 
 def analyze_downside_protection(financial_line_items: list) -> dict[str, any]:
@@ -357,4 +355,5 @@ def generate_pabrai_output(
         pydantic_model=MohnishPabraiSignal,
         agent_name=agent_id,
         default_factory=create_default_pabrai_signal,
+        ticker=ticker,
     ) 
\ No newline at end of file
@@ -3,14 +3,16 @@
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel, Field
 from src.data.models import CompanyNews
+from src.data.sentiment_store import article_key, get_sentiment_store, sentiment_model_key
 import pandas as pd
 import numpy as np
 import json
 
 from src.graph.state import AgentState, show_agent_reasoning
 from src.tools.api import get_company_news
+from src.tools.sentiment_scorer import DEFAULT_LOCAL_CONFIDENCE_THRESHOLD, get_local_sentiment_scorer
 from src.utils.api_key import get_api_key_from_state
-from src.utils.llm import call_llm
+from src.utils.llm import call_llm, get_agent_model_config
 from src.utils.progress import progress
 from typing_extensions import Literal
 
@@ -22,6 +24,22 @@ class Sentiment(BaseModel):
     confidence: int = Field(description="Confidence 0-100")
 
 
+class HeadlineSentiment(Sentiment):
+    """Represents the sentiment of one headline within a batch."""
+
+    id: int = Field(description="The id of the headline being classified")
+
+
+class HeadlineSentimentBatch(BaseModel):
+    """Represents the sentiments of a batch of headlines."""
+
+    sentiments: list[HeadlineSentiment]
+
+
+# Number of headlines classified per LLM call; override with metadata["news_sentiment_batch_size"] (1 disables batching)
+DEFAULT_SENTIMENT_BATCH_SIZE = 20
+
+
 def news_sentiment_agent(state: AgentState, agent_id: str = "news_sentiment_agent"):
     """
     Analyzes news sentiment for a list of tickers and generates trading signals.
@@ -29,6 +47,9 @@ def news_sentiment_agent(state: AgentState, agent_id: str = "news_sentiment_agen
     This agent fetches company news, uses an LLM to classify the sentiment of articles
     with missing sentiment data, and then aggregates the sentiments to produce an
     overall signal (bullish, bearish, or neutral) and a confidence score for each ticker.
+    Headlines are first scored by a local lexicon model; only the ones it is not confident
+    about are sent to the LLM (never, in offline mode). LLM classifications are batched
+    across tickers and persisted so a headline is sent to a given model only once.
 
     Args:
         state: The current state of the agent graph.
@@ -41,8 +62,19 @@ def news_sentiment_agent(state: AgentState, agent_id: str = "news_sentiment_agen
     end_date = data.get("end_date")
     tickers = data.get("tickers")
     api_key = get_api_key_from_state(state, "FINANCIAL_DATASETS_API_KEY")
+    metadata = state.get("metadata", {})
+    batch_size = metadata.get("news_sentiment_batch_size") or DEFAULT_SENTIMENT_BATCH_SIZE
+    local_threshold = metadata.get("news_sentiment_local_threshold", DEFAULT_LOCAL_CONFIDENCE_THRESHOLD)
+    offline = metadata.get("news_sentiment_offline", False)
+    scorer = get_local_sentiment_scorer()
+    sentiment_model = sentiment_model_key(*get_agent_model_config(state, agent_id))
+    sentiment_store = get_sentiment_store()
     sentiment_analysis = {}
 
+    news_by_ticker = {}
+    articles_to_analyze = []  # (ticker, article) pairs that need LLM classification
+    sentiment_confidences = {}  # Store confidence scores for each LLM-classified article
+    classified_counts = {}  # ticker -> number of articles labeled by each source
     for ticker in tickers:
         progress.update_status(agent_id, ticker, "Fetching company news")
         company_news = get_company_news(
@@ -52,45 +84,59 @@ def news_sentiment_agent(state: AgentState, agent_id: str = "news_sentiment_agen
             api_key=api_key,
         )
 
-        news_signals = []
-        sentiment_confidences = {}  # Store confidence scores for each article
-        
         if company_news:
+            # Articles come straight from the shared data cache, so label copies rather than the cached models
+            company_news = [news.model_copy() for news in company_news]
+
             # Check the 10 most recent articles
             recent_articles = company_news[:10]
             articles_without_sentiment = [news for news in recent_articles if news.sentiment is None]
-            
+
             # Analyze only the 5 most recent articles without sentiment to reduce LLM calls
-            sentiments_classified_by_llm = 0
-            if articles_without_sentiment:
-              # We only take the first 5 articles, but this is configurable
-              num_articles_to_analyze = 5
-              articles_to_analyze = articles_without_sentiment[:num_articles_to_analyze]
-              progress.update_status(agent_id, ticker, f"Analyzing sentiment for {len(articles_to_analyze)} articles")
-              
-              for idx, news in enumerate(articles_to_analyze):
-                # We analyze based on title, but can also pass in the entire article text,
-                # but this is more expensive and requires extracting the text from the article.
-                # Note: this is an opportunity for improvement!
-                progress.update_status(agent_id, ticker, f"Analyzing sentiment for article {idx + 1} of {len(articles_to_analyze)}")
-                prompt = (
-                    f"Please analyze the sentiment of the following news headline "
-                    f"with the following context: "
-                    f"The stock is {ticker}. "
-                    f"Determine if sentiment is 'positive', 'negative', or 'neutral' for the stock {ticker} only. "
-                    f"Also provide a confidence score for your prediction from 0 to 100. "
-                    f"Respond in JSON format.\n\n"
-                    f"Headline: {news.title}"
-                )
-                response = call_llm(prompt, Sentiment, agent_name=agent_id, state=state)
-                if response:
-                    news.sentiment = response.sentiment.lower()
-                    sentiment_confidences[id(news)] = response.confidence
+            # We only take the first 5 articles, but this is configurable
+            num_articles_to_analyze = 5
+            candidates = articles_without_sentiment[:num_articles_to_analyze]
+
+            # Reuse labels this model already produced for the same articles
+            stored_labels = sentiment_store.get_many(ticker, sentiment_model, candidates)
+            unlabeled = []
+            for news in candidates:
+                if (label := stored_labels.get(article_key(news))) is not None:
+                    news.sentiment, confidence = label
+                    sentiment_confidences[id(news)] = confidence if confidence is not None else 0
+                else:
+                    unlabeled.append(news)
+
+            # Score the rest locally; only headlines the local model is unsure about escalate to the LLM
+            classified_locally = 0
+            for news, (label, confidence) in zip(unlabeled, scorer.score([news.title for news in unlabeled])):
+                if offline or confidence >= local_threshold:
+                    news.sentiment = label
+                    sentiment_confidences[id(news)] = confidence
+                    classified_locally += 1
                 else:
-                    news.sentiment = "neutral"
-                    sentiment_confidences[id(news)] = 0
-                sentiments_classified_by_llm += 1
+                    articles_to_analyze.append((ticker, news))
+
+            classified_counts[ticker] = {
+                "store": len(candidates) - len(unlabeled),
+                "local": classified_locally,
+                "llm": len(unlabeled) - classified_locally,
+            }
+
+        news_by_ticker[ticker] = company_news
+
+    # Classify the remaining unlabeled headlines of all tickers together and persist the results
+    new_confidences, failed = _classify_headlines(articles_to_analyze, state, agent_id, batch_size)
+    sentiment_confidences.update(new_confidences)
+    for ticker in tickers:
+        sentiment_store.put_many(ticker, sentiment_model, [(news, news.sentiment, new_confidences[id(news)]) for article_ticker, news in articles_to_analyze if article_ticker == ticker and id(news) not in failed])
+
+    for ticker in tickers:
+        company_news = news_by_ticker[ticker]
+        news_signals = []
+        counts = classified_counts.get(ticker, {"store": 0, "local": 0, "llm": 0})
 
+        if company_news:
             # Aggregate sentiment across all articles
             sentiment = pd.Series([n.sentiment for n in company_news]).dropna()
             news_signals = np.where(sentiment == "negative","bearish", np.where(sentiment == "positive", "bullish", "neutral")).tolist()
@@ -129,7 +175,9 @@ def news_sentiment_agent(state: AgentState, agent_id: str = "news_sentiment_agen
                     "bullish_articles": bullish_signals,
                     "bearish_articles": bearish_signals,
                     "neutral_articles": neutral_signals,
-                    "articles_classified_by_llm": sentiments_classified_by_llm,
+                    "articles_classified_by_llm": counts["llm"] + counts["store"],
+                    "articles_from_sentiment_store": counts["store"],
+                    "articles_classified_locally": counts["local"],
                 },
             }
         }
@@ -151,18 +199,91 @@ def news_sentiment_agent(state: AgentState, agent_id: str = "news_sentiment_agen
     if state.get("metadata", {}).get("show_reasoning"):
         show_agent_reasoning(sentiment_analysis, "News Sentiment Analysis Agent")
 
-    if "analyst_signals" not in state["data"]:
-        state["data"]["analyst_signals"] = {}
-    state["data"]["analyst_signals"][agent_id] = sentiment_analysis
-
     progress.update_status(agent_id, None, "Done")
 
     return {
         "messages": [message],
-        "data": state["data"],
+        "data": {"analyst_signals": {agent_id: sentiment_analysis}},
     }
 
 
+def _classify_headlines(articles: list[tuple[str, CompanyNews]], state: AgentState, agent_id: str, batch_size: int) -> tuple[dict[int, int], set[int]]:
+    """
+    Classify the sentiment of news headlines with the LLM, labeling each article in place.
+
+    Headlines are sent in batches of ``batch_size`` per structured-output call. Any headline
+    missing from a batch response (or returned malformed) is re-classified on its own.
+
+    Args:
+        articles: (ticker, article) pairs to classify.
+        state: The current state of the agent graph.
+        agent_id: The ID of the agent.
+        batch_size: Maximum number of headlines per LLM call.
+
+    Returns:
+        Dictionary mapping article IDs (``id(article)``) to confidence scores, and the
+        IDs of articles the LLM failed to classify (labeled neutral with zero confidence).
+    """
+    sentiment_confidences = {}
+    failed = set()
+    if not articles:
+        return sentiment_confidences, failed
+
+    # We analyze based on title, but can also pass in the entire article text,
+    # but this is more expensive and requires extracting the text from the article.
+    # Note: this is an opportunity for improvement!
+    unclassified = []
+    if batch_size > 1:
+        for start in range(0, len(articles), batch_size):
+            batch = articles[start : start + batch_size]
+            for ticker in dict.fromkeys(ticker for ticker, _ in batch):
+                progress.update_status(agent_id, ticker, f"Analyzing sentiment for {len(batch)} headlines")
+
+            headlines = "\n".join(f"{idx}. [{ticker}] {news.title}" for idx, (ticker, news) in enumerate(batch))
+            prompt = (
+                f"Please analyze the sentiment of each of the following news headlines. "
+                f"Each headline is prefixed with its id and the stock it relates to. "
+                f"For each headline, determine if sentiment is 'positive', 'negative', or 'neutral' for that stock only. "
+                f"Also provide a confidence score for your prediction from 0 to 100. "
+                f"Respond in JSON format with one entry per headline id.\n\n"
+                f"Headlines:\n{headlines}"
+            )
+            response = call_llm(prompt, HeadlineSentimentBatch, agent_name=agent_id, state=state, default_factory=lambda: HeadlineSentimentBatch(sentiments=[]))
+
+            results = {item.id: item for item in response.sentiments if 0 <= item.id < len(batch)}
+            for idx, (ticker, news) in enumerate(batch):
+                if idx in results:
+                    news.sentiment = results[idx].sentiment.lower()
+                    sentiment_confidences[id(news)] = results[idx].confidence
+                else:
+                    unclassified.append((ticker, news))
+    else:
+        unclassified = list(articles)
+
+    # Fall back to one call per headline for anything the batches did not cover
+    for idx, (ticker, news) in enumerate(unclassified):
+        progress.update_status(agent_id, ticker, f"Analyzing sentiment for article {idx + 1} of {len(unclassified)}")
+        prompt = (
+            f"Please analyze the sentiment of the following news headline "
+            f"with the following context: "
+            f"The stock is {ticker}. "
+            f"Determine if sentiment is 'positive', 'negative', or 'neutral' for the stock {ticker} only. "
+            f"Also provide a confidence score for your prediction from 0 to 100. "
+            f"Respond in JSON format.\n\n"
+            f"Headline: {news.title}"
+        )
+        response = call_llm(prompt, Sentiment, agent_name=agent_id, state=state, default_factory=lambda: None, ticker=ticker)
+        if response:
+            news.sentiment = response.sentiment.lower()
+            sentiment_confidences[id(news)] = response.confidence
+        else:
+            news.sentiment = "neutral"
+            sentiment_confidences[id(news)] = 0
+            failed.add(id(news))
+
+    return sentiment_confidences, failed
+
+
 def _calculate_confidence_score(
     sentiment_confidences: dict,
     company_news: list,
@@ -150,12 +150,9 @@ def peter_lynch_agent(state: AgentState, agent_id: str = "peter_lynch_agent"):
     if state["metadata"].get("show_reasoning"):
         show_agent_reasoning(lynch_analysis, "Peter Lynch Agent")
 
-    # Save signals to state
-    state["data"]["analyst_signals"][agent_id] = lynch_analysis
-
     progress.update_status(agent_id, None, "Done")
 
-    return {"messages": [message], "data": state["data"]}
+    return {"messages": [message], "data": {"analyst_signals": {agent_id: lynch_analysis}}}
 
 
 def analyze_lynch_growth(financial_line_items: list) -> dict:
@@ -504,4 +501,5 @@ def generate_lynch_output(
         agent_name=agent_id,
         state=state,
         default_factory=create_default_signal,
+        ticker=ticker,
     )
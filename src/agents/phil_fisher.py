@@ -157,11 +157,9 @@ def phil_fisher_agent(state: AgentState, agent_id: str = "phil_fisher_agent"):
     if state["metadata"].get("show_reasoning"):
         show_agent_reasoning(fisher_analysis, "Phil Fisher Agent")
 
-    state["data"]["analyst_signals"][agent_id] = fisher_analysis
-
     progress.update_status(agent_id, None, "Done")
     
-    return {"messages": [message], "data": state["data"]}
+    return {"messages": [message], "data": {"analyst_signals": {agent_id: fisher_analysis}}}
 
 
 def analyze_fisher_growth_quality(financial_line_items: list) -> dict:
@@ -600,4 +598,5 @@ def generate_fisher_output(
         state=state,
         agent_name=agent_id,
         default_factory=create_default_signal,
+        ticker=ticker,
     )
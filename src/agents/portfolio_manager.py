@@ -63,8 +63,6 @@ def portfolio_management_agent(state: AgentState, agent_id: str = "portfolio_man
                     ticker_signals[agent] = {"sig": sig, "conf": conf}
         signals_by_ticker[ticker] = ticker_signals
 
-    state["data"]["current_prices"] = current_prices
-
     progress.update_status(agent_id, None, "Generating trading decisions")
 
     result = generate_trading_decision(
@@ -88,8 +86,8 @@ def portfolio_management_agent(state: AgentState, agent_id: str = "portfolio_man
     progress.update_status(agent_id, None, "Done")
 
     return {
-        "messages": state["messages"] + [message],
-        "data": state["data"],
+        "messages": [message],
+        "data": {"current_prices": current_prices},
     }
 
 
@@ -153,10 +153,9 @@ def rakesh_jhunjhunwala_agent(state: AgentState, agent_id: str = "rakesh_jhunjhu
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(jhunjhunwala_analysis, "Rakesh Jhunjhunwala Agent")
 
-    state["data"]["analyst_signals"][agent_id] = jhunjhunwala_analysis
     progress.update_status(agent_id, None, "Done")
 
-    return {"messages": [message], "data": state["data"]}
+    return {"messages": [message], "data": {"analyst_signals": {agent_id: jhunjhunwala_analysis}}}
 
 
 def analyze_profitability(financial_line_items: list) -> dict[str, any]:
@@ -705,4 +704,5 @@ def generate_jhunjhunwala_output(
         state=state,
         agent_name=agent_id,
         default_factory=create_default_rakesh_jhunjhunwala_signal,
+        ticker=ticker,
     )
\ No newline at end of file
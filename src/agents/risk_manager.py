@@ -2,14 +2,78 @@ from langchain_core.messages import HumanMessage
 from src.graph.state import AgentState, show_agent_reasoning
 from src.utils.progress import progress
 from src.tools.api import get_prices, prices_to_df
+import contextvars
 import json
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable
 import numpy as np
 import pandas as pd
+from src.data.cache import SingleFlight
 from src.utils.api_key import get_api_key_from_state
 
+class RiskAnalyticsCache:
+    """
+    Market risk analytics computed once per (ticker set, date window) and shared by several risk managers.
+
+    Concurrent requests for the same key wait for the first computation instead of repeating it.
+    """
+
+    def __init__(self, max_size: int = 8):
+        self.max_size = max(1, max_size)
+        self._analytics: OrderedDict[tuple, tuple] = OrderedDict()
+        self._lock = threading.Lock()
+        self._single_flight = SingleFlight()
+
+    def get_or_compute(self, key: tuple, compute: Callable[[], tuple], on_wait: Callable[[], None] | None = None) -> tuple:
+        """Return the analytics of the key, computing them unless cached; on_wait is called before waiting on another caller's computation."""
+        if on_wait is not None and self._single_flight.in_flight(repr(key)):
+            on_wait()
+        with self._single_flight.acquire(repr(key)):
+            with self._lock:
+                if key in self._analytics:
+                    self._analytics.move_to_end(key)
+                    return self._analytics[key]
+            analytics = compute()
+            with self._lock:
+                self._analytics[key] = analytics
+                while len(self._analytics) > self.max_size:
+                    self._analytics.popitem(last=False)
+            return analytics
+
+
+# Analytics shared by the risk managers of the current graph invocation, if it opened a run scope
+_run_analytics: contextvars.ContextVar[RiskAnalyticsCache | None] = contextvars.ContextVar("risk_analytics", default=None)
+
+
+@contextmanager
+def risk_analytics_run():
+    """
+    Share market risk analytics between the risk managers of one graph invocation.
+
+    The analytics are dropped when the invocation ends, so a later run over the same window (such
+    as a same-day rerun, when the latest prices may have moved) computes them from fresh data.
+    """
+    token = _run_analytics.set(RiskAnalyticsCache())
+    try:
+        yield
+    finally:
+        _run_analytics.reset(token)
+
+
 ##### Risk Management Agent #####
-def risk_management_agent(state: AgentState, agent_id: str = "risk_management_agent"):
-    """Controls position sizing based on volatility-adjusted risk factors for multiple tickers."""
+def risk_management_agent(state: AgentState, agent_id: str = "risk_management_agent", shared_analytics: RiskAnalyticsCache | None = None):
+    """
+    Controls position sizing based on volatility-adjusted risk factors for multiple tickers.
+
+    Market analytics (prices, volatility, correlations) only depend on the tickers and the date
+    window, so risk managers of several portfolio managers in one graph can share them through
+    shared_analytics (by default, those of the enclosing risk_analytics_run) and only project
+    the limits onto their own portfolio.
+    """
+    if shared_analytics is None:
+        shared_analytics = _run_analytics.get()
     portfolio = state["data"]["portfolio"]
     data = state["data"]
     tickers = data["tickers"]
@@ -17,72 +81,19 @@ def risk_management_agent(state: AgentState, agent_id: str = "risk_management_ag
     
     # Initialize risk analysis for each ticker
     risk_analysis = {}
-    current_prices = {}  # Store prices here to avoid redundant API calls
-    volatility_data = {}  # Store volatility metrics
-    returns_by_ticker: dict[str, pd.Series] = {}  # For correlation analysis
 
     # First, fetch prices and calculate volatility for all relevant tickers
     all_tickers = set(tickers) | set(portfolio.get("positions", {}).keys())
-    
-    for ticker in all_tickers:
-        progress.update_status(agent_id, ticker, "Fetching price data and calculating volatility")
-        
-        prices = get_prices(
-            ticker=ticker,
-            start_date=data["start_date"],
-            end_date=data["end_date"],
-            api_key=api_key,
-        )
+    compute = lambda: calculate_market_risk(all_tickers, data["start_date"], data["end_date"], api_key, agent_id)
+    def report_waiting():
+        # Another risk manager is computing the analytics; only it reports the per-ticker fetches
+        for ticker in tickers:
+            progress.update_status(agent_id, ticker, "Waiting for shared risk analytics")
 
-        if not prices:
-            progress.update_status(agent_id, ticker, "Warning: No price data found")
-            volatility_data[ticker] = {
-                "daily_volatility": 0.05,  # Default fallback volatility (5% daily)
-                "annualized_volatility": 0.05 * np.sqrt(252),
-                "volatility_percentile": 100,  # Assume high risk if no data
-                "data_points": 0
-            }
-            continue
-
-        prices_df = prices_to_df(prices)
-        
-        if not prices_df.empty and len(prices_df) > 1:
-            current_price = prices_df["close"].iloc[-1]
-            current_prices[ticker] = current_price
-            
-            # Calculate volatility metrics
-            volatility_metrics = calculate_volatility_metrics(prices_df)
-            volatility_data[ticker] = volatility_metrics
-
-            # Store returns for correlation analysis (use close-to-close returns)
-            daily_returns = prices_df["close"].pct_change().dropna()
-            if len(daily_returns) > 0:
-                returns_by_ticker[ticker] = daily_returns
-            
-            progress.update_status(
-                agent_id, 
-                ticker, 
-                f"Price: {current_price:.2f}, Ann. Vol: {volatility_metrics['annualized_volatility']:.1%}"
-            )
-        else:
-            progress.update_status(agent_id, ticker, "Warning: Insufficient price data")
-            current_prices[ticker] = 0
-            volatility_data[ticker] = {
-                "daily_volatility": 0.05,
-                "annualized_volatility": 0.05 * np.sqrt(252),
-                "volatility_percentile": 100,
-                "data_points": len(prices_df) if not prices_df.empty else 0
-            }
-
-    # Build returns DataFrame aligned across tickers for correlation analysis
-    correlation_matrix = None
-    if len(returns_by_ticker) >= 2:
-        try:
-            returns_df = pd.DataFrame(returns_by_ticker).dropna(how="any")
-            if returns_df.shape[1] >= 2 and returns_df.shape[0] >= 5:
-                correlation_matrix = returns_df.corr()
-        except Exception:
-            correlation_matrix = None
+    if shared_analytics is not None:
+        current_prices, volatility_data, correlation_matrix = shared_analytics.get_or_compute((tuple(sorted(all_tickers)), data["start_date"], data["end_date"]), compute, on_wait=report_waiting)
+    else:
+        current_prices, volatility_data, correlation_matrix = compute()
 
     # Determine which tickers currently have exposure (non-zero absolute position)
     active_positions = {
@@ -210,15 +221,81 @@ def risk_management_agent(state: AgentState, agent_id: str = "risk_management_ag
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(risk_analysis, "Volatility-Adjusted Risk Management Agent")
 
-    # Add the signal to the analyst_signals list
-    state["data"]["analyst_signals"][agent_id] = risk_analysis
-
     return {
-        "messages": state["messages"] + [message],
-        "data": data,
+        "messages": [message],
+        "data": {"analyst_signals": {agent_id: risk_analysis}},
     }
 
 
+def calculate_market_risk(tickers: set[str], start_date: str, end_date: str, api_key: str | None, agent_id: str) -> tuple[dict, dict, pd.DataFrame | None]:
+    """Fetch prices and calculate current prices, volatility metrics and the return correlation matrix of the tickers."""
+    current_prices = {}  # Store prices here to avoid redundant API calls
+    volatility_data = {}  # Store volatility metrics
+    returns_by_ticker: dict[str, pd.Series] = {}  # For correlation analysis
+
+    for ticker in tickers:
+        progress.update_status(agent_id, ticker, "Fetching price data and calculating volatility")
+        
+        prices = get_prices(
+            ticker=ticker,
+            start_date=start_date,
+            end_date=end_date,
+            api_key=api_key,
+        )
+
+        if not prices:
+            progress.update_status(agent_id, ticker, "Warning: No price data found")
+            volatility_data[ticker] = {
+                "daily_volatility": 0.05,  # Default fallback volatility (5% daily)
+                "annualized_volatility": 0.05 * np.sqrt(252),
+                "volatility_percentile": 100,  # Assume high risk if no data
+                "data_points": 0
+            }
+            continue
+
+        prices_df = prices_to_df(prices)
+        
+        if not prices_df.empty and len(prices_df) > 1:
+            current_price = prices_df["close"].iloc[-1]
+            current_prices[ticker] = current_price
+            
+            # Calculate volatility metrics
+            volatility_metrics = calculate_volatility_metrics(prices_df)
+            volatility_data[ticker] = volatility_metrics
+
+            # Store returns for correlation analysis (use close-to-close returns)
+            daily_returns = prices_df["close"].pct_change().dropna()
+            if len(daily_returns) > 0:
+                returns_by_ticker[ticker] = daily_returns
+            
+            progress.update_status(
+                agent_id, 
+                ticker, 
+                f"Price: {current_price:.2f}, Ann. Vol: {volatility_metrics['annualized_volatility']:.1%}"
+            )
+        else:
+            progress.update_status(agent_id, ticker, "Warning: Insufficient price data")
+            current_prices[ticker] = 0
+            volatility_data[ticker] = {
+                "daily_volatility": 0.05,
+                "annualized_volatility": 0.05 * np.sqrt(252),
+                "volatility_percentile": 100,
+                "data_points": len(prices_df) if not prices_df.empty else 0
+            }
+
+    # Build returns DataFrame aligned across tickers for correlation analysis
+    correlation_matrix = None
+    if len(returns_by_ticker) >= 2:
+        try:
+            returns_df = pd.DataFrame(returns_by_ticker).dropna(how="any")
+            if returns_df.shape[1] >= 2 and returns_df.shape[0] >= 5:
+                correlation_matrix = returns_df.corr()
+        except Exception:
+            correlation_matrix = None
+
+    return current_prices, volatility_data, correlation_matrix
+
+
 def calculate_volatility_metrics(prices_df: pd.DataFrame, lookback_days: int = 60) -> dict:
     """Calculate comprehensive volatility metrics from price data."""
     if len(prices_df) < 2:
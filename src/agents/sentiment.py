@@ -6,6 +6,9 @@ import numpy as np
 import json
 from src.utils.api_key import get_api_key_from_state
 from src.tools.api import get_insider_trades, get_company_news
+from src.data.sentiment_store import sentiment_model_key
+from src.utils.llm import get_agent_model_config
+from src.tools.sentiment_scorer import DEFAULT_LOCAL_CONFIDENCE_THRESHOLD, get_local_sentiment_scorer
 
 
 ##### Sentiment Agent #####
@@ -15,6 +18,8 @@ def sentiment_analyst_agent(state: AgentState, agent_id: str = "sentiment_analys
     end_date = data.get("end_date")
     tickers = data.get("tickers")
     api_key = get_api_key_from_state(state, "FINANCIAL_DATASETS_API_KEY")
+    # Headlines the API left unlabeled may already have been classified by this model
+    sentiment_model = sentiment_model_key(*get_agent_model_config(state, agent_id))
     # Initialize sentiment analysis for each ticker
     sentiment_analysis = {}
 
@@ -38,10 +43,15 @@ def sentiment_analyst_agent(state: AgentState, agent_id: str = "sentiment_analys
         progress.update_status(agent_id, ticker, "Fetching company news")
 
         # Get the company news
-        company_news = get_company_news(ticker, end_date, limit=100, api_key=api_key)
-
-        # Get the sentiment from the company news
-        sentiment = pd.Series([n.sentiment for n in company_news]).dropna()
+        company_news = get_company_news(ticker, end_date, limit=100, api_key=api_key, sentiment_model=sentiment_model)
+
+        # Get the sentiment from the company news, scoring unlabeled headlines locally when the score is confident
+        sentiments = [n.sentiment for n in company_news]
+        unlabeled = [idx for idx, label in enumerate(sentiments) if label is None]
+        for idx, (label, local_confidence) in zip(unlabeled, get_local_sentiment_scorer().score([company_news[idx].title for idx in unlabeled])):
+            if local_confidence >= DEFAULT_LOCAL_CONFIDENCE_THRESHOLD:
+                sentiments[idx] = label
+        sentiment = pd.Series(sentiments).dropna()
         news_signals = np.where(sentiment == "negative", "bearish", 
                               np.where(sentiment == "positive", "bullish", "neutral")).tolist()
         
@@ -127,12 +137,9 @@ def sentiment_analyst_agent(state: AgentState, agent_id: str = "sentiment_analys
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(sentiment_analysis, "Sentiment Analysis Agent")
 
-    # Add the signal to the analyst_signals list
-    state["data"]["analyst_signals"][agent_id] = sentiment_analysis
-
     progress.update_status(agent_id, None, "Done")
 
     return {
         "messages": [message],
-        "data": data,
+        "data": {"analyst_signals": {agent_id: sentiment_analysis}},
     }
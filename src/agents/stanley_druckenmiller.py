@@ -156,11 +156,9 @@ def stanley_druckenmiller_agent(state: AgentState, agent_id: str = "stanley_druc
     if state["metadata"].get("show_reasoning"):
         show_agent_reasoning(druck_analysis, "Stanley Druckenmiller Agent")
 
-    state["data"]["analyst_signals"][agent_id] = druck_analysis
-
     progress.update_status(agent_id, None, "Done")
     
-    return {"messages": [message], "data": state["data"]}
+    return {"messages": [message], "data": {"analyst_signals": {agent_id: druck_analysis}}}
 
 
 def analyze_growth_and_momentum(financial_line_items: list, prices: list) -> dict:
@@ -599,4 +597,5 @@ def generate_druckenmiller_output(
         agent_name=agent_id,
         state=state,
         default_factory=create_default_signal,
+        ticker=ticker,
     )
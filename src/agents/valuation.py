@@ -212,12 +212,9 @@ def valuation_analyst_agent(state: AgentState, agent_id: str = "valuation_analys
     if state["metadata"].get("show_reasoning"):
         show_agent_reasoning(valuation_analysis, "Valuation Analysis Agent")
 
-    # Add the signal to the analyst_signals list
-    state["data"]["analyst_signals"][agent_id] = valuation_analysis
-
     progress.update_status(agent_id, None, "Done")
     
-    return {"messages": [msg], "data": data}
+    return {"messages": [msg], "data": {"analyst_signals": {agent_id: valuation_analysis}}}
 
 #############################
 # Helper Valuation Functions
@@ -145,12 +145,9 @@ def warren_buffett_agent(state: AgentState, agent_id: str = "warren_buffett_agen
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(buffett_analysis, agent_id)
 
-    # Add the signal to the analyst_signals list
-    state["data"]["analyst_signals"][agent_id] = buffett_analysis
-
     progress.update_status(agent_id, None, "Done")
 
-    return {"messages": [message], "data": state["data"]}
+    return {"messages": [message], "data": {"analyst_signals": {agent_id: buffett_analysis}}}
 
 
 def analyze_fundamentals(metrics: list) -> dict[str, any]:
@@ -823,4 +820,5 @@ def generate_buffett_output(
         agent_name=agent_id,
         state=state,
         default_factory=create_default_warren_buffett_signal,
+        ticker=ticker,
     )
@@ -3,7 +3,9 @@ import sys
 from colorama import Fore, Style
 
 from src.main import run_hedge_fund
+from src.backtesting.cli import parse_resume_args, resume_engine
 from src.backtesting.engine import BacktestEngine
+from src.backtesting.checkpoint import BacktestCheckpoint
 from src.backtesting.types import PerformanceMetrics
 from src.cli.input import (
     parse_cli_inputs,
@@ -41,26 +43,38 @@ def run_backtest(backtester: BacktestEngine) -> PerformanceMetrics | None:
 
 ### Run the Backtest #####
 if __name__ == "__main__":
-    inputs = parse_cli_inputs(
-        description="Run backtesting simulation",
-        require_tickers=False,
-        default_months_back=1,
-        include_graph_flag=False,
-        include_reasoning_flag=False,
-    )
+    # Resuming reuses the checkpoint's configuration, so skip the interactive prompts
+    resume_args = parse_resume_args()
 
-    # Create and run the backtester
-    backtester = BacktestEngine(
-        agent=run_hedge_fund,
-        tickers=inputs.tickers,
-        start_date=inputs.start_date,
-        end_date=inputs.end_date,
-        initial_capital=inputs.initial_cash,
-        model_name=inputs.model_name,
-        model_provider=inputs.model_provider,
-        selected_analysts=inputs.selected_analysts,
-        initial_margin_requirement=inputs.margin_requirement,
-    )
+    if resume_args.resume:
+        backtester = resume_engine(resume_args.resume, every=resume_args.checkpoint_every)
+        if backtester is None:
+            sys.exit(1)
+    else:
+        inputs = parse_cli_inputs(
+            description="Run backtesting simulation",
+            require_tickers=False,
+            default_months_back=1,
+            include_graph_flag=False,
+            include_reasoning_flag=False,
+            include_checkpoint_flags=True,
+        )
+
+        # Create and run the backtester
+        backtester = BacktestEngine(
+            agent=run_hedge_fund,
+            tickers=inputs.tickers,
+            start_date=inputs.start_date,
+            end_date=inputs.end_date,
+            initial_capital=inputs.initial_cash,
+            model_name=inputs.model_name,
+            model_provider=inputs.model_provider,
+            selected_analysts=inputs.selected_analysts,
+            initial_margin_requirement=inputs.margin_requirement,
+            sentiment_offline=inputs.sentiment_offline,
+            sentiment_threshold=inputs.sentiment_threshold,
+            checkpoint=BacktestCheckpoint(inputs.checkpoint_path, every=inputs.checkpoint_every) if inputs.checkpoint_path else None,
+        )
 
     # Run the backtest with graceful exit handling
     performance_metrics = run_backtest(backtester)
@@ -24,6 +24,7 @@ from .trader import TradeExecutor
 from .metrics import PerformanceMetricsCalculator
 from .controller import AgentController
 from .engine import BacktestEngine
+from .checkpoint import BacktestCheckpoint
 from .valuation import calculate_portfolio_value, compute_exposures
 from .output import OutputBuilder
 
@@ -46,6 +47,7 @@ __all__ = [
     "PerformanceMetricsCalculator",
     "AgentController",
     "BacktestEngine",
+    "BacktestCheckpoint",
     "calculate_portfolio_value",
     "compute_exposures",
     "OutputBuilder",
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Mapping, Sequence
+
+CHECKPOINT_VERSION = 2
+
+
+def _json_default(value: Any) -> Any:
+    # numpy scalars (metrics, prices) and timestamps
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class BacktestCheckpoint:
+    """On-disk checkpoint of a backtest's progress.
+
+    The checkpoint file holds the run's configuration and, as of its last
+    completed day, the portfolio snapshot and metrics accumulator. Each
+    completed day (its equity curve point, printed rows and agent outputs) is
+    appended once to a journal next to it (``<path>.days.jsonl``), so saves
+    cost the same however long the run is, and an interrupted run can continue
+    from its last completed day without repeating its agent (LLM) calls.
+    """
+
+    def __init__(self, path: str | os.PathLike, *, every: int = 1) -> None:
+        self.path = Path(path)
+        self.days_path = self.path.with_name(self.path.name + ".days.jsonl")
+        # Completed days between saves
+        self.every = max(1, int(every))
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self) -> Dict[str, Any]:
+        """Load the checkpoint, with the journaled days up to its last completed day (in order) under "days"."""
+        with self.path.open("r") as f:
+            state = json.load(f)
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported backtest checkpoint version in {self.path}: {state.get('version')}")
+
+        # Days journaled after the last save (by a run that crashed before writing the checkpoint) are ignored
+        last_completed_date = state.get("last_completed_date")
+        days: Dict[str, Dict[str, Any]] = {}
+        if self.days_path.exists() and last_completed_date is not None:
+            with self.days_path.open("r") as f:
+                for line in f:
+                    if line.strip():
+                        day = json.loads(line)
+                        if day["date"] <= last_completed_date:
+                            days[day["date"]] = day
+        state["days"] = [days[date] for date in sorted(days)]
+        return state
+
+    def save(self, state: Mapping[str, Any], new_days: Sequence[Mapping[str, Any]] = ()) -> None:
+        """Append the days completed since the last save to the journal, then write the checkpoint atomically.
+
+        A crash mid-write keeps the previous checkpoint, which ignores any days journaled after it.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # A new run (no checkpoint yet) starts a new journal
+        with self.days_path.open("a" if self.path.exists() else "w") as f:
+            for day in new_days:
+                f.write(json.dumps(day, default=_json_default) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("w") as f:
+            json.dump({"version": CHECKPOINT_VERSION, **state}, f, default=_json_default)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+        self.days_path.unlink(missing_ok=True)
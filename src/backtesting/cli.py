@@ -9,6 +9,7 @@ from colorama import Fore, Style, init
 import questionary
 
 from .engine import BacktestEngine
+from .checkpoint import BacktestCheckpoint
 from src.llm.models import LLM_ORDER, OLLAMA_LLM_ORDER, get_model_info, ModelProvider
 from src.utils.analysts import ANALYST_ORDER
 from src.main import run_hedge_fund
@@ -35,10 +36,19 @@ def main() -> int:
     parser.add_argument("--analysts", type=str, required=False)
     parser.add_argument("--analysts-all", action="store_true")
     parser.add_argument("--ollama", action="store_true")
+    parser.add_argument("--sentiment-offline", action="store_true", help="Score news headlines locally only, without LLM calls")
+    parser.add_argument("--sentiment-threshold", type=float, help="Local sentiment confidence (0-100) at or above which headlines skip the LLM")
+    parser.add_argument("--checkpoint", type=str, required=False, help="Save progress to this file so an interrupted run can be resumed")
+    parser.add_argument("--checkpoint-every", type=int, default=1, help="Trading days between checkpoint saves")
+    parser.add_argument("--resume", type=str, required=False, help="Resume the backtest saved in this checkpoint file")
 
     args = parser.parse_args()
     init(autoreset=True)
 
+    if args.resume:
+        engine = resume_engine(args.resume, every=args.checkpoint_every)
+        return _run_engine(engine) if engine is not None else 1
+
     tickers = [t.strip() for t in args.tickers.split(",")] if args.tickers else []
 
     # Analysts selection is simplified; no interactive prompts here
@@ -138,8 +148,34 @@ def main() -> int:
         model_provider=model_provider,
         selected_analysts=selected_analysts,
         initial_margin_requirement=args.margin_requirement,
+        sentiment_offline=args.sentiment_offline,
+        sentiment_threshold=args.sentiment_threshold,
+        checkpoint=BacktestCheckpoint(args.checkpoint, every=args.checkpoint_every) if args.checkpoint else None,
     )
+    return _run_engine(engine)
+
+
+def parse_resume_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse only --resume and --checkpoint-every, leaving the other arguments to the caller's own parser."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--resume", metavar="PATH")
+    parser.add_argument("--checkpoint-every", dest="checkpoint_every", type=int, default=1)
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
+def resume_engine(path: str, every: int = 1) -> BacktestEngine | None:
+    """Build an engine resuming the backtest checkpointed at path, or print an error and return None if there is none."""
+    # The checkpoint holds the tickers, dates, analysts and model of the interrupted run
+    checkpoint = BacktestCheckpoint(path, every=every)
+    if not checkpoint.exists():
+        print(f"{Fore.RED}No backtest checkpoint found at {path}{Style.RESET_ALL}")
+        return None
+    print(f"{Fore.CYAN}Resuming backtest from {path}{Style.RESET_ALL}")
+    return BacktestEngine.from_checkpoint(checkpoint, agent=run_hedge_fund)
+
 
+def _run_engine(engine: BacktestEngine) -> int:
     metrics = engine.run_backtest()
     values = engine.get_portfolio_values()
 
@@ -10,10 +10,11 @@ from .controller import AgentController
 from .trader import TradeExecutor
 from .metrics import PerformanceMetricsCalculator
 from .portfolio import Portfolio
-from .types import PerformanceMetrics, PortfolioValuePoint
+from .types import AgentOutput, PerformanceMetrics, PortfolioValuePoint
 from .valuation import calculate_portfolio_value, compute_exposures
 from .output import OutputBuilder
 from .benchmarks import BenchmarkCalculator
+from .checkpoint import BacktestCheckpoint
 
 from src.tools.api import (
     get_company_news,
@@ -44,6 +45,9 @@ class BacktestEngine:
         model_provider: str,
         selected_analysts: list[str] | None,
         initial_margin_requirement: float,
+        sentiment_offline: bool = False,
+        sentiment_threshold: float | None = None,
+        checkpoint: BacktestCheckpoint | None = None,
     ) -> None:
         self._agent = agent
         self._tickers = tickers
@@ -53,6 +57,10 @@ class BacktestEngine:
         self._model_name = model_name
         self._model_provider = model_provider
         self._selected_analysts = selected_analysts
+        self._initial_margin_requirement = float(initial_margin_requirement)
+        self._sentiment_offline = sentiment_offline
+        self._sentiment_threshold = sentiment_threshold
+        self._checkpoint = checkpoint
 
         self._portfolio = Portfolio(
             tickers=tickers,
@@ -78,6 +86,61 @@ class BacktestEngine:
             "net_exposure": None,
         }
 
+        # Completed days, for checkpoints and resuming
+        self._agent_outputs: Dict[str, AgentOutput] = {}
+        self._last_completed_date: str | None = None
+        # Completed days not yet written to the checkpoint's journal
+        self._unsaved_days: list[dict] = []
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint: BacktestCheckpoint, *, agent) -> "BacktestEngine":
+        """Create an engine for the backtest saved in a checkpoint; run_backtest() resumes it."""
+        config = checkpoint.load()["config"]
+        return cls(agent=agent, checkpoint=checkpoint, **config)
+
+    def _checkpoint_config(self) -> dict:
+        return {
+            "tickers": list(self._tickers),
+            "start_date": self._start_date,
+            "end_date": self._end_date,
+            "initial_capital": self._initial_capital,
+            "model_name": self._model_name,
+            "model_provider": self._model_provider,
+            "selected_analysts": self._selected_analysts,
+            "initial_margin_requirement": self._initial_margin_requirement,
+            "sentiment_offline": self._sentiment_offline,
+            "sentiment_threshold": self._sentiment_threshold,
+        }
+
+    def _save_checkpoint(self) -> None:
+        self._checkpoint.save(
+            {
+                "config": self._checkpoint_config(),
+                "last_completed_date": self._last_completed_date,
+                "portfolio": self._portfolio.get_snapshot(),
+                "performance_metrics": self._performance_metrics,
+            },
+            new_days=self._unsaved_days,
+        )
+        self._unsaved_days = []
+
+    def _restore_checkpoint(self) -> bool:
+        """Restore the state of the checkpoint's last completed day. Returns False if there is none yet."""
+        if self._checkpoint is None or not self._checkpoint.exists():
+            return False
+        state = self._checkpoint.load()
+        if state["config"] != self._checkpoint_config():
+            raise ValueError(f"Checkpoint {self._checkpoint.path} was saved by a backtest with a different configuration")
+
+        self._portfolio = Portfolio.from_snapshot(state["portfolio"])
+        self._performance_metrics = state["performance_metrics"]
+        for day in state["days"]:
+            self._portfolio_values.append({**day["point"], "Date": pd.Timestamp(day["point"]["Date"])})
+            self._table_rows = day["rows"] + self._table_rows
+            self._agent_outputs[day["date"]] = day["agent_output"]
+        self._last_completed_date = state["last_completed_date"]
+        return True
+
     def _prefetch_data(self) -> None:
         end_date_dt = datetime.strptime(self._end_date, "%Y-%m-%d")
         start_date_dt = end_date_dt - relativedelta(years=1)
@@ -104,12 +167,17 @@ class BacktestEngine:
         else:
             self._portfolio_values = []
 
+        # Continue after the last completed day of an interrupted run
+        self._restore_checkpoint()
+
         for current_date in dates:
             lookback_start = (current_date - relativedelta(months=1)).strftime("%Y-%m-%d")
             current_date_str = current_date.strftime("%Y-%m-%d")
             previous_date_str = (current_date - relativedelta(days=1)).strftime("%Y-%m-%d")
             if lookback_start == current_date_str:
                 continue
+            if self._last_completed_date is not None and current_date_str <= self._last_completed_date:
+                continue
 
             try:
                 current_prices: Dict[str, float] = {}
@@ -138,6 +206,8 @@ class BacktestEngine:
                 model_name=self._model_name,
                 model_provider=self._model_provider,
                 selected_analysts=self._selected_analysts,
+                sentiment_offline=self._sentiment_offline,
+                sentiment_threshold=self._sentiment_threshold,
             )
             decisions = agent_output["decisions"]
 
@@ -186,9 +256,23 @@ class BacktestEngine:
                 if computed:
                     self._performance_metrics.update(computed)
 
+            self._agent_outputs[current_date_str] = agent_output
+            self._last_completed_date = current_date_str
+            if self._checkpoint is not None:
+                self._unsaved_days.append({"date": current_date_str, "point": point, "rows": rows, "agent_output": agent_output})
+                if len(self._unsaved_days) >= self._checkpoint.every:
+                    self._save_checkpoint()
+
+        if self._checkpoint is not None and self._unsaved_days:
+            self._save_checkpoint()
+
         return self._performance_metrics
 
     def get_portfolio_values(self) -> Sequence[PortfolioValuePoint]:
         return list(self._portfolio_values)
 
+    def get_agent_outputs(self) -> Dict[str, AgentOutput]:
+        """Agent outputs (decisions and analyst signals) of each completed day, by date."""
+        return dict(self._agent_outputs)
+
 
@@ -41,6 +41,21 @@ class Portfolio:
             },
         }
 
+    @classmethod
+    def from_snapshot(cls, snapshot: PortfolioSnapshot) -> "Portfolio":
+        """Rebuild a portfolio from a snapshot (e.g. one saved in a checkpoint)."""
+        portfolio = cls(
+            tickers=list(snapshot["positions"]),
+            initial_cash=snapshot["cash"],
+            margin_requirement=snapshot["margin_requirement"],
+        )
+        portfolio._portfolio["margin_used"] = float(snapshot["margin_used"])
+        for ticker, position in snapshot["positions"].items():
+            portfolio._portfolio["positions"][ticker].update(position)
+        for ticker, gains in snapshot["realized_gains"].items():
+            portfolio._portfolio["realized_gains"][ticker].update(gains)
+        return portfolio
+
     def get_snapshot(self) -> PortfolioSnapshot:
         positions_copy: Dict[str, PositionState] = {
             t: {
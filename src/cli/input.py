@@ -2,12 +2,10 @@ import sys
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 import argparse
-import questionary
 from colorama import Fore, Style
 
 from src.utils.analysts import ANALYST_ORDER
 from src.llm.models import LLM_ORDER, OLLAMA_LLM_ORDER, get_model_info, ModelProvider
-from src.utils.ollama import ensure_ollama_and_model
 from src.utils.ticker import normalize_ticker, validate_ticker
 
 from dataclasses import dataclass
@@ -41,6 +39,7 @@ def add_common_args(
         )
     if include_ollama:
         parser.add_argument("--ollama", action="store_true", help="Use Ollama for local LLM inference")
+        parser.add_argument("--mock-llm", action="store_true", help="Use the offline deterministic mock LLM (configured with MOCK_LLM_* env vars) for load and regression testing")
     return parser
 
 
@@ -103,6 +102,9 @@ def select_analysts(flags: dict | None = None) -> list[str]:
     if flags and flags.get("analysts"):
         return [a.strip() for a in flags["analysts"].split(",") if a.strip()]
 
+    # Prompt libraries are only imported by interactive runs
+    import questionary
+
     choices = questionary.checkbox(
         "Select your AI analysts.",
         choices=[questionary.Choice(display, value=value) for display, value in ANALYST_ORDER],
@@ -128,10 +130,17 @@ def select_analysts(flags: dict | None = None) -> list[str]:
     return choices
 
 
-def select_model(use_ollama: bool) -> tuple[str, str]:
+def select_model(use_ollama: bool, use_mock: bool = False) -> tuple[str, str]:
     model_name: str = ""
     model_provider: str | None = None
 
+    if use_mock:
+        print(f"{Fore.CYAN}Using the mock LLM provider (offline, deterministic).{Style.RESET_ALL}")
+        return "mock", ModelProvider.MOCK.value
+
+    import questionary
+    from src.utils.ollama import ensure_ollama_and_model
+
     if use_ollama:
         print(f"{Fore.CYAN}Using Ollama for local LLM inference.{Style.RESET_ALL}")
         model_name = questionary.select(
@@ -237,6 +246,11 @@ class CLIInputs:
     margin_requirement: float
     show_reasoning: bool = False
     show_agent_graph: bool = False
+    trace_path: Optional[str] = None
+    sentiment_offline: bool = False
+    sentiment_threshold: Optional[float] = None
+    checkpoint_path: Optional[str] = None
+    checkpoint_every: int = 1
     raw_args: Optional[argparse.Namespace] = None
 
 
@@ -247,6 +261,8 @@ def parse_cli_inputs(
     default_months_back: int | None,
     include_graph_flag: bool = False,
     include_reasoning_flag: bool = False,
+    include_trace_flag: bool = False,
+    include_checkpoint_flags: bool = False,
 ) -> CLIInputs:
     parser = argparse.ArgumentParser(description=description)
 
@@ -275,6 +291,16 @@ def parse_cli_inputs(
         parser.add_argument("--show-reasoning", action="store_true", help="Show reasoning from each agent")
     if include_graph_flag:
         parser.add_argument("--show-agent-graph", action="store_true", help="Show the agent graph")
+    if include_trace_flag:
+        parser.add_argument("--trace", dest="trace_path", metavar="PATH", help="Trace the run and write a Chrome trace (chrome://tracing, Perfetto) to PATH")
+
+    parser.add_argument("--sentiment-offline", action="store_true", help="Score news headlines with the local sentiment model only, without LLM calls")
+    parser.add_argument("--sentiment-threshold", type=float, metavar="CONFIDENCE", help="Local sentiment confidence (0-100) at or above which a headline is not sent to the LLM. Defaults to 70")
+
+    if include_checkpoint_flags:
+        parser.add_argument("--checkpoint", dest="checkpoint_path", metavar="PATH", help="Save the backtest's progress to PATH so an interrupted run can be resumed")
+        parser.add_argument("--checkpoint-every", dest="checkpoint_every", type=int, default=1, metavar="DAYS", help="Trading days between checkpoint saves. Defaults to 1")
+        parser.add_argument("--resume", metavar="PATH", help="Resume the backtest saved in the checkpoint at PATH (its tickers, dates and models are reused)")
 
     args = parser.parse_args()
 
@@ -284,7 +310,7 @@ def parse_cli_inputs(
         "analysts_all": getattr(args, "analysts_all", False),
         "analysts": getattr(args, "analysts", None),
     })
-    model_name, model_provider = select_model(getattr(args, "ollama", False))
+    model_name, model_provider = select_model(getattr(args, "ollama", False), getattr(args, "mock_llm", False))
     start_date, end_date = resolve_dates(getattr(args, "start_date", None), getattr(args, "end_date", None), default_months_back=default_months_back)
 
     return CLIInputs(
@@ -298,6 +324,11 @@ def parse_cli_inputs(
         margin_requirement=getattr(args, "margin_requirement", 0.0),
         show_reasoning=getattr(args, "show_reasoning", False),
         show_agent_graph=getattr(args, "show_agent_graph", False),
+        trace_path=getattr(args, "trace_path", None),
+        sentiment_offline=getattr(args, "sentiment_offline", False),
+        sentiment_threshold=getattr(args, "sentiment_threshold", None),
+        checkpoint_path=getattr(args, "checkpoint_path", None),
+        checkpoint_every=getattr(args, "checkpoint_every", 1),
         raw_args=args,
     )
 
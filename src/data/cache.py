@@ -1,69 +1,407 @@
+import hashlib
+import heapq
+import os
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable
+
+from pydantic import BaseModel
+
+from src.data.models import CompanyNews, FinancialMetrics, InsiderTrade, LineItem, Price
+
+# Default memory budget for the global cache; override with CACHE_MAX_MB (0 disables the limit)
+DEFAULT_CACHE_MAX_MB = 512
+
+# Namespaces whose records share a fixed schema, so sizing one record is representative of all
+_FIXED_SCHEMA_NAMESPACES = {"prices", "financial_metrics"}
+
+# Keys read from any cache in the current context, while a track_reads() block collects them
+_read_keys: ContextVar[set | None] = ContextVar("cache_read_keys", default=None)
+
+
+class _CacheEntry:
+    """A cached value with its estimated size, access count and (once asked for) content version."""
+
+    __slots__ = ("data", "size", "hits", "version")
+
+    def __init__(self, data: list, size: int, hits: int = 0, version: str | None = None):
+        self.data = data
+        self.size = size
+        self.hits = hits
+        self.version = version
+
+
 class Cache:
-    """In-memory cache for API responses."""
+    """
+    Thread-safe, memory-bounded in-memory cache for API responses.
 
-    def __init__(self):
-        self._prices_cache: dict[str, list[dict[str, any]]] = {}
-        self._financial_metrics_cache: dict[str, list[dict[str, any]]] = {}
-        self._line_items_cache: dict[str, list[dict[str, any]]] = {}
-        self._insider_trades_cache: dict[str, list[dict[str, any]]] = {}
-        self._company_news_cache: dict[str, list[dict[str, any]]] = {}
+    Records are stored as the already-validated model instances returned by the API
+    layer and handed back as-is on a hit, so callers must treat them as read-only
+    (prices, financial metrics and insider trades are frozen models). Each entry has a
+    version derived from its content, so callers can tell whether data they read changed.
+    """
+
+    NAMESPACES = ("prices", "financial_metrics", "line_items", "insider_trades", "company_news")
+    # Field that identifies a record within a namespace, used to merge new data into an entry
+    KEY_FIELDS = {"prices": "time", "financial_metrics": "report_period", "line_items": "report_period", "insider_trades": "filing_date", "company_news": "date"}
 
-    def _merge_data(self, existing: list[dict] | None, new_data: list[dict], key_field: str) -> list[dict]:
+    def __init__(self, max_bytes: int | None = None, eviction_policy: str = "lru"):
+        """
+        Args:
+            max_bytes: Approximate memory budget across all namespaces (None for unbounded)
+            eviction_policy: "lru" evicts the least recently used entry, "lfu" the least frequently used
+        """
+        if eviction_policy not in ("lru", "lfu"):
+            raise ValueError(f"Unknown cache eviction policy: {eviction_policy}")
+
+        self.max_bytes = max_bytes
+        self.eviction_policy = eviction_policy
+        self._lock = threading.RLock()
+        # (namespace, key) -> entry, ordered from least to most recently used
+        self._entries: OrderedDict[tuple[str, str], _CacheEntry] = OrderedDict()
+        self._current_bytes = 0
+        # LFU only: hit count -> keys with that count (least recently used first), and a min-heap of the
+        # counts that may hold stale ones, so the victim is found without scanning every entry
+        self._frequencies: dict[int, OrderedDict[tuple[str, str], None]] = {}
+        self._frequency_heap: list[int] = []
+        self._stats = {namespace: {"entries": 0, "bytes": 0, "hits": 0, "misses": 0, "evictions": 0} for namespace in self.NAMESPACES}
+
+    def _merge_data(self, existing: list[BaseModel] | None, new_data: list[BaseModel], key_field: str) -> list[BaseModel]:
         """Merge existing and new data, avoiding duplicates based on a key field."""
         if not existing:
-            return new_data
+            return list(new_data)
 
         # Create a set of existing keys for O(1) lookup
-        existing_keys = {item[key_field] for item in existing}
+        existing_keys = {getattr(item, key_field) for item in existing}
 
         # Only add items that don't exist yet
         merged = existing.copy()
-        merged.extend([item for item in new_data if item[key_field] not in existing_keys])
+        merged.extend([item for item in new_data if getattr(item, key_field) not in existing_keys])
         return merged
 
-    def get_prices(self, ticker: str) -> list[dict[str, any]] | None:
+    @staticmethod
+    def _estimate_record_size(record: BaseModel) -> int:
+        """Estimate the footprint of one cached record. Field names are interned and not counted."""
+        fields = record.__dict__
+        size = sys.getsizeof(record) + sys.getsizeof(fields) + sum(sys.getsizeof(value) for value in fields.values())
+        # Models that allow extra fields (line items) keep them in a separate dict
+        if extra := record.__pydantic_extra__:
+            size += sys.getsizeof(extra) + sum(sys.getsizeof(value) for value in extra.values())
+        return size
+
+    def _estimate_size(self, namespace: str, data: list[BaseModel]) -> int:
+        """Estimate the footprint of a cached list of records."""
+        if not data:
+            return sys.getsizeof(data)
+        if namespace in _FIXED_SCHEMA_NAMESPACES:
+            return sys.getsizeof(data) + len(data) * self._estimate_record_size(data[0])
+        # Variable-width records (news titles and URLs, line items) are measured individually
+        return sys.getsizeof(data) + sum(self._estimate_record_size(record) for record in data)
+
+    def _get(self, namespace: str, key: str) -> list[BaseModel] | None:
+        if (read_keys := _read_keys.get()) is not None:
+            read_keys.add((namespace, key))
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                self._stats[namespace]["misses"] += 1
+                return None
+            self._entries.move_to_end((namespace, key))
+            self._untrack((namespace, key), entry.hits)
+            entry.hits += 1
+            self._track((namespace, key), entry.hits)
+            self._stats[namespace]["hits"] += 1
+            # Copy the list (not the records) so callers cannot reorder or extend the cached entry
+            return list(entry.data)
+
+    def _set(self, namespace: str, key: str, data: list[BaseModel], key_field: str):
+        with self._lock:
+            existing = self._remove((namespace, key))
+            merged = self._merge_data(existing.data if existing else None, data, key_field=key_field)
+            # Merging only appends new records, so an entry that gained none keeps its version
+            version = existing.version if existing and len(merged) == len(existing.data) else None
+            self._insert((namespace, key), merged, hits=existing.hits if existing else 0, version=version)
+
+    def _insert(self, cache_key: tuple[str, str], data: list[BaseModel], hits: int = 0, version: str | None = None):
+        entry = _CacheEntry(data, self._estimate_size(cache_key[0], data), hits=hits, version=version)
+
+        # An entry that can never fit in the budget is not cached at all
+        if self.max_bytes is not None and entry.size > self.max_bytes:
+            return
+
+        self._entries[cache_key] = entry
+        self._track(cache_key, entry.hits)
+        self._current_bytes += entry.size
+        self._stats[cache_key[0]]["entries"] += 1
+        self._stats[cache_key[0]]["bytes"] += entry.size
+        self._evict()
+
+    def _remove(self, cache_key: tuple[str, str]) -> _CacheEntry | None:
+        entry = self._entries.pop(cache_key, None)
+        if entry is not None:
+            self._untrack(cache_key, entry.hits)
+            self._current_bytes -= entry.size
+            self._stats[cache_key[0]]["entries"] -= 1
+            self._stats[cache_key[0]]["bytes"] -= entry.size
+        return entry
+
+    @staticmethod
+    def _content_version(data: list[BaseModel]) -> str:
+        digest = hashlib.blake2b(digest_size=8)
+        for record in data:
+            digest.update(repr(record.__dict__).encode("utf-8"))
+            if extra := record.__pydantic_extra__:
+                digest.update(repr(extra).encode("utf-8"))
+        return digest.hexdigest()
+
+    @contextmanager
+    def track_reads(self):
+        """
+        Collect the keys read from the cache (hits and misses) in this context and its copies.
+
+        Yields the set of (namespace, key) pairs, e.g. to pass to key_versions() once a computation
+        that fetched its data through the cache is done.
+        """
+        read_keys = set()
+        token = _read_keys.set(read_keys)
+        try:
+            yield read_keys
+        finally:
+            _read_keys.reset(token)
+
+    def key_versions(self, cache_keys) -> dict[tuple[str, str], str | None]:
+        """Get the content version of each key's cached data (None when it is not cached)."""
+        versions = {}
+        with self._lock:
+            for cache_key in cache_keys:
+                entry = self._entries.get(cache_key)
+                if entry is not None and entry.version is None:
+                    entry.version = self._content_version(entry.data)
+                versions[cache_key] = entry.version if entry is not None else None
+        return versions
+
+    def _track(self, cache_key: tuple[str, str], hits: int):
+        if self.eviction_policy != "lfu":
+            return
+        bucket = self._frequencies.get(hits)
+        if bucket is None:
+            bucket = self._frequencies[hits] = OrderedDict()
+            heapq.heappush(self._frequency_heap, hits)
+            # Counts whose buckets emptied are left in the heap; drop them once they dominate it
+            if len(self._frequency_heap) > 2 * len(self._frequencies) + 16:
+                self._frequency_heap = sorted(self._frequencies)
+        bucket[cache_key] = None
+
+    def _untrack(self, cache_key: tuple[str, str], hits: int):
+        if self.eviction_policy != "lfu":
+            return
+        bucket = self._frequencies[hits]
+        del bucket[cache_key]
+        if not bucket:
+            del self._frequencies[hits]
+
+    def _lfu_victim(self) -> tuple[str, str]:
+        # The newest entry has had no chance to be read yet, so it is never the LFU victim.
+        # Each bucket is in least recently used order, so ties fall back to least recently used.
+        newest = next(reversed(self._entries))
+        heap = self._frequency_heap
+        skipped = []
+        try:
+            while True:
+                hits = heap[0]
+                bucket = self._frequencies.get(hits)
+                if bucket is None or hits in skipped:
+                    heapq.heappop(heap)
+                    continue
+                for cache_key in bucket:
+                    if cache_key != newest:
+                        return cache_key
+                # Only the newest entry has the fewest hits; look at the next count
+                skipped.append(heapq.heappop(heap))
+        finally:
+            for hits in skipped:
+                heapq.heappush(heap, hits)
+
+    def _evict(self):
+        """Evict entries until the cache fits in its memory budget."""
+        if self.max_bytes is None:
+            return
+
+        while self._current_bytes > self.max_bytes and self._entries:
+            if self.eviction_policy == "lfu" and len(self._entries) > 1:
+                victim = self._lfu_victim()
+            else:
+                victim = next(iter(self._entries))
+            self._remove(victim)
+            self._stats[victim[0]]["evictions"] += 1
+
+    def get_stats(self) -> dict[str, any]:
+        """Get memory usage and hit/miss/eviction counters, overall and per namespace."""
+        with self._lock:
+            namespaces = {namespace: dict(stats) for namespace, stats in self._stats.items()}
+            current_bytes = self._current_bytes
+            entries = len(self._entries)
+        hits = sum(stats["hits"] for stats in namespaces.values())
+        misses = sum(stats["misses"] for stats in namespaces.values())
+        return {
+            "max_bytes": self.max_bytes,
+            "current_bytes": current_bytes,
+            "entries": entries,
+            "eviction_policy": self.eviction_policy,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "evictions": sum(stats["evictions"] for stats in namespaces.values()),
+            "namespaces": namespaces,
+        }
+
+    def clear(self):
+        """Drop every cached entry. Hit/miss/eviction counters are kept."""
+        with self._lock:
+            for cache_key in list(self._entries):
+                self._remove(cache_key)
+
+    def snapshot(self, tickers: list[str]) -> dict[tuple[str, str], list[BaseModel]]:
+        """Get the cached data of the tickers in every namespace, e.g. to seed another process's cache."""
+        tickers = set(tickers)
+        with self._lock:
+            # Keys start with the ticker, followed by the request's parameters
+            return {cache_key: list(entry.data) for cache_key, entry in self._entries.items() if cache_key[1].partition("_")[0] in tickers}
+
+    def load(self, snapshot: dict[tuple[str, str], list[BaseModel]]):
+        """Merge a snapshot taken from another cache into this one."""
+        for (namespace, key), data in snapshot.items():
+            self._set(namespace, key, data, key_field=self.KEY_FIELDS[namespace])
+
+    def _ticker_keys(self, namespace: str, ticker: str) -> list[tuple[str, str]]:
+        return [cache_key for cache_key in self._entries if cache_key[0] == namespace and cache_key[1].partition("_")[0] == ticker]
+
+    def merge_recent(self, namespace: str, ticker: str, end_date: str, data: list[BaseModel], identity: Callable[[BaseModel], object] | None = None) -> int:
+        """
+        Merge newly published records into the ticker's cached windows that end on end_date.
+
+        Records replace cached ones with the same identity (the namespace's key field by default),
+        e.g. today's price bar as it updates during the day, and each window keeps its sort order.
+        Returns the number of windows updated.
+        """
+        key_field = self.KEY_FIELDS[namespace]
+        identity = identity or (lambda record: getattr(record, key_field))
+        new_ids = {identity(record) for record in data}
+        updated = 0
+        with self._lock:
+            for cache_key in self._ticker_keys(namespace, ticker):
+                # Price keys end with the window's end date; the other keys are followed by a limit
+                parts = cache_key[1].split("_")
+                if (parts[-1] if namespace == "prices" else parts[-2]) != end_date:
+                    continue
+                entry = self._remove(cache_key)
+                descending = len(entry.data) > 1 and getattr(entry.data[0], key_field) > getattr(entry.data[-1], key_field)
+                merged = [record for record in entry.data if identity(record) not in new_ids] + list(data)
+                merged.sort(key=lambda record: getattr(record, key_field), reverse=descending)
+                self._insert(cache_key, merged, hits=entry.hits)
+                updated += 1
+        return updated
+
+    def invalidate(self, namespace: str, ticker: str) -> int:
+        """Drop the ticker's cached entries in a namespace, e.g. after a new report is published."""
+        with self._lock:
+            cache_keys = self._ticker_keys(namespace, ticker)
+            for cache_key in cache_keys:
+                self._remove(cache_key)
+        return len(cache_keys)
+
+    def get_prices(self, ticker: str) -> list[Price] | None:
         """Get cached price data if available."""
-        return self._prices_cache.get(ticker)
+        return self._get("prices", ticker)
 
-    def set_prices(self, ticker: str, data: list[dict[str, any]]):
+    def set_prices(self, ticker: str, data: list[Price]):
         """Append new price data to cache."""
-        self._prices_cache[ticker] = self._merge_data(self._prices_cache.get(ticker), data, key_field="time")
+        self._set("prices", ticker, data, key_field=self.KEY_FIELDS["prices"])
 
-    def get_financial_metrics(self, ticker: str) -> list[dict[str, any]]:
+    def get_financial_metrics(self, ticker: str) -> list[FinancialMetrics] | None:
         """Get cached financial metrics if available."""
-        return self._financial_metrics_cache.get(ticker)
+        return self._get("financial_metrics", ticker)
 
-    def set_financial_metrics(self, ticker: str, data: list[dict[str, any]]):
+    def set_financial_metrics(self, ticker: str, data: list[FinancialMetrics]):
         """Append new financial metrics to cache."""
-        self._financial_metrics_cache[ticker] = self._merge_data(self._financial_metrics_cache.get(ticker), data, key_field="report_period")
+        self._set("financial_metrics", ticker, data, key_field=self.KEY_FIELDS["financial_metrics"])
 
-    def get_line_items(self, ticker: str) -> list[dict[str, any]] | None:
+    def get_line_items(self, ticker: str) -> list[LineItem] | None:
         """Get cached line items if available."""
-        return self._line_items_cache.get(ticker)
+        return self._get("line_items", ticker)
 
-    def set_line_items(self, ticker: str, data: list[dict[str, any]]):
+    def set_line_items(self, ticker: str, data: list[LineItem]):
         """Append new line items to cache."""
-        self._line_items_cache[ticker] = self._merge_data(self._line_items_cache.get(ticker), data, key_field="report_period")
+        self._set("line_items", ticker, data, key_field=self.KEY_FIELDS["line_items"])
 
-    def get_insider_trades(self, ticker: str) -> list[dict[str, any]] | None:
+    def get_insider_trades(self, ticker: str) -> list[InsiderTrade] | None:
         """Get cached insider trades if available."""
-        return self._insider_trades_cache.get(ticker)
+        return self._get("insider_trades", ticker)
 
-    def set_insider_trades(self, ticker: str, data: list[dict[str, any]]):
+    def set_insider_trades(self, ticker: str, data: list[InsiderTrade]):
         """Append new insider trades to cache."""
-        self._insider_trades_cache[ticker] = self._merge_data(self._insider_trades_cache.get(ticker), data, key_field="filing_date")  # Could also use transaction_date if preferred
+        self._set("insider_trades", ticker, data, key_field=self.KEY_FIELDS["insider_trades"])  # Could also use transaction_date if preferred
 
-    def get_company_news(self, ticker: str) -> list[dict[str, any]] | None:
+    def get_company_news(self, ticker: str) -> list[CompanyNews] | None:
         """Get cached company news if available."""
-        return self._company_news_cache.get(ticker)
+        return self._get("company_news", ticker)
 
-    def set_company_news(self, ticker: str, data: list[dict[str, any]]):
+    def set_company_news(self, ticker: str, data: list[CompanyNews]):
         """Append new company news to cache."""
-        self._company_news_cache[ticker] = self._merge_data(self._company_news_cache.get(ticker), data, key_field="date")
+        self._set("company_news", ticker, data, key_field=self.KEY_FIELDS["company_news"])
+
+
+class SingleFlight:
+    """Deduplicates concurrent fetches of the same key across threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> [fetch lock, number of callers holding or waiting on it]
+        self._fetch_locks: dict[str, list] = {}
+
+    @contextmanager
+    def acquire(self, key: str):
+        """
+        Serialize fetches for the same key so only one caller hits the API.
+
+        The first caller for a key acquires the fetch lock and populates the cache;
+        concurrent callers block until it is done. Yields True when another fetch for
+        the key was already in flight, in which case the caller should re-check the
+        cache before fetching itself.
+        """
+        with self._lock:
+            entry = self._fetch_locks.get(key)
+            waited = entry is not None
+            if entry is None:
+                entry = self._fetch_locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+
+        try:
+            with entry[0]:
+                yield waited
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._fetch_locks[key]
+
+    def in_flight(self, key: str) -> bool:
+        """Whether another caller currently holds or waits on the fetch lock of the key."""
+        with self._lock:
+            return key in self._fetch_locks
+
+
+def _max_bytes_from_env() -> int | None:
+    """Read the cache memory budget from CACHE_MAX_MB."""
+    max_mb = float(os.environ.get("CACHE_MAX_MB", DEFAULT_CACHE_MAX_MB))
+    return int(max_mb * 1024 * 1024) if max_mb > 0 else None
 
 
 # Global cache instance
-_cache = Cache()
+_cache = Cache(max_bytes=_max_bytes_from_env(), eviction_policy=os.environ.get("CACHE_EVICTION_POLICY", "lru").lower())
 
 
 def get_cache() -> Cache:
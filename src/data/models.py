@@ -1,7 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class Price(BaseModel):
+    # Cached instances are shared between callers, so they cannot be modified in place
+    model_config = ConfigDict(frozen=True)
+
     open: float
     close: float
     high: float
@@ -16,6 +19,9 @@ class PriceResponse(BaseModel):
 
 
 class FinancialMetrics(BaseModel):
+    # Cached instances are shared between callers, so they cannot be modified in place
+    model_config = ConfigDict(frozen=True)
+
     ticker: str
     report_period: str
     period: str
@@ -80,6 +86,9 @@ class LineItemResponse(BaseModel):
 
 
 class InsiderTrade(BaseModel):
+    # Cached instances are shared between callers, so they cannot be modified in place
+    model_config = ConfigDict(frozen=True)
+
     ticker: str
     issuer: str | None
     name: str | None
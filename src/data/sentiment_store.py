@@ -0,0 +1,114 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.data.models import CompanyNews
+
+# Default location of the headline sentiment database; override with SENTIMENT_STORE_PATH.
+# Point every worker at the same file (e.g. a shared volume) to classify each headline once across the fleet.
+DEFAULT_SENTIMENT_STORE_PATH = Path.home() / ".cache" / "ai-hedge-fund" / "headline_sentiment.db"
+
+
+def article_key(news: CompanyNews) -> str:
+    """Get a stable identity for an article: its URL, or a hash of its ticker and title when it has none."""
+    if news.url:
+        return news.url
+    return hashlib.sha256(f"{news.ticker}\n{news.title}".encode("utf-8")).hexdigest()
+
+
+def sentiment_model_key(model_name: str, model_provider: str) -> str:
+    """Get the identifier under which a model's sentiment labels are stored."""
+    return f"{model_provider}:{model_name}"
+
+
+class SentimentStore:
+    """Persistent store of LLM-classified headline sentiments, keyed by ticker, article and model."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            with self._lock:
+                if not self._initialized:
+                    connection.execute("PRAGMA journal_mode=WAL")
+                    connection.execute(
+                        """
+                        CREATE TABLE IF NOT EXISTS headline_sentiments (
+                            ticker TEXT NOT NULL,
+                            article_key TEXT NOT NULL,
+                            model TEXT NOT NULL,
+                            sentiment TEXT NOT NULL,
+                            confidence REAL,
+                            classified_at TEXT NOT NULL,
+                            PRIMARY KEY (ticker, article_key, model)
+                        )
+                        """
+                    )
+                    connection.commit()
+                    self._initialized = True
+        return connection
+
+    def get_many(self, ticker: str, model: str, articles: list[CompanyNews]) -> dict[str, tuple[str, float | None]]:
+        """
+        Look up stored sentiments for the given articles.
+
+        Returns:
+            Dictionary mapping article keys to (sentiment, confidence) for the articles already classified by ``model``.
+        """
+        keys = list({article_key(news) for news in articles})
+        if not keys:
+            return {}
+
+        labels = {}
+        connection = self._connect()
+        try:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                rows = connection.execute(
+                    f"SELECT article_key, sentiment, confidence FROM headline_sentiments WHERE ticker = ? AND model = ? AND article_key IN ({','.join('?' * len(chunk))})",
+                    [ticker, model, *chunk],
+                ).fetchall()
+                labels.update({key: (sentiment, confidence) for key, sentiment, confidence in rows})
+        finally:
+            connection.close()
+        return labels
+
+    def put_many(self, ticker: str, model: str, labels: list[tuple[CompanyNews, str, float | None]]):
+        """Store (article, sentiment, confidence) labels produced by ``model``."""
+        if not labels:
+            return
+
+        classified_at = datetime.now(timezone.utc).isoformat()
+        connection = self._connect()
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO headline_sentiments (ticker, article_key, model, sentiment, confidence, classified_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(ticker, article_key(news), model, sentiment, confidence, classified_at) for news, sentiment, confidence in labels],
+                )
+        finally:
+            connection.close()
+
+
+_sentiment_store: SentimentStore | None = None
+_sentiment_store_lock = threading.Lock()
+
+
+def get_sentiment_store() -> SentimentStore:
+    """Get the global headline sentiment store, creating its database directory on first use."""
+    global _sentiment_store
+    if _sentiment_store is None:
+        with _sentiment_store_lock:
+            if _sentiment_store is None:
+                path = Path(os.environ.get("SENTIMENT_STORE_PATH") or DEFAULT_SENTIMENT_STORE_PATH)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                _sentiment_store = SentimentStore(path)
+    return _sentiment_store
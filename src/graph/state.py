@@ -1,6 +1,7 @@
 from typing_extensions import Annotated, Sequence, TypedDict
 
-import operator
+import itertools
+import threading
 from langchain_core.messages import BaseMessage
 
 
@@ -11,10 +12,110 @@ def merge_dicts(a: dict[str, any], b: dict[str, any]) -> dict[str, any]:
     return {**a, **b}
 
 
+class MessageLog(Sequence):
+    """
+    Append-only, copy-on-write message log.
+
+    Logs share one backing list and each sees only its first ``len`` entries, so appending to
+    the newest log extends the backing list in place instead of copying the whole history.
+    Appending to an older log (a branch) copies its prefix once.
+    """
+
+    __slots__ = ("_items", "_length")
+    _lock = threading.Lock()
+
+    def __init__(self, messages=(), *, _items: list | None = None, _length: int = 0):
+        if _items is None:
+            _items = list(messages)
+            _length = len(_items)
+        self._items = _items
+        self._length = _length
+
+    def extend(self, messages) -> "MessageLog":
+        """Return a new log with the messages appended; this log is left unchanged."""
+        messages = list(messages)
+        if not messages:
+            return self
+        with self._lock:
+            if len(self._items) == self._length:
+                self._items.extend(messages)
+                return MessageLog(_items=self._items, _length=len(self._items))
+        items = self._items[: self._length] + messages
+        return MessageLog(_items=items, _length=len(items))
+
+    def __add__(self, other) -> "MessageLog":
+        return self.extend(other)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._items[: self._length][index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("MessageLog index out of range")
+        return self._items[index]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self):
+        return itertools.islice(self._items, self._length)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __reduce__(self):
+        return MessageLog, (list(self),)
+
+    def __repr__(self) -> str:
+        return f"MessageLog({list(self)!r})"
+
+
+def append_messages(left: Sequence[BaseMessage], right: Sequence[BaseMessage]) -> MessageLog:
+    """
+    Reducer for the message log: appends a node's new messages to the log.
+
+    Nodes should return only their new messages. A node that returns the full history
+    (``state["messages"] + [message]``) is handled too: the part already in the log is skipped.
+    """
+    if not isinstance(left, MessageLog):
+        left = MessageLog(left)
+    if isinstance(right, MessageLog):
+        if right._items is left._items and len(right) >= len(left):
+            # Already extends the log in place
+            return right
+        shared = 0
+        for mine, theirs in zip(left, right):
+            if mine is not theirs:
+                break
+            shared += 1
+        right = right[shared:]
+    return left.extend(right)
+
+
+def merge_data(a: dict[str, any], b: dict[str, any]) -> dict[str, any]:
+    """
+    Reducer for ``data``: shallow, copy-on-write merge of a node's update into the state.
+
+    ``analyst_signals`` holds one slot per agent. An update only carries the slots its node
+    wrote, and merging copies slot references rather than the signals themselves, so the cost
+    depends on the update and the number of agents, not on tickers or reasoning size.
+    """
+    if b is a or not b:
+        return a
+    merged = {**a, **b}
+    a_signals, b_signals = a.get("analyst_signals"), b.get("analyst_signals")
+    if a_signals and b_signals is not None and b_signals is not a_signals:
+        merged["analyst_signals"] = {**a_signals, **b_signals}
+    return merged
+
+
 # Define agent state
 class AgentState(TypedDict):
-    messages: Annotated[Sequence[BaseMessage], operator.add]
-    data: Annotated[dict[str, any], merge_dicts]
+    messages: Annotated[Sequence[BaseMessage], append_messages]
+    data: Annotated[dict[str, any], merge_data]
     metadata: Annotated[dict[str, any], merge_dicts]
 
 
@@ -0,0 +1,174 @@
+"""Deterministic offline chat model for load and regression testing."""
+
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+import types
+import typing
+from typing import Any, Literal
+
+import annotated_types
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel, PrivateAttr
+
+LatencyDistribution = Literal["fixed", "uniform", "normal", "lognormal"]
+
+
+class MockLLMError(RuntimeError):
+    """Injected failure of the mock provider."""
+
+
+def _prompt_keys(text: str) -> list[str]:
+    """Top-level keys of the first JSON object in the prompt, e.g. the tickers the portfolio manager is asked about."""
+    decoder = json.JSONDecoder()
+    start = text.find("{")
+    while start != -1:
+        try:
+            value, _ = decoder.raw_decode(text, start)
+            if isinstance(value, dict) and value:
+                return [str(key) for key in value]
+        except json.JSONDecodeError:
+            pass
+        start = text.find("{", start + 1)
+    return []
+
+
+def _number_bounds(metadata: list) -> tuple[float, float]:
+    low, high = 0.0, 100.0
+    for constraint in metadata:
+        if isinstance(constraint, (annotated_types.Ge, annotated_types.Gt)):
+            low = float(getattr(constraint, "ge", getattr(constraint, "gt", low)))
+        elif isinstance(constraint, (annotated_types.Le, annotated_types.Lt)):
+            high = float(getattr(constraint, "le", getattr(constraint, "lt", high)))
+    return low, max(low, high)
+
+
+def fake_value(annotation: Any, rng: random.Random, name: str, dict_keys: list[str], metadata: list | None = None) -> Any:
+    """Generate a random value that validates against ``annotation``."""
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+
+    if origin is Literal:
+        return rng.choice(args)
+    if origin in (typing.Union, types.UnionType):
+        return fake_value(next(arg for arg in args if arg is not type(None)), rng, name, dict_keys)
+    if origin is typing.Annotated:
+        return fake_value(args[0], rng, name, dict_keys, list(args[1:]))
+    if origin is list:
+        return [fake_value(args[0] if args else str, rng, name, dict_keys) for _ in range(rng.randint(1, 3))]
+    if origin is dict:
+        value_type = args[1] if len(args) == 2 else str
+        return {key: fake_value(value_type, rng, name, dict_keys) for key in (dict_keys or ["MOCK"])}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return fake_instance(annotation, rng, dict_keys)
+    if annotation is bool:
+        return rng.random() < 0.5
+    if annotation is int:
+        low, high = _number_bounds(metadata or [])
+        return rng.randint(int(low), int(high))
+    if annotation is float:
+        low, high = _number_bounds(metadata or [])
+        return round(rng.uniform(low, high), 2)
+    if annotation is str:
+        return f"Mock {name.replace('_', ' ')} {rng.randint(0, 9999)}"
+    return None
+
+
+def fake_instance(model: type[BaseModel], rng: random.Random, dict_keys: list[str] | None = None) -> dict:
+    """Generate field values for a pydantic model."""
+    return {name: fake_value(field.annotation, rng, name, dict_keys or [], field.metadata) for name, field in model.model_fields.items()}
+
+
+class MockChatModel(BaseChatModel):
+    """
+    Chat model that answers every prompt with schema-valid JSON, without any network access.
+
+    Outputs, latencies and injected failures are drawn from a random generator seeded with
+    ``seed``, the prompt and the attempt number, so runs are reproducible regardless of how
+    concurrent calls interleave.
+    """
+
+    model_name: str = "mock"
+    latency_distribution: LatencyDistribution = "fixed"
+    latency_mean_ms: float = 0.0
+    latency_stddev_ms: float = 0.0
+    failure_rate: float = 0.0
+    seed: int = 0
+    structured_schema: type[BaseModel] | None = None
+
+    _attempts: dict[str, int] = PrivateAttr(default_factory=dict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @classmethod
+    def from_env(cls, model_name: str = "mock") -> "MockChatModel":
+        """Configure from MOCK_LLM_LATENCY, MOCK_LLM_LATENCY_MS, MOCK_LLM_LATENCY_STDDEV_MS, MOCK_LLM_FAILURE_RATE and MOCK_LLM_SEED."""
+        return cls(
+            model_name=model_name,
+            latency_distribution=os.environ.get("MOCK_LLM_LATENCY", "fixed"),
+            latency_mean_ms=float(os.environ.get("MOCK_LLM_LATENCY_MS", "0")),
+            latency_stddev_ms=float(os.environ.get("MOCK_LLM_LATENCY_STDDEV_MS", "0")),
+            failure_rate=float(os.environ.get("MOCK_LLM_FAILURE_RATE", "0")),
+            seed=int(os.environ.get("MOCK_LLM_SEED", "0")),
+        )
+
+    @property
+    def _llm_type(self) -> str:
+        return "mock"
+
+    def _latency_seconds(self, rng: random.Random) -> float:
+        mean, stddev = self.latency_mean_ms, self.latency_stddev_ms
+        if self.latency_distribution == "uniform":
+            latency = rng.uniform(max(mean - stddev, 0), mean + stddev)
+        elif self.latency_distribution == "normal":
+            latency = rng.gauss(mean, stddev)
+        elif self.latency_distribution == "lognormal" and mean > 0:
+            # Parameterized by the mean and standard deviation of the latency itself (heavy right tail)
+            sigma2 = math.log(1 + (stddev / mean) ** 2)
+            latency = rng.lognormvariate(math.log(mean) - sigma2 / 2, math.sqrt(sigma2))
+        else:
+            latency = mean
+        return max(latency, 0.0) / 1000
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        digest = hashlib.sha256(f"{self.seed}\n{self.model_name}\n{prompt}".encode("utf-8")).hexdigest()
+        with self._lock:
+            attempt = self._attempts.get(digest, 0)
+            self._attempts[digest] = attempt + 1
+        rng = random.Random(f"{digest}:{attempt}")
+
+        time.sleep(self._latency_seconds(rng))
+        if rng.random() < self.failure_rate:
+            raise MockLLMError(f"Injected mock LLM failure (attempt {attempt + 1})")
+
+        if self.structured_schema is not None:
+            payload = fake_instance(self.structured_schema, rng, _prompt_keys(prompt))
+        else:
+            payload = {"response": f"Mock response {rng.randint(0, 9999)}"}
+        content = json.dumps(payload)
+
+        # Rough 4-characters-per-token estimate so usage tracking has something to aggregate
+        input_tokens, output_tokens = len(prompt) // 4 + 1, len(content) // 4 + 1
+        message = AIMessage(
+            content=content,
+            usage_metadata={"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens},
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def with_structured_output(self, schema, *, include_raw: bool = False, **kwargs: Any):
+        model = self.model_copy(update={"structured_schema": schema})
+        return model | RunnableLambda(lambda message: schema.model_validate_json(message.content))
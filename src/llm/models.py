@@ -1,19 +1,21 @@
+from __future__ import annotations
+
 import os
 import json
-from langchain_anthropic import ChatAnthropic
-from langchain_deepseek import ChatDeepSeek
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_groq import ChatGroq
-from langchain_xai import ChatXAI
-from langchain_openai import ChatOpenAI, AzureChatOpenAI
-from langchain_openai import ChatOpenAI
-from langchain_gigachat import GigaChat
-from langchain_ollama import ChatOllama
 from enum import Enum
 from pydantic import BaseModel
-from typing import Tuple, List
+from typing import TYPE_CHECKING, Tuple, List
 from pathlib import Path
 
+# Provider SDKs are imported by get_model when a model of theirs is first requested, since importing
+# all of them takes seconds and a run typically uses one
+if TYPE_CHECKING:
+    from langchain_gigachat import GigaChat
+    from langchain_groq import ChatGroq
+    from langchain_ollama import ChatOllama
+    from langchain_openai import ChatOpenAI
+    from src.llm.mock import MockChatModel
+
 
 class ModelProvider(str, Enum):
     """Enum for supported LLM providers"""
@@ -31,6 +33,7 @@ class ModelProvider(str, Enum):
     GIGACHAT = "GigaChat"
     AZURE_OPENAI = "Azure OpenAI"
     XAI = "xAI"
+    MOCK = "Mock"
 
 
 class LLMModel(BaseModel):
@@ -129,8 +132,22 @@ def get_models_list():
     ]
 
 
-def get_model(model_name: str, model_provider: ModelProvider, api_keys: dict = None) -> ChatOpenAI | ChatGroq | ChatOllama | GigaChat | None:
-    if model_provider == ModelProvider.GROQ:
+def get_ollama_base_url() -> str:
+    """Get the Ollama server URL used for model requests."""
+    # Check if OLLAMA_HOST is set (for Docker on macOS)
+    ollama_host = os.getenv("OLLAMA_HOST", "localhost")
+    return os.getenv("OLLAMA_BASE_URL", f"http://{ollama_host}:11434")
+
+
+def get_model(model_name: str, model_provider: ModelProvider, api_keys: dict = None) -> ChatOpenAI | ChatGroq | ChatOllama | GigaChat | MockChatModel | None:
+    if model_provider == ModelProvider.MOCK:
+        from src.llm.mock import MockChatModel
+
+        # Offline, deterministic model for load and regression testing (see src/llm/mock.py)
+        return MockChatModel.from_env(model_name)
+    elif model_provider == ModelProvider.GROQ:
+        from langchain_groq import ChatGroq
+
         api_key = (api_keys or {}).get("GROQ_API_KEY") or os.getenv("GROQ_API_KEY")
         if not api_key:
             # Print error to console
@@ -138,6 +155,8 @@ def get_model(model_name: str, model_provider: ModelProvider, api_keys: dict = N
             raise ValueError("Groq API key not found.  Please make sure GROQ_API_KEY is set in your .env file or provided via API keys.")
         return ChatGroq(model=model_name, api_key=api_key)
     elif model_provider == ModelProvider.OPENAI:
+        from langchain_openai import ChatOpenAI
+
         # Get and validate API key
         api_key = (api_keys or {}).get("OPENAI_API_KEY") or os.getenv("OPENAI_API_KEY")
         base_url = os.getenv("OPENAI_API_BASE")
@@ -147,33 +166,42 @@ def get_model(model_name: str, model_provider: ModelProvider, api_keys: dict = N
             raise ValueError("OpenAI API key not found.  Please make sure OPENAI_API_KEY is set in your .env file or provided via API keys.")
         return ChatOpenAI(model=model_name, api_key=api_key, base_url=base_url)
     elif model_provider == ModelProvider.ANTHROPIC:
+        from langchain_anthropic import ChatAnthropic
+
         api_key = (api_keys or {}).get("ANTHROPIC_API_KEY") or os.getenv("ANTHROPIC_API_KEY")
         if not api_key:
             print(f"API Key Error: Please make sure ANTHROPIC_API_KEY is set in your .env file or provided via API keys.")
             raise ValueError("Anthropic API key not found.  Please make sure ANTHROPIC_API_KEY is set in your .env file or provided via API keys.")
         return ChatAnthropic(model=model_name, api_key=api_key)
     elif model_provider == ModelProvider.DEEPSEEK:
+        from langchain_deepseek import ChatDeepSeek
+
         api_key = (api_keys or {}).get("DEEPSEEK_API_KEY") or os.getenv("DEEPSEEK_API_KEY")
         if not api_key:
             print(f"API Key Error: Please make sure DEEPSEEK_API_KEY is set in your .env file or provided via API keys.")
             raise ValueError("DeepSeek API key not found.  Please make sure DEEPSEEK_API_KEY is set in your .env file or provided via API keys.")
         return ChatDeepSeek(model=model_name, api_key=api_key)
     elif model_provider == ModelProvider.GOOGLE:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
         api_key = (api_keys or {}).get("GOOGLE_API_KEY") or os.getenv("GOOGLE_API_KEY")
         if not api_key:
             print(f"API Key Error: Please make sure GOOGLE_API_KEY is set in your .env file or provided via API keys.")
             raise ValueError("Google API key not found.  Please make sure GOOGLE_API_KEY is set in your .env file or provided via API keys.")
         return ChatGoogleGenerativeAI(model=model_name, api_key=api_key)
     elif model_provider == ModelProvider.OLLAMA:
+        from langchain_ollama import ChatOllama
+        from src.utils.ollama import DEFAULT_OLLAMA_KEEP_ALIVE
+
         # For Ollama, we use a base URL instead of an API key
-        # Check if OLLAMA_HOST is set (for Docker on macOS)
-        ollama_host = os.getenv("OLLAMA_HOST", "localhost")
-        base_url = os.getenv("OLLAMA_BASE_URL", f"http://{ollama_host}:11434")
         return ChatOllama(
             model=model_name,
-            base_url=base_url,
+            base_url=get_ollama_base_url(),
+            keep_alive=os.getenv("OLLAMA_KEEP_ALIVE") or DEFAULT_OLLAMA_KEEP_ALIVE,
         )
     elif model_provider == ModelProvider.OPENROUTER:
+        from langchain_openai import ChatOpenAI
+
         api_key = (api_keys or {}).get("OPENROUTER_API_KEY") or os.getenv("OPENROUTER_API_KEY")
         if not api_key:
             print(f"API Key Error: Please make sure OPENROUTER_API_KEY is set in your .env file or provided via API keys.")
@@ -195,12 +223,16 @@ def get_model(model_name: str, model_provider: ModelProvider, api_keys: dict = N
             }
         )
     elif model_provider == ModelProvider.XAI:
+        from langchain_xai import ChatXAI
+
         api_key = (api_keys or {}).get("XAI_API_KEY") or os.getenv("XAI_API_KEY")
         if not api_key:
             print(f"API Key Error: Please make sure XAI_API_KEY is set in your .env file or provided via API keys.")
             raise ValueError("xAI API key not found. Please make sure XAI_API_KEY is set in your .env file or provided via API keys.")
         return ChatXAI(model=model_name, api_key=api_key)
     elif model_provider == ModelProvider.GIGACHAT:
+        from langchain_gigachat import GigaChat
+
         if os.getenv("GIGACHAT_USER") or os.getenv("GIGACHAT_PASSWORD"):
             return GigaChat(model=model_name)
         else: 
@@ -211,6 +243,8 @@ def get_model(model_name: str, model_provider: ModelProvider, api_keys: dict = N
 
             return GigaChat(credentials=api_key, model=model_name)
     elif model_provider == ModelProvider.AZURE_OPENAI:
+        from langchain_openai import AzureChatOpenAI
+
         # Get and validate API key
         api_key = os.getenv("AZURE_OPENAI_API_KEY")
         if not api_key:
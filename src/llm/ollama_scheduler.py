@@ -0,0 +1,115 @@
+"""Scheduling of requests to a local Ollama server: model warm-up, keep-alive and per-model concurrency caps."""
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+
+# Lower values are served first. Warm-up loads run before everything else so queued requests
+# wait for the model to load instead of each triggering (and timing out on) the load.
+PRELOAD_PRIORITY = -1
+PORTFOLIO_MANAGER_PRIORITY = 0
+RISK_MANAGER_PRIORITY = 1
+ANALYST_PRIORITY = 2
+
+
+def agent_priority(agent_name: str | None) -> int:
+    """Priority of an agent's requests: the portfolio manager ahead of risk managers, ahead of analysts."""
+    if agent_name and agent_name.startswith("portfolio_manager"):
+        return PORTFOLIO_MANAGER_PRIORITY
+    if agent_name and agent_name.startswith("risk_management_agent"):
+        return RISK_MANAGER_PRIORITY
+    return ANALYST_PRIORITY
+
+
+class OllamaScheduler:
+    """
+    Caps in-flight requests per Ollama model and serves waiting requests in priority order.
+
+    Concurrent analyst threads otherwise all hit a single local server at once, which then
+    thrashes between requests (or models) instead of finishing any of them.
+    """
+
+    def __init__(self, max_concurrency: int = 2, keep_alive: str | None = None):
+        self.max_concurrency = max(1, max_concurrency)
+        self.keep_alive = keep_alive
+        self._condition = threading.Condition()
+        self._in_flight: dict[str, int] = {}
+        self._waiting: dict[str, list[tuple[int, int]]] = {}
+        self._sequence = itertools.count()
+        self._warmed: dict[str, float] = {}
+
+    @contextmanager
+    def slot(self, model_name: str, priority: int = ANALYST_PRIORITY):
+        """Wait for a free request slot for the model; ties in priority are served first come, first served."""
+        ticket = (priority, next(self._sequence))
+        with self._condition:
+            queue = self._waiting.setdefault(model_name, [])
+            heapq.heappush(queue, ticket)
+            while queue[0] != ticket or self._in_flight.get(model_name, 0) >= self.max_concurrency:
+                self._condition.wait()
+            heapq.heappop(queue)
+            self._in_flight[model_name] = self._in_flight.get(model_name, 0) + 1
+            # The next waiter may also fit under the cap
+            self._condition.notify_all()
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight[model_name] -= 1
+                self._condition.notify_all()
+
+    def run(self, fn: Callable[[], T], model_name: str, priority: int = ANALYST_PRIORITY) -> T:
+        """Call fn while holding a request slot for the model."""
+        with self.slot(model_name, priority):
+            return fn()
+
+    def preload(self, model_names: Iterable[str], base_url: str | None = None, background: bool = True):
+        """
+        Load models into server memory ahead of their first request, with the configured keep-alive.
+
+        Models warmed within the last minute are skipped, so calling this at the start of every
+        run (or backtest day) is cheap.
+        """
+        from src.utils.ollama import preload_model
+
+        now = time.monotonic()
+        with self._condition:
+            models = [name for name in dict.fromkeys(model_names) if now - self._warmed.get(name, float("-inf")) > 60]
+            for name in models:
+                self._warmed[name] = now
+
+        def _load(name: str):
+            with self.slot(name, PRELOAD_PRIORITY):
+                if not preload_model(name, self.keep_alive, base_url):
+                    # Let the next run retry the warm-up
+                    with self._condition:
+                        self._warmed.pop(name, None)
+
+        for name in models:
+            if background:
+                threading.Thread(target=_load, args=(name,), name=f"ollama-preload-{name}", daemon=True).start()
+            else:
+                _load(name)
+
+
+_scheduler: OllamaScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_ollama_scheduler() -> OllamaScheduler:
+    """Get the shared scheduler, configured by OLLAMA_MAX_CONCURRENCY (default 2) and OLLAMA_KEEP_ALIVE."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = OllamaScheduler(
+                    max_concurrency=int(os.environ.get("OLLAMA_MAX_CONCURRENCY", "2")),
+                    keep_alive=os.environ.get("OLLAMA_KEEP_ALIVE"),
+                )
+    return _scheduler
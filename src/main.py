@@ -1,16 +1,21 @@
 import sys
+from contextlib import nullcontext
 
 from dotenv import load_dotenv
 from langchain_core.messages import HumanMessage
 from langgraph.graph import END, StateGraph
 from colorama import Fore, Style, init
-import questionary
 from src.agents.portfolio_manager import portfolio_management_agent
 from src.agents.risk_manager import risk_management_agent
 from src.graph.state import AgentState
-from src.utils.display import print_trading_output
+from src.llm.models import ModelProvider, get_ollama_base_url
+from src.llm.ollama_scheduler import get_ollama_scheduler
+from src.tools.sentiment_scorer import sentiment_metadata
+from src.utils.display import print_trace_summary, print_trading_output, print_usage_summary
 from src.utils.analysts import ANALYST_ORDER, get_analyst_nodes
 from src.utils.progress import progress
+from src.utils.tracing import trace_run, traced_node
+from src.utils.usage import track_usage
 from src.utils.visualize import save_graph_as_png
 from src.cli.input import (
     parse_cli_inputs,
@@ -52,6 +57,9 @@ def run_hedge_fund(
     selected_analysts: list[str] = [],
     model_name: str = "gpt-4.1",
     model_provider: str = "OpenAI",
+    trace_path: str | None = None,
+    sentiment_offline: bool = False,
+    sentiment_threshold: float | None = None,
 ):
     # Start progress tracking
     progress.start()
@@ -61,31 +69,40 @@ def run_hedge_fund(
         workflow = create_workflow(selected_analysts if selected_analysts else None)
         agent = workflow.compile()
 
-        final_state = agent.invoke(
-            {
-                "messages": [
-                    HumanMessage(
-                        content="Make trading decisions based on the provided data.",
-                    )
-                ],
-                "data": {
-                    "tickers": tickers,
-                    "portfolio": portfolio,
-                    "start_date": start_date,
-                    "end_date": end_date,
-                    "analyst_signals": {},
+        # Load a local model while the analysts fetch their data, rather than on the first request
+        if model_provider == ModelProvider.OLLAMA:
+            get_ollama_scheduler().preload([model_name], base_url=get_ollama_base_url())
+
+        # Optionally trace where the run's time goes, exported as a Chrome trace to trace_path
+        with track_usage() as usage, (trace_run(trace_path) if trace_path else nullcontext()) as tracer:
+            final_state = agent.invoke(
+                {
+                    "messages": [
+                        HumanMessage(
+                            content="Make trading decisions based on the provided data.",
+                        )
+                    ],
+                    "data": {
+                        "tickers": tickers,
+                        "portfolio": portfolio,
+                        "start_date": start_date,
+                        "end_date": end_date,
+                        "analyst_signals": {},
+                    },
+                    "metadata": {
+                        "show_reasoning": show_reasoning,
+                        "model_name": model_name,
+                        "model_provider": model_provider,
+                        **sentiment_metadata(sentiment_offline, sentiment_threshold),
+                    },
                 },
-                "metadata": {
-                    "show_reasoning": show_reasoning,
-                    "model_name": model_name,
-                    "model_provider": model_provider,
-                },
-            },
-        )
+            )
 
         return {
             "decisions": parse_hedge_fund_response(final_state["messages"][-1].content),
             "analyst_signals": final_state["data"]["analyst_signals"],
+            "usage": usage.summary(),
+            "trace": tracer.summary() if tracer else None,
         }
     finally:
         # Stop progress tracking
@@ -111,12 +128,12 @@ def create_workflow(selected_analysts=None):
     # Add selected analyst nodes
     for analyst_key in selected_analysts:
         node_name, node_func = analyst_nodes[analyst_key]
-        workflow.add_node(node_name, node_func)
+        workflow.add_node(node_name, traced_node(node_func, node_name))
         workflow.add_edge("start_node", node_name)
 
     # Always add risk and portfolio management
-    workflow.add_node("risk_management_agent", risk_management_agent)
-    workflow.add_node("portfolio_manager", portfolio_management_agent)
+    workflow.add_node("risk_management_agent", traced_node(risk_management_agent, "risk_management_agent"))
+    workflow.add_node("portfolio_manager", traced_node(portfolio_management_agent, "portfolio_manager"))
 
     # Connect selected analysts to risk management
     for analyst_key in selected_analysts:
@@ -137,6 +154,7 @@ if __name__ == "__main__":
         default_months_back=None,
         include_graph_flag=True,
         include_reasoning_flag=True,
+        include_trace_flag=True,
     )
 
     tickers = inputs.tickers
@@ -175,5 +193,10 @@ if __name__ == "__main__":
         selected_analysts=inputs.selected_analysts,
         model_name=inputs.model_name,
         model_provider=inputs.model_provider,
+        trace_path=inputs.trace_path,
+        sentiment_offline=inputs.sentiment_offline,
+        sentiment_threshold=inputs.sentiment_threshold,
     )
     print_trading_output(result)
+    print_usage_summary(result.get("usage"))
+    print_trace_summary(result.get("trace"), inputs.trace_path)
@@ -3,8 +3,13 @@ import os
 import pandas as pd
 import requests
 import time
+from urllib.parse import parse_qs, urlparse
+from pydantic import BaseModel
 
-from src.data.cache import get_cache
+from src.data.cache import SingleFlight, get_cache
+from src.data.sentiment_store import article_key, get_sentiment_store
+from src.utils.tracing import span
+from src.utils.usage import record_api_call
 from src.data.models import (
     CompanyNews,
     CompanyNewsResponse,
@@ -22,6 +27,9 @@ from src.data.models import (
 # Global cache instance
 _cache = get_cache()
 
+# Deduplicates concurrent fetches of the same cache key
+_single_flight = SingleFlight()
+
 
 def _make_api_request(url: str, headers: dict, method: str = "GET", json_data: dict = None, max_retries: int = 3) -> requests.Response:
     """
@@ -40,33 +48,85 @@ def _make_api_request(url: str, headers: dict, method: str = "GET", json_data: d
     Raises:
         Exception: If the request fails with a non-429 error
     """
-    for attempt in range(max_retries + 1):  # +1 for initial attempt
-        if method.upper() == "POST":
-            response = requests.post(url, headers=headers, json=json_data)
-        else:
-            response = requests.get(url, headers=headers)
-        
-        if response.status_code == 429 and attempt < max_retries:
-            # Linear backoff: 60s, 90s, 120s, 150s...
-            delay = 60 + (30 * attempt)
-            print(f"Rate limited (429). Attempt {attempt + 1}/{max_retries + 1}. Waiting {delay}s before retrying...")
-            time.sleep(delay)
-            continue
-        
-        # Return the response (whether success, other errors, or final 429)
-        return response
-
-
-def get_prices(ticker: str, start_date: str, end_date: str, api_key: str = None) -> list[Price]:
-    """Fetch price data from cache or API."""
+    with span(urlparse(url).path, "api", method=method.upper()) as request_span:
+        if request_span is not None:
+            ticker = parse_qs(urlparse(url).query).get("ticker", [None])[0] or (json_data or {}).get("ticker")
+            if ticker:
+                request_span.attributes["ticker"] = ticker
+        start_time = time.perf_counter()
+        response = None
+        retries = 0
+        try:
+            for attempt in range(max_retries + 1):  # +1 for initial attempt
+                if method.upper() == "POST":
+                    response = requests.post(url, headers=headers, json=json_data)
+                else:
+                    response = requests.get(url, headers=headers)
+            
+                if response.status_code == 429 and attempt < max_retries:
+                    # Linear backoff: 60s, 90s, 120s, 150s...
+                    delay = 60 + (30 * attempt)
+                    print(f"Rate limited (429). Attempt {attempt + 1}/{max_retries + 1}. Waiting {delay}s before retrying...")
+                    time.sleep(delay)
+                    retries += 1
+                    continue
+            
+                # Return the response (whether success, other errors, or final 429)
+                return response
+        finally:
+            # Record wall time (including backoff) and retries per endpoint, without query parameters
+            record_api_call(
+                urlparse(url).path,
+                latency=time.perf_counter() - start_time,
+                retries=retries,
+                status_code=getattr(response, "status_code", None),
+            )
+
+
+def get_prices(
+    ticker: str,
+    start_date: str,
+    end_date: str,
+    api_key: str = None,
+    use_cache: bool = True,
+    columns: list[str] | None = None,
+) -> list[Price] | dict[str, list]:
+    """
+    Fetch price data from cache or API. With use_cache=False, fetch from the API and leave the cache untouched.
+
+    With columns, return only those fields as a column-oriented dict (see records_to_columns).
+    """
+    prices = _get_prices(ticker, start_date, end_date, api_key, use_cache)
+    return records_to_columns(prices, columns) if columns is not None else prices
+
+
+def _get_prices(ticker: str, start_date: str, end_date: str, api_key: str, use_cache: bool) -> list[Price]:
+    if not use_cache:
+        return _fetch_prices(ticker, start_date, end_date, api_key)
+
     # Create a cache key that includes all parameters to ensure exact matches
     cache_key = f"{ticker}_{start_date}_{end_date}"
     
-    # Check cache first - simple exact match
+    # Check cache first - simple exact match. Hits return the stored, already-validated models
     if cached_data := _cache.get_prices(cache_key):
-        return [Price(**price) for price in cached_data]
+        return cached_data
+
+    # Only one caller fetches a given key; concurrent callers wait and then hit the cache
+    with _single_flight.acquire(f"prices:{cache_key}") as waited:
+        if waited and (cached_data := _cache.get_prices(cache_key)):
+            return cached_data
+
+        # If not in cache, fetch from API
+        prices = _fetch_prices(ticker, start_date, end_date, api_key)
+        if not prices:
+            return []
+
+        # Cache the results using the comprehensive cache key
+        _cache.set_prices(cache_key, prices)
+        return prices
 
-    # If not in cache, fetch from API
+
+def _fetch_prices(ticker: str, start_date: str, end_date: str, api_key: str = None) -> list[Price]:
     headers = {}
     financial_api_key = api_key or os.environ.get("FINANCIAL_DATASETS_API_KEY")
     if financial_api_key:
@@ -79,14 +139,7 @@ def get_prices(ticker: str, start_date: str, end_date: str, api_key: str = None)
 
     # Parse response with Pydantic model
     price_response = PriceResponse(**response.json())
-    prices = price_response.prices
-
-    if not prices:
-        return []
-
-    # Cache the results using the comprehensive cache key
-    _cache.set_prices(cache_key, [p.model_dump() for p in prices])
-    return prices
+    return price_response.prices
 
 
 def get_financial_metrics(
@@ -95,16 +148,45 @@ def get_financial_metrics(
     period: str = "ttm",
     limit: int = 10,
     api_key: str = None,
-) -> list[FinancialMetrics]:
-    """Fetch financial metrics from cache or API."""
+    use_cache: bool = True,
+    columns: list[str] | None = None,
+) -> list[FinancialMetrics] | dict[str, list]:
+    """
+    Fetch financial metrics from cache or API. With use_cache=False, fetch from the API and leave the cache untouched.
+
+    With columns, return only those fields as a column-oriented dict (see records_to_columns).
+    """
+    financial_metrics = _get_financial_metrics(ticker, end_date, period, limit, api_key, use_cache)
+    return records_to_columns(financial_metrics, columns) if columns is not None else financial_metrics
+
+
+def _get_financial_metrics(ticker: str, end_date: str, period: str, limit: int, api_key: str, use_cache: bool) -> list[FinancialMetrics]:
+    if not use_cache:
+        return _fetch_financial_metrics(ticker, end_date, period, limit, api_key)
+
     # Create a cache key that includes all parameters to ensure exact matches
     cache_key = f"{ticker}_{period}_{end_date}_{limit}"
     
     # Check cache first - simple exact match
     if cached_data := _cache.get_financial_metrics(cache_key):
-        return [FinancialMetrics(**metric) for metric in cached_data]
+        return cached_data
+
+    # Only one caller fetches a given key; concurrent callers wait and then hit the cache
+    with _single_flight.acquire(f"financial_metrics:{cache_key}") as waited:
+        if waited and (cached_data := _cache.get_financial_metrics(cache_key)):
+            return cached_data
+
+        # If not in cache, fetch from API
+        financial_metrics = _fetch_financial_metrics(ticker, end_date, period, limit, api_key)
+        if not financial_metrics:
+            return []
+
+        # Cache the validated models using the comprehensive cache key
+        _cache.set_financial_metrics(cache_key, financial_metrics)
+        return financial_metrics
 
-    # If not in cache, fetch from API
+
+def _fetch_financial_metrics(ticker: str, end_date: str, period: str, limit: int, api_key: str = None) -> list[FinancialMetrics]:
     headers = {}
     financial_api_key = api_key or os.environ.get("FINANCIAL_DATASETS_API_KEY")
     if financial_api_key:
@@ -117,14 +199,7 @@ def get_financial_metrics(
 
     # Parse response with Pydantic model
     metrics_response = FinancialMetricsResponse(**response.json())
-    financial_metrics = metrics_response.financial_metrics
-
-    if not financial_metrics:
-        return []
-
-    # Cache the results as dicts using the comprehensive cache key
-    _cache.set_financial_metrics(cache_key, [m.model_dump() for m in financial_metrics])
-    return financial_metrics
+    return metrics_response.financial_metrics
 
 
 def search_line_items(
@@ -170,16 +245,45 @@ def get_insider_trades(
     start_date: str | None = None,
     limit: int = 1000,
     api_key: str = None,
-) -> list[InsiderTrade]:
-    """Fetch insider trades from cache or API."""
+    use_cache: bool = True,
+    columns: list[str] | None = None,
+) -> list[InsiderTrade] | dict[str, list]:
+    """
+    Fetch insider trades from cache or API. With use_cache=False, fetch from the API and leave the cache untouched.
+
+    With columns, return only those fields as a column-oriented dict (see records_to_columns).
+    """
+    trades = _get_insider_trades(ticker, end_date, start_date, limit, api_key, use_cache)
+    return records_to_columns(trades, columns) if columns is not None else trades
+
+
+def _get_insider_trades(ticker: str, end_date: str, start_date: str | None, limit: int, api_key: str, use_cache: bool) -> list[InsiderTrade]:
+    if not use_cache:
+        return _fetch_insider_trades(ticker, end_date, start_date, limit, api_key)
+
     # Create a cache key that includes all parameters to ensure exact matches
     cache_key = f"{ticker}_{start_date or 'none'}_{end_date}_{limit}"
     
     # Check cache first - simple exact match
     if cached_data := _cache.get_insider_trades(cache_key):
-        return [InsiderTrade(**trade) for trade in cached_data]
+        return cached_data
+
+    # Only one caller fetches a given key; concurrent callers wait and then hit the cache
+    with _single_flight.acquire(f"insider_trades:{cache_key}") as waited:
+        if waited and (cached_data := _cache.get_insider_trades(cache_key)):
+            return cached_data
+
+        # If not in cache, fetch from API
+        all_trades = _fetch_insider_trades(ticker, end_date, start_date, limit, api_key)
+        if not all_trades:
+            return []
+
+        # Cache the results using the comprehensive cache key
+        _cache.set_insider_trades(cache_key, all_trades)
+        return all_trades
 
-    # If not in cache, fetch from API
+
+def _fetch_insider_trades(ticker: str, end_date: str, start_date: str | None, limit: int, api_key: str = None) -> list[InsiderTrade]:
     headers = {}
     financial_api_key = api_key or os.environ.get("FINANCIAL_DATASETS_API_KEY")
     if financial_api_key:
@@ -218,11 +322,6 @@ def get_insider_trades(
         if current_end_date <= start_date:
             break
 
-    if not all_trades:
-        return []
-
-    # Cache the results using the comprehensive cache key
-    _cache.set_insider_trades(cache_key, [trade.model_dump() for trade in all_trades])
     return all_trades
 
 
@@ -232,16 +331,71 @@ def get_company_news(
     start_date: str | None = None,
     limit: int = 1000,
     api_key: str = None,
+    sentiment_model: str | None = None,
+    use_cache: bool = True,
 ) -> list[CompanyNews]:
-    """Fetch company news from cache or API."""
+    """
+    Fetch company news from cache or API. With use_cache=False, fetch from the API and leave the cache untouched.
+
+    If ``sentiment_model`` is given (see ``sentiment_model_key``), articles without a
+    sentiment are labeled with that model's stored classifications from the headline
+    sentiment store.
+    """
+    company_news = _get_company_news(ticker, end_date, start_date=start_date, limit=limit, api_key=api_key, use_cache=use_cache)
+    if sentiment_model and company_news:
+        company_news = _apply_stored_sentiments(ticker, company_news, sentiment_model)
+    return company_news
+
+
+def _apply_stored_sentiments(ticker: str, company_news: list[CompanyNews], sentiment_model: str) -> list[CompanyNews]:
+    """Fill in missing article sentiments from the headline sentiment store."""
+    unlabeled = [news for news in company_news if news.sentiment is None]
+    if not unlabeled:
+        return company_news
+
+    labels = get_sentiment_store().get_many(ticker, sentiment_model, unlabeled)
+    if not labels:
+        return company_news
+
+    # Cached articles are shared, so labeled articles are returned as copies
+    return [news.model_copy(update={"sentiment": labels[key][0]}) if news.sentiment is None and (key := article_key(news)) in labels else news for news in company_news]
+
+
+def _get_company_news(
+    ticker: str,
+    end_date: str,
+    start_date: str | None = None,
+    limit: int = 1000,
+    api_key: str = None,
+    use_cache: bool = True,
+) -> list[CompanyNews]:
+    """Fetch company news from cache or API. With use_cache=False, fetch from the API and leave the cache untouched."""
+    if not use_cache:
+        return _fetch_company_news(ticker, end_date, start_date, limit, api_key)
+
     # Create a cache key that includes all parameters to ensure exact matches
     cache_key = f"{ticker}_{start_date or 'none'}_{end_date}_{limit}"
     
     # Check cache first - simple exact match
     if cached_data := _cache.get_company_news(cache_key):
-        return [CompanyNews(**news) for news in cached_data]
+        return cached_data
+
+    # Only one caller fetches a given key; concurrent callers wait and then hit the cache
+    with _single_flight.acquire(f"company_news:{cache_key}") as waited:
+        if waited and (cached_data := _cache.get_company_news(cache_key)):
+            return cached_data
+
+        # If not in cache, fetch from API
+        all_news = _fetch_company_news(ticker, end_date, start_date, limit, api_key)
+        if not all_news:
+            return []
+
+        # Cache the results using the comprehensive cache key
+        _cache.set_company_news(cache_key, all_news)
+        return all_news
 
-    # If not in cache, fetch from API
+
+def _fetch_company_news(ticker: str, end_date: str, start_date: str | None, limit: int, api_key: str = None) -> list[CompanyNews]:
     headers = {}
     financial_api_key = api_key or os.environ.get("FINANCIAL_DATASETS_API_KEY")
     if financial_api_key:
@@ -280,11 +434,6 @@ def get_company_news(
         if current_end_date <= start_date:
             break
 
-    if not all_news:
-        return []
-
-    # Cache the results using the comprehensive cache key
-    _cache.set_company_news(cache_key, [news.model_dump() for news in all_news])
     return all_news
 
 
@@ -324,9 +473,21 @@ def get_market_cap(
     return market_cap
 
 
+def records_to_columns(records: list[BaseModel], fields: list[str] | None = None) -> dict[str, list]:
+    """
+    Convert records to a column-oriented dict of field name -> values.
+
+    Reads attributes directly instead of dumping each model, so callers that only
+    need a few fields (e.g. closing prices) skip building a full dict per record.
+    """
+    if fields is None:
+        fields = list(type(records[0]).model_fields) if records else []
+    return {field: [getattr(record, field) for record in records] for field in fields}
+
+
 def prices_to_df(prices: list[Price]) -> pd.DataFrame:
     """Convert prices to a DataFrame."""
-    df = pd.DataFrame([p.model_dump() for p in prices])
+    df = pd.DataFrame(records_to_columns(prices, ["open", "close", "high", "low", "volume", "time"]))
     df["Date"] = pd.to_datetime(df["time"])
     df.set_index("Date", inplace=True)
     numeric_cols = ["open", "close", "high", "low", "volume"]
@@ -0,0 +1,141 @@
+import contextvars
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from src.data.cache import get_cache
+from src.data.models import InsiderTrade
+from src.data.sentiment_store import article_key
+from src.tools.api import get_company_news, get_financial_metrics, get_insider_trades, get_prices
+
+# How far back the first refresh of a ticker looks for its latest price bar
+PRICE_LOOKBACK_DAYS = 7
+
+
+def insider_trade_key(trade: InsiderTrade) -> tuple:
+    """Get an identity for an insider trade; filings have no ID, so the filer and transaction identify them."""
+    return (trade.filing_date, trade.name, trade.transaction_date, trade.transaction_shares)
+
+
+class _Watermark:
+    """The newest data seen for a ticker."""
+
+    __slots__ = ("lock", "price", "news_date", "news_keys", "insider_date", "insider_keys", "report_period", "metrics_checked")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # (time, close, volume) of the latest price bar
+        self.price: tuple | None = None
+        # Date of the latest article or filing, and the identities of those published on that day
+        self.news_date: str | None = None
+        self.news_keys: set = set()
+        self.insider_date: str | None = None
+        self.insider_keys: set = set()
+        # Latest financial report period, and the end date it was last checked on
+        self.report_period: str | None = None
+        self.metrics_checked: str | None = None
+
+
+def _advance(date: str | None, keys: set, records: list, date_field: str, identity) -> tuple[list, str | None, set]:
+    """Find the records newer than a (date, keys) watermark and move the watermark past them."""
+    new_records = [
+        record
+        for record in records
+        if date is None or getattr(record, date_field) > date or (getattr(record, date_field)[:10] == date[:10] and identity(record) not in keys)
+    ]
+    if not new_records:
+        return [], date, keys
+    latest = max(getattr(record, date_field) for record in records)
+    if date is None or latest[:10] != date[:10]:
+        keys = set()
+    keys = keys | {identity(record) for record in records if getattr(record, date_field)[:10] == latest[:10]}
+    return new_records, max(latest, date or latest), keys
+
+
+class DataRefresher:
+    """
+    Incremental refresh of the cached analyst data of a set of tickers, for runs that repeat on a schedule.
+
+    Each refresh fetches only what was published since the previous one (the latest price bars,
+    new headlines and insider filings) and merges it into the cached windows that end on the run's
+    end date, so analysts re-reading those windows see the new data without refetching them. New
+    financial reports, which at most appear daily, drop the ticker's cached metrics instead. Each
+    ticker gets a version that changes whenever its data (or the end date) does, so callers can
+    recompute only the tickers whose version changed.
+    """
+
+    def __init__(self, max_workers: int = 8, news_limit: int = 100, cache=None):
+        self.max_workers = max(1, max_workers)
+        self.news_limit = news_limit
+        self._cache = cache or get_cache()
+        self._watermarks: dict[str, _Watermark] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self, tickers: list[str], end_date: str, api_key: str = None) -> dict[str, str]:
+        """Fetch the tickers' new data as of end_date and return each ticker's data version."""
+        if len(tickers) <= 1 or self.max_workers == 1:
+            return {ticker: self._refresh_ticker(ticker, end_date, api_key) for ticker in tickers}
+
+        # Each thread runs in a copy of the caller's context, so usage trackers see the API calls
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tickers)), thread_name_prefix="data-refresh") as executor:
+            futures = {ticker: executor.submit(contextvars.copy_context().run, self._refresh_ticker, ticker, end_date, api_key) for ticker in tickers}
+            return {ticker: future.result() for ticker, future in futures.items()}
+
+    def latest_prices(self, tickers: list[str]) -> dict[str, float]:
+        """Get the latest closing price seen for each ticker that has one."""
+        with self._lock:
+            watermarks = {ticker: self._watermarks.get(ticker) for ticker in tickers}
+        return {ticker: watermark.price[1] for ticker, watermark in watermarks.items() if watermark is not None and watermark.price is not None}
+
+    def _refresh_ticker(self, ticker: str, end_date: str, api_key: str = None) -> str:
+        with self._lock:
+            watermark = self._watermarks.setdefault(ticker, _Watermark())
+
+        # Concurrent refreshes of a ticker (e.g. by two runs trading it) take turns
+        with watermark.lock:
+            return self._refresh_watermark(ticker, watermark, end_date, api_key)
+
+    def _refresh_watermark(self, ticker: str, watermark: _Watermark, end_date: str, api_key: str = None) -> str:
+        # Prices: from the day of the latest bar seen, which may have been updated since
+        price_start = watermark.price[0][:10] if watermark.price else (datetime.strptime(end_date, "%Y-%m-%d") - timedelta(days=PRICE_LOOKBACK_DAYS)).strftime("%Y-%m-%d")
+        prices = get_prices(ticker, price_start, end_date, api_key=api_key, use_cache=False)
+        if prices:
+            latest = max(prices, key=lambda price: price.time)
+            watermark.price = (latest.time, latest.close, latest.volume)
+            self._cache.merge_recent("prices", ticker, end_date, prices)
+
+        news = get_company_news(ticker, end_date, start_date=(watermark.news_date or end_date)[:10], limit=self.news_limit, api_key=api_key, use_cache=False)
+        new_news, watermark.news_date, watermark.news_keys = _advance(watermark.news_date, watermark.news_keys, news, "date", article_key)
+        if new_news:
+            self._cache.merge_recent("company_news", ticker, end_date, new_news, identity=article_key)
+
+        trades = get_insider_trades(ticker, end_date, start_date=(watermark.insider_date or end_date)[:10], api_key=api_key, use_cache=False)
+        new_trades, watermark.insider_date, watermark.insider_keys = _advance(watermark.insider_date, watermark.insider_keys, trades, "filing_date", insider_trade_key)
+        if new_trades:
+            self._cache.merge_recent("insider_trades", ticker, end_date, new_trades, identity=insider_trade_key)
+
+        # Reports are published at most daily, so metrics are checked once per end date
+        if watermark.metrics_checked != end_date:
+            metrics = get_financial_metrics(ticker, end_date, limit=1, api_key=api_key, use_cache=False)
+            report_period = metrics[0].report_period if metrics else None
+            if watermark.report_period is not None and report_period != watermark.report_period:
+                self._cache.invalidate("financial_metrics", ticker)
+            watermark.report_period = report_period
+            watermark.metrics_checked = end_date
+
+        return self._version(end_date, watermark)
+
+    @staticmethod
+    def _version(end_date: str, watermark: _Watermark) -> str:
+        state = [
+            end_date,
+            watermark.price,
+            watermark.news_date,
+            sorted(watermark.news_keys),
+            watermark.insider_date,
+            sorted(map(repr, watermark.insider_keys)),
+            watermark.report_period,
+        ]
+        return hashlib.sha256(json.dumps(state, default=str).encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,129 @@
+"""Local, offline headline sentiment scoring with a finance lexicon."""
+import re
+
+import numpy as np
+
+# Confidence at or above which a local score is trusted without asking the LLM
+DEFAULT_LOCAL_CONFIDENCE_THRESHOLD = 70
+
+# Finance lexicon: term -> weight. Positive weights are bullish, negative weights bearish.
+# Inflected forms (plural, past tense, gerund) are generated by _expand_lexicon.
+_LEXICON = {
+    # Bullish
+    "beat": 2.0, "surge": 2.0, "soar": 2.0, "jump": 1.5, "rally": 1.5, "gain": 1.0, "rise": 1.0, "climb": 1.0,
+    "upgrade": 2.0, "outperform": 1.5, "record": 1.0, "profit": 1.0, "growth": 1.0, "grow": 1.0, "strong": 1.0,
+    "boost": 1.0, "expand": 1.0, "raise": 1.0, "exceed": 1.5, "top": 1.0, "win": 1.0, "approve": 1.5,
+    "approval": 1.5, "breakthrough": 2.0, "bullish": 2.0, "buyback": 1.5, "dividend": 0.5, "rebound": 1.5,
+    "recover": 1.0, "recovery": 1.0, "partnership": 1.0, "launch": 0.5, "acquire": 0.5, "optimistic": 1.5,
+    "upbeat": 1.5, "robust": 1.0, "accelerate": 1.0, "improve": 1.0, "positive": 1.0, "high": 0.5,
+    "overweight": 1.5, "buy": 1.0, "upside": 1.5, "milestone": 1.0, "innovation": 0.5, "success": 1.5,
+    # Bearish
+    "miss": -2.0, "plunge": -2.0, "plummet": -2.0, "tumble": -2.0, "crash": -2.0, "slump": -1.5, "sink": -1.5,
+    "fall": -1.0, "drop": -1.0, "decline": -1.0, "slide": -1.0, "lose": -1.0, "loss": -1.5, "downgrade": -2.0,
+    "underperform": -1.5, "weak": -1.0, "cut": -1.0, "lawsuit": -1.5, "sue": -1.5, "probe": -1.5,
+    "investigation": -1.5, "fraud": -2.0, "recall": -1.5, "layoff": -1.5, "bankruptcy": -2.5, "default": -1.5,
+    "warn": -1.5, "warning": -1.5, "bearish": -2.0, "fine": -1.0, "penalty": -1.5, "halt": -1.5, "delay": -1.0,
+    "concern": -1.0, "risk": -0.5, "fear": -1.0, "volatile": -0.5, "pessimistic": -1.5, "disappoint": -1.5,
+    "shortfall": -1.5, "slowdown": -1.5, "slow": -1.0, "low": -0.5, "negative": -1.0, "underweight": -1.5,
+    "sell": -1.0, "downside": -1.5, "scandal": -2.0, "resign": -1.0, "breach": -1.5, "ban": -1.5, "tariff": -1.0,
+}
+
+# Tokens that flip the polarity of the following lexicon term ("not strong", "no growth")
+_NEGATIONS = {"not", "no", "never", "without", "fails", "failed", "fail", "lack", "lacks"}
+
+_TOKEN_PATTERN = re.compile(r"[a-z]+")
+
+
+def _expand_lexicon(lexicon: dict[str, float]) -> dict[str, float]:
+    """Add common inflections of every lexicon term."""
+    expanded = {}
+    for term, weight in lexicon.items():
+        stem = term[:-1] if term.endswith("e") else term
+        forms = [term, f"{term}s", f"{term}es", f"{stem}ed", f"{stem}ing", f"{term}{term[-1]}ed", f"{term}{term[-1]}ing"]
+        if term.endswith("y"):
+            forms += [f"{term[:-1]}ies", f"{term[:-1]}ied"]
+        for form in forms:
+            expanded.setdefault(form, weight)
+    # Irregular forms
+    for form, base in {"rose": "rise", "fell": "fall", "sank": "sink", "won": "win", "lost": "lose", "grew": "grow", "cuts": "cut"}.items():
+        expanded[form] = lexicon[base]
+    return expanded
+
+
+class LocalSentimentScorer:
+    """
+    CPU-only headline sentiment scorer.
+
+    Headlines are tokenized into lexicon-term counts and scored as a single
+    vectorized weighted sum over all headlines, so batches of thousands of
+    headlines score in milliseconds with no network access.
+    """
+
+    def __init__(self, lexicon: dict[str, float] | None = None):
+        expanded = _expand_lexicon(lexicon or _LEXICON)
+        self._vocabulary = {term: idx for idx, term in enumerate(expanded)}
+        self._weights = np.fromiter(expanded.values(), dtype=float, count=len(expanded))
+
+    def score(self, headlines: list[str]) -> list[tuple[str, int]]:
+        """
+        Score headlines.
+
+        Returns:
+            A (sentiment, confidence) pair per headline, where sentiment is "positive",
+            "negative" or "neutral" and confidence is 0-100.
+        """
+        if not headlines:
+            return []
+
+        # Sparse (headline, term, sign) triples for every lexicon term found
+        rows, terms, signs = [], [], []
+        for row, headline in enumerate(headlines):
+            negate = False
+            for token in _TOKEN_PATTERN.findall(headline.lower()):
+                idx = self._vocabulary.get(token)
+                if idx is not None:
+                    rows.append(row)
+                    terms.append(idx)
+                    signs.append(-1.0 if negate else 1.0)
+                negate = token in _NEGATIONS
+
+        n = len(headlines)
+        contributions = self._weights[np.asarray(terms, dtype=int)] * np.asarray(signs, dtype=float)
+        rows = np.asarray(rows, dtype=int)
+        bullish = np.bincount(rows, weights=np.clip(contributions, 0, None), minlength=n)
+        bearish = np.bincount(rows, weights=np.clip(-contributions, 0, None), minlength=n)
+
+        net = bullish - bearish
+        total = bullish + bearish
+        # Confidence grows with the net weight of evidence and shrinks when the headline is mixed
+        agreement = np.divide(np.abs(net), total, out=np.zeros(n), where=total > 0)
+        confidence = np.clip(40 + 25 * np.abs(net), 0, 95) * agreement
+        sentiment = np.where(net >= 1, "positive", np.where(net <= -1, "negative", "neutral"))
+        # Headlines without lexicon terms or with cancelling terms are ambiguous
+        confidence = np.where(sentiment == "neutral", np.where(total > 0, 20, 30), confidence)
+
+        return [(label, int(round(conf))) for label, conf in zip(sentiment.tolist(), confidence.tolist())]
+
+
+_scorer: LocalSentimentScorer | None = None
+
+
+def get_local_sentiment_scorer() -> LocalSentimentScorer:
+    """Get the shared local sentiment scorer."""
+    global _scorer
+    if _scorer is None:
+        _scorer = LocalSentimentScorer()
+    return _scorer
+
+
+def sentiment_metadata(offline: bool = False, threshold: float | None = None) -> dict:
+    """
+    Graph metadata for the news sentiment agent's scoring mode.
+
+    offline scores every headline locally, without LLM calls; threshold is the local confidence
+    (0-100) at or above which a local score is trusted instead of asking the LLM.
+    """
+    metadata = {"news_sentiment_offline": bool(offline)}
+    if threshold is not None:
+        metadata["news_sentiment_local_threshold"] = threshold
+    return metadata
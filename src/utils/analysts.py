@@ -1,23 +1,33 @@
 """Constants and utilities related to analysts configuration."""
 
-from src.agents import portfolio_manager
-from src.agents.aswath_damodaran import aswath_damodaran_agent
-from src.agents.ben_graham import ben_graham_agent
-from src.agents.bill_ackman import bill_ackman_agent
-from src.agents.cathie_wood import cathie_wood_agent
-from src.agents.charlie_munger import charlie_munger_agent
-from src.agents.fundamentals import fundamentals_analyst_agent
-from src.agents.michael_burry import michael_burry_agent
-from src.agents.phil_fisher import phil_fisher_agent
-from src.agents.peter_lynch import peter_lynch_agent
-from src.agents.sentiment import sentiment_analyst_agent
-from src.agents.stanley_druckenmiller import stanley_druckenmiller_agent
-from src.agents.technicals import technical_analyst_agent
-from src.agents.valuation import valuation_analyst_agent
-from src.agents.warren_buffett import warren_buffett_agent
-from src.agents.rakesh_jhunjhunwala import rakesh_jhunjhunwala_agent
-from src.agents.mohnish_pabrai import mohnish_pabrai_agent
-from src.agents.news_sentiment import news_sentiment_agent
+import importlib
+from typing import Callable
+
+
+class LazyAgent:
+    """
+    An agent function that is imported from its module on first use.
+
+    Agent modules pull in their data and LLM dependencies, so the registry holds these instead of
+    the functions: only the agents a run actually uses are imported.
+    """
+
+    def __init__(self, module: str, name: str):
+        self.module = module
+        self.name = name
+        self._function: Callable | None = None
+
+    def load(self) -> Callable:
+        if self._function is None:
+            self._function = getattr(importlib.import_module(self.module), self.name)
+        return self._function
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"LazyAgent({self.module}.{self.name})"
+
 
 # Define analyst configuration - single source of truth
 ANALYST_CONFIG = {
@@ -25,7 +35,7 @@ ANALYST_CONFIG = {
         "display_name": "Aswath Damodaran",
         "description": "The Dean of Valuation",
         "investing_style": "Focuses on intrinsic value and financial metrics to assess investment opportunities through rigorous valuation analysis.",
-        "agent_func": aswath_damodaran_agent,
+        "agent_func": LazyAgent("src.agents.aswath_damodaran", "aswath_damodaran_agent"),
         "type": "analyst",
         "order": 0,
     },
@@ -33,7 +43,7 @@ ANALYST_CONFIG = {
         "display_name": "Ben Graham",
         "description": "The Father of Value Investing",
         "investing_style": "Emphasizes a margin of safety and invests in undervalued companies with strong fundamentals through systematic value analysis.",
-        "agent_func": ben_graham_agent,
+        "agent_func": LazyAgent("src.agents.ben_graham", "ben_graham_agent"),
         "type": "analyst",
         "order": 1,
     },
@@ -41,7 +51,7 @@ ANALYST_CONFIG = {
         "display_name": "Bill Ackman",
         "description": "The Activist Investor",
         "investing_style": "Seeks to influence management and unlock value through strategic activism and contrarian investment positions.",
-        "agent_func": bill_ackman_agent,
+        "agent_func": LazyAgent("src.agents.bill_ackman", "bill_ackman_agent"),
         "type": "analyst",
         "order": 2,
     },
@@ -49,7 +59,7 @@ ANALYST_CONFIG = {
         "display_name": "Cathie Wood",
         "description": "The Queen of Growth Investing",
         "investing_style": "Focuses on disruptive innovation and growth, investing in companies that are leading technological advancements and market disruption.",
-        "agent_func": cathie_wood_agent,
+        "agent_func": LazyAgent("src.agents.cathie_wood", "cathie_wood_agent"),
         "type": "analyst",
         "order": 3,
     },
@@ -57,7 +67,7 @@ ANALYST_CONFIG = {
         "display_name": "Charlie Munger",
         "description": "The Rational Thinker",
         "investing_style": "Advocates for value investing with a focus on quality businesses and long-term growth through rational decision-making.",
-        "agent_func": charlie_munger_agent,
+        "agent_func": LazyAgent("src.agents.charlie_munger", "charlie_munger_agent"),
         "type": "analyst",
         "order": 4,
     },
@@ -65,7 +75,7 @@ ANALYST_CONFIG = {
         "display_name": "Michael Burry",
         "description": "The Big Short Contrarian",
         "investing_style": "Makes contrarian bets, often shorting overvalued markets and investing in undervalued assets through deep fundamental analysis.",
-        "agent_func": michael_burry_agent,
+        "agent_func": LazyAgent("src.agents.michael_burry", "michael_burry_agent"),
         "type": "analyst",
         "order": 5,
     },
@@ -73,7 +83,7 @@ ANALYST_CONFIG = {
         "display_name": "Mohnish Pabrai",
         "description": "The Dhandho Investor",
         "investing_style": "Focuses on value investing and long-term growth through fundamental analysis and a margin of safety.",
-        "agent_func": mohnish_pabrai_agent,
+        "agent_func": LazyAgent("src.agents.mohnish_pabrai", "mohnish_pabrai_agent"),
         "type": "analyst",
         "order": 6,
     },
@@ -81,7 +91,7 @@ ANALYST_CONFIG = {
         "display_name": "Peter Lynch",
         "description": "The 10-Bagger Investor",
         "investing_style": "Invests in companies with understandable business models and strong growth potential using the 'buy what you know' strategy.",
-        "agent_func": peter_lynch_agent,
+        "agent_func": LazyAgent("src.agents.peter_lynch", "peter_lynch_agent"),
         "type": "analyst",
         "order": 6,
     },
@@ -89,7 +99,7 @@ ANALYST_CONFIG = {
         "display_name": "Phil Fisher",
         "description": "The Scuttlebutt Investor",
         "investing_style": "Emphasizes investing in companies with strong management and innovative products, focusing on long-term growth through scuttlebutt research.",
-        "agent_func": phil_fisher_agent,
+        "agent_func": LazyAgent("src.agents.phil_fisher", "phil_fisher_agent"),
         "type": "analyst",
         "order": 7,
     },
@@ -97,7 +107,7 @@ ANALYST_CONFIG = {
         "display_name": "Rakesh Jhunjhunwala",
         "description": "The Big Bull Of India",
         "investing_style": "Leverages macroeconomic insights to invest in high-growth sectors, particularly within emerging markets and domestic opportunities.",
-        "agent_func": rakesh_jhunjhunwala_agent,
+        "agent_func": LazyAgent("src.agents.rakesh_jhunjhunwala", "rakesh_jhunjhunwala_agent"),
         "type": "analyst",
         "order": 8,
     },
@@ -105,7 +115,7 @@ ANALYST_CONFIG = {
         "display_name": "Stanley Druckenmiller",
         "description": "The Macro Investor",
         "investing_style": "Focuses on macroeconomic trends, making large bets on currencies, commodities, and interest rates through top-down analysis.",
-        "agent_func": stanley_druckenmiller_agent,
+        "agent_func": LazyAgent("src.agents.stanley_druckenmiller", "stanley_druckenmiller_agent"),
         "type": "analyst",
         "order": 9,
     },
@@ -113,7 +123,7 @@ ANALYST_CONFIG = {
         "display_name": "Warren Buffett",
         "description": "The Oracle of Omaha",
         "investing_style": "Seeks companies with strong fundamentals and competitive advantages through value investing and long-term ownership.",
-        "agent_func": warren_buffett_agent,
+        "agent_func": LazyAgent("src.agents.warren_buffett", "warren_buffett_agent"),
         "type": "analyst",
         "order": 10,
     },
@@ -121,7 +131,7 @@ ANALYST_CONFIG = {
         "display_name": "Technical Analyst",
         "description": "Chart Pattern Specialist",
         "investing_style": "Focuses on chart patterns and market trends to make investment decisions, often using technical indicators and price action analysis.",
-        "agent_func": technical_analyst_agent,
+        "agent_func": LazyAgent("src.agents.technicals", "technical_analyst_agent"),
         "type": "analyst",
         "order": 11,
     },
@@ -129,7 +139,7 @@ ANALYST_CONFIG = {
         "display_name": "Fundamentals Analyst",
         "description": "Financial Statement Specialist",
         "investing_style": "Delves into financial statements and economic indicators to assess the intrinsic value of companies through fundamental analysis.",
-        "agent_func": fundamentals_analyst_agent,
+        "agent_func": LazyAgent("src.agents.fundamentals", "fundamentals_analyst_agent"),
         "type": "analyst",
         "order": 12,
     },
@@ -137,7 +147,7 @@ ANALYST_CONFIG = {
         "display_name": "News Sentiment Analyst",
         "description": "News Sentiment Specialist",
         "investing_style": "Analyzes news sentiment to predict market movements and identify opportunities through news analysis.",
-        "agent_func": news_sentiment_agent,
+        "agent_func": LazyAgent("src.agents.news_sentiment", "news_sentiment_agent"),
         "type": "analyst",
         "order": 13,
     },
@@ -145,7 +155,7 @@ ANALYST_CONFIG = {
         "display_name": "Sentiment Analyst",
         "description": "Market Sentiment Specialist",
         "investing_style": "Gauges market sentiment and investor behavior to predict market movements and identify opportunities through behavioral analysis.",
-        "agent_func": sentiment_analyst_agent,
+        "agent_func": LazyAgent("src.agents.sentiment", "sentiment_analyst_agent"),
         "type": "analyst",
         "order": 13,
     },
@@ -153,7 +163,7 @@ ANALYST_CONFIG = {
         "display_name": "Valuation Analyst",
         "description": "Company Valuation Specialist",
         "investing_style": "Specializes in determining the fair value of companies, using various valuation models and financial metrics for investment decisions.",
-        "agent_func": valuation_analyst_agent,
+        "agent_func": LazyAgent("src.agents.valuation", "valuation_analyst_agent"),
         "type": "analyst",
         "order": 14,
     },
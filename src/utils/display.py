@@ -226,6 +226,97 @@ def print_trading_output(result: dict) -> None:
         print(f"{Fore.CYAN}{wrapped_reasoning}{Style.RESET_ALL}")
 
 
+def print_usage_summary(usage: dict | None) -> None:
+    """
+    Print LLM and financial API usage per agent, with latency, tokens and estimated cost.
+
+    Args:
+        usage (dict): Usage summary as returned by UsageTracker.summary()
+    """
+    if not usage:
+        return
+
+    table_data = []
+    for agent, totals in sorted(usage.get("by_agent", {}).items(), key=lambda item: -item[1]["latency_seconds"]):
+        agent_name = agent.replace("_agent", "").replace("_", " ").title()
+        table_data.append(
+            [
+                f"{Fore.CYAN}{agent_name}{Style.RESET_ALL}",
+                totals["calls"],
+                totals["retries"],
+                f"{totals['latency_seconds']:.1f}s",
+                totals["input_tokens"],
+                totals["output_tokens"],
+                f"${totals['estimated_cost']:.4f}",
+            ]
+        )
+
+    llm = usage.get("llm", {})
+    api = usage.get("api", {})
+    table_data.append(
+        [
+            f"{Fore.WHITE}{Style.BRIGHT}Total{Style.RESET_ALL}",
+            llm.get("calls", 0),
+            llm.get("retries", 0),
+            f"{llm.get('latency_seconds', 0.0):.1f}s",
+            llm.get("input_tokens", 0),
+            llm.get("output_tokens", 0),
+            f"{Fore.YELLOW}${llm.get('estimated_cost', 0.0):.4f}{Style.RESET_ALL}",
+        ]
+    )
+
+    print(f"\n{Fore.WHITE}{Style.BRIGHT}LLM USAGE:{Style.RESET_ALL}")
+    print(
+        tabulate(
+            table_data,
+            headers=[f"{Fore.WHITE}Agent", "Calls", "Retries", "Wall Time", "Prompt Tokens", "Completion Tokens", "Est. Cost"],
+            tablefmt="grid",
+            colalign=("left", "right", "right", "right", "right", "right", "right"),
+        )
+    )
+    print(
+        f"{Fore.WHITE}Financial API: {api.get('calls', 0)} requests, {api.get('retries', 0)} rate-limit retries, "
+        f"{api.get('latency_seconds', 0.0):.1f}s{Style.RESET_ALL}"
+    )
+
+
+def print_trace_summary(summary: list | None, trace_path: str | None = None, limit: int = 20) -> None:
+    """
+    Print where a traced run's time went: the spans with the most self time.
+
+    Args:
+        summary (list): Rows as returned by Tracer.summary()
+        trace_path (str): Where the Chrome trace was written
+        limit (int): Maximum number of rows to print
+    """
+    if not summary:
+        return
+
+    table_data = [
+        [
+            f"{Fore.CYAN}{row['name']}{Style.RESET_ALL}",
+            row["category"],
+            row["count"],
+            f"{row['total_seconds']:.2f}s",
+            f"{row['self_seconds']:.2f}s",
+            f"{row['max_seconds']:.2f}s",
+        ]
+        for row in summary[:limit]
+    ]
+
+    print(f"\n{Fore.WHITE}{Style.BRIGHT}TRACE SUMMARY:{Style.RESET_ALL}")
+    print(
+        tabulate(
+            table_data,
+            headers=[f"{Fore.WHITE}Span", "Kind", "Count", "Total", "Self", "Max"],
+            tablefmt="grid",
+            colalign=("left", "left", "right", "right", "right", "right"),
+        )
+    )
+    if trace_path:
+        print(f"{Fore.WHITE}Chrome trace written to {trace_path}{Style.RESET_ALL}")
+
+
 def print_backtest_results(table_rows: list) -> None:
     """Print the backtest results in a nicely formatted table"""
     # Clear the screen
@@ -0,0 +1,255 @@
+"""Hedged LLM requests: duplicate slow calls to the same or a fallback model and take the first valid result."""
+
+import contextvars
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable
+
+from pydantic import BaseModel
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    """Raised when an LLM call has not produced a valid result by its deadline."""
+
+
+class HedgingPolicy(BaseModel):
+    """
+    Tail-latency policy for call_llm.
+
+    When enabled, a request still running after its model's p95 latency is duplicated to the
+    fallback model (or the same model when none is set) and the first valid result wins.
+    ``deadline_seconds`` bounds the whole call, retries included; on expiry call_llm returns
+    the caller's default response instead of blocking.
+    """
+
+    enabled: bool = False
+    fallback_model_name: str | None = None
+    fallback_model_provider: str | None = None
+    # Hedge delay used until a model has enough latency samples for a p95
+    initial_hedge_delay_seconds: float = 10.0
+    min_hedge_delay_seconds: float = 1.0
+    min_latency_samples: int = 20
+    # Spend cap: at most this fraction of recent calls may send a duplicate request
+    max_hedge_fraction: float = 0.05
+    deadline_seconds: float | None = None
+
+    @property
+    def active(self) -> bool:
+        return self.enabled or self.deadline_seconds is not None
+
+
+def _policy_from_env() -> HedgingPolicy:
+    deadline = os.environ.get("LLM_DEADLINE_SECONDS")
+    return HedgingPolicy(
+        enabled=os.environ.get("LLM_HEDGING", "").lower() in ("1", "true", "yes"),
+        deadline_seconds=float(deadline) if deadline else None,
+    )
+
+
+def get_hedging_policy(state: dict | None) -> HedgingPolicy:
+    """
+    Get the hedging policy for a run.
+
+    Precedence: ``state["metadata"]["llm_hedging"]``, then the request's ``llm_hedging``,
+    then the LLM_HEDGING / LLM_DEADLINE_SECONDS environment variables.
+    """
+    metadata = (state or {}).get("metadata", {})
+    config = metadata.get("llm_hedging")
+    if config is None:
+        config = getattr(metadata.get("request"), "llm_hedging", None)
+    if config is None:
+        return _policy_from_env()
+    return config if isinstance(config, HedgingPolicy) else HedgingPolicy(**config)
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies per model, used to pick the hedge delay."""
+
+    def __init__(self, window: int = 200):
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque[float]] = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, model_key: str, seconds: float):
+        with self._lock:
+            self._samples[model_key].append(seconds)
+
+    def percentile(self, model_key: str, q: float, min_samples: int = 1) -> float | None:
+        with self._lock:
+            samples = sorted(self._samples.get(model_key, ()))
+        if len(samples) < max(min_samples, 1):
+            return None
+        return samples[min(int(q * len(samples)), len(samples) - 1)]
+
+
+class HedgeBudget:
+    """Caps hedged requests to a fraction of the most recent calls and to a number running at once."""
+
+    def __init__(self, window: int = 200, max_in_flight: int = 8):
+        self.max_in_flight = max(1, max_in_flight)
+        self._lock = threading.Lock()
+        self._recent: deque[bool] = deque(maxlen=window)
+        self._in_flight = 0
+
+    def record_call(self):
+        with self._lock:
+            self._recent.append(False)
+
+    def try_acquire(self, max_fraction: float, pool_saturated: bool = False) -> bool:
+        """
+        Mark the latest call as hedged if the budget allows it; call release() once the hedge finishes.
+
+        Hedges are skipped while max_in_flight of them are still running (lost hedges keep running in
+        the background) or while the pool has no idle worker, where a hedge would only queue.
+        """
+        with self._lock:
+            if not self._recent or pool_saturated or self._in_flight >= self.max_in_flight:
+                return False
+            hedged = sum(self._recent)
+            # Always allow the first hedge so a cold process can still cut a pathological tail
+            if hedged and (hedged + 1) / len(self._recent) > max_fraction:
+                return False
+            self._recent[-1] = True
+            self._in_flight += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self._in_flight -= 1
+
+
+class _CountingExecutor(ThreadPoolExecutor):
+    """Thread pool that counts its queued and running tasks, to tell when it has no idle worker."""
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = ""):
+        super().__init__(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._count_lock = threading.Lock()
+        self._tasks = 0
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        with self._count_lock:
+            self._tasks += 1
+        try:
+            future = super().submit(fn, *args, **kwargs)
+        except BaseException:
+            self._task_done(None)
+            raise
+        future.add_done_callback(self._task_done)
+        return future
+
+    def _task_done(self, future: Future | None):
+        with self._count_lock:
+            self._tasks -= 1
+
+    @property
+    def saturated(self) -> bool:
+        with self._count_lock:
+            return self._tasks >= self._max_workers
+
+
+_HEDGE_WORKERS = int(os.environ.get("LLM_HEDGE_WORKERS", "32"))
+_latency_tracker = LatencyTracker()
+# Abandoned requests keep their worker, so at most a quarter of the pool runs hedges by default
+_hedge_budget = HedgeBudget(max_in_flight=int(os.environ.get("LLM_MAX_HEDGES_IN_FLIGHT", str(max(1, _HEDGE_WORKERS // 4)))))
+# Hedges run here; lost ones keep running in the background. Primary requests get their own threads
+_executor = _CountingExecutor(max_workers=_HEDGE_WORKERS, thread_name_prefix="llm-hedge")
+
+
+def get_latency_tracker() -> LatencyTracker:
+    return _latency_tracker
+
+
+def hedge_delay(policy: HedgingPolicy, model_key: str) -> float:
+    """Delay after which a request is hedged: the model's p95 latency, or the policy's initial delay."""
+    p95 = _latency_tracker.percentile(model_key, 0.95, policy.min_latency_samples)
+    if p95 is None:
+        return policy.initial_hedge_delay_seconds
+    return max(p95, policy.min_hedge_delay_seconds)
+
+
+def _submit(fn: Callable[[], Any]) -> Future:
+    # Run in a copy of the caller's context so usage trackers still see the call
+    context = contextvars.copy_context()
+    return _executor.submit(context.run, fn)
+
+
+def _start_thread(fn: Callable[[], Any]) -> Future:
+    """Run a request on a thread of its own, so it starts at once however many abandoned requests are still running."""
+    future = Future()
+    future.set_running_or_notify_cancel()
+    context = contextvars.copy_context()
+
+    def run():
+        try:
+            result = context.run(fn)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    threading.Thread(target=run, name="llm-request", daemon=True).start()
+    return future
+
+
+def hedged_invoke(
+    primary: Callable[[], Any],
+    hedge: Callable[[], Any] | None,
+    delay: float | None,
+    deadline_at: float | None,
+    max_hedge_fraction: float = 1.0,
+) -> Any:
+    """
+    Run ``primary`` and, if it has not returned a valid (non-None) result after ``delay`` seconds,
+    also ``hedge``. Returns the first valid result.
+
+    The primary request runs on its own thread, so the deadline clock only covers the request
+    itself; the hedge runs on the shared hedge pool and is skipped while the pool is busy. A hedge
+    still queued when the call returns or times out is cancelled.
+
+    Raises:
+        LLMDeadlineExceeded: if no valid result is available by ``deadline_at`` (a time.monotonic() value)
+        Exception: the last error raised when every launched request failed
+    """
+    budget = _hedge_budget
+    budget.record_call()
+    start = time.monotonic()
+    hedge_at = start + delay if hedge is not None and delay is not None else None
+    pending = {_start_thread(primary)}
+    last_error = None
+    result = None
+
+    try:
+        while pending:
+            now = time.monotonic()
+            wake_times = [t for t in (hedge_at, deadline_at) if t is not None]
+            timeout = max(min(wake_times) - now, 0) if wake_times else None
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                if result is not None:
+                    return result
+
+            now = time.monotonic()
+            if hedge_at is not None and now >= hedge_at and pending:
+                hedge_at = None
+                if budget.try_acquire(max_hedge_fraction, pool_saturated=_executor.saturated):
+                    hedge_future = _submit(hedge)
+                    hedge_future.add_done_callback(lambda _: budget.release())
+                    pending.add(hedge_future)
+            if deadline_at is not None and now >= deadline_at and pending:
+                raise LLMDeadlineExceeded(f"No LLM response within the deadline ({now - start:.1f}s)")
+    finally:
+        # Requests still queued are not needed anymore (running ones cannot be interrupted)
+        for future in pending:
+            future.cancel()
+
+    if last_error is not None:
+        raise last_error
+    return result
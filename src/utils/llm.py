@@ -1,9 +1,14 @@
 """Helper functions for LLM"""
 
 import json
+import time
 from pydantic import BaseModel
-from src.llm.models import get_model, get_model_info
+from src.llm.models import ModelProvider, get_model, get_model_info
+from src.llm.ollama_scheduler import agent_priority, get_ollama_scheduler
+from src.utils.hedging import LLMDeadlineExceeded, get_hedging_policy, get_latency_tracker, hedge_delay, hedged_invoke
 from src.utils.progress import progress
+from src.utils.tracing import span
+from src.utils.usage import TokenUsageCallback, record_llm_call
 from src.graph.state import AgentState
 
 
@@ -14,6 +19,7 @@ def call_llm(
     state: AgentState | None = None,
     max_retries: int = 3,
     default_factory=None,
+    ticker: str | None = None,
 ) -> BaseModel:
     """
     Makes an LLM call with retry logic, handling both JSON supported and non-JSON supported models.
@@ -25,6 +31,10 @@ def call_llm(
         state: Optional state object to extract agent-specific model configuration
         max_retries: Maximum number of retries (default: 3)
         default_factory: Optional factory function to create default response on failure
+        ticker: Optional ticker the call is about, used to attribute its usage
+
+    Request hedging and the call deadline follow the run's HedgingPolicy (see src.utils.hedging).
+    When the deadline passes, the default response is returned instead of waiting further.
 
     Returns:
         An instance of the specified Pydantic model
@@ -45,6 +55,82 @@ def call_llm(
         if request and hasattr(request, 'api_keys'):
             api_keys = request.api_keys
 
+    llm, model_info = _get_structured_llm(model_name, model_provider, api_keys, pydantic_model)
+
+    # Optionally hedge slow requests to a fallback (or the same) model and bound the call with a deadline
+    policy = get_hedging_policy(state)
+    model_key = f"{model_provider}:{model_name}"
+    deadline_at = time.monotonic() + policy.deadline_seconds if policy.deadline_seconds is not None else None
+    hedge = None
+    if policy.enabled:
+        hedge_model_name = policy.fallback_model_name or model_name
+        hedge_model_provider = policy.fallback_model_provider or model_provider
+        hedge = lambda: _invoke_hedge(prompt, pydantic_model, hedge_model_name, hedge_model_provider, api_keys, agent_name, ticker)
+
+    # Call the LLM with retries, recording wall time, retries and token usage for the whole call
+    usage_callback = TokenUsageCallback()
+    invoke = lambda: _invoke_structured(llm, model_info, prompt, pydantic_model, [usage_callback])
+    if model_provider == ModelProvider.OLLAMA:
+        # Queue behind the per-model concurrency cap of the local server, portfolio manager first
+        unscheduled_invoke = invoke
+        invoke = lambda: get_ollama_scheduler().run(unscheduled_invoke, model_name, agent_priority(agent_name))
+    with span("call_llm", "llm", agent=agent_name, ticker=ticker, model=model_key, output=pydantic_model.__name__):
+        start_time = time.perf_counter()
+        attempts = 0
+        success = False
+        try:
+            for attempt in range(max_retries):
+                attempts = attempt + 1
+                try:
+                    attempt_start = time.perf_counter()
+                    if policy.active:
+                        result = hedged_invoke(invoke, hedge, hedge_delay(policy, model_key) if hedge else None, deadline_at, policy.max_hedge_fraction)
+                    else:
+                        result = invoke()
+
+                    if result is not None:
+                        get_latency_tracker().record(model_key, time.perf_counter() - attempt_start)
+                        success = True
+                        return result
+
+                except LLMDeadlineExceeded as e:
+                    # Past the deadline a default answer beats holding up the rest of the graph
+                    if agent_name:
+                        progress.update_status(agent_name, ticker, "Deadline exceeded - using default")
+                    print(f"LLM call exceeded its deadline: {e}")
+                    if default_factory:
+                        return default_factory()
+                    return create_default_response(pydantic_model)
+
+                except Exception as e:
+                    if agent_name:
+                        progress.update_status(agent_name, None, f"Error - retry {attempt + 1}/{max_retries}")
+
+                    if attempt == max_retries - 1:
+                        print(f"Error in LLM call after {max_retries} attempts: {e}")
+                        # Use default_factory if provided, otherwise create a basic default
+                        if default_factory:
+                            return default_factory()
+                        return create_default_response(pydantic_model)
+        finally:
+            record_llm_call(
+                agent_name,
+                model_name,
+                model_provider,
+                ticker,
+                latency=time.perf_counter() - start_time,
+                retries=max(attempts - 1, 0),
+                input_tokens=usage_callback.input_tokens,
+                output_tokens=usage_callback.output_tokens,
+                success=success,
+            )
+
+    # This should never be reached due to the retry logic above
+    return create_default_response(pydantic_model)
+
+
+def _get_structured_llm(model_name: str, model_provider: str, api_keys: dict | None, pydantic_model: type[BaseModel]):
+    """Get the model, wrapped for structured output when it supports JSON mode, and its model info."""
     model_info = get_model_info(model_name, model_provider)
     llm = get_model(model_name, model_provider, api_keys)
 
@@ -54,34 +140,44 @@ def call_llm(
             pydantic_model,
             method="json_mode",
         )
+    return llm, model_info
 
-    # Call the LLM with retries
-    for attempt in range(max_retries):
-        try:
-            # Call the LLM
-            result = llm.invoke(prompt)
-
-            # For non-JSON support models, we need to extract and parse the JSON manually
-            if model_info and not model_info.has_json_mode():
-                parsed_result = extract_json_from_response(result.content)
-                if parsed_result:
-                    return pydantic_model(**parsed_result)
-            else:
-                return result
 
-        except Exception as e:
-            if agent_name:
-                progress.update_status(agent_name, None, f"Error - retry {attempt + 1}/{max_retries}")
+def _invoke_structured(llm, model_info, prompt: any, pydantic_model: type[BaseModel], callbacks: list) -> BaseModel | None:
+    """Make a single LLM call. Returns None when a non-JSON-mode model's response holds no parsable JSON."""
+    with span("llm.request", "llm"):
+        result = llm.invoke(prompt, config={"callbacks": callbacks})
 
-            if attempt == max_retries - 1:
-                print(f"Error in LLM call after {max_retries} attempts: {e}")
-                # Use default_factory if provided, otherwise create a basic default
-                if default_factory:
-                    return default_factory()
-                return create_default_response(pydantic_model)
+    # For non-JSON support models, we need to extract and parse the JSON manually
+    if model_info and not model_info.has_json_mode():
+        with span("llm.parse", "llm"):
+            parsed_result = extract_json_from_response(result.content)
+            return pydantic_model(**parsed_result) if parsed_result else None
+    return result
 
-    # This should never be reached due to the retry logic above
-    return create_default_response(pydantic_model)
+
+def _invoke_hedge(prompt: any, pydantic_model: type[BaseModel], model_name: str, model_provider: str, api_keys: dict | None, agent_name: str | None, ticker: str | None) -> BaseModel | None:
+    """Make a duplicate request for a slow call, recording its usage as a separate call."""
+    usage_callback = TokenUsageCallback()
+    start_time = time.perf_counter()
+    result = None
+    try:
+        llm, model_info = _get_structured_llm(model_name, model_provider, api_keys, pydantic_model)
+        with span("llm.hedge", "llm", model=f"{model_provider}:{model_name}"):
+            result = _invoke_structured(llm, model_info, prompt, pydantic_model, [usage_callback])
+        return result
+    finally:
+        record_llm_call(
+            agent_name,
+            model_name,
+            model_provider,
+            ticker,
+            latency=time.perf_counter() - start_time,
+            retries=0,
+            input_tokens=usage_callback.input_tokens,
+            output_tokens=usage_callback.output_tokens,
+            success=result is not None,
+        )
 
 
 def create_default_response(model_class: type[BaseModel]) -> BaseModel:
@@ -12,6 +12,8 @@ from . import docker
 
 # Constants
 DEFAULT_OLLAMA_SERVER_URL = "http://localhost:11434"
+# How long the server keeps a model loaded after its last request; override with OLLAMA_KEEP_ALIVE
+DEFAULT_OLLAMA_KEEP_ALIVE = "30m"
 
 
 def _get_ollama_base_url() -> str:
@@ -80,6 +82,22 @@ def get_locally_available_models() -> List[str]:
         return []
 
 
+def get_ollama_keep_alive() -> str:
+    """Return how long Ollama should keep models loaded between requests."""
+    return os.environ.get("OLLAMA_KEEP_ALIVE") or DEFAULT_OLLAMA_KEEP_ALIVE
+
+
+def preload_model(model_name: str, keep_alive: str | None = None, base_url: str | None = None) -> bool:
+    """Load a model into memory ahead of its first request and keep it loaded for keep_alive."""
+    endpoint = f"{base_url.rstrip('/')}/api/generate" if base_url else _get_ollama_endpoint("/api/generate")
+    try:
+        # A generate request without a prompt only loads the model
+        response = requests.post(endpoint, json={"model": model_name, "keep_alive": keep_alive or get_ollama_keep_alive()}, timeout=300)
+        return response.status_code == 200
+    except requests.RequestException:
+        return False
+
+
 def start_ollama_server() -> bool:
     """Start the Ollama server if it's not already running."""
     if is_ollama_server_running():
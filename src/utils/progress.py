@@ -1,71 +1,195 @@
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from rich.console import Console
 from rich.live import Live
 from rich.table import Table
 from rich.style import Style
 from rich.text import Text
-from typing import Dict, Optional, Callable, List
+from typing import Dict, Optional, Callable, List, NamedTuple
+
+from src.utils.tracing import mark_phase
 
 console = Console()
 
 
+class ProgressUpdate(NamedTuple):
+    """The latest status of an (agent, ticker) pair within one tick."""
+
+    agent_name: str
+    ticker: Optional[str]
+    status: str
+    analysis: Optional[str]
+    timestamp: str
+    run_id: Optional[str] = None
+
+
+ProgressHandler = Callable[[List[ProgressUpdate]], None]
+
+# Run whose graph is executing in this context; propagates into the graph's node threads
+_current_run_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("progress_run_id", default=None)
+
+
+@contextmanager
+def progress_run(run_id: Optional[str]):
+    """Attribute the status updates made in this context (and the graph threads it spawns) to a run."""
+    token = _current_run_id.set(run_id)
+    try:
+        yield
+    finally:
+        _current_run_id.reset(token)
+
+
 class AgentProgress:
-    """Manages progress tracking for multiple agents."""
+    """
+    Manages progress tracking for multiple agents.
+
+    Updates are cheap and thread-safe: they are recorded under a lock and coalesced per
+    (agent, ticker). A background tick (every tick_seconds) renders the display and hands each
+    registered handler the batch of updates since the previous tick.
 
-    def __init__(self):
+    Global handlers receive every update. Run subscribers only receive the updates of their run
+    (see progress_run), so concurrent runs do not see each other's agents.
+    """
+
+    def __init__(self, tick_seconds: float = 0.1):
+        self.tick_seconds = tick_seconds
         self.agent_status: Dict[str, Dict[str, str]] = {}
         self.table = Table(show_header=False, box=None, padding=(0, 1))
         self.live = Live(self.table, console=console, refresh_per_second=4)
         self.started = False
-        self.update_handlers: List[Callable[[str, Optional[str], str], None]] = []
-
-    def register_handler(self, handler: Callable[[str, Optional[str], str], None]):
-        """Register a handler to be called when agent status updates."""
-        self.update_handlers.append(handler)
+        self.update_handlers: List[ProgressHandler] = []
+        self.run_handlers: Dict[str, List[ProgressHandler]] = {}
+        self._lock = threading.Lock()
+        # Serializes flushes so batches reach handlers in order
+        self._flush_lock = threading.Lock()
+        # (run, agent, ticker) -> latest update, ordered by when each was last updated
+        self._pending: Dict[tuple, ProgressUpdate] = {}
+        self._dirty = False
+        self._tick_thread: Optional[threading.Thread] = None
+
+    def register_handler(self, handler: ProgressHandler):
+        """Register a handler to be called with each batch of status updates."""
+        with self._lock:
+            self.update_handlers.append(handler)
+        self._ensure_ticking()
         return handler  # Return handler to support use as decorator
 
-    def unregister_handler(self, handler: Callable[[str, Optional[str], str], None]):
+    def unregister_handler(self, handler: ProgressHandler):
         """Unregister a previously registered handler."""
-        if handler in self.update_handlers:
-            self.update_handlers.remove(handler)
+        with self._lock:
+            if handler in self.update_handlers:
+                self.update_handlers.remove(handler)
+
+    def subscribe(self, run_id: str, handler: ProgressHandler):
+        """Register a handler for the status updates of one run."""
+        with self._lock:
+            self.run_handlers.setdefault(run_id, []).append(handler)
+        self._ensure_ticking()
+        return handler
+
+    def unsubscribe(self, run_id: str, handler: ProgressHandler):
+        """Unregister a run's handler."""
+        with self._lock:
+            handlers = self.run_handlers.get(run_id, [])
+            if handler in handlers:
+                handlers.remove(handler)
+            if not handlers:
+                self.run_handlers.pop(run_id, None)
 
     def start(self):
         """Start the progress display."""
         if not self.started:
             self.live.start()
             self.started = True
+            self._ensure_ticking()
 
     def stop(self):
-        """Stop the progress display."""
+        """Stop the progress display, after rendering the final statuses."""
         if self.started:
+            self.flush()
             self.live.stop()
             self.started = False
 
     def update_status(self, agent_name: str, ticker: Optional[str] = None, status: str = "", analysis: Optional[str] = None):
         """Update the status of an agent."""
-        if agent_name not in self.agent_status:
-            self.agent_status[agent_name] = {"status": "", "ticker": None}
-
-        if ticker:
-            self.agent_status[agent_name]["ticker"] = ticker
-        if status:
-            self.agent_status[agent_name]["status"] = status
-        if analysis:
-            self.agent_status[agent_name]["analysis"] = analysis
-        
+        # Statuses split a traced node's span into phases (data fetching, analysis, LLM calls, ...)
+        mark_phase(agent_name, ticker, status)
+
         # Set the timestamp as UTC datetime
         timestamp = datetime.now(timezone.utc).isoformat()
-        self.agent_status[agent_name]["timestamp"] = timestamp
-
-        # Notify all registered handlers
-        for handler in self.update_handlers:
-            handler(agent_name, ticker, status, analysis, timestamp)
+        run_id = _current_run_id.get()
 
-        self._refresh_display()
+        with self._lock:
+            info = self.agent_status.setdefault(agent_name, {"status": "", "ticker": None})
+            if ticker:
+                info["ticker"] = ticker
+            if status:
+                info["status"] = status
+            if analysis:
+                info["analysis"] = analysis
+            info["timestamp"] = timestamp
+            self._dirty = True
+
+            if self.update_handlers or run_id in self.run_handlers:
+                key = (run_id, agent_name, ticker)
+                previous = self._pending.pop(key, None)
+                # A later status without analysis must not drop the analysis of an earlier one
+                if previous is not None and not analysis:
+                    analysis = previous.analysis
+                self._pending[key] = ProgressUpdate(agent_name, ticker, status, analysis, timestamp, run_id)
+
+    def flush(self):
+        """Render the display and dispatch pending updates to the handlers now, instead of on the next tick."""
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._pending.values())
+                self._pending.clear()
+                handlers = list(self.update_handlers)
+                run_handlers = {run_id: list(subscribers) for run_id, subscribers in self.run_handlers.items()}
+                render = self.started and self._dirty
+                self._dirty = False
+
+            if render:
+                self._refresh_display()
+            if not batch:
+                return
+            deliveries = [(handler, batch) for handler in handlers]
+            if run_handlers:
+                by_run: Dict[str, List[ProgressUpdate]] = {}
+                for update in batch:
+                    if update.run_id in run_handlers:
+                        by_run.setdefault(update.run_id, []).append(update)
+                deliveries += [(handler, updates) for run_id, updates in by_run.items() for handler in run_handlers[run_id]]
+            for handler, updates in deliveries:
+                try:
+                    handler(updates)
+                except Exception as e:
+                    print(f"Progress handler failed: {e}")
+
+    def _ensure_ticking(self):
+        with self._lock:
+            if self._tick_thread is None:
+                self._tick_thread = threading.Thread(target=self._tick, name="progress-tick", daemon=True)
+                self._tick_thread.start()
+
+    def _tick(self):
+        while True:
+            time.sleep(self.tick_seconds)
+            self.flush()
+            with self._lock:
+                # Idle: let the thread end until the display or a handler needs it again
+                if not self.started and not self.update_handlers and not self.run_handlers and not self._pending:
+                    self._tick_thread = None
+                    return
 
     def get_all_status(self):
         """Get the current status of all agents as a dictionary."""
-        return {agent_name: {"ticker": info["ticker"], "status": info["status"], "display_name": self._get_display_name(agent_name)} for agent_name, info in self.agent_status.items()}
+        with self._lock:
+            return {agent_name: {"ticker": info["ticker"], "status": info["status"], "display_name": self._get_display_name(agent_name)} for agent_name, info in self.agent_status.items()}
 
     def _get_display_name(self, agent_name: str) -> str:
         """Convert agent_name to a display-friendly format."""
@@ -73,8 +197,11 @@ class AgentProgress:
 
     def _refresh_display(self):
         """Refresh the progress display."""
-        self.table.columns.clear()
-        self.table.add_column(width=100)
+        # Build a new table and swap it in, so the live display never renders a half-built one
+        table = Table(show_header=False, box=None, padding=(0, 1))
+        table.add_column(width=100)
+        with self._lock:
+            statuses = [(agent_name, dict(info)) for agent_name, info in self.agent_status.items()]
 
         # Sort agents with Risk Management and Portfolio Management at the bottom
         def sort_key(item):
@@ -86,7 +213,7 @@ class AgentProgress:
             else:
                 return (1, agent_name)
 
-        for agent_name, info in sorted(self.agent_status.items(), key=sort_key):
+        for agent_name, info in sorted(statuses, key=sort_key):
             status = info["status"]
             ticker = info["ticker"]
             # Create the status text with appropriate styling
@@ -109,8 +236,11 @@ class AgentProgress:
                 status_text.append(f"[{ticker}] ", style=Style(color="cyan"))
             status_text.append(status, style=style)
 
-            self.table.add_row(status_text)
+            table.add_row(status_text)
+
+        self.table = table
+        self.live.update(table)
 
 
-# Create a global instance
-progress = AgentProgress()
+# Create a global instance; PROGRESS_TICK_SECONDS sets how often the display and handlers are updated
+progress = AgentProgress(tick_seconds=float(os.environ.get("PROGRESS_TICK_SECONDS", "0.1")))
@@ -0,0 +1,229 @@
+"""
+Execution tracing of agent graph runs: nested spans for graph nodes, their progress phases,
+LLM calls and financial API requests, exported as a Chrome trace (chrome://tracing, Perfetto)
+and a summary table.
+
+Tracing is off unless a run is wrapped in ``trace_run``; instrumented code then pays a single
+context variable lookup per call.
+"""
+
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+# Attributes a span inherits from its parent, so LLM and API spans are attributed to their agent and ticker
+_INHERITED_ATTRIBUTES = ("agent", "ticker")
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = ("span_id", "name", "category", "parent", "attributes", "thread_id", "start_ns", "end_ns", "phase")
+
+    def __init__(self, span_id: int, name: str, category: str, parent: "Span | None", attributes: dict[str, Any]):
+        self.span_id = span_id
+        self.name = name
+        self.category = category
+        self.parent = parent
+        inherited = {key: parent.attributes[key] for key in _INHERITED_ATTRIBUTES if parent and key in parent.attributes}
+        self.attributes = {**inherited, **{key: value for key, value in attributes.items() if value is not None}}
+        self.thread_id = threading.get_ident()
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: int | None = None
+        # Open progress phase of a node span (see Tracer.mark_phase)
+        self.phase: Span | None = None
+
+    @property
+    def duration_seconds(self) -> float:
+        return ((self.end_ns or time.perf_counter_ns()) - self.start_ns) / 1e9
+
+
+class Tracer:
+    """Collects the spans of one traced run."""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.start_ns = time.perf_counter_ns()
+
+    def start_span(self, name: str, category: str, parent: Span | None, attributes: dict[str, Any]) -> Span:
+        span = Span(next(self._ids), name, category, parent, attributes)
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    def end_span(self, span: Span):
+        if span.phase is not None:
+            self.end_span(span.phase)
+            span.phase = None
+        span.end_ns = time.perf_counter_ns()
+
+    def mark_phase(self, span: Span, status: str, ticker: str | None = None):
+        """End the span's current progress phase and start the next one, named after the status."""
+        if span.phase is not None:
+            self.end_span(span.phase)
+            span.phase = None
+        if status and status != "Done":
+            span.phase = self.start_span(status, "phase", span, {"ticker": ticker})
+
+    def to_chrome_trace(self) -> dict:
+        """The trace in Chrome trace event format, one complete ("X") event per span."""
+        pid = os.getpid()
+        thread_numbers: dict[int, int] = {}
+        events = []
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            tid = thread_numbers.setdefault(span.thread_id, len(thread_numbers) + 1)
+            end_ns = span.end_ns or time.perf_counter_ns()
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": (span.start_ns - self.start_ns) / 1000,
+                    "dur": (end_ns - span.start_ns) / 1000,
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {key: _serializable(value) for key, value in span.attributes.items()},
+                }
+            )
+        for thread_id, tid in thread_numbers.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": f"thread-{tid}"}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: str | Path) -> Path:
+        """Write the Chrome trace to a JSON file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+        return path
+
+    def summary(self) -> list[dict]:
+        """
+        Per span name: count, total and self time (total minus time in child spans), slowest first.
+
+        Self time shows where a run's time actually goes, e.g. a node's time outside its LLM calls.
+        """
+        with self._lock:
+            spans = list(self.spans)
+        child_seconds: dict[int, float] = defaultdict(float)
+        for span in spans:
+            if span.parent is not None:
+                child_seconds[span.parent.span_id] += span.duration_seconds
+
+        rows: dict[tuple[str, str], dict] = {}
+        for span in spans:
+            row = rows.setdefault(
+                (span.category, span.name),
+                {"category": span.category, "name": span.name, "count": 0, "total_seconds": 0.0, "self_seconds": 0.0, "max_seconds": 0.0},
+            )
+            duration = span.duration_seconds
+            row["count"] += 1
+            row["total_seconds"] += duration
+            row["self_seconds"] += max(0.0, duration - child_seconds[span.span_id])
+            row["max_seconds"] = max(row["max_seconds"], duration)
+        return sorted(rows.values(), key=lambda row: -row["self_seconds"])
+
+
+def _serializable(value: Any) -> Any:
+    return value if isinstance(value, (str, int, float, bool)) else str(value)
+
+
+_active_tracer: contextvars.ContextVar[Tracer | None] = contextvars.ContextVar("active_tracer", default=None)
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar("current_span", default=None)
+
+
+def get_tracer() -> Tracer | None:
+    """The tracer of the current run, or None when tracing is off."""
+    return _active_tracer.get()
+
+
+@contextmanager
+def trace_run(path: str | Path | None = None, name: str = "run", **attributes):
+    """
+    Trace everything run inside the block (including graph nodes on worker threads).
+
+    Yields the Tracer; when a path is given, the Chrome trace is written there on exit.
+    """
+    tracer = Tracer()
+    tracer_token = _active_tracer.set(tracer)
+    root = tracer.start_span(name, "run", None, attributes)
+    span_token = _current_span.set(root)
+    try:
+        yield tracer
+    finally:
+        tracer.end_span(root)
+        _current_span.reset(span_token)
+        _active_tracer.reset(tracer_token)
+        if path is not None:
+            tracer.export(path)
+
+
+@contextmanager
+def span(name: str, category: str = "", **attributes):
+    """
+    Record the block as a span nested under the current one. Yields the Span, or None when tracing is off.
+
+    Spans opened inside a node's progress phase nest under that phase.
+    """
+    tracer = _active_tracer.get()
+    if tracer is None:
+        yield None
+        return
+    parent = _current_span.get()
+    if parent is not None and parent.phase is not None:
+        parent = parent.phase
+    current = tracer.start_span(name, category, parent, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    finally:
+        _current_span.reset(token)
+        tracer.end_span(current)
+
+
+def traced_node(node_function: Callable, node_name: str) -> Callable:
+    """Wrap a graph node so each execution is recorded as a span attributed to the agent."""
+
+    @functools.wraps(node_function)
+    def wrapper(*args, **kwargs):
+        if _active_tracer.get() is None:
+            return node_function(*args, **kwargs)
+        with span(node_name, "node", agent=node_name):
+            return node_function(*args, **kwargs)
+
+    return wrapper
+
+
+def mark_phase(agent_name: str, ticker: str | None, status: str):
+    """Start a new progress phase (e.g. "Fetching financial metrics") of the agent's running node span."""
+    tracer = _active_tracer.get()
+    if tracer is None:
+        return
+    current = _current_span.get()
+    # Statuses reported from inside LLM or API calls (e.g. retries) do not start a phase
+    if current is not None and current.category == "node" and current.attributes.get("agent") == agent_name:
+        tracer.mark_phase(current, status, ticker)
+
+
+def get_trace_dir() -> Path | None:
+    """Directory for the traces of backend runs, from AGENT_TRACE_DIR. Backend tracing is off when unset."""
+    trace_dir = os.environ.get("AGENT_TRACE_DIR")
+    return Path(trace_dir) if trace_dir else None
+
+
+def new_trace_path(trace_dir: Path, prefix: str = "trace") -> Path:
+    """A unique file path for a new trace in the directory."""
+    return trace_dir / f"{prefix}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.json"
@@ -0,0 +1,185 @@
+"""Instrumentation of LLM and financial API calls: latency, retries, tokens and estimated cost."""
+
+import contextvars
+import json
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+# USD prices per million tokens, keyed by model name prefix
+_PRICING_PATH = Path(__file__).parent.parent / "llm" / "model_pricing.json"
+_pricing: dict[str, dict[str, float]] | None = None
+
+
+def _get_pricing() -> dict[str, dict[str, float]]:
+    global _pricing
+    if _pricing is None:
+        with open(_PRICING_PATH) as f:
+            _pricing = json.load(f)
+    return _pricing
+
+
+def estimate_cost(model_name: str, input_tokens: int, output_tokens: int) -> float:
+    """Estimate the USD cost of a call from its token counts. Models without a known price (e.g. local Ollama models) cost nothing."""
+    pricing = _get_pricing()
+    # The longest matching prefix wins, so "gpt-5-mini" is not priced as "gpt-5"
+    matches = [prefix for prefix in pricing if model_name and model_name.startswith(prefix)]
+    if not matches:
+        return 0.0
+    price = pricing[max(matches, key=len)]
+    return (input_tokens * price["input"] + output_tokens * price["output"]) / 1_000_000
+
+
+class TokenUsageCallback(BaseCallbackHandler):
+    """LangChain callback that sums the token usage reported by the provider across every call it observes."""
+
+    def __init__(self):
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    def on_llm_end(self, response: LLMResult, **kwargs):
+        found = False
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    self.input_tokens += usage.get("input_tokens", 0) or 0
+                    self.output_tokens += usage.get("output_tokens", 0) or 0
+                    found = True
+        # Older integrations only report usage in llm_output
+        if not found:
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            self.input_tokens += token_usage.get("prompt_tokens", 0) or 0
+            self.output_tokens += token_usage.get("completion_tokens", 0) or 0
+
+
+def _new_totals() -> dict:
+    return {"calls": 0, "failures": 0, "retries": 0, "latency_seconds": 0.0, "input_tokens": 0, "output_tokens": 0, "estimated_cost": 0.0}
+
+
+def _merge_totals(totals: dict, view: dict):
+    for key, value in view.items():
+        totals[key] += value
+
+
+class UsageTracker:
+    """
+    Thread-safe aggregate of LLM and financial API usage.
+
+    LLM calls are aggregated per agent, model and ticker; API calls per endpoint.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._llm = _new_totals()
+        self._api = _new_totals()
+        self._by_agent = defaultdict(_new_totals)
+        self._by_model = defaultdict(_new_totals)
+        self._by_ticker = defaultdict(_new_totals)
+        self._by_endpoint = defaultdict(_new_totals)
+
+    @staticmethod
+    def _add(totals: dict, latency: float, retries: int, success: bool, input_tokens: int = 0, output_tokens: int = 0, cost: float = 0.0):
+        totals["calls"] += 1
+        totals["failures"] += 0 if success else 1
+        totals["retries"] += retries
+        totals["latency_seconds"] += latency
+        totals["input_tokens"] += input_tokens
+        totals["output_tokens"] += output_tokens
+        totals["estimated_cost"] += cost
+
+    def record_llm_call(
+        self,
+        agent_name: str | None,
+        model_name: str,
+        model_provider: str,
+        ticker: str | None,
+        latency: float,
+        retries: int,
+        input_tokens: int,
+        output_tokens: int,
+        success: bool = True,
+    ):
+        """Record one call_llm invocation, including all of its retries."""
+        cost = estimate_cost(model_name, input_tokens, output_tokens)
+        with self._lock:
+            for totals in (
+                self._llm,
+                self._by_agent[agent_name or "unknown"],
+                self._by_model[f"{model_provider}:{model_name}"],
+                self._by_ticker[ticker or "all"],
+            ):
+                self._add(totals, latency, retries, success, input_tokens, output_tokens, cost)
+
+    def record_api_call(self, endpoint: str, latency: float, retries: int, status_code: int | None):
+        """Record one financial API request, including its rate-limit retries."""
+        success = isinstance(status_code, int) and status_code < 400
+        with self._lock:
+            for totals in (self._api, self._by_endpoint[endpoint]):
+                self._add(totals, latency, retries, success)
+
+    def merge_summary(self, summary: dict):
+        """Add usage recorded by another tracker (e.g. in a worker process), given as its summary()."""
+        with self._lock:
+            for totals, view in ((self._llm, summary["llm"]), (self._api, summary["api"])):
+                _merge_totals(totals, view)
+            for table, section in ((self._by_agent, "by_agent"), (self._by_model, "by_model"), (self._by_ticker, "by_ticker"), (self._by_endpoint, "by_endpoint")):
+                for key, view in summary[section].items():
+                    _merge_totals(table[key], view)
+
+    def summary(self) -> dict:
+        """Get a JSON-serializable snapshot of the recorded usage."""
+
+        def _llm_view(totals: dict) -> dict:
+            return {**totals, "latency_seconds": round(totals["latency_seconds"], 3), "estimated_cost": round(totals["estimated_cost"], 6)}
+
+        def _api_view(totals: dict) -> dict:
+            return {key: totals[key] for key in ("calls", "failures", "retries")} | {"latency_seconds": round(totals["latency_seconds"], 3)}
+
+        with self._lock:
+            return {
+                "llm": _llm_view(self._llm),
+                "api": _api_view(self._api),
+                "by_agent": {key: _llm_view(value) for key, value in self._by_agent.items()},
+                "by_model": {key: _llm_view(value) for key, value in self._by_model.items()},
+                "by_ticker": {key: _llm_view(value) for key, value in self._by_ticker.items()},
+                "by_endpoint": {key: _api_view(value) for key, value in self._by_endpoint.items()},
+            }
+
+
+# Trackers active in the current context, outermost first. A call is recorded in every
+# active tracker, so a per-cycle tracker nested inside a per-run tracker feeds both.
+_active_trackers: contextvars.ContextVar[tuple[UsageTracker, ...]] = contextvars.ContextVar("usage_trackers", default=())
+
+
+@contextmanager
+def track_usage(tracker: UsageTracker | None = None):
+    """Record LLM and API usage made in this context (and the graph threads it spawns) into a tracker."""
+    tracker = tracker or UsageTracker()
+    token = _active_trackers.set(_active_trackers.get() + (tracker,))
+    try:
+        yield tracker
+    finally:
+        _active_trackers.reset(token)
+
+
+def record_llm_call(*args, **kwargs):
+    """Record an LLM call in every active tracker."""
+    for tracker in _active_trackers.get():
+        tracker.record_llm_call(*args, **kwargs)
+
+
+def record_api_call(*args, **kwargs):
+    """Record a financial API call in every active tracker."""
+    for tracker in _active_trackers.get():
+        tracker.record_api_call(*args, **kwargs)
+
+
+def record_usage_summary(summary: dict):
+    """Add a usage summary recorded elsewhere (e.g. in a worker process) to every active tracker."""
+    for tracker in _active_trackers.get():
+        tracker.merge_summary(summary)
@@ -0,0 +1,125 @@
+import pytest
+
+from src.backtesting.checkpoint import BacktestCheckpoint
+from src.backtesting.engine import BacktestEngine
+from tests.backtesting.integration.mocks import MockConfigurableAgent
+
+
+TICKERS = ["AAPL", "MSFT", "TSLA"]
+
+DECISION_SEQUENCE = [
+    {"AAPL": {"action": "buy", "quantity": 100}, "TSLA": {"action": "short", "quantity": 40}},
+    {"MSFT": {"action": "buy", "quantity": 30}},
+    {"AAPL": {"action": "sell", "quantity": 30}},
+    {"TSLA": {"action": "cover", "quantity": 20}},
+]
+
+
+class CrashingAgent(MockConfigurableAgent):
+    """Mock agent whose provider goes down on a given call."""
+
+    def __init__(self, decision_sequence: list[dict], tickers: list[str], crash_on_call: int):
+        super().__init__(decision_sequence, tickers)
+        self.crash_on_call = crash_on_call
+
+    def __call__(self, **kwargs):
+        if self.call_count == self.crash_on_call:
+            raise RuntimeError("LLM provider outage")
+        return super().__call__(**kwargs)
+
+
+def _engine(agent, checkpoint=None) -> BacktestEngine:
+    return BacktestEngine(
+        agent=agent,
+        tickers=TICKERS,
+        start_date="2024-03-01",
+        end_date="2024-03-08",
+        initial_capital=100000.0,
+        model_name="test-model",
+        model_provider="test-provider",
+        selected_analysts=None,
+        initial_margin_requirement=0.5,
+        checkpoint=checkpoint,
+    )
+
+
+def test_resumed_backtest_matches_uninterrupted_run(tmp_path):
+    uninterrupted = _engine(MockConfigurableAgent(DECISION_SEQUENCE, TICKERS))
+    expected_metrics = uninterrupted.run_backtest()
+
+    checkpoint = BacktestCheckpoint(tmp_path / "backtest.json")
+    crashing = _engine(CrashingAgent(DECISION_SEQUENCE, TICKERS, crash_on_call=2), checkpoint)
+    with pytest.raises(RuntimeError):
+        crashing.run_backtest()
+
+    # Only the remaining days call the agent again
+    resumed_agent = MockConfigurableAgent(DECISION_SEQUENCE[2:], TICKERS)
+    resumed = BacktestEngine.from_checkpoint(checkpoint, agent=resumed_agent)
+    metrics = resumed.run_backtest()
+
+    assert resumed_agent.call_count == len(DECISION_SEQUENCE) - 2
+    assert metrics == expected_metrics
+    assert resumed.get_portfolio_values() == uninterrupted.get_portfolio_values()
+    assert resumed._portfolio.get_snapshot() == uninterrupted._portfolio.get_snapshot()
+    assert resumed.get_agent_outputs() == uninterrupted.get_agent_outputs()
+
+
+def test_checkpoint_every_n_days_repeats_only_unsaved_days(tmp_path):
+    checkpoint = BacktestCheckpoint(tmp_path / "backtest.json", every=2)
+    crashing = _engine(CrashingAgent(DECISION_SEQUENCE, TICKERS, crash_on_call=3), checkpoint)
+    with pytest.raises(RuntimeError):
+        crashing.run_backtest()
+
+    state = checkpoint.load()
+    assert [day["date"] for day in state["days"]] == ["2024-03-05", "2024-03-06"]
+
+    # The third day completed before the crash but was not saved yet
+    resumed_agent = MockConfigurableAgent(DECISION_SEQUENCE[2:], TICKERS)
+    BacktestEngine.from_checkpoint(checkpoint, agent=resumed_agent).run_backtest()
+    assert resumed_agent.call_count == len(DECISION_SEQUENCE) - 2
+
+
+def test_checkpoint_of_a_different_backtest_is_rejected(tmp_path):
+    checkpoint = BacktestCheckpoint(tmp_path / "backtest.json")
+    _engine(MockConfigurableAgent(DECISION_SEQUENCE, TICKERS), checkpoint).run_backtest()
+
+    other = BacktestEngine(
+        agent=MockConfigurableAgent(DECISION_SEQUENCE, TICKERS),
+        tickers=["AAPL"],
+        start_date="2024-03-01",
+        end_date="2024-03-08",
+        initial_capital=100000.0,
+        model_name="test-model",
+        model_provider="test-provider",
+        selected_analysts=None,
+        initial_margin_requirement=0.5,
+        checkpoint=checkpoint,
+    )
+    with pytest.raises(ValueError):
+        other.run_backtest()
+
+
+def test_each_completed_day_is_journaled_once(tmp_path):
+    checkpoint = BacktestCheckpoint(tmp_path / "backtest.json")
+    engine = _engine(MockConfigurableAgent(DECISION_SEQUENCE, TICKERS), checkpoint)
+    engine.run_backtest()
+
+    # Saves append the new day to the journal; the checkpoint file only holds the latest state
+    journaled = [line for line in checkpoint.days_path.read_text().splitlines() if line]
+    assert len(journaled) == len(engine.get_agent_outputs())
+    assert "agent_outputs" not in checkpoint.path.read_text()
+
+    checkpoint.clear()
+    assert not checkpoint.exists() and not checkpoint.days_path.exists()
+
+
+def test_resume_from_the_command_line_honors_checkpoint_every(tmp_path):
+    from src.backtesting.cli import parse_resume_args, resume_engine
+
+    path = tmp_path / "backtest.json"
+    _engine(MockConfigurableAgent(DECISION_SEQUENCE, TICKERS), BacktestCheckpoint(path)).run_backtest()
+
+    args = parse_resume_args(["--resume", str(path), "--checkpoint-every", "3", "--tickers", "AAPL"])
+    engine = resume_engine(args.resume, every=args.checkpoint_every)
+    assert engine._checkpoint.every == 3
+    assert resume_engine(str(tmp_path / "missing.json")) is None
@@ -0,0 +1,315 @@
+"""Tests for the per-day and per-ticker backtest result storage."""
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.backend.database.connection import create_database_engine
+from app.backend.database.models import Base, HedgeFundBacktestCheckpoint, HedgeFundBacktestDay
+from app.backend.models.schemas import BacktestRequest, FlowRunStatus
+from app.backend.repositories.backtest_result_repository import DAY_FIELDS, BacktestResultRepository
+from app.backend.repositories.flow_repository import FlowRepository
+from app.backend.repositories.flow_run_repository import FlowRunRepository
+from app.backend.routes import hedge_fund as hedge_fund_routes
+from app.backend.routes.hedge_fund import _stream_backtest
+from app.backend.services import backtest_service as backtest_service_module
+from app.backend.services.backtest_result_writer import BacktestResultWriter
+from app.backend.services.backtest_service import BacktestService
+from app.backend.services.portfolio import create_portfolio
+from app.backend.services.run_scheduler import BACKTEST, RunScheduler
+
+
+def _day_result(day: int, tickers=("AAPL", "MSFT")) -> dict:
+    date = f"2024-01-{day:02d}"
+    return {
+        "date": date,
+        "portfolio_value": 100000.0 + day,
+        "cash": 50000.0,
+        "decisions": {ticker: {"action": "buy", "quantity": 1} for ticker in tickers},
+        "executed_trades": {ticker: 1 for ticker in tickers},
+        "analyst_signals": {"technical_analyst_agent": {ticker: {"signal": "bullish", "confidence": 60} for ticker in tickers}},
+        "current_prices": {ticker: 100.0 + day for ticker in tickers},
+        "long_exposure": 50000.0,
+        "short_exposure": 0.0,
+        "gross_exposure": 50000.0,
+        "net_exposure": 50000.0,
+        "long_short_ratio": None,
+        "portfolio_return": day / 100,
+        "performance_metrics": {"sharpe_ratio": 1.0},
+        "usage": None,
+        "ticker_details": [
+            {
+                "ticker": ticker,
+                "action": "buy",
+                "quantity": 1,
+                "price": 100.0 + day,
+                "shares_owned": day,
+                "long_shares": day,
+                "short_shares": 0,
+                "position_value": (100.0 + day) * day,
+                "bullish_count": 1,
+                "bearish_count": 0,
+                "neutral_count": 0,
+            }
+            for ticker in tickers
+        ],
+    }
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def run_id(session_factory):
+    with session_factory() as db:
+        flow_id = FlowRepository(db).create_flow(name="flow", nodes={}, edges={}).id
+        return FlowRunRepository(db).create_flow_run(flow_id, trading_mode="backtest").id
+
+
+class TestBacktestResultRepository:
+    def test_days_are_paginated_and_projected(self, session_factory, run_id):
+        with session_factory() as db:
+            repo = BacktestResultRepository(db)
+            assert repo.add_day_results(run_id, [_day_result(day) for day in range(1, 11)]) == 10
+
+            total, rows = repo.get_days(run_id, start_date="2024-01-03", fields=["portfolio_value"], limit=3, offset=2)
+
+        assert total == 8
+        assert rows == [
+            {"date": "2024-01-05", "portfolio_value": 100005.0},
+            {"date": "2024-01-06", "portfolio_value": 100006.0},
+            {"date": "2024-01-07", "portfolio_value": 100007.0},
+        ]
+
+    def test_ticker_results_carry_the_tickers_signals(self, session_factory, run_id):
+        with session_factory() as db:
+            repo = BacktestResultRepository(db)
+            repo.add_day_results(run_id, [_day_result(day) for day in range(1, 4)])
+
+            total, rows = repo.get_ticker_results(run_id, ticker="MSFT", fields=["price", "analyst_signals"])
+
+        assert total == 3
+        assert [row["date"] for row in rows] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+        assert rows[0]["price"] == 101.0
+        assert rows[0]["analyst_signals"] == {"technical_analyst_agent": {"signal": "bullish", "confidence": 60}}
+
+    def test_latest_checkpoint_and_days_after_it(self, session_factory, run_id):
+        with session_factory() as db:
+            repo = BacktestResultRepository(db)
+            repo.add_day_results(run_id, [_day_result(1), _day_result(2)], checkpoint={"last_completed_date": "2024-01-02"})
+            repo.add_day_results(run_id, [_day_result(3), _day_result(4)], checkpoint={"last_completed_date": "2024-01-04"})
+            repo.add_day_results(run_id, [_day_result(5)])
+
+            assert repo.get_checkpoint(run_id) == {"last_completed_date": "2024-01-04"}
+            # Each batch replaces the run's checkpoint rather than adding another, and it is not an analysis cycle
+            assert db.query(HedgeFundBacktestCheckpoint).filter(HedgeFundBacktestCheckpoint.flow_run_id == run_id).count() == 1
+            assert FlowRunRepository(db).get_flow_run_cycles(run_id) == []
+            repo.delete_results(run_id, after_date="2024-01-04")
+            db.commit()
+            assert repo.get_days(run_id)[0] == 4
+            assert repo.get_ticker_results(run_id)[0] == 8
+
+            repo.delete_results(run_id)
+            db.commit()
+            assert repo.get_checkpoint(run_id) is None
+
+    def test_deleting_a_run_deletes_its_results(self, session_factory, run_id):
+        with session_factory() as db:
+            BacktestResultRepository(db).add_day_results(run_id, [_day_result(1)])
+            assert FlowRunRepository(db).delete_flow_run(run_id)
+
+            assert BacktestResultRepository(db).get_days(run_id) == (0, [])
+            assert BacktestResultRepository(db).get_ticker_results(run_id) == (0, [])
+
+
+class TestBacktestResultWriter:
+    def test_writes_in_batches_and_completes_the_run(self, session_factory, run_id):
+        writer = BacktestResultWriter(run_id, batch_size=4, session_factory=session_factory)
+        stored_before_finish = []
+        checkpoints_built = []
+
+        def checkpoint(day):
+            checkpoints_built.append(day)
+            return {"last_completed_date": f"2024-01-{day:02d}"}
+
+        async def run():
+            for day in range(1, 11):
+                writer.add(_day_result(day), checkpoint=lambda day=day: checkpoint(day))
+            await asyncio.gather(*writer._writes)
+            with session_factory() as db:
+                stored_before_finish.append(db.query(HedgeFundBacktestDay).count())
+            await writer.finish(results={"total_days": 10})
+
+        asyncio.run(run())
+
+        assert stored_before_finish == [8]
+        # Checkpoints are only built for the last day of each written batch
+        assert checkpoints_built == [4, 8, 10]
+        with session_factory() as db:
+            assert BacktestResultRepository(db).get_days(run_id)[0] == 10
+            assert BacktestResultRepository(db).get_checkpoint(run_id) == {"last_completed_date": "2024-01-10"}
+            flow_run = FlowRunRepository(db).get_flow_run_by_id(run_id)
+            assert flow_run.status == FlowRunStatus.COMPLETE.value
+            assert flow_run.results == {"total_days": 10}
+
+    def test_failed_runs_keep_their_stored_days(self, session_factory, run_id):
+        writer = BacktestResultWriter(run_id, batch_size=4, session_factory=session_factory)
+
+        async def run():
+            for day in range(1, 3):
+                writer.add(_day_result(day))
+            await writer.finish(error_message="Backtest did not complete")
+            # Finishing twice (e.g. from cleanup after a failure) is a no-op
+            await writer.finish(results={"total_days": 2})
+
+        asyncio.run(run())
+
+        with session_factory() as db:
+            assert BacktestResultRepository(db).get_days(run_id)[0] == 2
+            flow_run = FlowRunRepository(db).get_flow_run_by_id(run_id)
+            assert flow_run.status == FlowRunStatus.ERROR.value
+            assert flow_run.error_message == "Backtest did not complete"
+
+
+class TestBacktestResume:
+    TICKERS = ["AAPL", "MSFT"]
+
+    @pytest.fixture(autouse=True)
+    def offline_backtest(self, monkeypatch):
+        """Deterministic prices and decisions, without data APIs or LLMs."""
+
+        def prices(self, previous_date_str, current_date_str):
+            day = pd.Timestamp(current_date_str).day
+            return {"AAPL": 100.0 + day * 1.5, "MSFT": 300.0 - day * 2.25}
+
+        async def run_graph(*, end_date, **kwargs):
+            day = pd.Timestamp(end_date).day
+            decisions = {
+                "AAPL": {"action": "buy" if day % 2 else "sell", "quantity": 10 if day % 2 else 4},
+                "MSFT": {"action": "short" if day % 3 else "cover", "quantity": 5 if day % 3 else 3},
+            }
+            signals = {"technical_analyst_agent": {ticker: {"signal": "bullish", "confidence": day} for ticker in self.TICKERS}}
+            return {"messages": [SimpleNamespace(content=json.dumps(decisions))], "data": {"analyst_signals": signals}}
+
+        monkeypatch.setattr(BacktestService, "prefetch_data", lambda self: None)
+        monkeypatch.setattr(BacktestService, "get_current_prices", prices)
+        monkeypatch.setattr(backtest_service_module, "run_graph_async", run_graph)
+
+    def _service(self, checkpoint=None) -> BacktestService:
+        return BacktestService(
+            graph=None,
+            portfolio=create_portfolio(100000.0, 0.5, self.TICKERS),
+            tickers=self.TICKERS,
+            start_date="2024-01-02",
+            end_date="2024-01-19",
+            initial_capital=100000.0,
+            checkpoint=checkpoint,
+        )
+
+    def _store(self, writer: BacktestResultWriter, crash_after_days=None):
+        days = []
+
+        def progress_callback(update):
+            if update["type"] == "backtest_result":
+                writer.add(update["data"], checkpoint=update["checkpoint"])
+                days.append(update["data"]["date"])
+                if len(days) == crash_after_days:
+                    raise RuntimeError("LLM provider outage")
+
+        return progress_callback
+
+    def test_resumed_backtest_matches_uninterrupted_run(self, session_factory, run_id):
+        expected = asyncio.run(self._service().run_backtest_async())
+
+        writer = BacktestResultWriter(run_id, batch_size=3, session_factory=session_factory)
+
+        async def crash():
+            try:
+                await self._service().run_backtest_async(progress_callback=self._store(writer, crash_after_days=8))
+            except RuntimeError:
+                await writer.finish(error_message="Backtest did not complete")
+
+        asyncio.run(crash())
+
+        # Resume as the route does: from the last checkpoint, with the days stored up to it
+        with session_factory() as db:
+            repo = BacktestResultRepository(db)
+            checkpoint = repo.get_checkpoint(run_id)
+            repo.delete_results(run_id, after_date=checkpoint["last_completed_date"])
+            db.commit()
+            _, completed_days = repo.get_days(run_id, fields=DAY_FIELDS, limit=None)
+
+        # Flushing the failed run stored its last days with a checkpoint after them
+        assert checkpoint["last_completed_date"] == "2024-01-11"
+        assert len(completed_days) == 8
+
+        resumed_writer = BacktestResultWriter(run_id, batch_size=3, session_factory=session_factory)
+
+        async def resume():
+            result = await self._service({**checkpoint, "results": completed_days}).run_backtest_async(progress_callback=self._store(resumed_writer))
+            await resumed_writer.finish(results={"total_days": len(result["results"])})
+            return result
+
+        result = asyncio.run(resume())
+
+        assert result["final_portfolio"] == expected["final_portfolio"]
+        assert result["performance_metrics"] == expected["performance_metrics"]
+        assert result["portfolio_values"] == expected["portfolio_values"]
+        assert len(result["results"]) == len(expected["results"])
+        with session_factory() as db:
+            total, days = BacktestResultRepository(db).get_days(run_id, fields=["portfolio_value"])
+            assert [day["portfolio_value"] for day in days] == [day["portfolio_value"] for day in expected["results"]]
+            assert FlowRunRepository(db).get_flow_run_by_id(run_id).status == FlowRunStatus.COMPLETE.value
+
+
+class TestBacktestStreamStatus:
+    class _Request:
+        """A client that stays connected until the response stream is closed."""
+
+        client = None
+
+        async def receive(self):
+            await asyncio.Event().wait()
+
+    def _response(self, run_id, session_factory, monkeypatch):
+        async def never_finishes(self, progress_callback=None):
+            await asyncio.Event().wait()
+
+        monkeypatch.setattr(BacktestService, "run_backtest_async", never_finishes)
+        request_data = BacktestRequest(tickers=["AAPL"], graph_nodes=[], graph_edges=[], start_date="2024-01-02", end_date="2024-01-05")
+        writer = BacktestResultWriter(run_id, session_factory=session_factory)
+        return _stream_backtest(request_data, self._Request(), None, RunScheduler(workers={BACKTEST: 1}), writer)
+
+    def _status(self, session_factory, run_id):
+        with session_factory() as db:
+            return FlowRunRepository(db).get_flow_run_by_id(run_id).status
+
+    def test_run_is_only_in_progress_while_streaming(self, session_factory, run_id, monkeypatch):
+        async def run():
+            response = self._response(run_id, session_factory, monkeypatch)
+            # Not streamed yet (e.g. the client went away first): the run never started
+            status_before_streaming = self._status(session_factory, run_id)
+            stream = response.body_iterator
+            await stream.__anext__()
+            status_while_streaming = self._status(session_factory, run_id)
+            # The client disconnects mid-stream
+            await stream.aclose()
+            return status_before_streaming, status_while_streaming
+
+        before, during = asyncio.run(run())
+
+        assert before == FlowRunStatus.IDLE.value
+        assert during == FlowRunStatus.IN_PROGRESS.value
+        with session_factory() as db:
+            flow_run = FlowRunRepository(db).get_flow_run_by_id(run_id)
+            assert flow_run.status == FlowRunStatus.ERROR.value
+            assert flow_run.error_message == "Backtest did not complete"
+        assert run_id not in hedge_fund_routes._active_backtest_runs
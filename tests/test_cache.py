@@ -0,0 +1,246 @@
+"""Tests for the in-memory API response cache."""
+import random
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from pydantic import ValidationError
+
+from src.data.cache import Cache
+from src.data.models import CompanyNews, Price
+from src.tools.api import _single_flight, get_prices, records_to_columns
+
+
+def _price_response():
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {
+        "ticker": "AAPL",
+        "prices": [{"time": "2024-01-02T00:00:00Z", "open": 100.0, "close": 101.0, "high": 102.0, "low": 99.0, "volume": 1000}],
+    }
+    return response
+
+
+class TestSingleFlight:
+    """Concurrent requests for the same key should share a single fetch."""
+
+    def test_concurrent_misses_fetch_once(self):
+        cache = Cache()
+        calls = []
+
+        def slow_request(url, headers, *args, **kwargs):
+            calls.append(url)
+            time.sleep(0.05)
+            return _price_response()
+
+        results = []
+        with patch("src.tools.api._cache", cache), patch("src.tools.api._make_api_request", side_effect=slow_request):
+            threads = [threading.Thread(target=lambda: results.append(get_prices("AAPL", "2024-01-01", "2024-01-05"))) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert len(calls) == 1
+        assert len(results) == 8
+        assert all(len(prices) == 1 and prices[0].close == 101.0 for prices in results)
+
+    def test_different_keys_fetch_independently(self):
+        cache = Cache()
+        with patch("src.tools.api._cache", cache), patch("src.tools.api._make_api_request", return_value=_price_response()) as mock_request:
+            get_prices("AAPL", "2024-01-01", "2024-01-05")
+            get_prices("AAPL", "2024-01-01", "2024-01-06")
+            get_prices("AAPL", "2024-01-01", "2024-01-05")
+
+        assert mock_request.call_count == 2
+
+    def test_failed_fetch_releases_key(self):
+        cache = Cache()
+        failed = Mock(status_code=500, text="boom")
+        with patch("src.tools.api._cache", cache), patch("src.tools.api._make_api_request", side_effect=[failed, _price_response()]):
+            try:
+                get_prices("AAPL", "2024-01-01", "2024-01-05")
+            except Exception:
+                pass
+            prices = get_prices("AAPL", "2024-01-01", "2024-01-05")
+
+        assert len(prices) == 1
+        assert _single_flight._fetch_locks == {}
+
+
+def _prices(count: int, offset: int = 0) -> list[Price]:
+    return [Price(time=f"2024-01-{i + offset:02d}", open=1.0, close=1.0, high=1.0, low=1.0, volume=1) for i in range(1, count + 1)]
+
+
+class TestMemoryBound:
+    """The cache should stay within its memory budget by evicting entries."""
+
+    def test_lru_evicts_least_recently_used(self):
+        entry_size = Cache()._estimate_size("prices", _prices(5))
+        cache = Cache(max_bytes=entry_size * 2)
+
+        cache.set_prices("A", _prices(5))
+        cache.set_prices("B", _prices(5))
+        cache.get_prices("A")
+        cache.set_prices("C", _prices(5))
+
+        assert cache.get_prices("A") is not None
+        assert cache.get_prices("B") is None
+        assert cache.get_prices("C") is not None
+        assert cache.get_stats()["evictions"] == 1
+        assert cache.get_stats()["current_bytes"] <= entry_size * 2
+
+    def test_lfu_evicts_least_frequently_used(self):
+        entry_size = Cache()._estimate_size("prices", _prices(5))
+        cache = Cache(max_bytes=entry_size * 2, eviction_policy="lfu")
+
+        cache.set_prices("A", _prices(5))
+        cache.set_prices("B", _prices(5))
+        cache.get_prices("A")
+        cache.get_prices("A")
+        cache.get_prices("B")
+        cache.set_prices("C", _prices(5))
+
+        assert cache.get_prices("A") is not None
+        assert cache.get_prices("B") is None
+
+    def test_lfu_matches_a_full_scan(self):
+        # The victim is the least frequently used entry other than the newest, ties going to the least recently used
+        entry_size = Cache()._estimate_size("prices", _prices(5))
+        cache = Cache(max_bytes=entry_size * 8, eviction_policy="lfu")
+        expected = {}  # key -> hits, in least to most recently used order
+        rng = random.Random(0)
+
+        for _ in range(2000):
+            key = f"T{rng.randrange(20)}"
+            if rng.random() < 0.6:
+                hit = cache.get_prices(key) is not None
+                assert hit == (key in expected)
+                if hit:
+                    expected[key] = expected.pop(key) + 1
+            else:
+                cache.set_prices(key, _prices(5))
+                expected[key] = expected.pop(key, 0)
+                if len(expected) > 8:
+                    newest = next(reversed(expected))
+                    del expected[min((k for k in expected if k != newest), key=expected.get)]
+
+        assert {key: entry.hits for (_, key), entry in cache._entries.items()} == expected
+        assert len(cache._frequency_heap) <= 2 * len(cache._frequencies) + 16
+
+    def test_merge_updates_size_accounting(self):
+        cache = Cache()
+        cache.set_prices("A", _prices(5))
+        cache.set_prices("A", _prices(5, offset=5))
+
+        assert len(cache.get_prices("A")) == 10
+        assert cache.get_stats()["current_bytes"] == cache._estimate_size("prices", cache._entries[("prices", "A")].data)
+        assert cache.get_stats()["namespaces"]["prices"]["entries"] == 1
+
+    def test_stats_track_hits_and_misses(self):
+        cache = Cache()
+        cache.get_company_news("A")
+        cache.set_company_news("A", [CompanyNews(ticker="A", title="Headline", author="Author", source="Source", date="2024-01-01", url="https://example.com")])
+        cache.get_company_news("A")
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["namespaces"]["company_news"]["bytes"] > 0
+
+
+class TestRecentData:
+    """New records are merged into the windows ending on the refresh's end date."""
+
+    def test_merge_recent_updates_windows_ending_on_the_date(self):
+        cache = Cache()
+        cache.set_prices("A_2024-01-01_2024-01-05", _prices(5))
+        cache.set_prices("A_2023-12-01_2024-01-04", _prices(4))
+        news = [CompanyNews(ticker="A", title=f"Headline {day}", author="Author", source="Source", date=f"2024-01-0{day}", url=f"https://example.com/{day}") for day in (4, 2)]
+        cache.set_company_news("A_none_2024-01-05_100", news)
+
+        # Today's bar is replaced as it updates, older windows are left alone
+        updated_bar = Price(time="2024-01-05", open=1.0, close=2.0, high=2.0, low=1.0, volume=5)
+        assert cache.merge_recent("prices", "A", "2024-01-05", [updated_bar]) == 1
+        assert cache.get_prices("A_2024-01-01_2024-01-05")[-1].close == 2.0
+        assert len(cache.get_prices("A_2024-01-01_2024-01-05")) == 5
+        assert len(cache.get_prices("A_2023-12-01_2024-01-04")) == 4
+
+        # Newest-first windows stay newest first
+        latest = CompanyNews(ticker="A", title="Headline 5", author="Author", source="Source", date="2024-01-05", url="https://example.com/5")
+        cache.merge_recent("company_news", "A", "2024-01-05", [latest], identity=lambda article: article.url)
+        assert [article.date for article in cache.get_company_news("A_none_2024-01-05_100")] == ["2024-01-05", "2024-01-04", "2024-01-02"]
+        assert cache.get_stats()["current_bytes"] == sum(entry.size for entry in cache._entries.values())
+
+    def test_invalidate_drops_only_the_tickers_entries(self):
+        cache = Cache()
+        cache.set_prices("A_2024-01-01_2024-01-05", _prices(5))
+        cache.set_prices("AB_2024-01-01_2024-01-05", _prices(5))
+
+        assert cache.invalidate("prices", "A") == 1
+        assert cache.get_prices("A_2024-01-01_2024-01-05") is None
+        assert cache.get_prices("AB_2024-01-01_2024-01-05") is not None
+
+    def test_key_versions_follow_the_content_read(self):
+        cache = Cache()
+        cache.set_prices("A_2024-01-01_2024-01-05", _prices(5))
+        with cache.track_reads() as read_keys:
+            cache.get_prices("A_2024-01-01_2024-01-05")
+            cache.get_prices("A_2024-01-01_2024-01-06")
+        versions = cache.key_versions(read_keys)
+        assert versions[("prices", "A_2024-01-01_2024-01-06")] is None
+
+        # Other keys changing, and reloading the same data, leave the versions alone
+        cache.set_prices("A_2023-12-01_2024-01-05", _prices(5))
+        cache.set_prices("A_2024-01-01_2024-01-05", _prices(5))
+        cache.load(cache.snapshot(["A"]))
+        assert cache.key_versions(read_keys) == versions
+
+        cache.merge_recent("prices", "A", "2024-01-05", [Price(time="2024-01-05", open=1.0, close=2.0, high=2.0, low=1.0, volume=5)])
+        assert cache.key_versions(read_keys)[("prices", "A_2024-01-01_2024-01-05")] != versions[("prices", "A_2024-01-01_2024-01-05")]
+
+        # The version is derived from the content, so another cache holding the same data agrees
+        other = Cache()
+        other.load(cache.snapshot(["A"]))
+        assert other.key_versions(read_keys) == cache.key_versions(read_keys)
+
+
+class TestCachedModels:
+    """Cache hits should return the stored models without re-validating them."""
+
+    def test_hit_returns_stored_instances(self):
+        cache = Cache()
+        with patch("src.tools.api._cache", cache), patch("src.tools.api._make_api_request", return_value=_price_response()):
+            first = get_prices("AAPL", "2024-01-01", "2024-01-05")
+            with patch("src.data.models.Price.__init__", side_effect=AssertionError("re-validated")):
+                second = get_prices("AAPL", "2024-01-01", "2024-01-05")
+
+        assert second[0] is first[0]
+        second.append(None)
+        assert len(cache.get_prices("AAPL_2024-01-01_2024-01-05")) == 1
+
+    def test_shared_records_cannot_be_modified(self):
+        cache = Cache()
+        with patch("src.tools.api._cache", cache), patch("src.tools.api._make_api_request", return_value=_price_response()):
+            prices = get_prices("AAPL", "2024-01-01", "2024-01-05")
+            with pytest.raises(ValidationError):
+                prices[0].close = 0.0
+
+            assert get_prices("AAPL", "2024-01-01", "2024-01-05")[0].close == 101.0
+        # Updated records are copies
+        assert prices[0].model_copy(update={"close": 0.0}).close == 0.0
+
+    def test_records_to_columns(self):
+        prices = [Price(open=1.0, close=2.0, high=3.0, low=0.5, volume=10, time="2024-01-02"), Price(open=2.0, close=3.0, high=4.0, low=1.5, volume=20, time="2024-01-03")]
+
+        assert records_to_columns(prices, ["close", "time"]) == {"close": [2.0, 3.0], "time": ["2024-01-02", "2024-01-03"]}
+        assert set(records_to_columns(prices)) == {"open", "close", "high", "low", "volume", "time"}
+
+    def test_fetch_functions_return_columns(self):
+        cache = Cache()
+        with patch("src.tools.api._cache", cache), patch("src.tools.api._make_api_request", return_value=_price_response()) as mock_request:
+            assert get_prices("AAPL", "2024-01-01", "2024-01-05", columns=["close"]) == {"close": [101.0]}
+            # Hits are served from the cached models too
+            assert get_prices("AAPL", "2024-01-01", "2024-01-05", columns=["time", "close"]) == {"time": ["2024-01-02T00:00:00Z"], "close": [101.0]}
+            assert mock_request.call_count == 1
@@ -0,0 +1,244 @@
+"""Tests for scheduled (continuous and advisory) flow runs and their incremental data refresh."""
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.backend.database.connection import create_database_engine
+from app.backend.database.models import Base
+from app.backend.models.schemas import ContinuousRunRequest, FlowRunStatus
+from app.backend.repositories.flow_repository import FlowRepository
+from app.backend.repositories.flow_run_repository import FlowRunRepository
+from app.backend.services import continuous_trading, graph as graph_service
+from app.backend.services.continuous_trading import ContinuousTradingScheduler
+from app.backend.services.run_scheduler import BACKTEST, RUN, RunScheduler
+from src.data.cache import Cache
+from src.data.models import CompanyNews, FinancialMetrics, Price
+from src.tools import data_refresh
+from src.tools.data_refresh import DataRefresher
+from src.utils.usage import record_api_call
+
+
+class FakeDataApi:
+    """Stands in for the data API, serving whatever has been 'published' so far."""
+
+    def __init__(self):
+        self.prices = [Price(time="2024-03-01T00:00:00Z", open=1.0, close=100.0, high=1.0, low=1.0, volume=10)]
+        self.news = []
+        self.report_period = "2023-12-31"
+        self.calls = []
+
+    def get_prices(self, ticker, start_date, end_date, api_key=None, use_cache=True):
+        self.calls.append(("prices", start_date))
+        return [price for price in self.prices if price.time[:10] >= start_date]
+
+    def get_company_news(self, ticker, end_date, start_date=None, limit=1000, api_key=None, use_cache=True):
+        self.calls.append(("news", start_date))
+        return [article for article in self.news if article.date[:10] >= start_date]
+
+    def get_insider_trades(self, ticker, end_date, start_date=None, limit=1000, api_key=None, use_cache=True):
+        self.calls.append(("insider_trades", start_date))
+        return []
+
+    def get_financial_metrics(self, ticker, end_date, period="ttm", limit=10, api_key=None, use_cache=True):
+        self.calls.append(("financial_metrics", end_date))
+        metrics = FinancialMetrics.model_construct(ticker=ticker, report_period=self.report_period)
+        return [metrics]
+
+
+def _article(date: str, title: str) -> CompanyNews:
+    return CompanyNews(ticker="AAPL", title=title, author="Author", source="Source", date=date, url=f"https://example.com/{title}")
+
+
+class TestDataRefresher:
+    @pytest.fixture
+    def api(self, monkeypatch):
+        api = FakeDataApi()
+        monkeypatch.setattr(data_refresh, "get_prices", api.get_prices)
+        monkeypatch.setattr(data_refresh, "get_company_news", api.get_company_news)
+        monkeypatch.setattr(data_refresh, "get_insider_trades", api.get_insider_trades)
+        monkeypatch.setattr(data_refresh, "get_financial_metrics", api.get_financial_metrics)
+        return api
+
+    def test_version_changes_only_with_new_data(self, api):
+        cache = Cache()
+        cache.set_company_news("AAPL_2023-12-01_2024-03-01_1000", [_article("2024-02-28T10:00:00Z", "old")])
+        refresher = DataRefresher(cache=cache)
+
+        first = refresher.refresh(["AAPL"], "2024-03-01")
+        assert refresher.refresh(["AAPL"], "2024-03-01") == first
+
+        # A new headline changes the version and is merged into the analysts' cached window
+        api.news.append(_article("2024-03-01T15:00:00Z", "new"))
+        second = refresher.refresh(["AAPL"], "2024-03-01")
+        assert second["AAPL"] != first["AAPL"]
+        assert [article.title for article in cache.get_company_news("AAPL_2023-12-01_2024-03-01_1000")] == ["old", "new"]
+
+        # Today's price bar updating intraday is new data as well
+        api.prices[-1] = api.prices[-1].model_copy(update={"close": 101.0})
+        assert refresher.refresh(["AAPL"], "2024-03-01")["AAPL"] != second["AAPL"]
+        assert refresher.latest_prices(["AAPL", "MSFT"]) == {"AAPL": 101.0}
+
+    def test_deltas_are_fetched_from_the_watermarks(self, api):
+        refresher = DataRefresher(cache=Cache())
+        api.news.append(_article("2024-03-01T09:00:00Z", "a"))
+        refresher.refresh(["AAPL"], "2024-03-01")
+
+        # Prices from the latest bar's day, news from the latest article's day, filings (none yet) from today
+        api.calls.clear()
+        refresher.refresh(["AAPL"], "2024-03-02")
+        assert api.calls == [("prices", "2024-03-01"), ("news", "2024-03-01"), ("insider_trades", "2024-03-02"), ("financial_metrics", "2024-03-02")]
+
+        # Metrics are checked once per day
+        api.calls.clear()
+        refresher.refresh(["AAPL"], "2024-03-02")
+        assert [call[0] for call in api.calls] == ["prices", "news", "insider_trades"]
+
+    def test_new_report_drops_cached_metrics(self, api):
+        cache = Cache()
+        refresher = DataRefresher(cache=cache)
+        refresher.refresh(["AAPL"], "2024-03-01")
+        cache.set_financial_metrics("AAPL_ttm_2024-03-02_10", [FinancialMetrics.model_construct(ticker="AAPL", report_period="2023-12-31")])
+
+        api.report_period = "2024-03-01"
+        refresher.refresh(["AAPL"], "2024-03-02")
+
+        assert cache.get_financial_metrics("AAPL_ttm_2024-03-02_10") is None
+
+
+class FakeRefresher:
+    """Serves a fixed sequence of data versions, one per refresh."""
+
+    def __init__(self, versions: list[dict]):
+        self.versions = versions
+        self.refreshes = 0
+
+    def refresh(self, tickers, end_date, api_key=None):
+        record_api_call("/prices/", latency=0.0, retries=0, status_code=200)
+        versions = self.versions[min(self.refreshes, len(self.versions) - 1)]
+        self.refreshes += 1
+        return versions
+
+    def latest_prices(self, tickers):
+        return {ticker: 100.0 for ticker in tickers}
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+class TestContinuousTradingScheduler:
+    TICKERS = ["AAPL", "MSFT"]
+
+    @pytest.fixture
+    def graph_runs(self, monkeypatch):
+        runs = []
+
+        async def run_graph(**kwargs):
+            runs.append(kwargs["request"].data_versions)
+            decisions = {"AAPL": {"action": "buy", "quantity": 10}, "MSFT": {"action": "hold", "quantity": 0}}
+            return {"messages": [SimpleNamespace(content=json.dumps(decisions))], "data": {"analyst_signals": {"technical_analyst_agent": {}}}}
+
+        monkeypatch.setattr(continuous_trading, "run_graph_async", run_graph)
+        return runs
+
+    def _start(self, session_factory, refresher, trading_mode="continuous"):
+        with session_factory() as db:
+            flow_id = FlowRepository(db).create_flow(name="flow", nodes={}, edges={}).id
+            flow_run_id = FlowRunRepository(db).create_flow_run(flow_id, trading_mode=trading_mode).id
+        request = ContinuousRunRequest(tickers=self.TICKERS, graph_nodes=[], graph_edges=[], flow_id=flow_id, end_date="2024-03-01", trading_mode=trading_mode)
+        scheduler = ContinuousTradingScheduler(run_scheduler=RunScheduler(workers={RUN: 1, BACKTEST: 1}), refresher=refresher, session_factory=session_factory)
+        scheduler.start(flow_run_id, request, graph=None)
+        return scheduler, flow_run_id
+
+    def test_cycles_run_the_graph_only_when_data_changed(self, session_factory, graph_runs, monkeypatch):
+        monkeypatch.setitem(continuous_trading.SCHEDULE_SECONDS, "hourly", 0.1)
+        monkeypatch.setitem(continuous_trading.DURATION_SECONDS, "1day", 0.25)
+        refresher = FakeRefresher([{"AAPL": "a1", "MSFT": "m1"}, {"AAPL": "a1", "MSFT": "m1"}, {"AAPL": "a1", "MSFT": "m2"}])
+
+        async def run():
+            scheduler, flow_run_id = self._start(session_factory, refresher)
+            await asyncio.sleep(0.4)
+            assert not scheduler.is_running(flow_run_id)
+            return flow_run_id
+
+        flow_run_id = asyncio.run(run())
+
+        assert graph_runs == [{"AAPL": "a1", "MSFT": "m1"}, {"AAPL": "a1", "MSFT": "m2"}]
+        with session_factory() as db:
+            repo = FlowRunRepository(db)
+            cycles = repo.get_flow_run_cycles(flow_run_id)
+            assert [cycle.status for cycle in cycles] == ["COMPLETED"] * 3
+            assert [cycle.trading_decisions != {} for cycle in cycles] == [True, False, True]
+            assert cycles[0].executed_trades == {"AAPL": 10, "MSFT": 0}
+            assert all(cycle.api_calls_count == 1 for cycle in cycles)
+            assert cycles[-1].portfolio_snapshot["positions"]["AAPL"]["long"] == 20
+
+            flow_run = repo.get_flow_run_by_id(flow_run_id)
+            assert flow_run.status == FlowRunStatus.COMPLETE.value
+            assert flow_run.results["cycles"] == 3
+            assert flow_run.final_portfolio["positions"]["AAPL"]["long"] == 20
+
+    def test_refresh_versions_reach_the_run_metadata(self, session_factory, monkeypatch):
+        metadata = []
+        graph = MagicMock()
+        graph.invoke.side_effect = lambda state: metadata.append(state["metadata"]) or {"messages": [SimpleNamespace(content="{}")], "data": {}}
+
+        async def run_graph(executor=None, **kwargs):
+            return graph_service.run_graph(**{**kwargs, "graph": graph})
+
+        monkeypatch.setattr(continuous_trading, "run_graph_async", run_graph)
+
+        async def run():
+            scheduler, flow_run_id = self._start(session_factory, FakeRefresher([{"AAPL": "a1", "MSFT": "m1"}]))
+            while not metadata:
+                await asyncio.sleep(0.01)
+            await scheduler.stop(flow_run_id)
+
+        asyncio.run(run())
+
+        # Every cycle's window ends today, so only the versions tell caches the data changed
+        assert metadata[0]["data_versions"] == {"AAPL": "a1", "MSFT": "m1"}
+
+    def test_advisory_runs_do_not_trade_and_can_be_stopped(self, session_factory, graph_runs):
+        async def run():
+            scheduler, flow_run_id = self._start(session_factory, FakeRefresher([{"AAPL": "a1", "MSFT": "m1"}]), trading_mode="advisory")
+            while not graph_runs:
+                await asyncio.sleep(0.01)
+            assert await scheduler.stop(flow_run_id)
+            assert not await scheduler.stop(flow_run_id)
+            return flow_run_id
+
+        flow_run_id = asyncio.run(run())
+
+        with session_factory() as db:
+            repo = FlowRunRepository(db)
+            cycle = repo.get_flow_run_cycles(flow_run_id)[0]
+            assert cycle.trading_decisions["AAPL"]["action"] == "buy"
+            assert cycle.executed_trades == {}
+            flow_run = repo.get_flow_run_by_id(flow_run_id)
+            assert flow_run.status == FlowRunStatus.COMPLETE.value
+            assert flow_run.final_portfolio["positions"]["AAPL"]["long"] == 0
+
+    def test_shutdown_records_runs_as_interrupted(self, session_factory, graph_runs):
+        async def run():
+            scheduler, flow_run_id = self._start(session_factory, FakeRefresher([{"AAPL": "a1", "MSFT": "m1"}]))
+            while not graph_runs:
+                await asyncio.sleep(0.01)
+            await scheduler.shutdown()
+            assert scheduler.get_active_runs() == []
+            return flow_run_id
+
+        flow_run_id = asyncio.run(run())
+
+        with session_factory() as db:
+            flow_run = FlowRunRepository(db).get_flow_run_by_id(flow_run_id)
+            assert flow_run.status == FlowRunStatus.ERROR.value
+            assert flow_run.error_message == "Server shut down before the run finished"
@@ -0,0 +1,65 @@
+"""Tests for the compiled graph cache of the backend."""
+from unittest.mock import Mock, patch
+
+from app.backend.models.schemas import GraphEdge, GraphNode
+from app.backend.repositories.flow_repository import FlowRepository
+from app.backend.services.graph import create_graph, get_compiled_graph
+from app.backend.services.graph_cache import CompiledGraphCache, graph_signature
+
+
+def _flow(*extra_nodes: str):
+    node_ids = ["warren_buffett_abc123", "portfolio_manager_def456", *extra_nodes]
+    nodes = [GraphNode(id=node_id, position={"x": 0, "y": 0}) for node_id in node_ids]
+    edges = [GraphEdge(id=f"e-{node_id}", source=node_id, target="portfolio_manager_def456") for node_id in node_ids if not node_id.startswith("portfolio_manager")]
+    return nodes, edges
+
+
+class TestGraphSignature:
+    def test_ignores_order_and_layout(self):
+        nodes, edges = _flow("ben_graham_aaa111")
+        moved = [GraphNode(id=node.id, position={"x": 100, "y": 5}) for node in reversed(nodes)]
+
+        assert graph_signature(nodes, edges) == graph_signature(moved, list(reversed(edges)))
+
+    def test_changes_with_structure(self):
+        assert graph_signature(*_flow()) != graph_signature(*_flow("ben_graham_aaa111"))
+
+
+class TestCompiledGraphCache:
+    def test_repeat_runs_skip_compilation(self):
+        cache = CompiledGraphCache()
+        nodes, edges = _flow()
+        with patch("app.backend.services.graph.get_graph_cache", return_value=cache), patch("app.backend.services.graph.create_graph", wraps=create_graph) as mock_create:
+            first = get_compiled_graph(nodes, edges, flow_id=1)
+            second = get_compiled_graph(nodes, edges, flow_id=1)
+
+        assert first is second
+        assert mock_create.call_count == 1
+        assert cache.get_stats()["hits"] == 1
+
+    def test_lru_eviction(self):
+        cache = CompiledGraphCache(max_size=2)
+        flows = [_flow(), _flow("ben_graham_aaa111"), _flow("bill_ackman_bbb222")]
+        cache.get_or_compile(*flows[0], Mock)
+        cache.get_or_compile(*flows[1], Mock)
+        cache.get_or_compile(*flows[0], Mock)
+        cache.get_or_compile(*flows[2], Mock)
+
+        compile_graph = Mock()
+        cache.get_or_compile(*flows[0], compile_graph)
+        cache.get_or_compile(*flows[1], compile_graph)
+        assert compile_graph.call_count == 1
+
+    def test_update_flow_invalidates(self):
+        cache = CompiledGraphCache()
+        nodes, edges = _flow()
+        cache.get_or_compile(nodes, edges, Mock, flow_id=7)
+        cache.get_or_compile(nodes, edges, Mock, flow_id=8)
+
+        repository = FlowRepository(Mock())
+        with patch("app.backend.repositories.flow_repository.get_graph_cache", return_value=cache), patch.object(repository, "get_flow_by_id", return_value=Mock()):
+            repository.update_flow(7, name="Renamed")
+            assert cache.get_stats()["size"] == 2
+            repository.update_flow(7, nodes=[])
+
+        assert cache.get_stats()["size"] == 1
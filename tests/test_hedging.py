@@ -0,0 +1,146 @@
+"""Tests for hedged LLM requests and call deadlines."""
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.agents.news_sentiment import Sentiment
+from src.utils.hedging import HedgeBudget, _CountingExecutor, HedgingPolicy, LLMDeadlineExceeded, LatencyTracker, get_hedging_policy, hedged_invoke
+from src.utils.llm import call_llm
+
+
+def _slow(result, seconds):
+    def run():
+        time.sleep(seconds)
+        return result
+
+    return run
+
+
+class TestHedgedInvoke:
+    def test_fast_primary_is_not_hedged(self):
+        hedge = Mock(return_value="hedge")
+        assert hedged_invoke(lambda: "primary", hedge, delay=0.5, deadline_at=None) == "primary"
+        hedge.assert_not_called()
+
+    def test_slow_primary_is_hedged(self):
+        with patch("src.utils.hedging._hedge_budget", HedgeBudget()):
+            start = time.monotonic()
+            result = hedged_invoke(_slow("primary", 1.0), lambda: "hedge", delay=0.05, deadline_at=None)
+
+        assert result == "hedge"
+        assert time.monotonic() - start < 0.5
+
+    def test_invalid_result_waits_for_other_request(self):
+        with patch("src.utils.hedging._hedge_budget", HedgeBudget()):
+            result = hedged_invoke(_slow(None, 0.1), _slow("hedge", 0.2), delay=0.05, deadline_at=None)
+
+        assert result == "hedge"
+
+    def test_deadline_raises(self):
+        with pytest.raises(LLMDeadlineExceeded):
+            hedged_invoke(_slow("primary", 1.0), None, delay=None, deadline_at=time.monotonic() + 0.05)
+
+    def test_budget_caps_hedged_fraction(self):
+        budget = HedgeBudget()
+        granted = 0
+        for _ in range(20):
+            budget.record_call()
+            granted += budget.try_acquire(0.1)
+
+        assert granted == 2
+
+    def test_in_flight_hedges_are_bounded(self):
+        # Lost hedges keep running after the call returns; new hedges wait for them to finish
+        budget = HedgeBudget(max_in_flight=1)
+        hedge_running = threading.Event()
+        release_hedge = threading.Event()
+
+        def stuck_hedge():
+            hedge_running.set()
+            release_hedge.wait(5)
+            return "hedge"
+
+        with patch("src.utils.hedging._hedge_budget", budget):
+            with pytest.raises(LLMDeadlineExceeded):
+                hedged_invoke(_slow(None, 0.05), stuck_hedge, delay=0.01, deadline_at=time.monotonic() + 0.1)
+            assert hedge_running.wait(1)
+            second_hedge = Mock(return_value="hedge")
+            assert hedged_invoke(_slow("primary", 0.1), second_hedge, delay=0.01, deadline_at=None) == "primary"
+            second_hedge.assert_not_called()
+
+            release_hedge.set()
+            deadline = time.monotonic() + 1
+            while budget._in_flight and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert hedged_invoke(_slow("primary", 1.0), lambda: "hedge", delay=0.01, deadline_at=None) == "hedge"
+
+    def test_saturated_pool_is_not_hedged_and_does_not_delay_primaries(self):
+        # Abandoned requests occupy every hedge worker
+        executor = _CountingExecutor(max_workers=1)
+        release = threading.Event()
+        executor.submit(release.wait, 5)
+        hedge = Mock(return_value="hedge")
+        try:
+            with patch("src.utils.hedging._executor", executor), patch("src.utils.hedging._hedge_budget", HedgeBudget()):
+                result = hedged_invoke(_slow("primary", 0.1), hedge, delay=0.01, deadline_at=time.monotonic() + 0.5)
+        finally:
+            release.set()
+            executor.shutdown()
+
+        assert result == "primary"
+        hedge.assert_not_called()
+
+    def test_deadline_cancels_queued_hedges(self):
+        class UnsaturatedExecutor(_CountingExecutor):
+            saturated = False
+
+        executor = UnsaturatedExecutor(max_workers=1)
+        release = threading.Event()
+        executor.submit(release.wait, 5)
+        hedge = Mock(return_value="hedge")
+        try:
+            with patch("src.utils.hedging._executor", executor), patch("src.utils.hedging._hedge_budget", HedgeBudget()):
+                with pytest.raises(LLMDeadlineExceeded):
+                    hedged_invoke(_slow("primary", 0.5), hedge, delay=0.01, deadline_at=time.monotonic() + 0.1)
+        finally:
+            release.set()
+            executor.shutdown(wait=True)
+
+        hedge.assert_not_called()
+
+
+class TestLatencyTracker:
+    def test_p95_needs_min_samples(self):
+        tracker = LatencyTracker()
+        for seconds in range(1, 101):
+            tracker.record("OpenAI:gpt-4.1", seconds)
+
+        assert tracker.percentile("OpenAI:gpt-4.1", 0.95) == 96
+        assert tracker.percentile("OpenAI:gpt-5", 0.95) is None
+
+
+class TestCallLLMDeadline:
+    """A persona call past its deadline should fall back to its default_factory."""
+
+    def test_deadline_returns_default_factory(self):
+        llm = Mock()
+        llm.invoke.side_effect = lambda *args, **kwargs: time.sleep(1.0)
+        model_info = Mock()
+        model_info.has_json_mode.return_value = False
+        state = {"metadata": {"llm_hedging": {"deadline_seconds": 0.1}}}
+        default = Sentiment(sentiment="neutral", confidence=0)
+
+        start = time.monotonic()
+        with patch("src.utils.llm.get_model", return_value=llm), patch("src.utils.llm.get_model_info", return_value=model_info):
+            response = call_llm("prompt", Sentiment, agent_name="sentiment_agent", state=state, default_factory=lambda: default)
+
+        assert response is default
+        assert time.monotonic() - start < 0.5
+        assert llm.invoke.call_count == 1
+
+    def test_policy_from_metadata_and_env(self, monkeypatch):
+        monkeypatch.setenv("LLM_HEDGING", "true")
+        assert get_hedging_policy({"metadata": {}}).enabled
+        assert get_hedging_policy({"metadata": {"llm_hedging": HedgingPolicy(deadline_seconds=5)}}).deadline_seconds == 5
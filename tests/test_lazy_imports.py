@@ -0,0 +1,31 @@
+"""Tests that startup imports leave agents and LLM provider SDKs to the runs that use them."""
+import subprocess
+import sys
+from pathlib import Path
+
+from src.utils.analysts import ANALYST_CONFIG, LazyAgent
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _loaded_modules(module: str, prefixes: tuple[str, ...]) -> list[str]:
+    """Import a module in a fresh interpreter and list the loaded modules with any of the prefixes."""
+    code = f"import sys, {module}; print('\\n'.join(sorted(m for m in sys.modules if m.startswith({prefixes!r}))))"
+    output = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout
+    return output.split()
+
+
+class TestLazyImports:
+    def test_registry_and_model_list_import_no_agents_or_providers(self):
+        loaded = _loaded_modules("src.utils.analysts, src.llm.models", ("src.agents.", "langchain_openai", "langchain_anthropic", "langchain_groq", "questionary"))
+        assert loaded == []
+
+    def test_cli_imports_no_prompt_library(self):
+        assert _loaded_modules("src.cli.input", ("questionary", "prompt_toolkit")) == []
+
+    def test_lazy_agent_imports_its_function_on_first_call(self):
+        agent = LazyAgent("src.agents.technicals", "technical_analyst_agent")
+        from src.agents.technicals import technical_analyst_agent
+
+        assert agent.load() is technical_analyst_agent
+        assert all(config["agent_func"].load() is not None for config in ANALYST_CONFIG.values())
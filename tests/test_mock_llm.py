@@ -0,0 +1,93 @@
+"""Tests for the offline mock LLM provider."""
+import time
+
+import pytest
+from pydantic import BaseModel, Field
+
+from src.agents.portfolio_manager import PortfolioManagerOutput
+from src.agents.warren_buffett import WarrenBuffettSignal
+from src.llm.mock import MockChatModel, MockLLMError
+from src.llm.models import ModelProvider, get_model
+from src.utils.llm import call_llm
+from src.utils.usage import track_usage
+
+MOCK_STATE = {"metadata": {"model_name": "mock", "model_provider": ModelProvider.MOCK.value}}
+
+
+class Bounded(BaseModel):
+    score: float = Field(ge=10, le=20)
+    tags: list[str]
+    note: str | None = None
+
+
+class TestMockProvider:
+    def test_get_model_returns_mock(self, monkeypatch):
+        monkeypatch.setenv("MOCK_LLM_SEED", "7")
+        model = get_model("mock", ModelProvider.MOCK)
+
+        assert isinstance(model, MockChatModel)
+        assert model.seed == 7
+
+    def test_structured_outputs_are_schema_valid_and_deterministic(self):
+        first = call_llm("Analyze AAPL", WarrenBuffettSignal, agent_name="warren_buffett_agent", state=MOCK_STATE)
+        second = call_llm("Analyze AAPL", WarrenBuffettSignal, agent_name="warren_buffett_agent", state=MOCK_STATE)
+
+        assert isinstance(first, WarrenBuffettSignal)
+        assert first == second
+
+    def test_field_constraints_are_respected(self):
+        result = MockChatModel().with_structured_output(Bounded).invoke("anything")
+
+        assert 10 <= result.score <= 20
+        assert result.tags
+
+    def test_dict_keys_come_from_prompt(self):
+        prompt = 'Signals:\n{"AAPL":{"warren_buffett_agent":{"sig":"bullish"}},"MSFT":{}}'
+        result = call_llm(prompt, PortfolioManagerOutput, agent_name="portfolio_manager", state=MOCK_STATE)
+
+        assert set(result.decisions) == {"AAPL", "MSFT"}
+
+    def test_reports_token_usage(self):
+        with track_usage() as usage:
+            call_llm("Analyze AAPL", WarrenBuffettSignal, agent_name="warren_buffett_agent", state=MOCK_STATE)
+
+        assert usage.summary()["llm"]["input_tokens"] > 0
+        assert usage.summary()["by_model"]["Mock:mock"]["calls"] == 1
+
+
+class TestMockLatencyAndFailures:
+    def test_fixed_latency(self):
+        model = MockChatModel(latency_mean_ms=50)
+        start = time.perf_counter()
+        model.invoke("hello")
+
+        assert time.perf_counter() - start >= 0.05
+
+    def test_failures_are_injected_and_reproducible(self):
+        outcomes = []
+        for _ in range(2):
+            model = MockChatModel(failure_rate=0.5, seed=3)
+            run = []
+            for _ in range(10):
+                try:
+                    model.invoke("hello")
+                    run.append(True)
+                except MockLLMError:
+                    run.append(False)
+            outcomes.append(run)
+
+        assert outcomes[0] == outcomes[1]
+        assert True in outcomes[0] and False in outcomes[0]
+
+    def test_always_failing_model_falls_back_to_default(self, monkeypatch):
+        monkeypatch.setenv("MOCK_LLM_FAILURE_RATE", "1")
+        default = WarrenBuffettSignal(signal="neutral", confidence=0, reasoning="default")
+
+        result = call_llm("Analyze AAPL", WarrenBuffettSignal, agent_name="warren_buffett_agent", state=MOCK_STATE, default_factory=lambda: default)
+
+        assert result is default
+
+    @pytest.mark.parametrize("distribution", ["uniform", "normal", "lognormal"])
+    def test_latency_distributions_are_non_negative(self, distribution):
+        model = MockChatModel(latency_distribution=distribution, latency_mean_ms=1, latency_stddev_ms=5)
+        model.invoke("hello")
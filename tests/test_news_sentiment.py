@@ -0,0 +1,164 @@
+"""Tests for headline classification in the news sentiment agent."""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.agents.news_sentiment import HeadlineSentiment, HeadlineSentimentBatch, Sentiment, news_sentiment_agent
+from src.data.models import CompanyNews
+from src.data.sentiment_store import SentimentStore, sentiment_model_key
+
+
+@pytest.fixture(autouse=True)
+def sentiment_store(tmp_path):
+    store = SentimentStore(tmp_path / "headline_sentiment.db")
+    with patch("src.agents.news_sentiment.get_sentiment_store", return_value=store), patch("src.tools.api.get_sentiment_store", return_value=store):
+        yield store
+
+
+def _news(ticker: str, count: int) -> list[CompanyNews]:
+    return [CompanyNews(ticker=ticker, title=f"{ticker} headline {i}", author="a", source="s", date=f"2024-01-{i + 1:02d}", url=f"https://example.com/{ticker}/{i}") for i in range(count)]
+
+
+def _state(batch_size=None):
+    metadata = {"show_reasoning": False}
+    if batch_size is not None:
+        metadata["news_sentiment_batch_size"] = batch_size
+    return {"messages": [], "data": {"tickers": ["AAPL", "MSFT"], "end_date": "2024-01-31", "analyst_signals": {}}, "metadata": metadata}
+
+
+def _run(state, llm_responses):
+    news = {"AAPL": _news("AAPL", 3), "MSFT": _news("MSFT", 2)}
+    with patch("src.agents.news_sentiment.get_company_news", side_effect=lambda ticker, **kwargs: news[ticker]), patch("src.agents.news_sentiment.call_llm", side_effect=llm_responses) as mock_llm:
+        result = news_sentiment_agent(state)
+    return result["data"]["analyst_signals"]["news_sentiment_agent"], mock_llm
+
+
+class TestBatchedClassification:
+    def test_classifies_all_tickers_in_one_call(self):
+        batch = HeadlineSentimentBatch(sentiments=[HeadlineSentiment(id=i, sentiment="positive", confidence=80) for i in range(5)])
+        signals, mock_llm = _run(_state(), [batch])
+
+        assert mock_llm.call_count == 1
+        assert mock_llm.call_args.args[1] is HeadlineSentimentBatch
+        assert signals["AAPL"]["signal"] == "bullish"
+        assert signals["MSFT"]["reasoning"]["news_sentiment"]["metrics"]["articles_classified_by_llm"] == 2
+
+    def test_missing_items_fall_back_to_single_calls(self):
+        batch = HeadlineSentimentBatch(sentiments=[HeadlineSentiment(id=i, sentiment="negative", confidence=70) for i in range(3)] + [HeadlineSentiment(id=99, sentiment="positive", confidence=70)])
+        single = Sentiment(sentiment="negative", confidence=60)
+        signals, mock_llm = _run(_state(), [batch, single, single])
+
+        assert mock_llm.call_count == 3
+        assert all(call.args[1] is Sentiment for call in mock_llm.call_args_list[1:])
+        assert signals["MSFT"]["signal"] == "bearish"
+
+    def test_batch_size_splits_calls(self):
+        responses = [HeadlineSentimentBatch(sentiments=[HeadlineSentiment(id=i, sentiment="neutral", confidence=50) for i in range(2)]) for _ in range(3)]
+        _, mock_llm = _run(_state(batch_size=2), responses)
+
+        assert mock_llm.call_count == 3
+
+
+class TestPersistentSentiments:
+    def test_second_run_reuses_stored_labels(self, sentiment_store):
+        batch = HeadlineSentimentBatch(sentiments=[HeadlineSentiment(id=i, sentiment="negative", confidence=90) for i in range(5)])
+        first, _ = _run(_state(), [batch])
+        second, mock_llm = _run(_state(), [])
+
+        assert mock_llm.call_count == 0
+        for ticker in ("AAPL", "MSFT"):
+            assert second[ticker]["signal"] == first[ticker]["signal"]
+            assert second[ticker]["confidence"] == first[ticker]["confidence"]
+        assert second["AAPL"]["reasoning"]["news_sentiment"]["metrics"]["articles_from_sentiment_store"] == 3
+
+    def test_labels_are_stored_per_model(self, sentiment_store):
+        batch = HeadlineSentimentBatch(sentiments=[HeadlineSentiment(id=i, sentiment="negative", confidence=90) for i in range(5)])
+        _run(_state(), [batch])
+
+        state = _state()
+        state["metadata"]["model_name"] = "other-model"
+        _, mock_llm = _run(state, [batch])
+        assert mock_llm.call_count == 1
+
+    def test_failed_classifications_are_not_stored(self, sentiment_store):
+        _run(_state(batch_size=1), [None] * 5)
+
+        assert sentiment_store.get_many("AAPL", sentiment_model_key("gpt-4.1", "OPENAI"), _news("AAPL", 3)) == {}
+
+    def test_get_company_news_merges_stored_labels(self, sentiment_store):
+        from src.tools.api import get_company_news
+
+        articles = _news("AAPL", 2)
+        sentiment_store.put_many("AAPL", "OPENAI:gpt-4.1", [(articles[0], "positive", 80)])
+        with patch("src.tools.api._get_company_news", return_value=articles):
+            merged = get_company_news("AAPL", "2024-01-31", sentiment_model="OPENAI:gpt-4.1")
+            unmerged = get_company_news("AAPL", "2024-01-31")
+
+        assert [news.sentiment for news in merged] == ["positive", None]
+        assert articles[0].sentiment is None
+        assert unmerged[0].sentiment is None
+
+
+class TestLocalTier:
+    def _run_with_titles(self, state, titles, llm_responses):
+        news = [CompanyNews(ticker="AAPL", title=title, author="a", source="s", date=f"2024-01-{i + 1:02d}", url=f"https://example.com/{i}") for i, title in enumerate(titles)]
+        state["data"]["tickers"] = ["AAPL"]
+        with patch("src.agents.news_sentiment.get_company_news", return_value=news), patch("src.agents.news_sentiment.call_llm", side_effect=llm_responses) as mock_llm:
+            result = news_sentiment_agent(state)
+        return result["data"]["analyst_signals"]["news_sentiment_agent"]["AAPL"], mock_llm
+
+    def test_confident_local_scores_skip_llm(self):
+        batch = HeadlineSentimentBatch(sentiments=[HeadlineSentiment(id=0, sentiment="neutral", confidence=60)])
+        signal, mock_llm = self._run_with_titles(_state(), ["Apple beats estimates as shares surge", "Apple names new CFO"], [batch])
+
+        assert mock_llm.call_count == 1
+        assert "Apple names new CFO" in mock_llm.call_args.args[0]
+        assert "beats" not in mock_llm.call_args.args[0]
+        assert signal["reasoning"]["news_sentiment"]["metrics"]["articles_classified_locally"] == 1
+
+    def test_offline_mode_never_calls_llm(self):
+        state = _state()
+        state["metadata"]["news_sentiment_offline"] = True
+        signal, mock_llm = self._run_with_titles(state, ["Apple shares plunge", "Apple names new CFO"], [])
+
+        assert mock_llm.call_count == 0
+        assert signal["signal"] == "bearish"
+        assert signal["reasoning"]["news_sentiment"]["metrics"]["articles_classified_locally"] == 2
+
+
+class TestScoringModeSettings:
+    """The offline / local-threshold settings reach the agent from the CLI and the backend."""
+
+    def test_cli_flags_are_parsed(self, monkeypatch):
+        from src.cli.input import parse_cli_inputs
+
+        monkeypatch.setattr("sys.argv", ["main.py", "--tickers", "AAPL", "--analysts", "news_sentiment_analyst", "--mock-llm", "--sentiment-offline", "--sentiment-threshold", "80"])
+        inputs = parse_cli_inputs(description="test", require_tickers=True, default_months_back=None)
+
+        assert inputs.sentiment_offline is True
+        assert inputs.sentiment_threshold == 80
+
+    def test_run_hedge_fund_offline_never_calls_llm_for_headlines(self):
+        from src.main import run_hedge_fund
+
+        news = [CompanyNews(ticker="AAPL", title="Apple names new CFO", author="a", source="s", date="2024-01-02", url="https://example.com/0")]
+        portfolio = {"cash": 100000.0, "margin_requirement": 0.0, "positions": {"AAPL": {"long": 0, "short": 0}}}
+        with patch("src.agents.news_sentiment.get_company_news", return_value=news), patch("src.agents.news_sentiment.call_llm") as mock_llm, patch("src.agents.risk_manager.get_prices", return_value=[]):
+            result = run_hedge_fund(["AAPL"], "2024-01-01", "2024-01-31", portfolio, selected_analysts=["news_sentiment_analyst"], model_name="mock", model_provider="Mock", sentiment_offline=True)
+
+        assert mock_llm.call_count == 0
+        assert result["analyst_signals"]["news_sentiment_agent"]["AAPL"]["reasoning"]["news_sentiment"]["metrics"]["articles_classified_locally"] == 1
+
+    def test_backend_requests_set_the_graph_metadata(self):
+        from app.backend.models.schemas import BacktestRequest
+        from app.backend.services.graph import run_graph
+
+        metadata = {}
+        graph = MagicMock()
+        graph.invoke.side_effect = lambda state: metadata.update(state["metadata"]) or {"messages": []}
+        request = BacktestRequest(tickers=["AAPL"], graph_nodes=[], graph_edges=[], start_date="2024-01-01", end_date="2024-01-31", sentiment_offline=True, sentiment_threshold=85)
+
+        run_graph(graph, {}, ["AAPL"], "2024-01-01", "2024-01-31", "mock", "Mock", request=request)
+
+        assert metadata["news_sentiment_offline"] is True
+        assert metadata["news_sentiment_local_threshold"] == 85
@@ -0,0 +1,192 @@
+"""Tests for reusing analyst results across runs of a flow."""
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.backend.services.agent_service import create_agent_function
+from app.backend.services.node_result_store import NodeResultStore
+from src.data.cache import Cache
+from src.data.models import Price
+from src.utils.usage import record_llm_call
+
+
+class FakeAnalyst:
+    def __init__(self, failing_tickers=()):
+        self.analyzed = []
+        self.failing_tickers = set(failing_tickers)
+
+    def __call__(self, state, agent_id):
+        signals = {}
+        for ticker in state["data"]["tickers"]:
+            self.analyzed.append(ticker)
+            record_llm_call(agent_id, "mock", "Mock", ticker, latency=0.0, retries=0, input_tokens=0, output_tokens=0, success=ticker not in self.failing_tickers)
+            signals[ticker] = {"signal": "bullish", "confidence": 50, "reasoning": ticker}
+        return {"messages": [], "data": {"analyst_signals": {agent_id: signals}}}
+
+
+def _state(tickers, end_date="2024-03-01", model_name="mock", request=None, data_versions=None):
+    return {
+        "messages": [],
+        "data": {"tickers": tickers, "start_date": "2024-01-01", "end_date": end_date, "analyst_signals": {}},
+        "metadata": {"model_name": model_name, "model_provider": "Mock", "request": request, "data_versions": data_versions},
+    }
+
+
+@pytest.fixture
+def cache():
+    cache = Cache()
+    with patch("app.backend.services.node_result_store.get_cache", return_value=cache):
+        yield cache
+
+
+@pytest.fixture
+def store(cache):
+    store = NodeResultStore()
+    with patch("app.backend.services.node_result_store.get_node_result_store", return_value=store):
+        yield store
+
+
+def _prices(close):
+    return [Price(time="2024-03-01", open=1.0, close=close, high=close, low=1.0, volume=1)]
+
+
+class TestMemoizedAnalyst:
+    def test_only_new_tickers_are_analyzed(self, store):
+        analyst = FakeAnalyst()
+        node = create_agent_function(analyst, "warren_buffett_abc123", memoize_key="warren_buffett")
+
+        node(_state(["AAPL", "MSFT"]))
+        result = node(_state(["MSFT", "NVDA"]))
+
+        assert analyst.analyzed == ["AAPL", "MSFT", "NVDA"]
+        assert list(result["data"]["analyst_signals"]["warren_buffett_abc123"]) == ["MSFT", "NVDA"]
+        assert result["messages"][0].name == "warren_buffett_abc123"
+
+    def test_results_survive_node_id_changes(self, store):
+        analyst = FakeAnalyst()
+        create_agent_function(analyst, "warren_buffett_abc123", memoize_key="warren_buffett")(_state(["AAPL"]))
+        result = create_agent_function(analyst, "warren_buffett_zzz999", memoize_key="warren_buffett")(_state(["AAPL"]))
+
+        assert analyst.analyzed == ["AAPL"]
+        assert "AAPL" in result["data"]["analyst_signals"]["warren_buffett_zzz999"]
+
+    @pytest.mark.parametrize("changed", [{"end_date": "2024-03-02"}, {"model_name": "other-mock"}])
+    def test_changed_inputs_are_recomputed(self, store, changed):
+        analyst = FakeAnalyst()
+        node = create_agent_function(analyst, "warren_buffett_abc123", memoize_key="warren_buffett")
+
+        node(_state(["AAPL"]))
+        node(_state(["AAPL"], **changed))
+
+        assert analyst.analyzed == ["AAPL", "AAPL"]
+
+    def test_results_are_recomputed_when_the_tickers_data_changes(self, store, cache):
+        analyst = FakeAnalyst()
+
+        def fetching_analyst(state, agent_id):
+            # The analyst's own fetches populate the cache; the result is stored against that data
+            for ticker in state["data"]["tickers"]:
+                if cache.get_prices(f"{ticker}_2024-01-01_2024-03-01") is None:
+                    cache.set_prices(f"{ticker}_2024-01-01_2024-03-01", _prices(1.0))
+            return analyst(state, agent_id)
+
+        node = create_agent_function(fetching_analyst, "warren_buffett_abc123", memoize_key="warren_buffett")
+        node(_state(["AAPL", "MSFT"]))
+        node(_state(["AAPL", "MSFT"]))
+        assert analyst.analyzed == ["AAPL", "MSFT"]
+
+        # Same window, but today's bar was refreshed for one ticker
+        cache.merge_recent("prices", "MSFT", "2024-03-01", _prices(2.0))
+        node(_state(["AAPL", "MSFT"]))
+
+        assert analyst.analyzed == ["AAPL", "MSFT", "MSFT"]
+
+    def test_other_analysts_fetches_do_not_invalidate_results(self, store, cache):
+        analysts = {name: FakeAnalyst() for name in ("a", "b")}
+
+        def fetching_analyst(name, window_start):
+            def run(state, agent_id):
+                for ticker in state["data"]["tickers"]:
+                    cache_key = f"{ticker}_{window_start}_2024-03-01"
+                    if cache.get_prices(cache_key) is None:
+                        cache.set_prices(cache_key, _prices(1.0))
+                return analysts[name](state, agent_id)
+
+            return run
+
+        nodes = [create_agent_function(fetching_analyst("a", "2024-01-01"), "a_abc123", memoize_key="a"), create_agent_function(fetching_analyst("b", "2023-01-01"), "b_abc123", memoize_key="b")]
+        for _ in range(2):
+            for node in nodes:
+                node(_state(["AAPL"]))
+        # Reloading unchanged data (as process-mode workers do for each job) keeps the results valid
+        cache.load(cache.snapshot(["AAPL"]))
+        nodes[0](_state(["AAPL"]))
+
+        assert {name: len(analyst.analyzed) for name, analyst in analysts.items()} == {"a": 1, "b": 1}
+
+    def test_failed_tickers_are_not_stored(self, store):
+        analyst = FakeAnalyst(failing_tickers={"MSFT"})
+        node = create_agent_function(analyst, "warren_buffett_abc123", memoize_key="warren_buffett")
+
+        node(_state(["AAPL", "MSFT"]))
+        node(_state(["AAPL", "MSFT"]))
+
+        assert analyst.analyzed == ["AAPL", "MSFT", "MSFT"]
+
+    def test_same_analyst_on_parallel_branches_runs_once(self, store):
+        analyst = FakeAnalyst()
+        slow_analyst = lambda state, agent_id: (time.sleep(0.05), analyst(state, agent_id))[1]
+        nodes = [create_agent_function(slow_analyst, f"warren_buffett_{suffix}", memoize_key="warren_buffett") for suffix in ["aaa111", "bbb222"]]
+        results = []
+
+        threads = [threading.Thread(target=lambda node=node: results.append(node(_state(["AAPL"])))) for node in nodes]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert analyst.analyzed == ["AAPL"]
+        assert all("AAPL" in next(iter(result["data"]["analyst_signals"].values())) for result in results)
+
+    def test_requests_can_opt_out(self, store):
+        analyst = FakeAnalyst()
+        node = create_agent_function(analyst, "warren_buffett_abc123", memoize_key="warren_buffett")
+        request = SimpleNamespace(reuse_cached_results=False)
+
+        node(_state(["AAPL"], request=request))
+        node(_state(["AAPL"], request=request))
+
+        assert analyst.analyzed == ["AAPL", "AAPL"]
+
+    def test_only_tickers_with_new_data_versions_are_recomputed(self, cache):
+        # Versioned results stay valid until the version changes, however old they are
+        store = NodeResultStore(ttl_seconds=0)
+        analyst = FakeAnalyst()
+        node = create_agent_function(analyst, "warren_buffett_abc123", memoize_key="warren_buffett")
+
+        with patch("app.backend.services.node_result_store.get_node_result_store", return_value=store):
+            node(_state(["AAPL", "MSFT"], data_versions={"AAPL": "a1", "MSFT": "m1"}))
+            node(_state(["AAPL", "MSFT"], data_versions={"AAPL": "a1", "MSFT": "m2"}))
+
+        assert analyst.analyzed == ["AAPL", "MSFT", "MSFT"]
+
+
+class TestNodeResultStore:
+    def test_entries_expire(self):
+        store = NodeResultStore(ttl_seconds=0)
+        store.set(("key",), {"signal": "bullish"})
+
+        assert store.get(("key",)) is None
+
+    def test_lru_eviction(self):
+        store = NodeResultStore(max_size=2)
+        store.set(("a",), 1)
+        store.set(("b",), 2)
+        store.get(("a",))
+        store.set(("c",), 3)
+
+        assert store.get(("a",)) == 1
+        assert store.get(("b",)) is None
@@ -0,0 +1,94 @@
+"""Tests for the Ollama request scheduler."""
+import threading
+import time
+from unittest.mock import Mock, patch
+
+from src.llm.models import ModelProvider, get_model
+from src.llm.ollama_scheduler import ANALYST_PRIORITY, PORTFOLIO_MANAGER_PRIORITY, OllamaScheduler, agent_priority
+
+
+class TestOllamaScheduler:
+    def test_caps_in_flight_requests_per_model(self):
+        scheduler = OllamaScheduler(max_concurrency=2)
+        in_flight, peak = 0, 0
+        lock = threading.Lock()
+
+        def request():
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+
+        threads = [threading.Thread(target=scheduler.run, args=(request, "llama3.1")) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak == 2
+
+    def test_models_have_independent_caps(self):
+        scheduler = OllamaScheduler(max_concurrency=1)
+        with scheduler.slot("llama3.1"):
+            # Would block forever if the cap were shared across models
+            assert scheduler.run(lambda: "ok", "qwen3") == "ok"
+
+    def test_waiting_requests_are_served_by_priority(self):
+        scheduler = OllamaScheduler(max_concurrency=1)
+        order = []
+        release = threading.Event()
+
+        def hold():
+            with scheduler.slot("llama3.1"):
+                release.wait()
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        time.sleep(0.02)
+
+        waiters = []
+        for name, priority in [("analyst_1", ANALYST_PRIORITY), ("analyst_2", ANALYST_PRIORITY), ("portfolio_manager", PORTFOLIO_MANAGER_PRIORITY)]:
+            thread = threading.Thread(target=scheduler.run, args=(lambda name=name: order.append(name), "llama3.1", priority))
+            thread.start()
+            waiters.append(thread)
+            time.sleep(0.02)
+
+        release.set()
+        for thread in [holder, *waiters]:
+            thread.join()
+
+        assert order == ["portfolio_manager", "analyst_1", "analyst_2"]
+
+    def test_agent_priority(self):
+        assert agent_priority("portfolio_manager_abc123") < agent_priority("risk_management_agent_abc123") < agent_priority("warren_buffett_agent")
+
+
+class TestOllamaWarmUp:
+    @patch("src.utils.ollama.requests.post")
+    def test_preload_sets_keep_alive_once(self, mock_post):
+        mock_post.return_value = Mock(status_code=200)
+        scheduler = OllamaScheduler(keep_alive="1h")
+
+        scheduler.preload(["llama3.1", "llama3.1"], base_url="http://localhost:11434", background=False)
+        scheduler.preload(["llama3.1"], base_url="http://localhost:11434", background=False)
+
+        mock_post.assert_called_once()
+        assert mock_post.call_args.args[0] == "http://localhost:11434/api/generate"
+        assert mock_post.call_args.kwargs["json"] == {"model": "llama3.1", "keep_alive": "1h"}
+
+    @patch("src.utils.ollama.requests.post")
+    def test_failed_preload_is_retried(self, mock_post):
+        mock_post.return_value = Mock(status_code=500)
+        scheduler = OllamaScheduler()
+
+        scheduler.preload(["llama3.1"], background=False)
+        scheduler.preload(["llama3.1"], background=False)
+
+        assert mock_post.call_count == 2
+
+    def test_chat_model_keeps_model_loaded(self, monkeypatch):
+        monkeypatch.setenv("OLLAMA_KEEP_ALIVE", "45m")
+        assert get_model("llama3.1", ModelProvider.OLLAMA).keep_alive == "45m"
@@ -0,0 +1,172 @@
+"""Tests for running graph invocations in worker processes."""
+import asyncio
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from app.backend.models.schemas import GraphEdge, GraphNode, HedgeFundRequest
+from app.backend.services.graph import get_compiled_graph, run_graph
+from app.backend.services.portfolio import create_portfolio
+from app.backend.services import process_pool
+from app.backend.services.process_pool import ProcessGraphRunner
+from app.backend.services.run_scheduler import RUN, RunScheduler
+from src.data.cache import Cache, get_cache
+from src.data.models import Price
+from src.utils.progress import progress
+from src.utils.usage import track_usage
+
+START_DATE, END_DATE = "2024-01-01", "2024-03-01"
+
+
+def _request() -> HedgeFundRequest:
+    return HedgeFundRequest(
+        tickers=["AAPL"],
+        graph_nodes=[GraphNode(id="technical_analyst_aaa111"), GraphNode(id="portfolio_manager_bbb222")],
+        graph_edges=[GraphEdge(id="edge", source="technical_analyst_aaa111", target="portfolio_manager_bbb222")],
+        model_name="mock",
+        model_provider="Mock",
+        reuse_cached_results=False,
+    )
+
+
+def _prices() -> list[Price]:
+    return [Price(open=100 + i, close=100 + i * 1.1, high=102 + i, low=99 + i, volume=1000, time=day.strftime("%Y-%m-%d")) for i, day in enumerate(pd.bdate_range(START_DATE, END_DATE))]
+
+
+@pytest.fixture
+def seeded_cache():
+    # The only data the graph needs; workers get it from the parent's snapshot instead of the API
+    cache_key = f"AAPL_{START_DATE}_{END_DATE}"
+    get_cache().set_prices(cache_key, _prices())
+    yield
+    get_cache().clear()
+
+
+class TestProcessGraphRunner:
+    def test_runs_graph_in_worker_with_progress_and_usage(self, seeded_cache):
+        runner = ProcessGraphRunner(max_workers=1)
+        request = _request()
+        received = []
+        progress.subscribe("run-1", received.extend)
+
+        async def scenario():
+            with track_usage() as usage:
+                result = await runner.run(create_portfolio(1000, 0, ["AAPL"], None), ["AAPL"], START_DATE, END_DATE, "mock", "Mock", request, run_id="run-1")
+            progress.flush()
+            return result, usage.summary()
+
+        try:
+            result, usage = asyncio.run(scenario())
+        finally:
+            progress.unsubscribe("run-1", received.extend)
+            runner.shutdown()
+
+        expected = run_graph(get_compiled_graph(request.graph_nodes, request.graph_edges), create_portfolio(1000, 0, ["AAPL"], None), ["AAPL"], START_DATE, END_DATE, "mock", "Mock", request)
+        assert result["messages"][-1].content == expected["messages"][-1].content
+        assert result["usage"]["api"]["calls"] == 0
+        assert usage["by_agent"] == result["usage"]["by_agent"]
+        assert {(update.agent_name, update.status) for update in received} >= {("technical_analyst_aaa111", "Done"), ("portfolio_manager_bbb222", "Done")}
+        assert all(update.run_id == "run-1" for update in received)
+
+
+class TestProcessRunScheduling:
+    """Process-mode runs are held to their scheduler slot like threaded runs."""
+
+    @pytest.fixture
+    def runner(self, monkeypatch):
+        # A thread pool stands in for the worker processes, so the jobs can be blocked and observed
+        runner = ProcessGraphRunner(max_workers=1)
+        runner._pool.shutdown()
+        runner._pool = ThreadPoolExecutor(max_workers=1)
+        self.snapshot_threads = []
+        self.started = []
+        self.release = threading.Event()
+
+        def snapshot(tickers):
+            self.snapshot_threads.append(threading.get_ident())
+            return {}
+
+        def run_job(job_id, cache_snapshot, *args):
+            self.started.append(job_id)
+            self.release.wait(5)
+            runner._updates.put(("done", job_id))
+            return {"usage": {}}
+
+        monkeypatch.setattr(process_pool, "get_cache", lambda: SimpleNamespace(snapshot=snapshot))
+        monkeypatch.setattr(process_pool, "_run_graph_in_worker", run_job)
+        yield runner
+        self.release.set()
+        runner._pool.shutdown()
+
+    def _run(self, scheduler, runner, run_id):
+        async def run():
+            async with scheduler.slot(scheduler.submit(run_id, RUN, f"flow:{run_id}")):
+                await runner.run({}, ["AAPL"], START_DATE, END_DATE, "mock", "Mock", _request(), run_id, executor=scheduler.executor)
+
+        return asyncio.create_task(run())
+
+    def test_cancelled_run_holds_its_slot_until_the_worker_returns(self, runner):
+        async def scenario():
+            scheduler = RunScheduler(workers={RUN: 1})
+            running = self._run(scheduler, runner, "a")
+            while not self.started:
+                await asyncio.sleep(0.01)
+            waiting = self._run(scheduler, runner, "b")
+
+            scheduler.cancel("a")
+            with pytest.raises(asyncio.CancelledError):
+                await running
+            await asyncio.sleep(0.05)
+            # The worker is still running "a", so "b" keeps waiting for the slot
+            stats_while_draining = dict(scheduler.get_stats()[RUN])
+
+            self.release.set()
+            waiting.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiting
+            return threading.get_ident(), stats_while_draining
+
+        loop_thread, stats_while_draining = asyncio.run(scenario())
+        assert stats_while_draining["running"] == 1 and stats_while_draining["queued"] == 1
+        assert len(self.started) == 1
+        assert self.snapshot_threads and loop_thread not in self.snapshot_threads
+
+    def test_cancelling_a_run_cancels_its_queued_job(self, runner):
+        async def scenario():
+            scheduler = RunScheduler(workers={RUN: 2})
+            first = self._run(scheduler, runner, "a")
+            while not self.started:
+                await asyncio.sleep(0.01)
+            # The single worker is busy, so "b"'s job waits in the pool
+            second = self._run(scheduler, runner, "b")
+            await asyncio.sleep(0.05)
+
+            scheduler.cancel("b")
+            with pytest.raises(asyncio.CancelledError):
+                await second
+            await asyncio.sleep(0.01)
+            running_after_cancel = scheduler.get_stats()[RUN]["running"]
+
+            self.release.set()
+            await first
+            return running_after_cancel
+
+        assert asyncio.run(scenario()) == 1
+        assert len(self.started) == 1
+
+
+class TestCacheSnapshot:
+    def test_snapshot_round_trips_the_tickers_entries(self):
+        source = Cache()
+        source.set_prices(f"AAPL_{START_DATE}_{END_DATE}", _prices())
+        source.set_prices(f"MSFT_{START_DATE}_{END_DATE}", _prices())
+
+        target = Cache()
+        target.load(pickle.loads(pickle.dumps(source.snapshot(["AAPL"]))))
+
+        assert target.get_prices(f"AAPL_{START_DATE}_{END_DATE}") == _prices()
+        assert target.get_prices(f"MSFT_{START_DATE}_{END_DATE}") is None
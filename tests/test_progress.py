@@ -0,0 +1,58 @@
+"""Tests for the coalescing progress event bus."""
+import threading
+import time
+
+from src.utils.progress import AgentProgress
+
+
+class TestAgentProgress:
+    def test_updates_are_coalesced_per_agent_and_ticker(self):
+        bus = AgentProgress(tick_seconds=60)
+        batches = []
+        bus.register_handler(batches.append)
+
+        bus.update_status("warren_buffett_agent", "AAPL", "Fetching financial metrics")
+        bus.update_status("warren_buffett_agent", "MSFT", "Fetching financial metrics")
+        bus.update_status("warren_buffett_agent", "AAPL", "Generating analysis", analysis="{}")
+        bus.update_status("warren_buffett_agent", "AAPL", "Done")
+        bus.flush()
+
+        assert len(batches) == 1
+        assert [(update.ticker, update.status, update.analysis) for update in batches[0]] == [("MSFT", "Fetching financial metrics", None), ("AAPL", "Done", "{}")]
+
+    def test_empty_ticks_do_not_call_handlers(self):
+        bus = AgentProgress(tick_seconds=60)
+        batches = []
+        bus.register_handler(batches.append)
+
+        bus.flush()
+        assert batches == []
+
+    def test_background_tick_dispatches_updates_from_many_threads(self):
+        bus = AgentProgress(tick_seconds=0.01)
+        received = []
+        bus.register_handler(received.extend)
+
+        threads = [threading.Thread(target=lambda i=i: [bus.update_status(f"agent_{i}", f"T{j}", "Working") for j in range(50)]) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        deadline = time.monotonic() + 2
+        while len({(update.agent_name, update.ticker) for update in received}) < 400 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert len({(update.agent_name, update.ticker) for update in received}) == 400
+        assert len(bus.get_all_status()) == 8
+
+    def test_failing_handler_does_not_block_others(self):
+        bus = AgentProgress(tick_seconds=60)
+        received = []
+        bus.register_handler(lambda updates: 1 / 0)
+        bus.register_handler(received.extend)
+
+        bus.update_status("warren_buffett_agent", None, "Done")
+        bus.flush()
+
+        assert [update.status for update in received] == ["Done"]
@@ -0,0 +1,167 @@
+"""Tests for per-run progress channels and their bridge into SSE event loops."""
+import asyncio
+import json
+import threading
+
+import numpy as np
+
+from app.backend.models.events import CompleteEvent, ProgressUpdateEvent, _json_default, encode_sse_batch
+from app.backend.services.progress_stream import ProgressStream
+from src.utils.progress import AgentProgress, progress_run
+
+
+def _event(status: str) -> ProgressUpdateEvent:
+    return ProgressUpdateEvent(agent="backtest", ticker=None, status=status)
+
+
+class TestRunChannels:
+    def test_runs_only_receive_their_own_updates(self):
+        bus = AgentProgress(tick_seconds=60)
+        received = {"run-a": [], "run-b": []}
+        for run_id, updates in received.items():
+            bus.subscribe(run_id, updates.extend)
+
+        def agent(run_id):
+            with progress_run(run_id):
+                bus.update_status("warren_buffett_agent", "AAPL", f"Working on {run_id}")
+
+        threads = [threading.Thread(target=agent, args=(run_id,)) for run_id in received]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        bus.flush()
+
+        assert [update.status for update in received["run-a"]] == ["Working on run-a"]
+        assert [update.status for update in received["run-b"]] == ["Working on run-b"]
+
+    def test_unsubscribed_runs_are_not_buffered(self):
+        bus = AgentProgress(tick_seconds=60)
+        with progress_run("nobody-listening"):
+            bus.update_status("warren_buffett_agent", "AAPL", "Working")
+
+        assert bus._pending == {}
+
+
+class TestProgressStream:
+    def test_events_from_worker_threads_wake_the_consumer(self):
+        async def scenario():
+            stream = ProgressStream()
+            threading.Thread(target=lambda: [stream.publish(_event(f"day {i}")) for i in range(100)]).start()
+
+            events = []
+            while len(events) < 100:
+                events += await stream.get(timeout=2)
+            return events
+
+        events = asyncio.run(scenario())
+        assert [event.status for event in events] == [f"day {i}" for i in range(100)]
+
+    def test_slow_clients_get_merged_updates_and_keep_unkeyed_events(self):
+        async def scenario():
+            stream = ProgressStream(max_pending=2)
+            stream.publish(_event("day 1 result"))
+            for ticker in ["AAPL", "MSFT", "NVDA"]:
+                stream.publish(_event(f"{ticker} fetching"), key=ticker)
+                stream.publish(_event(f"{ticker} done"), key=ticker)
+            stream.publish(_event("day 2 result"))
+            return stream, await stream.drain()
+
+        stream, events = asyncio.run(scenario())
+        assert [event.status for event in events] == ["day 1 result", "MSFT done", "NVDA done", "day 2 result"]
+        assert stream.dropped == 1
+
+    def test_publishing_after_the_loop_closed_is_ignored(self):
+        async def make_stream():
+            return ProgressStream()
+
+        stream = asyncio.run(make_stream())
+        stream.publish(_event("late"))
+
+
+def _parse_frame(frame: str) -> tuple[str, object]:
+    event_line, data_line = frame.strip().split("\n")
+    return event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))
+
+
+class TestSSEFrames:
+    def test_single_events_keep_their_own_frame(self):
+        event = _event("Working")
+
+        assert _parse_frame(encode_sse_batch([event])) == ("progress", event.model_dump())
+        assert event.to_sse() == encode_sse_batch([event])
+
+    def test_several_events_share_a_batch_frame(self):
+        event_type, data = _parse_frame(encode_sse_batch([_event("day 1"), _event("day 2")]))
+
+        assert event_type == "batch"
+        assert [(item["type"], item["status"]) for item in data] == [("progress", "day 1"), ("progress", "day 2")]
+
+    def test_complete_event_encodes_numpy_and_nested_values(self):
+        event = CompleteEvent(data={"metrics": {"sharpe_ratio": np.float64(1.5), 2024: [np.int64(3)]}})
+
+        assert _parse_frame(event.to_sse())[1]["data"] == {"metrics": {"sharpe_ratio": 1.5, "2024": [3]}}
+
+    def test_fallback_encoder_keeps_numpy_scalar_types(self):
+        assert [_json_default(value) for value in (np.int64(3), np.float32(1.5), np.bool_(True))] == [3, 1.5, True]
+        assert type(_json_default(np.int64(3))) is int
+        assert _json_default(ProgressUpdateEvent(agent="a", status="s"))["agent"] == "a"
+
+    def test_frames_are_sent_as_soon_as_events_are_published(self):
+        async def scenario():
+            stream = ProgressStream()
+            loop = asyncio.get_running_loop()
+            run_task = loop.create_future()
+            disconnect_task = loop.create_future()
+            frames = []
+
+            async def consume():
+                async for frame in stream.frames(run_task, disconnect_task):
+                    frames.append(frame)
+
+            consumer = asyncio.create_task(consume())
+            await asyncio.sleep(0)
+            stream.publish(_event("day 1"))
+            await asyncio.sleep(0.01)
+            received_before_finish = len(frames)
+            run_task.set_result(None)
+            await asyncio.wait_for(consumer, timeout=1)
+            return received_before_finish, frames
+
+        received_before_finish, frames = asyncio.run(scenario())
+        assert received_before_finish == 1
+        assert _parse_frame(frames[0])[1]["status"] == "day 1"
+
+    def test_events_queued_behind_a_slow_client_are_batched(self):
+        async def scenario():
+            stream = ProgressStream()
+            loop = asyncio.get_running_loop()
+            run_task = loop.create_future()
+            disconnect_task = loop.create_future()
+            frames = []
+            stream.publish(_event("day 1"))
+            async for frame in stream.frames(run_task, disconnect_task):
+                frames.append(frame)
+                if len(frames) == 1:
+                    # The client is still reading the first frame while more days complete
+                    for day in range(2, 5):
+                        stream.publish(_event(f"day {day}"))
+                    await asyncio.sleep(0)
+                else:
+                    run_task.set_result(None)
+            return frames
+
+        frames = asyncio.run(scenario())
+        assert [_parse_frame(frame)[0] for frame in frames] == ["progress", "batch"]
+        assert [item["status"] for item in _parse_frame(frames[1])[1]] == ["day 2", "day 3", "day 4"]
+
+    def test_disconnect_stops_the_stream_without_waiting_for_events(self):
+        async def scenario():
+            stream = ProgressStream()
+            loop = asyncio.get_running_loop()
+            run_task = loop.create_future()
+            disconnect_task = loop.create_future()
+            loop.call_later(0.01, disconnect_task.set_result, True)
+            return [frame async for frame in stream.frames(run_task, disconnect_task)]
+
+        assert asyncio.run(asyncio.wait_for(scenario(), timeout=1)) == []
@@ -0,0 +1,172 @@
+"""Tests for admission control and fair scheduling of backend runs."""
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from app.backend.services.backtest_service import BacktestService
+from app.backend.services.run_scheduler import RunQueueFullError, RunScheduler
+
+
+async def _run(scheduler, ticket, log, positions=None, hold=None):
+    on_position = positions.append if positions is not None else None
+    async with scheduler.slot(ticket, on_position=on_position):
+        log.append(ticket.run_id)
+        await (hold or asyncio.sleep(0))
+
+
+class TestRunScheduler:
+    def test_runs_beyond_the_worker_count_wait_their_turn(self):
+        async def scenario():
+            scheduler = RunScheduler(workers={"run": 1})
+            release = asyncio.get_running_loop().create_future()
+            log, positions = [], []
+            first = asyncio.create_task(_run(scheduler, scheduler.submit("a", "run", "flow:1"), log, hold=release))
+            second = asyncio.create_task(_run(scheduler, scheduler.submit("b", "run", "flow:2"), log, positions))
+            await asyncio.sleep(0.01)
+            waiting = (list(log), scheduler.get_stats()["run"])
+            release.set_result(None)
+            await asyncio.gather(first, second)
+            return waiting, log, positions
+
+        (log_while_busy, stats), log, positions = asyncio.run(scenario())
+        assert log_while_busy == ["a"]
+        assert stats == {"workers": 1, "running": 1, "queued": 1, "max_queued": 50}
+        assert log == ["a", "b"]
+        assert positions == [1]
+
+    def test_owners_are_served_round_robin(self):
+        async def scenario():
+            scheduler = RunScheduler(workers={"backtest": 1})
+            release = asyncio.get_running_loop().create_future()
+            log = []
+            blocker = asyncio.create_task(_run(scheduler, scheduler.submit("busy", "backtest", "flow:0"), log, hold=release))
+            tickets = [scheduler.submit(run_id, "backtest", owner) for run_id, owner in [("a1", "flow:1"), ("a2", "flow:1"), ("a3", "flow:1"), ("b1", "flow:2")]]
+            positions = {ticket.run_id: ticket.position for ticket in tickets}
+            tasks = [asyncio.create_task(_run(scheduler, ticket, log)) for ticket in tickets]
+            await asyncio.sleep(0)
+            release.set_result(None)
+            await asyncio.gather(blocker, *tasks)
+            return positions, log
+
+        positions, log = asyncio.run(scenario())
+        assert positions == {"a1": 1, "b1": 2, "a2": 3, "a3": 4}
+        assert log == ["busy", "a1", "b1", "a2", "a3"]
+
+    def test_full_queue_rejects_new_runs(self):
+        async def scenario():
+            scheduler = RunScheduler(workers={"run": 1}, max_queued=1)
+            scheduler.submit("a", "run", "flow:1")
+            scheduler.submit("b", "run", "flow:1")
+            with pytest.raises(RunQueueFullError):
+                scheduler.submit("c", "run", "flow:1")
+            return scheduler.has_capacity("run")
+
+        assert asyncio.run(scenario()) is False
+
+    def test_cancelling_a_queued_run_frees_its_place(self):
+        async def scenario():
+            scheduler = RunScheduler(workers={"run": 1})
+            release = asyncio.get_running_loop().create_future()
+            log = []
+            first = asyncio.create_task(_run(scheduler, scheduler.submit("a", "run", "flow:1"), log, hold=release))
+            queued = asyncio.create_task(_run(scheduler, scheduler.submit("b", "run", "flow:1"), log))
+            third = scheduler.submit("c", "run", "flow:1")
+            await asyncio.sleep(0)
+
+            assert scheduler.cancel("b")
+            assert not scheduler.cancel("unknown")
+            with pytest.raises(asyncio.CancelledError):
+                await queued
+            position_after_cancel = third.position
+
+            release.set_result(None)
+            await asyncio.gather(first, _run(scheduler, third, log))
+            return position_after_cancel, log, scheduler.get_stats()["run"]
+
+        position_after_cancel, log, stats = asyncio.run(scenario())
+        assert position_after_cancel == 1
+        assert log == ["a", "c"]
+        assert stats["running"] == 0 and stats["queued"] == 0
+
+
+    def test_run_cancelled_before_entering_its_slot_never_runs(self):
+        async def scenario():
+            scheduler = RunScheduler(workers={"run": 1})
+            release = asyncio.get_running_loop().create_future()
+            log = []
+            first = asyncio.create_task(_run(scheduler, scheduler.submit("a", "run", "flow:1"), log, hold=release))
+            # Cancelled (e.g. by DELETE /runs/{run_id}) while queued, before its task entered the slot
+            queued = scheduler.submit("b", "run", "flow:1")
+            assert scheduler.cancel("b")
+            assert not queued.admitted
+            with pytest.raises(asyncio.CancelledError):
+                await _run(scheduler, queued, log)
+
+            release.set_result(None)
+            await first
+            return log, scheduler.get_stats()["run"]
+
+        log, stats = asyncio.run(scenario())
+        assert log == ["a"]
+        assert stats["running"] == 0 and stats["queued"] == 0
+
+    def test_cancelled_run_holds_its_slot_until_its_work_returns(self):
+        work_started, release_work = threading.Event(), threading.Event()
+
+        def blocking_work():
+            work_started.set()
+            release_work.wait(5)
+
+        async def scenario():
+            scheduler = RunScheduler(workers={"run": 1})
+            loop = asyncio.get_running_loop()
+            log = []
+
+            async def run_work():
+                async with scheduler.slot(scheduler.submit("a", "run", "flow:1")):
+                    await loop.run_in_executor(scheduler.executor, blocking_work)
+
+            running = asyncio.create_task(run_work())
+            await loop.run_in_executor(None, work_started.wait, 5)
+            waiting = asyncio.create_task(_run(scheduler, scheduler.submit("b", "run", "flow:2"), log))
+
+            assert scheduler.cancel("a")
+            with pytest.raises(asyncio.CancelledError):
+                await running
+            await asyncio.sleep(0.01)
+            # The cancelled run's thread is still busy, so "b" must keep waiting
+            stats_while_draining = dict(scheduler.get_stats()["run"])
+            log_while_draining = list(log)
+
+            release_work.set()
+            await waiting
+            return stats_while_draining, log_while_draining, log, scheduler.get_stats()["run"]
+
+        stats_while_draining, log_while_draining, log, stats = asyncio.run(scenario())
+        assert stats_while_draining["running"] == 1 and stats_while_draining["queued"] == 1
+        assert log_while_draining == []
+        assert log == ["b"]
+        assert stats["running"] == 0
+
+
+class TestBacktestBlockingIO:
+    def test_data_fetching_runs_off_the_event_loop(self):
+        threads = set()
+
+        def fetch(*args, **kwargs):
+            threads.add(threading.get_ident())
+            return pd.DataFrame({"close": [100.0]})
+
+        async def scenario():
+            service = BacktestService(graph=None, portfolio={}, tickers=["AAPL"], start_date="2024-01-01", end_date="2024-01-02", initial_capital=1000, request=None)
+            with patch.object(BacktestService, "prefetch_data", lambda self: fetch()), patch("app.backend.services.backtest_service.get_price_data", fetch):
+                await service._run_blocking(service.prefetch_data)
+                prices = await service._run_blocking(service.get_current_prices, "2024-01-01", "2024-01-02")
+            return threading.get_ident(), prices
+
+        loop_thread, prices = asyncio.run(scenario())
+        assert prices == {"AAPL": 100.0}
+        assert threads and loop_thread not in threads
@@ -0,0 +1,29 @@
+"""Tests for the local headline sentiment scorer."""
+from src.tools.sentiment_scorer import DEFAULT_LOCAL_CONFIDENCE_THRESHOLD, LocalSentimentScorer
+
+
+class TestLocalSentimentScorer:
+    def setup_method(self):
+        self.scorer = LocalSentimentScorer()
+
+    def test_clear_headlines_are_confident(self):
+        (positive, positive_confidence), (negative, negative_confidence) = self.scorer.score(["Apple beats estimates as shares surge", "Tesla shares plunge after recall"])
+
+        assert positive == "positive" and positive_confidence >= DEFAULT_LOCAL_CONFIDENCE_THRESHOLD
+        assert negative == "negative" and negative_confidence >= DEFAULT_LOCAL_CONFIDENCE_THRESHOLD
+
+    def test_ambiguous_headlines_escalate(self):
+        results = self.scorer.score(["Microsoft announces new CEO", "Stock falls as profit misses", "Nvidia outlook not strong despite record revenue"])
+
+        assert all(confidence < DEFAULT_LOCAL_CONFIDENCE_THRESHOLD for _, confidence in results)
+
+    def test_negation_flips_polarity(self):
+        (sentiment, _), = self.scorer.score(["Merger not approved"])
+
+        assert sentiment == "negative"
+
+    def test_inflected_forms(self):
+        assert [sentiment for sentiment, _ in self.scorer.score(["Shares rallied", "Revenue fell", "Profits soaring"])] == ["positive", "negative", "positive"]
+
+    def test_empty_input(self):
+        assert self.scorer.score([]) == []
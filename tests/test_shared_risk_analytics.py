@@ -0,0 +1,124 @@
+"""Tests for sharing work across the portfolio-manager branches of a graph."""
+import threading
+from unittest.mock import patch
+
+from app.backend.models.schemas import GraphEdge, GraphNode
+from langchain_core.messages import HumanMessage
+
+from app.backend.services.graph import create_graph, run_graph
+from src.agents.risk_manager import RiskAnalyticsCache, risk_management_agent
+from src.data.models import Price
+from src.utils.analysts import ANALYST_CONFIG
+
+
+def _prices(ticker, start_date, end_date, api_key=None):
+    return [Price(open=100 + day, close=100 + day * (1 if ticker == "AAPL" else -1), high=110, low=90, volume=1000, time=f"2024-01-{day:02d}") for day in range(1, 21)]
+
+
+def _state(cash):
+    return {
+        "messages": [],
+        "data": {
+            "tickers": ["AAPL", "MSFT"],
+            "portfolio": {"cash": cash, "positions": {}},
+            "start_date": "2024-01-01",
+            "end_date": "2024-01-20",
+            "analyst_signals": {},
+        },
+        "metadata": {"show_reasoning": False},
+    }
+
+
+class TestSharedRiskAnalytics:
+    @patch("src.agents.risk_manager.get_prices", side_effect=_prices)
+    def test_analytics_are_computed_once_and_projected_per_portfolio(self, mock_get_prices):
+        shared = RiskAnalyticsCache()
+        results = {}
+
+        def run(agent_id, cash):
+            results[agent_id] = risk_management_agent(_state(cash), agent_id=agent_id, shared_analytics=shared)
+
+        threads = [threading.Thread(target=run, args=(f"risk_management_agent_{suffix}", cash)) for suffix, cash in [("aaa111", 10_000), ("bbb222", 50_000)]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert mock_get_prices.call_count == 2  # once per ticker, not per risk manager
+        small = results["risk_management_agent_aaa111"]["data"]["analyst_signals"]["risk_management_agent_aaa111"]["AAPL"]
+        large = results["risk_management_agent_bbb222"]["data"]["analyst_signals"]["risk_management_agent_bbb222"]["AAPL"]
+        assert small["volatility_metrics"] == large["volatility_metrics"]
+        assert small["remaining_position_limit"] < large["remaining_position_limit"]
+
+    def test_waiting_risk_managers_report_the_shared_phase(self):
+        shared = RiskAnalyticsCache()
+        fetching, waiting, release = threading.Event(), threading.Event(), threading.Event()
+        statuses = []
+
+        def slow_prices(*args, **kwargs):
+            fetching.set()
+            release.wait(5)
+            return _prices(*args, **kwargs)
+
+        def record_status(agent_id, ticker=None, status="", analysis=None):
+            statuses.append((agent_id, ticker, status))
+            if status == "Waiting for shared risk analytics":
+                waiting.set()
+
+        with patch("src.agents.risk_manager.get_prices", side_effect=slow_prices), patch("src.agents.risk_manager.progress.update_status", side_effect=record_status):
+            first = threading.Thread(target=risk_management_agent, args=(_state(10_000),), kwargs={"agent_id": "risk_management_agent_aaa111", "shared_analytics": shared})
+            second = threading.Thread(target=risk_management_agent, args=(_state(50_000),), kwargs={"agent_id": "risk_management_agent_bbb222", "shared_analytics": shared})
+            first.start()
+            assert fetching.wait(5)
+            second.start()
+            assert waiting.wait(5)
+            release.set()
+            first.join()
+            second.join()
+
+        waiting_statuses = {(agent_id, ticker) for agent_id, ticker, status in statuses if status == "Waiting for shared risk analytics"}
+        assert waiting_statuses == {("risk_management_agent_bbb222", "AAPL"), ("risk_management_agent_bbb222", "MSFT")}
+
+    @patch("src.agents.risk_manager.get_prices", side_effect=_prices)
+    def test_unshared_result_matches_shared(self, _):
+        shared = risk_management_agent(_state(10_000), shared_analytics=RiskAnalyticsCache())
+        unshared = risk_management_agent(_state(10_000))
+
+        assert shared["data"] == unshared["data"]
+
+    def test_graph_runs_share_analytics_only_within_a_run(self):
+        connections = {"technical_analyst_abc123": "portfolio_manager_aaa111", "fundamentals_analyst_def456": "portfolio_manager_bbb222"}
+        nodes = [GraphNode(id=node_id, position={"x": 0, "y": 0}) for connection in connections.items() for node_id in connection]
+        edges = [GraphEdge(id=f"e-{pm}", source=analyst, target=pm) for analyst, pm in connections.items()]
+        closes = {"AAPL": 100.0, "MSFT": 200.0}
+
+        def prices(ticker, start_date, end_date, api_key=None):
+            return [Price(open=1, close=closes[ticker] + day, high=1, low=1, volume=1000, time=f"2024-01-{day:02d}") for day in range(1, 21)]
+
+        def analyst(state, agent_id):
+            return {"messages": [], "data": {"analyst_signals": {agent_id: {}}}}
+
+        def portfolio_manager(state, agent_id):
+            return {"messages": [HumanMessage(content="{}", name=agent_id)]}
+
+        risk_prices = []
+
+        def risk_manager(state, agent_id):
+            update = risk_management_agent(state, agent_id=agent_id)
+            risk_prices.append(update["data"]["analyst_signals"][agent_id]["AAPL"]["current_price"])
+            return update
+
+        with patch.dict(ANALYST_CONFIG["technical_analyst"], {"agent_func": analyst}), patch.dict(ANALYST_CONFIG["fundamentals_analyst"], {"agent_func": analyst}), \
+                patch("app.backend.services.graph.portfolio_management_agent", portfolio_manager), \
+                patch("app.backend.services.graph.risk_management_agent", risk_manager):
+            graph = create_graph(nodes, edges).compile()
+
+        # The compiled graph is reused across runs (as the graph cache does) over the same window
+        with patch("src.agents.risk_manager.get_prices", side_effect=prices) as mock_get_prices:
+            run_graph(graph, {"cash": 10_000, "positions": {}}, ["AAPL", "MSFT"], "2024-01-01", "2024-01-20", "gpt-4o", "OpenAI")
+            assert mock_get_prices.call_count == 2  # once per ticker, not per risk manager
+            closes["AAPL"] = 150.0
+            run_graph(graph, {"cash": 10_000, "positions": {}}, ["AAPL", "MSFT"], "2024-01-01", "2024-01-20", "gpt-4o", "OpenAI")
+            assert mock_get_prices.call_count == 4
+
+        assert risk_prices == [120.0, 120.0, 170.0, 170.0]
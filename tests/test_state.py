@@ -0,0 +1,86 @@
+"""Tests for the structural-sharing agent state reducers."""
+import pickle
+
+from langchain_core.messages import HumanMessage
+from langgraph.graph import END, StateGraph
+
+from src.graph.state import AgentState, MessageLog, append_messages, merge_data
+
+
+def _message(name: str) -> HumanMessage:
+    return HumanMessage(content=name, name=name)
+
+
+class TestMessageLog:
+    def test_appends_share_the_backing_list(self):
+        log = append_messages([], [_message("a")])
+        extended = append_messages(log, [_message("b")])
+
+        assert extended._items is log._items
+        assert [m.name for m in log] == ["a"]
+        assert [m.name for m in extended] == ["a", "b"]
+
+    def test_branching_copies_on_write(self):
+        log = MessageLog([_message("a")])
+        first = log + [_message("b")]
+        second = log + [_message("c")]
+
+        assert [m.name for m in first] == ["a", "b"]
+        assert [m.name for m in second] == ["a", "c"]
+        assert log == [_message("a")]
+
+    def test_full_history_updates_are_not_duplicated(self):
+        log = MessageLog([_message("a")])
+        first = append_messages(log, log + [_message("b")])
+        second = append_messages(first, log + [_message("c")])
+
+        assert [m.name for m in second] == ["a", "b", "c"]
+
+    def test_sequence_behaviour(self):
+        log = MessageLog([_message("a"), _message("b")]) + [_message("c")]
+
+        assert log[-1].name == "c"
+        assert [m.name for m in log[1:]] == ["b", "c"]
+        assert pickle.loads(pickle.dumps(log)) == log
+
+
+class TestMergeData:
+    def test_merges_signal_slots_without_copying_signals(self):
+        buffett = {"AAPL": {"signal": "bullish", "reasoning": "x" * 1000}}
+        state = {"tickers": ["AAPL"], "analyst_signals": {"warren_buffett_agent": buffett}}
+
+        merged = merge_data(state, {"analyst_signals": {"ben_graham_agent": {"AAPL": {"signal": "bearish"}}}})
+
+        assert set(merged["analyst_signals"]) == {"warren_buffett_agent", "ben_graham_agent"}
+        assert merged["analyst_signals"]["warren_buffett_agent"] is buffett
+        assert merged["tickers"] is state["tickers"]
+        assert set(state["analyst_signals"]) == {"warren_buffett_agent"}
+
+    def test_empty_update_is_free(self):
+        state = {"analyst_signals": {}}
+        assert merge_data(state, {}) is state
+
+
+class TestParallelAgents:
+    def test_parallel_nodes_write_their_own_slots(self):
+        def start(state: AgentState):
+            return state
+
+        def analyst(name):
+            def node(state: AgentState):
+                return {"messages": [_message(name)], "data": {"analyst_signals": {name: {"AAPL": name}}}}
+
+            return node
+
+        workflow = StateGraph(AgentState)
+        workflow.add_node("start_node", start)
+        for name in ["buffett", "graham", "lynch"]:
+            workflow.add_node(name, analyst(name))
+            workflow.add_edge("start_node", name)
+            workflow.add_edge(name, END)
+        workflow.set_entry_point("start_node")
+
+        result = workflow.compile().invoke({"messages": [_message("input")], "data": {"analyst_signals": {}}, "metadata": {}})
+
+        assert sorted(result["data"]["analyst_signals"]) == ["buffett", "graham", "lynch"]
+        assert len(result["messages"]) == 4
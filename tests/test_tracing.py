@@ -0,0 +1,72 @@
+"""Tests for execution tracing of agent graph runs."""
+import json
+from unittest.mock import Mock, patch
+
+from langgraph.graph import END, StateGraph
+
+from app.backend.services.agent_service import create_agent_function
+from src.agents.warren_buffett import WarrenBuffettSignal
+from src.graph.state import AgentState
+from src.llm.models import ModelProvider
+from src.tools.api import _make_api_request
+from src.utils.llm import call_llm
+from src.utils.progress import progress
+from src.utils.tracing import get_tracer, span, trace_run, traced_node
+
+
+def _analyst(state: AgentState, agent_id: str = "warren_buffett_agent"):
+    progress.update_status(agent_id, "AAPL", "Fetching financial metrics")
+    _make_api_request("https://api.financialdatasets.ai/financial-metrics/?ticker=AAPL", {})
+    progress.update_status(agent_id, "AAPL", "Generating analysis")
+    call_llm("Analyze AAPL", WarrenBuffettSignal, agent_name=agent_id, state=state, ticker="AAPL")
+    progress.update_status(agent_id, None, "Done")
+    return {"data": {"analyst_signals": {agent_id: {}}}}
+
+
+def _run_graph():
+    workflow = StateGraph(AgentState)
+    workflow.add_node("warren_buffett_abc123", create_agent_function(_analyst, "warren_buffett_abc123"))
+    workflow.add_edge("warren_buffett_abc123", END)
+    workflow.set_entry_point("warren_buffett_abc123")
+    return workflow.compile().invoke({"messages": [], "data": {"analyst_signals": {}}, "metadata": {"model_name": "mock", "model_provider": ModelProvider.MOCK.value}})
+
+
+class TestTracing:
+    @patch("src.tools.api.requests.get")
+    def test_records_nested_spans_across_node_threads(self, mock_get, tmp_path):
+        mock_get.return_value = Mock(status_code=200)
+        path = tmp_path / "trace.json"
+
+        with trace_run(path) as tracer:
+            _run_graph()
+
+        spans = {span.name: span for span in tracer.spans}
+        node = spans["warren_buffett_abc123"]
+        assert node.category == "node" and node.parent.name == "run"
+        assert spans["/financial-metrics/"].parent is spans["Fetching financial metrics"]
+        assert spans["/financial-metrics/"].attributes == {"agent": "warren_buffett_abc123", "ticker": "AAPL", "method": "GET"}
+        assert spans["call_llm"].parent is spans["Generating analysis"]
+        assert spans["llm.request"].parent is spans["call_llm"]
+        assert spans["Generating analysis"].parent is node
+        assert all(span.end_ns is not None for span in tracer.spans)
+
+        events = json.loads(path.read_text())["traceEvents"]
+        assert {event["name"] for event in events if event["ph"] == "X"} == set(spans)
+
+    def test_summary_reports_self_time(self):
+        with trace_run() as tracer:
+            with span("outer", "test"):
+                with span("inner", "test"):
+                    pass
+
+        rows = {row["name"]: row for row in tracer.summary()}
+        assert rows["outer"]["count"] == 1
+        assert rows["outer"]["self_seconds"] <= rows["outer"]["total_seconds"] - rows["inner"]["total_seconds"] + 1e-6
+
+    def test_off_by_default(self):
+        node = Mock(return_value={"data": {}})
+
+        assert traced_node(node, "node")({}) == {"data": {}}
+        with span("ignored") as current:
+            assert current is None
+        assert get_tracer() is None
@@ -0,0 +1,90 @@
+"""Tests for LLM and financial API usage instrumentation."""
+from unittest.mock import Mock, patch
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from src.agents.news_sentiment import Sentiment
+from src.tools.api import _make_api_request
+from src.utils.llm import call_llm
+from src.utils.usage import UsageTracker, estimate_cost, track_usage
+
+
+def _fake_llm(*contents: str) -> GenericFakeChatModel:
+    messages = [AIMessage(content=content, usage_metadata={"input_tokens": 1000, "output_tokens": 200, "total_tokens": 1200}) for content in contents]
+    return GenericFakeChatModel(messages=iter(messages))
+
+
+class TestCostEstimate:
+    def test_longest_prefix_wins(self):
+        assert estimate_cost("gpt-5-mini", 1_000_000, 0) == 0.25
+        assert estimate_cost("gpt-5", 1_000_000, 0) == 1.25
+
+    def test_unknown_model_is_free(self):
+        assert estimate_cost("llama3.1:8b", 1_000_000, 1_000_000) == 0.0
+
+
+class TestLLMInstrumentation:
+    """call_llm should record wall time, retries and provider-reported tokens."""
+
+    def _call(self, llm, **kwargs):
+        model_info = Mock()
+        model_info.has_json_mode.return_value = False
+        with patch("src.utils.llm.get_model", return_value=llm), patch("src.utils.llm.get_model_info", return_value=model_info):
+            return call_llm("prompt", Sentiment, agent_name="sentiment_agent", **kwargs)
+
+    def test_records_tokens_and_cost_per_agent_model_and_ticker(self):
+        with track_usage() as usage:
+            response = self._call(_fake_llm('```json\n{"sentiment": "positive", "confidence": 80}\n```'), ticker="AAPL")
+
+        assert response.sentiment == "positive"
+        summary = usage.summary()
+        assert summary["llm"]["calls"] == 1
+        assert summary["llm"]["retries"] == 0
+        assert summary["llm"]["input_tokens"] == 1000
+        assert summary["llm"]["output_tokens"] == 200
+        # gpt-4.1 system default: $2 / $8 per million tokens
+        assert summary["llm"]["estimated_cost"] == 0.0036
+        assert summary["by_agent"]["sentiment_agent"]["calls"] == 1
+        assert summary["by_ticker"]["AAPL"]["calls"] == 1
+        assert "OPENAI:gpt-4.1" in summary["by_model"]
+
+    def test_retries_count_every_attempt(self):
+        llm = _fake_llm("not json", '```json\n{"sentiment": "negative", "confidence": 60}\n```')
+        with track_usage() as usage:
+            self._call(llm)
+
+        summary = usage.summary()
+        assert summary["llm"]["calls"] == 1
+        assert summary["llm"]["retries"] == 1
+        assert summary["llm"]["input_tokens"] == 2000
+
+    def test_nested_trackers_both_record(self):
+        with track_usage() as run_usage:
+            with track_usage() as cycle_usage:
+                self._call(_fake_llm('```json\n{"sentiment": "neutral", "confidence": 50}\n```'))
+            self._call(_fake_llm('```json\n{"sentiment": "neutral", "confidence": 50}\n```'))
+
+        assert cycle_usage.summary()["llm"]["calls"] == 1
+        assert run_usage.summary()["llm"]["calls"] == 2
+
+    def test_nothing_recorded_without_tracker(self):
+        tracker = UsageTracker()
+        self._call(_fake_llm('```json\n{"sentiment": "neutral", "confidence": 50}\n```'))
+        assert tracker.summary()["llm"]["calls"] == 0
+
+
+class TestAPIInstrumentation:
+    @patch("src.tools.api.time.sleep")
+    @patch("src.tools.api.requests.get")
+    def test_records_rate_limit_retries_per_endpoint(self, mock_get, mock_sleep):
+        mock_get.side_effect = [Mock(status_code=429), Mock(status_code=200)]
+
+        with track_usage() as usage:
+            _make_api_request("https://api.financialdatasets.ai/prices/?ticker=AAPL", {})
+
+        summary = usage.summary()
+        assert summary["api"]["calls"] == 1
+        assert summary["api"]["retries"] == 1
+        assert summary["api"]["failures"] == 0
+        assert summary["by_endpoint"]["/prices/"]["calls"] == 1